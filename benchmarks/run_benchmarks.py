@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""Standing benchmark suite for the QSeaBattle hot paths.
+
+Runs every registered benchmark case over a matrix of layouts, appends the
+results to a JSON history and compares them against a stored baseline.
+The process exits with status 1 when a hot path regressed beyond the
+configured threshold, so it can be used as a CI gate.
+
+Usage (from the repository root):
+  python benchmarks/run_benchmarks.py                      # run + compare
+  python benchmarks/run_benchmarks.py --update-baseline    # store new baseline
+  python benchmarks/run_benchmarks.py --sizes 2 4 --skip-tf --only game_play
+
+The suite runs offline and on CPU only (GPUs are hidden from TensorFlow).
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# CPU only, quiet TensorFlow; must be set before TensorFlow is imported.
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_REPO_ROOT / "src"))
+
+import numpy as np  # noqa: E402
+
+from Q_Sea_Battle.benchmark_utilities import (  # noqa: E402
+    BenchmarkResult,
+    append_history,
+    compare_to_baseline,
+    format_results,
+    layout_label,
+    load_baseline,
+    run_benchmark,
+    write_baseline,
+)
+from Q_Sea_Battle.game import Game  # noqa: E402
+from Q_Sea_Battle.game_env import GameEnv  # noqa: E402
+from Q_Sea_Battle.game_layout import GameLayout  # noqa: E402
+from Q_Sea_Battle.majority_players import MajorityPlayers  # noqa: E402
+from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers  # noqa: E402
+from Q_Sea_Battle.simple_players import SimplePlayers  # noqa: E402
+from Q_Sea_Battle.tournament import Tournament  # noqa: E402
+from Q_Sea_Battle.tournament_log import TournamentLog  # noqa: E402
+from Q_Sea_Battle.validation import TRUSTED, validation_level  # noqa: E402
+
+
+DEFAULT_SIZES = [2, 4, 8, 16, 32]
+DEFAULT_HISTORY = _REPO_ROOT / "benchmarks" / "history.json"
+DEFAULT_BASELINE = _REPO_ROOT / "benchmarks" / "baseline.json"
+
+#: Games per Tournament.tournament() call in the tournament benchmark.
+TOURNAMENT_GAMES = 20
+#: Rows appended per call in the TournamentLog.update benchmark.
+LOG_ROWS = 50
+#: Fields per call in the batched NumPy inference benchmark.
+BATCH_ROWS = 1024
+#: Members trained together in the ensemble benchmark.
+ENSEMBLE_MEMBERS = 32
+
+# A case builder takes a layout and returns the keyword arguments for
+# run_benchmark (at least ``fn``), or None if the case does not apply.
+CaseBuilder = Callable[[GameLayout], Optional[Dict[str, Any]]]
+CASES: Dict[str, CaseBuilder] = {}
+TF_CASES: set[str] = set()
+
+
+def register(name: str, requires_tf: bool = False) -> Callable[[CaseBuilder], CaseBuilder]:
+    """Register a benchmark case builder under ``name``."""
+
+    def decorator(builder: CaseBuilder) -> CaseBuilder:
+        CASES[name] = builder
+        if requires_tf:
+            TF_CASES.add(name)
+        return builder
+
+    return decorator
+
+
+def _trusted(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap ``fn`` so that it runs with trusted input validation."""
+
+    def wrapped() -> Any:
+        with validation_level(TRUSTED):
+            return fn()
+
+    return wrapped
+
+
+def _sample_inputs(layout: GameLayout) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return a random (field, gun, comm) triple for a layout."""
+    n2 = layout.field_size ** 2
+    field = np.random.randint(0, 2, size=n2)
+    gun = np.zeros(n2, dtype=int)
+    gun[np.random.randint(0, n2)] = 1
+    comm = np.random.randint(0, 2, size=layout.comms_size)
+    return field, gun, comm
+
+
+# ---------------------------------------------------------------------------
+# Game loop, tournament and logging
+# ---------------------------------------------------------------------------
+
+
+@register("game_play_simple")
+def _case_game_play_simple(layout: GameLayout) -> Dict[str, Any]:
+    game = Game(GameEnv(layout), SimplePlayers(layout))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("game_play_majority")
+def _case_game_play_majority(layout: GameLayout) -> Dict[str, Any]:
+    game = Game(GameEnv(layout), MajorityPlayers(layout))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("game_play_simple_buffered")
+def _case_game_play_simple_buffered(layout: GameLayout) -> Dict[str, Any]:
+    game = Game(GameEnv(layout, buffered=True, seed=0), SimplePlayers(layout))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("game_play_majority_buffered")
+def _case_game_play_majority_buffered(layout: GameLayout) -> Dict[str, Any]:
+    game = Game(GameEnv(layout, buffered=True, seed=0), MajorityPlayers(layout))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("game_play_pr_assisted")
+def _case_game_play_pr_assisted(layout: GameLayout) -> Dict[str, Any]:
+    game = Game(GameEnv(layout), PRAssistedPlayers(layout, p_high=0.9))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("game_play_pr_assisted_trusted")
+def _case_game_play_pr_assisted_trusted(layout: GameLayout) -> Dict[str, Any]:
+    kwargs = _case_game_play_pr_assisted(layout)
+    return {**kwargs, "fn": _trusted(kwargs["fn"])}
+
+
+@register("tournament_majority")
+def _case_tournament(layout: GameLayout) -> Dict[str, Any]:
+    t_layout = GameLayout.from_dict({**layout.to_dict(), "number_of_games_in_tournament": TOURNAMENT_GAMES})
+    tournament = Tournament(GameEnv(t_layout), MajorityPlayers(t_layout), t_layout)
+    return {"fn": tournament.tournament, "items_per_call": TOURNAMENT_GAMES, "unit": "game"}
+
+
+@register("tournament_log_update")
+def _case_tournament_log_update(layout: GameLayout) -> Dict[str, Any]:
+    field, gun, comm = _sample_inputs(layout)
+
+    def fn() -> None:
+        log = TournamentLog(layout)
+        for game_id in range(LOG_ROWS):
+            log.update(field, gun, comm, 1, 1, 1.0)
+            log.update_indicators(game_id=game_id, tournament_id=0, meta_id=0)
+
+    return {"fn": fn, "items_per_call": LOG_ROWS, "unit": "row"}
+
+
+# ---------------------------------------------------------------------------
+# PR-assisted players
+# ---------------------------------------------------------------------------
+
+
+@register("pr_assisted_player_a_decide")
+def _case_pr_assisted_a(layout: GameLayout) -> Dict[str, Any]:
+    players = PRAssistedPlayers(layout, p_high=0.9)
+    player_a, _ = players.players()
+    field, _, _ = _sample_inputs(layout)
+    return {"fn": lambda: player_a.decide(field), "setup": players.reset}
+
+
+@register("pr_assisted_player_b_decide")
+def _case_pr_assisted_b(layout: GameLayout) -> Dict[str, Any]:
+    players = PRAssistedPlayers(layout, p_high=0.9)
+    player_a, player_b = players.players()
+    field, gun, comm = _sample_inputs(layout)
+
+    def setup() -> None:
+        players.reset()
+        player_a.decide(field)
+
+    return {"fn": lambda: player_b.decide(gun, comm), "setup": setup}
+
+
+@register("pr_assisted_player_a_decide_trusted")
+def _case_pr_assisted_a_trusted(layout: GameLayout) -> Dict[str, Any]:
+    kwargs = _case_pr_assisted_a(layout)
+    return {**kwargs, "fn": _trusted(kwargs["fn"])}
+
+
+@register("pr_assisted_player_b_decide_trusted")
+def _case_pr_assisted_b_trusted(layout: GameLayout) -> Dict[str, Any]:
+    kwargs = _case_pr_assisted_b(layout)
+    return {**kwargs, "fn": _trusted(kwargs["fn"])}
+
+
+# ---------------------------------------------------------------------------
+# TensorFlow layers and models (batch size 1, as used during play)
+# ---------------------------------------------------------------------------
+
+
+@register("pr_assisted_layer_call", requires_tf=True)
+def _case_pr_assisted_layer(layout: GameLayout) -> Dict[str, Any]:
+    import tensorflow as tf
+
+    from Q_Sea_Battle.pr_assisted_layer import PRAssistedLayer
+
+    n2 = layout.field_size ** 2
+    layer = PRAssistedLayer(length=n2, p_high=0.9, mode="sample", seed=0)
+    meas = tf.cast(tf.random.uniform((1, n2)) < 0.5, tf.float32)
+    inputs = {
+        "current_measurement": meas,
+        "previous_measurement": tf.zeros_like(meas),
+        "previous_outcome": tf.zeros_like(meas),
+        "first_measurement": tf.ones((1, 1)),
+    }
+    return {"fn": lambda: layer(inputs)}
+
+
+@register("pr_assisted_layer_call_trusted", requires_tf=True)
+def _case_pr_assisted_layer_trusted(layout: GameLayout) -> Dict[str, Any]:
+    kwargs = _case_pr_assisted_layer(layout)
+    return {**kwargs, "fn": _trusted(kwargs["fn"])}
+
+
+@register("neural_net_players_game", requires_tf=True)
+def _case_neural_net_players(layout: GameLayout) -> Dict[str, Any]:
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    game = Game(GameEnv(layout), NeuralNetPlayers(layout))
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("neural_net_players_game_tables", requires_tf=True)
+def _case_neural_net_players_tables(layout: GameLayout) -> Dict[str, Any]:
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    players = NeuralNetPlayers(layout)
+    players.compile_lookup_tables()
+    game = Game(GameEnv(layout), players)
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("numpy_neural_net_players_game", requires_tf=True)
+def _case_numpy_neural_net_players(layout: GameLayout) -> Dict[str, Any]:
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.numpy_inference import NumpyNeuralNetPlayers
+
+    players = NumpyNeuralNetPlayers.from_neural_net_players(NeuralNetPlayers(layout))
+    game = Game(GameEnv(layout), players)
+    return {"fn": game.play, "unit": "game"}
+
+
+@register("numpy_neural_net_batch_inference", requires_tf=True)
+def _case_numpy_neural_net_batch(layout: GameLayout) -> Dict[str, Any]:
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.numpy_inference import NumpyNeuralNetPlayers
+
+    players = NumpyNeuralNetPlayers.from_neural_net_players(NeuralNetPlayers(layout))
+    n2 = layout.field_size ** 2
+    fields = np.random.randint(0, 2, size=(BATCH_ROWS, n2))
+    return {"fn": lambda: players.comm_logits(fields), "items_per_call": BATCH_ROWS, "unit": "field"}
+
+
+@register("ensemble_dial_step", requires_tf=True)
+def _case_ensemble_dial_step(layout: GameLayout) -> Dict[str, Any]:
+    from Q_Sea_Battle.ensemble_training import EnsembleTrainer
+
+    trainer = EnsembleTrainer(layout, seeds=list(range(ENSEMBLE_MEMBERS)))
+    return {
+        "fn": lambda: trainer.dial_step(batch_size=256),
+        "items_per_call": ENSEMBLE_MEMBERS,
+        "unit": "member-step",
+    }
+
+
+@register("lin_model_inference", requires_tf=True)
+def _case_lin_models(layout: GameLayout) -> Dict[str, Any]:
+    import tensorflow as tf
+
+    from Q_Sea_Battle.lin_trainable_assisted_model_a import LinTrainableAssistedModelA
+    from Q_Sea_Battle.lin_trainable_assisted_model_b import LinTrainableAssistedModelB
+
+    model_a = LinTrainableAssistedModelA(layout.field_size, layout.comms_size, sr_mode="sample", seed=0)
+    model_b = LinTrainableAssistedModelB(layout.field_size, layout.comms_size, sr_mode="sample", seed=0)
+    field, gun, comm = _sample_inputs(layout)
+    field_t = tf.constant(field[None, :], dtype=tf.float32)
+    gun_t = tf.constant(gun[None, :], dtype=tf.float32)
+    comm_t = tf.constant(comm[None, :], dtype=tf.float32)
+
+    def fn() -> None:
+        _, meas, out = model_a.compute_with_internal(field_t)
+        model_b([gun_t, comm_t, meas, out])
+
+    return {"fn": fn}
+
+
+@register("pyr_model_inference", requires_tf=True)
+def _case_pyr_models(layout: GameLayout) -> Optional[Dict[str, Any]]:
+    if layout.comms_size != 1:
+        return None
+    import tensorflow as tf
+
+    from Q_Sea_Battle.pyr_trainable_assisted_model_a import PyrTrainableAssistedModelA
+    from Q_Sea_Battle.pyr_trainable_assisted_model_b import PyrTrainableAssistedModelB
+
+    model_a = PyrTrainableAssistedModelA(layout, p_high=0.9, sr_mode="sample")
+    model_b = PyrTrainableAssistedModelB(layout, p_high=0.9, sr_mode="sample")
+    field, gun, comm = _sample_inputs(layout)
+    field_t = tf.constant(field[None, :], dtype=tf.float32)
+    gun_t = tf.constant(gun[None, :], dtype=tf.float32)
+    comm_t = tf.constant(comm[None, :], dtype=tf.float32)
+
+    def fn() -> None:
+        _, meas, out = model_a.compute_with_internal(field_t)
+        model_b([gun_t, comm_t, meas, out])
+
+    return {"fn": fn}
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def run_suite(
+    sizes: List[int],
+    comms_size: int = 1,
+    only: Optional[List[str]] = None,
+    skip_tf: bool = False,
+    min_time: float = 0.2,
+    measure_memory: bool = True,
+    seed: int = 0,
+) -> List[BenchmarkResult]:
+    """Run the selected benchmark cases over all layouts."""
+    results: List[BenchmarkResult] = []
+    names = [n for n in CASES if (only is None or n in only) and not (skip_tf and n in TF_CASES)]
+    for field_size in sizes:
+        layout = GameLayout(field_size=field_size, comms_size=comms_size)
+        label = layout_label(field_size, comms_size)
+        for name in names:
+            np.random.seed(seed)
+            spec = CASES[name](layout)
+            if spec is None:
+                continue
+            result = run_benchmark(
+                name,
+                layout=label,
+                min_time=min_time,
+                measure_memory=measure_memory,
+                **spec,
+            )
+            results.append(result)
+            print(format_results([result]).splitlines()[-1], flush=True)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Field sizes to run.")
+    parser.add_argument("--comms-size", type=int, default=1)
+    parser.add_argument("--only", nargs="+", default=None, choices=sorted(CASES), help="Run only these cases.")
+    parser.add_argument("--skip-tf", action="store_true", help="Skip TensorFlow layer/model cases.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum timed seconds per case.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak-memory measurement.")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative latency regression.")
+    parser.add_argument(
+        "--memory-threshold", type=float, default=None, help="Allowed relative peak-memory regression."
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline.")
+    args = parser.parse_args(argv)
+
+    print(format_results([]))
+    results = run_suite(
+        sizes=args.sizes,
+        comms_size=args.comms_size,
+        only=args.only,
+        skip_tf=args.skip_tf,
+        min_time=args.min_time,
+        measure_memory=not args.no_memory,
+    )
+    append_history(args.history, results)
+
+    if args.update_baseline:
+        write_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(
+        results, baseline, threshold=args.threshold, memory_threshold=args.memory_threshold
+    )
+    if regressions:
+        print("\nRegressions beyond threshold:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions beyond threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,14 +25,20 @@ from .players_base import Players
 from .player_base_a import PlayerA
 from .player_base_b import PlayerB
 from .game import Game
-from .tournament import Tournament
+from .game_context import GameContext
+from .tournament import SequentialStopping, Tournament
+from .tournament_series import SeriesResult, TournamentSeries
 from .tournament_log import TournamentLog
+from .tournament_log_query import LogIndex
+from .instrumentation import Instrumentation, InstrumentationSummary, StageStats
+from .validation import get_validation_level, set_validation_level, validation_level
+from .paired_evaluation import PairedEvaluation, PairedEvaluationResult
+from .counterfactual_evaluation import AllGunsEvaluation, AllGunsResult, NoiseMarginalizedEvaluation
 
 from .simple_players import SimplePlayers
 from .majority_players import MajorityPlayers
 
 from .pr_assisted import PRAssisted
-from .pr_assisted_layer import PRAssistedLayer
 from .pr_assisted_players import PRAssistedPlayers
 from .pr_assisted_player_a import PRAssistedPlayerA
 from .pr_assisted_player_b import PRAssistedPlayerB
@@ -44,10 +50,27 @@ from .reference_performance_utilities import (
     expected_win_rate_majority,
     expected_win_rate_assisted,
     limit_from_mutual_information,
+    binary_entropy_array,
+    binary_entropy_reverse_array,
+    expected_win_rate_simple_array,
+    expected_win_rate_majority_array,
+    expected_win_rate_assisted_array,
+    limit_from_mutual_information_array,
 )
 
 from .logit_utilities import logit_to_prob, logit_to_logprob
-from .dru_utilities import dru_train, dru_execute
+from .numpy_inference import DenseStack, NumpyNeuralNetPlayers, export_dense_stack
+from .model_registry import ModelEntry, ModelRegistry, parse_model_filename
+from .training_checkpoints import CheckpointManager
+from .replay_buffer import ReplayBuffer
+from .result_cache import CachedResult, ResultCache, players_fingerprint
+from .large_field import (
+    LargeFieldGameEnv,
+    LargeFieldMajorityPlayers,
+    LargeFieldPRAssistedPlayers,
+    LargeFieldResult,
+    LargeFieldTournament,
+)
 
 
 # -----------------------------------------------------------------------------
@@ -55,6 +78,12 @@ from .dru_utilities import dru_train, dru_execute
 # -----------------------------------------------------------------------------
 # Mapping: exported_name -> (module_path, attribute_name)
 _LAZY: Dict[str, Tuple[str, str]] = {
+    # TF layers/utilities of the core API; lazy so that `import Q_Sea_Battle`
+    # does not load TensorFlow (e.g. for NumPy-only evaluation workers).
+    "PRAssistedLayer": (".pr_assisted_layer", "PRAssistedLayer"),
+    "dru_train": (".dru_utilities", "dru_train"),
+    "dru_execute": (".dru_utilities", "dru_execute"),
+
     # Neural net players (TF)
     "NeuralNetPlayers": (".neural_net_players", "NeuralNetPlayers"),
     "NeuralNetPlayerA": (".neural_net_player_a", "NeuralNetPlayerA"),
@@ -103,6 +132,30 @@ _LAZY: Dict[str, Tuple[str, str]] = {
     "pyr_to_tf_dataset": (".pyr_trainable_assisted_imitation_utilities", "to_tf_dataset"),
     "transfer_pyr_model_b_layer_weights": (".pyr_trainable_assisted_imitation_utilities", "transfer_pyr_model_b_layer_weights"),
     "transfer_pyr_model_a_layer_weights": (".pyr_trainable_assisted_imitation_utilities", "transfer_pyr_model_a_layer_weights"),
+    "pyr_train_layers_jointly": (".pyr_trainable_assisted_imitation_utilities", "train_layers_jointly"),
+
+    # Vectorised ensemble training of neural player pairs (TF)
+    "EnsembleTrainer": (".ensemble_training", "EnsembleTrainer"),
+    "StackedDenseModel": (".ensemble_training", "StackedDenseModel"),
+
+    # Resumable DIAL/DRU training (TF)
+    "DialTrainer": (".dial_training", "DialTrainer"),
+    "ReinforceTrainer": (".reinforce_training", "ReinforceTrainer"),
+
+    # Imitation training telemetry and early stopping (TF)
+    "TrainingControl": (".training_control", "TrainingControl"),
+    "TrainingReport": (".training_control", "TrainingReport"),
+    "pyr_joint_training_arrays": (".pyr_trainable_assisted_imitation_utilities", "joint_training_arrays"),
+
+    # Truth-table compilation of small Pyr levels (TF)
+    "LookupTableLayer": (".pyr_lookup_tables", "LookupTableLayer"),
+    "compile_layer_table": (".pyr_lookup_tables", "compile_layer_table"),
+    "compile_pyr_lookup_tables": (".pyr_lookup_tables", "compile_pyr_lookup_tables"),
+
+    # Tournament log persistence (fastparquet)
+    "TournamentLogWriter": (".tournament_log_storage", "TournamentLogWriter"),
+    "read_tournament_log": (".tournament_log_storage", "read_tournament_log"),
+    "iter_tournament_log": (".tournament_log_storage", "iter_tournament_log"),
 }
 
 
@@ -141,13 +194,27 @@ __all__ = [
     "PlayerB",
     "Game",
     "Tournament",
+    "SequentialStopping",
     "TournamentLog",
+    # Instrumentation
+    "Instrumentation",
+    "InstrumentationSummary",
+    "StageStats",
+    # Validation policy
+    "get_validation_level",
+    "set_validation_level",
+    "validation_level",
+    # Evaluation
+    "PairedEvaluation",
+    "PairedEvaluationResult",
+    "AllGunsEvaluation",
+    "AllGunsResult",
+    "NoiseMarginalizedEvaluation",
     # Baselines
     "SimplePlayers",
     "MajorityPlayers",
     # Classical assisted
     "PRAssisted",
-    "PRAssistedLayer",
     "PRAssistedPlayers",
     "PRAssistedPlayerA",
     "PRAssistedPlayerB",
@@ -158,11 +225,44 @@ __all__ = [
     "expected_win_rate_majority",
     "expected_win_rate_assisted",
     "limit_from_mutual_information",
+    "binary_entropy_array",
+    "binary_entropy_reverse_array",
+    "expected_win_rate_simple_array",
+    "expected_win_rate_majority_array",
+    "expected_win_rate_assisted_array",
+    "limit_from_mutual_information_array",
     # Logit helpers + DRU
     "logit_to_prob",
     "logit_to_logprob",
-    "dru_train",
-    "dru_execute",
+    # NumPy inference
+    "DenseStack",
+    "NumpyNeuralNetPlayers",
+    "export_dense_stack",
+    # Model registry
+    "ModelEntry",
+    "ModelRegistry",
+    "parse_model_filename",
+    # Training checkpoints
+    "CheckpointManager",
+    # Replay buffer
+    "ReplayBuffer",
+    # Tournament result cache
+    "CachedResult",
+    "ResultCache",
+    "players_fingerprint",
+    # Tournament series
+    "SeriesResult",
+    "TournamentSeries",
+    # Tournament log queries
+    "LogIndex",
+    # Concurrent play
+    "GameContext",
+    # Out-of-core large-field play
+    "LargeFieldGameEnv",
+    "LargeFieldMajorityPlayers",
+    "LargeFieldPRAssistedPlayers",
+    "LargeFieldResult",
+    "LargeFieldTournament",
     # Lazy exports (optional layers)
     *sorted(_LAZY.keys()),
 ]
@@ -0,0 +1,380 @@
+"""Throughput and memory benchmarking helpers for QSeaBattle hot paths.
+
+This module contains the measurement machinery used by the standing
+benchmark suite in ``benchmarks/run_benchmarks.py``:
+
+- :func:`run_benchmark` times a callable (per-call latency, throughput) and
+  measures its peak traced memory with :mod:`tracemalloc`.
+- :func:`append_history` stores results in a JSON history file.
+- :func:`write_baseline` / :func:`load_baseline` persist a reference run.
+- :func:`compare_to_baseline` flags hot paths that regressed beyond a
+  configurable threshold.
+
+The helpers only depend on the standard library so that they can be used
+offline and on CPU-only machines.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of a single benchmark case.
+
+    Attributes:
+        name: Name of the benchmarked hot path (e.g. ``"game_play"``).
+        layout: Label of the layout the case ran on (e.g. ``"4x4_m1"``).
+        calls: Number of timed calls.
+        items_per_call: Work items per call (e.g. games per tournament).
+        total_seconds: Total wall time of the timed calls.
+        items_per_sec: Throughput in items per second.
+        latency_mean_us: Mean per-call latency in microseconds.
+        latency_median_us: Median per-call latency in microseconds.
+        latency_p95_us: 95th percentile per-call latency in microseconds.
+        peak_memory_bytes: Peak traced memory of one call, or -1 if not measured.
+        unit: Name of one work item (``"call"``, ``"game"``, ...).
+        extra: Free-form additional measurements.
+    """
+
+    name: str
+    layout: str
+    calls: int
+    items_per_call: int
+    total_seconds: float
+    items_per_sec: float
+    latency_mean_us: float
+    latency_median_us: float
+    latency_p95_us: float
+    peak_memory_bytes: int
+    unit: str = "call"
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Unique key of this case used to match results against a baseline."""
+        return benchmark_key(self.name, self.layout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable dictionary representation."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark metric that exceeded its allowed threshold.
+
+    Attributes:
+        key: Benchmark key (``"name[layout]"``).
+        metric: Name of the regressed metric.
+        baseline: Baseline value of the metric.
+        current: Current value of the metric.
+        ratio: ``current / baseline``.
+    """
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    ratio: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key}: {self.metric} {self.baseline:.4g} -> {self.current:.4g} "
+            f"({(self.ratio - 1.0) * 100.0:+.1f}%)"
+        )
+
+
+def benchmark_key(name: str, layout: str) -> str:
+    """Return the key identifying a (name, layout) benchmark case."""
+    return f"{name}[{layout}]"
+
+
+def layout_label(field_size: int, comms_size: int) -> str:
+    """Return the canonical layout label used in benchmark keys."""
+    return f"{field_size}x{field_size}_m{comms_size}"
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the ``q``-quantile (0..1) of pre-sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return float(sorted_values[index])
+
+
+def measure_peak_memory(
+    fn: Callable[[], Any],
+    calls: int = 3,
+    setup: Optional[Callable[[], Any]] = None,
+) -> int:
+    """Measure the peak traced memory allocated by a single call of ``fn``.
+
+    Args:
+        fn: Callable to measure.
+        calls: Number of calls; the maximum peak over all calls is reported.
+        setup: Optional callable run before each call, outside the measurement.
+
+    Returns:
+        Peak memory in bytes above the traced baseline at call start.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(max(1, int(calls))):
+            if setup is not None:
+                setup()
+            gc.collect()
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - start)
+        return int(peak)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def run_benchmark(
+    name: str,
+    fn: Callable[[], Any],
+    layout: str,
+    *,
+    setup: Optional[Callable[[], Any]] = None,
+    items_per_call: int = 1,
+    unit: str = "call",
+    warmup: int = 2,
+    min_calls: int = 5,
+    max_calls: int = 100_000,
+    min_time: float = 0.2,
+    measure_memory: bool = True,
+    memory_calls: int = 3,
+) -> BenchmarkResult:
+    """Time a callable and return its benchmark statistics.
+
+    Each call is timed individually with :func:`time.perf_counter`. Calls are
+    repeated until both ``min_calls`` and ``min_time`` are reached (or
+    ``max_calls`` is hit). Peak memory is measured in a separate pass because
+    tracing allocations slows the code under test.
+
+    Args:
+        name: Name of the hot path.
+        fn: Zero-argument callable executing one unit of work.
+        layout: Layout label (see :func:`layout_label`).
+        setup: Optional zero-argument callable run before every call, outside
+            the timed region (e.g. resetting PR-assisted boxes).
+        items_per_call: Number of work items one call represents.
+        unit: Name of one work item.
+        warmup: Number of untimed warm-up calls.
+        min_calls: Minimum number of timed calls.
+        max_calls: Maximum number of timed calls.
+        min_time: Minimum total timed wall time in seconds.
+        measure_memory: If True, measure peak traced memory.
+        memory_calls: Number of calls used for the memory measurement.
+
+    Returns:
+        A :class:`BenchmarkResult`.
+    """
+    for _ in range(max(0, int(warmup))):
+        if setup is not None:
+            setup()
+        fn()
+
+    latencies: List[float] = []
+    total = 0.0
+    while len(latencies) < max_calls and (len(latencies) < min_calls or total < min_time):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        latencies.append(dt)
+        total += dt
+
+    peak = measure_peak_memory(fn, calls=memory_calls, setup=setup) if measure_memory else -1
+
+    ordered = sorted(latencies)
+    n_calls = len(latencies)
+    return BenchmarkResult(
+        name=name,
+        layout=layout,
+        calls=n_calls,
+        items_per_call=int(items_per_call),
+        total_seconds=total,
+        items_per_sec=(n_calls * items_per_call / total) if total > 0.0 else float("inf"),
+        latency_mean_us=1e6 * total / n_calls,
+        latency_median_us=1e6 * statistics.median(ordered),
+        latency_p95_us=1e6 * _percentile(ordered, 0.95),
+        peak_memory_bytes=peak,
+        unit=unit,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def environment_metadata() -> Dict[str, Any]:
+    """Return metadata describing the machine and library versions."""
+    meta: Dict[str, Any] = {
+        "timestamp": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+    try:
+        import numpy as np
+
+        meta["numpy"] = np.__version__
+    except Exception:  # pragma: no cover
+        pass
+    return meta
+
+
+def append_history(
+    path: str | Path,
+    results: Iterable[BenchmarkResult],
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Append a benchmark run to a JSON history file.
+
+    The file holds ``{"runs": [{"metadata": {...}, "results": [...]}, ...]}``
+    and is created if it does not exist.
+
+    Args:
+        path: Location of the history file.
+        results: Results of the current run.
+        metadata: Optional run metadata; defaults to :func:`environment_metadata`.
+
+    Returns:
+        The run record that was appended.
+    """
+    path = Path(path)
+    history: Dict[str, Any] = {"runs": []}
+    if path.exists():
+        history = json.loads(path.read_text(encoding="utf-8"))
+        history.setdefault("runs", [])
+
+    record = {
+        "metadata": dict(metadata) if metadata is not None else environment_metadata(),
+        "results": [r.to_dict() for r in results],
+    }
+    history["runs"].append(record)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+    return record
+
+
+def write_baseline(
+    path: str | Path,
+    results: Iterable[BenchmarkResult],
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Store results as the reference baseline, keyed by benchmark key."""
+    path = Path(path)
+    payload = {
+        "metadata": dict(metadata) if metadata is not None else environment_metadata(),
+        "results": {r.key: r.to_dict() for r in results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: str | Path) -> Dict[str, Dict[str, Any]]:
+    """Load a baseline written by :func:`write_baseline`.
+
+    Returns:
+        Mapping from benchmark key to the stored result dictionary, or an
+        empty dictionary if the file does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return dict(payload.get("results", {}))
+
+
+def compare_to_baseline(
+    results: Iterable[BenchmarkResult],
+    baseline: Mapping[str, Mapping[str, Any]],
+    threshold: float = 0.25,
+    metric: str = "latency_median_us",
+    memory_threshold: Optional[float] = None,
+) -> List[Regression]:
+    """Return the hot paths that regressed relative to a baseline.
+
+    A case regresses when ``current / baseline - 1 > threshold`` for the
+    (lower-is-better) ``metric``. If ``memory_threshold`` is given, peak
+    memory is checked in the same way. Cases missing from the baseline are
+    ignored.
+
+    Args:
+        results: Current results.
+        baseline: Mapping as returned by :func:`load_baseline`.
+        threshold: Allowed relative slowdown (0.25 = 25%).
+        metric: Timing metric to compare.
+        memory_threshold: Optional allowed relative peak-memory increase.
+
+    Returns:
+        List of :class:`Regression` records (empty if nothing regressed).
+
+    Raises:
+        ValueError: If a threshold is negative.
+    """
+    if threshold < 0.0 or (memory_threshold is not None and memory_threshold < 0.0):
+        raise ValueError("thresholds must be non-negative.")
+
+    checks = [(metric, threshold)]
+    if memory_threshold is not None:
+        checks.append(("peak_memory_bytes", memory_threshold))
+
+    regressions: List[Regression] = []
+    for result in results:
+        ref = baseline.get(result.key)
+        if ref is None:
+            continue
+        current_values = result.to_dict()
+        for name, limit in checks:
+            ref_value = float(ref.get(name, 0.0))
+            value = float(current_values[name])
+            if ref_value <= 0.0 or value < 0.0:
+                continue
+            ratio = value / ref_value
+            if ratio - 1.0 > limit:
+                regressions.append(
+                    Regression(key=result.key, metric=name, baseline=ref_value, current=value, ratio=ratio)
+                )
+    return regressions
+
+
+def format_results(results: Iterable[BenchmarkResult]) -> str:
+    """Format results as a fixed-width text table."""
+    lines = [
+        f"{'benchmark':<44} {'items/s':>12} {'median us':>11} {'p95 us':>11} {'peak KiB':>10}",
+    ]
+    for r in results:
+        peak = "n/a" if r.peak_memory_bytes < 0 else f"{r.peak_memory_bytes / 1024.0:.1f}"
+        lines.append(
+            f"{r.key:<44} {r.items_per_sec:>12.1f} {r.latency_median_us:>11.1f} "
+            f"{r.latency_p95_us:>11.1f} {peak:>10}"
+        )
+    return "\n".join(lines)
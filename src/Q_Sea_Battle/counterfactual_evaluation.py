@@ -0,0 +1,392 @@
+"""Counterfactual (lower-variance) evaluation modes for QSeaBattle players.
+
+The gun position is independent of the field and Player A never sees it.
+:class:`AllGunsEvaluation` therefore lets Player A decide once per sampled
+field and scores Player B on every one of the n2 gun positions, which
+gives the exact win rate of the sampled field (averaged over guns) at the
+cost of a single Player A decision.
+
+:class:`NoiseMarginalizedEvaluation` removes the channel-noise sampling
+instead: Player B is evaluated on every noisy variant of Player A's
+message (or on the most likely ones plus one sampled remainder), and the
+expected reward under the noise model is logged instead of a 0/1 sample.
+
+Players that share state between A and B (PR-assisted boxes, trainable
+assisted ``previous`` tensors) are supported through
+``Players.snapshot_shared_state()`` / ``Players.restore_shared_state()``:
+the shared state is captured after Player A has decided and restored
+before every replay of Player B. Factories must declare that replays are
+safe with ``supports_counterfactual = True`` or override both methods;
+others are rejected, since replaying a Player B that changes shared state
+without a restore would bias the scores silently.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .game_env import GameEnv
+from .game_layout import GameLayout
+from .players_base import Players
+from .tournament import Tournament
+from .tournament_log import TournamentLog
+from .validation import TRUSTED, validation_level
+
+
+def _check_counterfactual(players: Players) -> None:
+    """Raise ValueError unless Player B can safely be replayed.
+
+    Raises:
+        ValueError: If the factory neither sets ``supports_counterfactual``
+            nor overrides snapshot_shared_state() and restore_shared_state().
+    """
+    if getattr(players, "supports_counterfactual", False):
+        return
+    cls = type(players)
+    overridden = all(
+        callable(getattr(cls, name, None)) and getattr(cls, name) is not getattr(Players, name)
+        for name in ("snapshot_shared_state", "restore_shared_state")
+    )
+    if not overridden:
+        raise ValueError(
+            f"{cls.__name__} does not declare supports_counterfactual and does not override "
+            "snapshot_shared_state()/restore_shared_state(); Player B cannot be replayed safely."
+        )
+
+
+def _snapshot(players: Players) -> Any:
+    """Snapshot shared state if the factory supports it."""
+    snapshot = getattr(players, "snapshot_shared_state", None)
+    return snapshot() if snapshot is not None else None
+
+
+def _restore(players: Players, state: Any) -> None:
+    """Restore shared state if the factory supports it."""
+    restore = getattr(players, "restore_shared_state", None)
+    if restore is not None:
+        restore(state)
+
+
+@dataclass
+class AllGunsResult:
+    """Rewards of Player B on every gun position for each sampled field.
+
+    Attributes:
+        game_layout: Layout of the evaluated games.
+        fields: Array of shape (n_fields, n2) with the sampled fields.
+        comms: Array of shape (n_fields, m) with the (noisy) messages.
+        rewards: Array of shape (n_fields, n2); entry [i, g] is the reward
+            of Player B for field i when the gun is at cell g.
+    """
+
+    game_layout: GameLayout
+    fields: np.ndarray
+    comms: np.ndarray
+    rewards: np.ndarray
+
+    @property
+    def n_fields(self) -> int:
+        """Number of evaluated fields."""
+        return int(self.rewards.shape[0])
+
+    @property
+    def per_field(self) -> np.ndarray:
+        """Exact win rate of every field, averaged over all gun positions."""
+        return self.rewards.mean(axis=1)
+
+    def outcome(self) -> Tuple[float, float]:
+        """Return (mean reward, standard error) as TournamentLog.outcome().
+
+        Fields are sampled independently, so the standard error is computed
+        from the per-field win rates.
+        """
+        if self.n_fields == 0:
+            return 0.0, 0.0
+        per_field = self.per_field
+        mean = float(per_field.mean())
+        if self.n_fields <= 1:
+            return mean, 0.0
+        return mean, float(per_field.std(ddof=1) / np.sqrt(self.n_fields))
+
+    def per_cell(self) -> pd.DataFrame:
+        """Return win-rate statistics per gun cell.
+
+        Columns:
+            ``row``/``col``: Position of the cell on the field.
+            ``mean_reward``/``std_error``: Win rate with the gun on that cell.
+            ``mean_reward_cell_0``/``mean_reward_cell_1``: Win rate
+            conditioned on the value of that cell (NaN if never observed).
+        """
+        n = self.game_layout.field_size
+        n2 = n * n
+        cells = np.arange(n2)
+        mean = self.rewards.mean(axis=0)
+        if self.n_fields > 1:
+            std_error = self.rewards.std(axis=0, ddof=1) / np.sqrt(self.n_fields)
+        else:
+            std_error = np.zeros(n2)
+
+        occupied = self.fields == 1
+        hits_1 = (self.rewards * occupied).sum(axis=0)
+        hits_0 = (self.rewards * ~occupied).sum(axis=0)
+        count_1 = occupied.sum(axis=0)
+        count_0 = self.n_fields - count_1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_1 = np.where(count_1 > 0, hits_1 / count_1, np.nan)
+            mean_0 = np.where(count_0 > 0, hits_0 / count_0, np.nan)
+
+        return pd.DataFrame(
+            {
+                "row": cells // n,
+                "col": cells % n,
+                "mean_reward": mean,
+                "std_error": std_error,
+                "mean_reward_cell_0": mean_0,
+                "mean_reward_cell_1": mean_1,
+            },
+            index=pd.Index(cells, name="cell"),
+        )
+
+
+class AllGunsEvaluation:
+    """Score Player B on all n2 gun positions for every sampled field.
+
+    Per field the environment is reset, the players are reset, Player A
+    decides once and channel noise is applied once. Player B is then asked
+    to decide for every gun position, with the shared A/B state restored
+    before each decision.
+
+    Args:
+        game_layout: Layout of the games.
+        players: Players factory to evaluate.
+        game_env: Optional environment supplying fields and noise; a new
+            GameEnv(game_layout) is used if omitted.
+
+    Raises:
+        ValueError: If the players do not support counterfactual replays
+            (see ``Players.supports_counterfactual``).
+    """
+
+    def __init__(
+        self,
+        game_layout: GameLayout,
+        players: Players,
+        game_env: Optional[GameEnv] = None,
+    ) -> None:
+        _check_counterfactual(players)
+        self.game_layout = game_layout
+        self.players = players
+        self.game_env = game_env if game_env is not None else GameEnv(game_layout)
+
+    def run(self, n_fields: Optional[int] = None) -> AllGunsResult:
+        """Evaluate ``n_fields`` fields on all gun positions.
+
+        Args:
+            n_fields: Number of fields; defaults to
+                game_layout.number_of_games_in_tournament.
+
+        Returns:
+            An AllGunsResult.
+
+        Raises:
+            ValueError: If ``n_fields`` is not positive.
+        """
+        if n_fields is None:
+            n_fields = self.game_layout.number_of_games_in_tournament
+        if n_fields <= 0:
+            raise ValueError("n_fields must be > 0.")
+
+        n2 = self.game_layout.field_size ** 2
+        m = self.game_layout.comms_size
+        env = self.game_env
+        guns = np.eye(n2, dtype=int)
+        prepare_tournament = getattr(self.players, "prepare_tournament", None)
+        if prepare_tournament is not None:
+            prepare_tournament()
+
+        fields = np.zeros((n_fields, n2), dtype=int)
+        comms = np.zeros((n_fields, m), dtype=int)
+        rewards = np.zeros((n_fields, n2), dtype=float)
+
+        # Fields and guns are generated here; skip the player input checks.
+        with validation_level(TRUSTED):
+            for i in range(n_fields):
+                env.reset()
+                field, _ = env.provide()
+                self.players.reset()
+                player_a, player_b = self.players.players()
+
+                comm = player_a.decide(field.copy(), supp=None)
+                comm_noisy = env.apply_channel_noise(comm)
+                state = _snapshot(self.players)
+
+                for g in range(n2):
+                    _restore(self.players, state)
+                    shoot = int(player_b.decide(guns[g].copy(), comm_noisy.copy(), supp=None))
+                    rewards[i, g] = 1.0 if shoot == field[g] else 0.0
+
+                fields[i] = field
+                comms[i] = comm_noisy
+
+        return AllGunsResult(game_layout=self.game_layout, fields=fields, comms=comms, rewards=rewards)
+
+
+def enumerate_noise_masks(
+    comms_size: int, channel_noise: float, max_flips: Optional[int] = None
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Enumerate flip masks with their exact probabilities.
+
+    Args:
+        comms_size: Message length m.
+        channel_noise: Independent flip probability c of every bit.
+        max_flips: Only masks with at most this many flipped bits are
+            enumerated; None enumerates all 2^m masks.
+
+    Returns:
+        Tuple (masks, weights): boolean masks of shape (m,) ordered from
+        the fewest flips, and their probabilities c^k (1 - c)^(m - k).
+        The weights sum to 1 only if all masks are enumerated.
+    """
+    m = int(comms_size)
+    c = float(channel_noise)
+    k_max = m if max_flips is None else min(int(max_flips), m)
+
+    masks: List[np.ndarray] = []
+    weights: List[float] = []
+    for k in range(k_max + 1):
+        weight = c ** k * (1.0 - c) ** (m - k)
+        for flipped in combinations(range(m), k):
+            mask = np.zeros(m, dtype=bool)
+            mask[list(flipped)] = True
+            masks.append(mask)
+            weights.append(weight)
+    return masks, np.asarray(weights, dtype=float)
+
+
+class NoiseMarginalizedEvaluation(Tournament):
+    """Tournament that logs the expected reward over channel noise.
+
+    Every game samples a field and gun as usual and lets Player A decide
+    once. Player B is then evaluated on the noisy variants of the message
+    and the log stores the expected reward under the noise model:
+
+    - If ``comms_size <= max_exact_bits`` all 2^m flip masks are
+      evaluated with their exact probabilities, which removes the
+      noise-induced variance entirely.
+    - Otherwise all masks with at most ``max_flips`` flips are evaluated
+      exactly and the remaining probability mass is covered by a single
+      mask sampled from the noise distribution conditioned on more than
+      ``max_flips`` flips, which keeps the estimate unbiased.
+
+    The shared A/B state is restored before every replay of Player B (see
+    Players.snapshot_shared_state). The returned TournamentLog has float
+    rewards in [0, 1], so TournamentLog.outcome() and the sequential
+    stopping rules of Tournament apply unchanged. The logged ``comm`` is
+    Player A's noise-free message and ``shoot`` the decision on it.
+
+    Args:
+        game_env: Game environment.
+        players: Players factory.
+        game_layout: Layout (channel noise, tournament length).
+        max_exact_bits: Largest m for which all masks are enumerated.
+        max_flips: Number of flips enumerated exactly when m is larger.
+
+    Raises:
+        ValueError: If the players do not support counterfactual replays
+            (see ``Players.supports_counterfactual``), or ``max_exact_bits``
+            or ``max_flips`` is negative.
+    """
+
+    def __init__(
+        self,
+        game_env: GameEnv,
+        players: Players,
+        game_layout: GameLayout,
+        max_exact_bits: int = 8,
+        max_flips: int = 2,
+    ) -> None:
+        super().__init__(game_env, players, game_layout)
+        _check_counterfactual(players)
+        if max_exact_bits < 0 or max_flips < 0:
+            raise ValueError("max_exact_bits and max_flips must be non-negative.")
+
+        m = game_layout.comms_size
+        c = float(game_layout.channel_noise)
+        if c <= 0.0 or c >= 1.0:
+            # Deterministic channel: a single mask with probability one.
+            self._masks = [np.full(m, c >= 1.0, dtype=bool)]
+            self._weights = np.ones(1)
+            self._residual_flips: Optional[np.ndarray] = None
+        elif m <= max_exact_bits:
+            self._masks, self._weights = enumerate_noise_masks(m, c)
+            self._residual_flips = None
+        else:
+            self._masks, self._weights = enumerate_noise_masks(m, c, max_flips=max_flips)
+            # Distribution of the number of flips, conditioned on > max_flips.
+            ks = np.arange(max_flips + 1, m + 1)
+            pmf = np.array([comb(m, int(k)) * c ** k * (1.0 - c) ** (m - k) for k in ks])
+            self._residual_flips = ks
+            self._residual_pmf = pmf / pmf.sum()
+        self.residual_weight = float(max(0.0, 1.0 - self._weights.sum()))
+
+    @property
+    def n_variants(self) -> int:
+        """Number of Player B decisions per game."""
+        return len(self._masks) + (1 if self._residual_flips is not None else 0)
+
+    def _sample_residual_mask(self) -> np.ndarray:
+        """Sample a mask with more than max_flips flips from the noise model."""
+        m = self.game_layout.comms_size
+        k = int(np.random.choice(self._residual_flips, p=self._residual_pmf))
+        mask = np.zeros(m, dtype=bool)
+        mask[np.random.choice(m, size=k, replace=False)] = True
+        return mask
+
+    def _play_games(self, game: Any, log: TournamentLog, first_game_id: int, n_games: int) -> None:
+        """Play games, logging the noise-marginalised expected reward."""
+        del game  # games are played variant by variant below
+        env = self.game_env
+        tournament_id = 0
+        meta_id = 0
+
+        for game_id in range(first_game_id, first_game_id + n_games):
+            env.reset()
+            field, gun = env.provide()
+            self.players.reset()
+            player_a, player_b = self.players.players()
+            cell_value = int(field[gun == 1][0])
+
+            comm = np.asarray(player_a.decide(field.copy(), supp=None), dtype=int)
+            state = _snapshot(self.players)
+
+            expected = 0.0
+            first_shoot = 0
+            for index, (mask, weight) in enumerate(zip(self._masks, self._weights)):
+                _restore(self.players, state)
+                shoot = int(player_b.decide(gun.copy(), env.apply_noise_mask(comm, mask), supp=None))
+                if index == 0:
+                    first_shoot = shoot
+                if shoot == cell_value:
+                    expected += float(weight)
+            if self._residual_flips is not None:
+                _restore(self.players, state)
+                mask = self._sample_residual_mask()
+                shoot = int(player_b.decide(gun.copy(), env.apply_noise_mask(comm, mask), supp=None))
+                if shoot == cell_value:
+                    expected += self.residual_weight
+
+            log.update(field, gun, comm, first_shoot, cell_value, min(1.0, expected))
+            log.update_indicators(game_id=game_id, tournament_id=tournament_id, meta_id=meta_id)
+            sample_block = getattr(env, "sample_block", None)
+            if sample_block is not None:
+                log.update_sample_block(sample_block)
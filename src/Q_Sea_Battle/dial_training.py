@@ -0,0 +1,296 @@
+"""Resumable DIAL/DRU training of NeuralNetPlayers models.
+
+:class:`DialTrainer` runs the DIAL/DRU policy-gradient loop of the DIAL
+tutorial: per epoch, ``batches_per_epoch`` REINFORCE updates of B's shoot
+action with gradients reaching A through the DRU, with sigma annealed
+linearly from ``sigma_start`` to ``sigma_end`` over the epochs and an
+optional tournament evaluation every few epochs.
+
+All randomness of the training step comes from generators owned by the
+trainer (a NumPy ``Generator`` for the batches and a
+``tf.random.Generator`` for the DRU noise and the sampled actions).
+Together with the model weights, the Adam slots, the epoch counter and
+the history, their states form the trainer state, which is written to a
+:class:`~Q_Sea_Battle.training_checkpoints.CheckpointManager` every
+``checkpoint_every`` epochs. :meth:`DialTrainer.run` resumes from the
+latest checkpoint, and a resumed run produces the same weights, bit for
+bit, as an uninterrupted one.
+
+Tournament evaluation uses the global NumPy RNG of the game environment;
+it is recorded in the history but does not influence training.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from .dru_utilities import dru_train
+from .game_env import GameEnv
+from .neural_net_player_a import _scale_field
+from .neural_net_players import NeuralNetPlayers
+from .tournament import Tournament
+from .training_checkpoints import CheckpointManager
+
+
+class DialTrainer:
+    """DIAL/DRU trainer for the models of a NeuralNetPlayers factory.
+
+    Args:
+        players: Factory whose ``model_a``/``model_b`` are trained in place
+            (default models are built if missing).
+        num_epochs: Length of the sigma schedule and of :meth:`run`.
+        batches_per_epoch: Policy-gradient updates per epoch.
+        batch_size: Games per update.
+        learning_rate: Adam learning rate.
+        sigma_start: DRU noise at the start of the schedule.
+        sigma_end: DRU noise at the last epoch.
+        clip_range: Clip range of the noisy logits in the DRU.
+        entropy_coeff: Weight of the shoot-policy entropy bonus.
+        normalize_adv: Normalise the advantages by their standard deviation.
+        seed: Seed of the trainer's NumPy and TensorFlow generators.
+
+    Raises:
+        ValueError: If ``num_epochs`` or ``batches_per_epoch`` is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        players: NeuralNetPlayers,
+        num_epochs: int,
+        batches_per_epoch: int = 40,
+        batch_size: int = 2048,
+        learning_rate: float = 1e-3,
+        sigma_start: float = 2.0,
+        sigma_end: float = 0.3,
+        clip_range: Tuple[float, float] = (-10.0, 10.0),
+        entropy_coeff: float = 0.01,
+        normalize_adv: bool = True,
+        seed: int = 0,
+    ) -> None:
+        if num_epochs < 1 or batches_per_epoch < 1:
+            raise ValueError("num_epochs and batches_per_epoch must be >= 1.")
+        players.players()  # builds default models if missing
+        self.players = players
+        self.game_layout = players.game_layout
+        self.model_a: tf.keras.Model = players.model_a
+        self.model_b: tf.keras.Model = players.model_b
+        self.num_epochs = int(num_epochs)
+        self.batches_per_epoch = int(batches_per_epoch)
+        self.batch_size = int(batch_size)
+        self.sigma_start = float(sigma_start)
+        self.sigma_end = float(sigma_end)
+        self.clip_range = tuple(clip_range)
+        self.entropy_coeff = float(entropy_coeff)
+        self.normalize_adv = bool(normalize_adv)
+        self.seed = int(seed)
+
+        self.optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+        self.optimizer.build(self._params())
+        self.rng = np.random.default_rng(self.seed)
+        self.tf_rng = tf.random.Generator.from_seed(self.seed)
+
+        #: Number of completed epochs.
+        self.epoch = 0
+        #: One dict per completed epoch (epoch, sigma, mean_reward, mean_loss
+        #: and, on evaluation epochs, tournament_reward).
+        self.history: List[Dict[str, Any]] = []
+
+    def _params(self) -> List[tf.Variable]:
+        return self.model_a.trainable_variables + self.model_b.trainable_variables
+
+    # ------------------------------------------------------------------
+    # Training step
+    # ------------------------------------------------------------------
+    def sigma_for_epoch(self, epoch: int) -> float:
+        """DRU noise of (1-based) ``epoch``, interpolated linearly."""
+        t = epoch / max(1, self.num_epochs)
+        return self.sigma_start * (1.0 - t) + self.sigma_end * t
+
+    def sample_batch(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample ``(fields, guns, cell_values)`` from the trainer's generator.
+
+        Returns:
+            Arrays of shapes (B, n2), (B, n2) and (B, 1).
+        """
+        n2 = self.game_layout.field_size ** 2
+        fields = (self.rng.random((batch_size, n2)) < self.game_layout.enemy_probability).astype(np.float32)
+        gun_idx = self.rng.integers(0, n2, size=batch_size)
+        guns = np.zeros_like(fields)
+        guns[np.arange(batch_size), gun_idx] = 1.0
+        cell_values = fields[np.arange(batch_size), gun_idx][:, None]
+        return fields, guns, cell_values
+
+    def step(self, sigma: float) -> Tuple[float, float]:
+        """One DIAL policy-gradient update with DRU.
+
+        The models change in place, so the players' lookup tables are
+        dropped.
+
+        Returns:
+            ``(mean_reward, loss)`` of the batch.
+        """
+        fields, guns, cell_values = self.sample_batch(self.batch_size)
+        n2 = self.game_layout.field_size ** 2
+        gun_idx_norm = tf.constant(np.argmax(guns, axis=1)[:, None].astype(np.float32) / float(max(1, n2 - 1)))
+        fields_scaled = tf.constant(_scale_field(fields))
+        cell_values = tf.constant(cell_values)
+        eps = 1e-8
+
+        params = self._params()
+        with tf.GradientTape() as tape:
+            comm_logits = self.model_a(fields_scaled, training=True)
+            comm_cont = tf.cast(
+                dru_train(comm_logits, sigma=sigma, clip_range=self.clip_range, generator=self.tf_rng), tf.float32
+            )
+            shoot_logits = self.model_b(tf.concat([gun_idx_norm, comm_cont], axis=1), training=True)
+
+            probs = tf.nn.sigmoid(shoot_logits)
+            actions = tf.cast(self.tf_rng.uniform(tf.shape(probs)) < probs, tf.float32)
+            rewards = tf.cast(tf.equal(actions, cell_values), tf.float32)
+
+            advantages = rewards - tf.reduce_mean(rewards)
+            if self.normalize_adv:
+                advantages = advantages / (tf.math.reduce_std(advantages) + 1e-8)
+            advantages = tf.stop_gradient(advantages)
+
+            log_probs = actions * tf.math.log(probs + eps) + (1.0 - actions) * tf.math.log(1.0 - probs + eps)
+            entropy = -(probs * tf.math.log(probs + eps) + (1.0 - probs) * tf.math.log(1.0 - probs + eps))
+            loss = -tf.reduce_mean(log_probs * advantages) - self.entropy_coeff * tf.reduce_mean(entropy)
+
+        grads = tape.gradient(loss, params)
+        self.optimizer.apply_gradients(zip(grads, params))
+        self.players.invalidate_lookup_tables()
+        return float(tf.reduce_mean(rewards).numpy()), float(loss.numpy())
+
+    def evaluate(self, n_games: Optional[int] = None) -> float:
+        """Mean reward of greedy play in a tournament with the current models."""
+        layout = self.game_layout
+        if n_games is not None:
+            layout = replace(layout, number_of_games_in_tournament=int(n_games))
+        players = NeuralNetPlayers(layout, model_a=self.model_a, model_b=self.model_b, explore=False)
+        log = Tournament(GameEnv(game_layout=layout), players, layout).tournament()
+        return float(log.outcome()[0])
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+    def run(
+        self,
+        checkpoints: Optional[CheckpointManager] = None,
+        checkpoint_every: int = 1,
+        evaluate_every: Optional[int] = None,
+        n_eval_games: Optional[int] = None,
+        stop_after: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Train up to ``num_epochs``, resuming from the latest checkpoint.
+
+        Args:
+            checkpoints: Manager to resume from and to write to. A fresh
+                trainer (epoch 0) restores the latest checkpoint, if any.
+            checkpoint_every: Write a checkpoint every this many epochs
+                (and after the last epoch).
+            evaluate_every: Run a tournament every this many epochs; None
+                disables evaluation.
+            n_eval_games: Games per evaluation tournament; defaults to the
+                layout's ``number_of_games_in_tournament``.
+            stop_after: Return after this epoch even if the schedule is
+                longer (the run can be continued later).
+
+        Returns:
+            The history of all completed epochs.
+        """
+        if checkpoints is not None and self.epoch == 0 and checkpoints.latest() is not None:
+            self.load_state(*checkpoints.restore())
+        last = self.num_epochs if stop_after is None else min(self.num_epochs, int(stop_after))
+
+        try:
+            while self.epoch < last:
+                epoch = self.epoch + 1
+                sigma = self.sigma_for_epoch(epoch)
+                results = [self.step(sigma) for _ in range(self.batches_per_epoch)]
+                record: Dict[str, Any] = {
+                    "epoch": epoch,
+                    "sigma": sigma,
+                    "mean_reward": float(np.mean([r for r, _ in results])),
+                    "mean_loss": float(np.mean([l for _, l in results])),
+                }
+                if evaluate_every is not None and epoch % evaluate_every == 0:
+                    record["tournament_reward"] = self.evaluate(n_eval_games)
+                self.history.append(record)
+                self.epoch = epoch
+                if checkpoints is not None and (epoch % checkpoint_every == 0 or epoch == last):
+                    checkpoints.save(epoch, *self.state())
+        finally:
+            if checkpoints is not None:
+                checkpoints.wait()
+        return self.history
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Snapshot the complete trainer state.
+
+        Returns:
+            ``(arrays, meta)``: weights of both models, Adam variables and
+            the TensorFlow generator state as arrays; epoch counter, sigma
+            schedule, NumPy generator state and history as metadata.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for prefix, variables in (
+            ("model_a", self.model_a.weights),
+            ("model_b", self.model_b.weights),
+            ("optimizer", self.optimizer.variables),
+        ):
+            for i, v in enumerate(variables):
+                arrays[f"{prefix}/{i}"] = np.array(v.numpy())
+        arrays["tf_rng"] = self.tf_rng.state.numpy()
+        meta = {
+            "epoch": self.epoch,
+            "num_epochs": self.num_epochs,
+            "sigma_start": self.sigma_start,
+            "sigma_end": self.sigma_end,
+            "seed": self.seed,
+            "np_rng": self.rng.bit_generator.state,
+            "history": list(self.history),
+        }
+        return arrays, meta
+
+    def load_state(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        """Restore a snapshot taken with :meth:`state`.
+
+        Raises:
+            ValueError: If the snapshot does not match the models or the
+                sigma schedule of this trainer.
+        """
+        schedule = (self.num_epochs, self.sigma_start, self.sigma_end)
+        if (meta["num_epochs"], meta["sigma_start"], meta["sigma_end"]) != schedule:
+            raise ValueError(
+                f"Checkpoint schedule {(meta['num_epochs'], meta['sigma_start'], meta['sigma_end'])} "
+                f"differs from the trainer's {schedule}."
+            )
+        for prefix, variables in (
+            ("model_a", self.model_a.weights),
+            ("model_b", self.model_b.weights),
+            ("optimizer", self.optimizer.variables),
+        ):
+            stored = sorted((k for k in arrays if k.startswith(prefix + "/")), key=lambda k: int(k.split("/")[1]))
+            if len(stored) != len(variables):
+                raise ValueError(f"Checkpoint has {len(stored)} {prefix} variables, expected {len(variables)}.")
+            for key, v in zip(stored, variables):
+                if tuple(arrays[key].shape) != tuple(v.shape):
+                    raise ValueError(f"Checkpoint {key} has shape {arrays[key].shape}, expected {tuple(v.shape)}.")
+                v.assign(arrays[key])
+        self.tf_rng.reset(arrays["tf_rng"])
+        self.rng.bit_generator.state = meta["np_rng"]
+        self.epoch = int(meta["epoch"])
+        self.history = list(meta["history"])
+        self.players.invalidate_lookup_tables()
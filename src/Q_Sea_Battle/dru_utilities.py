@@ -17,7 +17,7 @@ Version: 0.1
 
 from __future__ import annotations
 
-from typing import Any, Tuple, Union
+from typing import Any, Optional, Tuple, Union
 
 import numpy as np
 import tensorflow as tf
@@ -38,6 +38,7 @@ def dru_train(
     message_logits: ArrayLike,
     sigma: float = 2.0,
     clip_range: Tuple[float, float] | None = (-10.0, 10.0),
+    generator: Optional[tf.random.Generator] = None,
 ) -> ArrayLike:
     """Differentiable DRU mapping used during centralized training.
 
@@ -71,6 +72,11 @@ def dru_train(
             Optional ``(min, max)`` range to clip the noisy logits
             ``m + epsilon`` before applying the logistic, to avoid
             numerical overflow. If ``None``, no clipping is applied.
+        generator:
+            Optional ``tf.random.Generator`` for the noise on the
+            TensorFlow path. Its state can be checkpointed, which makes
+            interrupted training runs resumable bit for bit. If ``None``,
+            the global ``tf.random`` state is used.
 
     Returns:
         Same type and shape as ``message_logits``, with values in ``(0, 1)``.
@@ -85,7 +91,10 @@ def dru_train(
         logits = tf.cast(message_logits, tf.float32)
 
         if sigma > 0.0:
-            noise = tf.random.normal(tf.shape(logits), mean=0.0, stddev=sigma)
+            if generator is not None:
+                noise = generator.normal(tf.shape(logits), mean=0.0, stddev=sigma)
+            else:
+                noise = tf.random.normal(tf.shape(logits), mean=0.0, stddev=sigma)
             logits = logits + noise
 
         if clip_range is not None:
@@ -0,0 +1,391 @@
+"""Vectorised training of an ensemble of NeuralNetPlayers model pairs.
+
+Parameter sweeps over seeds train many tiny ``model_a``/``model_b`` pairs
+one after another, which leaves most of the CPU idle. The ensemble trainer
+stacks ``K`` copies of the same Dense architecture into one model whose
+kernels have shape ``(K, in, out)``; every layer is a single ``einsum``
+over all members. Each member has its own initialisation, data stream and
+(for DIAL) its own noise, and the loss is the *sum* of the per-member mean
+losses, so each member receives exactly the gradient it would get when
+trained alone. Adam is element-wise, so one optimizer over the stacked
+variables behaves like ``K`` independent optimizers.
+
+After training, :meth:`EnsembleTrainer.players` unstacks the members into
+ordinary Keras models attached to :class:`NeuralNetPlayers` factories.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from .dru_utilities import dru_train
+from .game_layout import GameLayout
+from .neural_net_player_a import _scale_field
+from .neural_net_player_b import _gun_one_hot_to_index
+from .neural_net_players import NeuralNetPlayers
+from .numpy_inference import export_dense_stack
+
+
+class StackedDense(tf.keras.layers.Layer):
+    """``K`` Dense layers of the same shape evaluated with one einsum.
+
+    Args:
+        kernels: Initial kernels of shape (K, in, out).
+        biases: Initial biases of shape (K, out).
+        activation: Keras activation name (e.g. ``"relu"``, ``"linear"``).
+        name: Optional layer name.
+    """
+
+    def __init__(
+        self,
+        kernels: np.ndarray,
+        biases: np.ndarray,
+        activation: str = "linear",
+        name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(name=name, **kwargs)
+        kernels = np.asarray(kernels, dtype=np.float32)
+        biases = np.asarray(biases, dtype=np.float32)
+        if kernels.ndim != 3 or biases.shape != (kernels.shape[0], kernels.shape[2]):
+            raise ValueError(f"kernels {kernels.shape} and biases {biases.shape} do not match.")
+        self.activation_name = activation
+        self._activation = tf.keras.activations.get(None if activation == "linear" else activation)
+        self.kernel = self.add_weight(name="kernel", shape=kernels.shape, initializer="zeros")
+        self.bias = self.add_weight(name="bias", shape=biases.shape, initializer="zeros")
+        self.kernel.assign(kernels)
+        self.bias.assign(biases)
+
+    def call(self, x: tf.Tensor) -> tf.Tensor:
+        """Map (K, B, in) to (K, B, out)."""
+        h = tf.einsum("kbi,kio->kbo", x, self.kernel) + self.bias[:, None, :]
+        return self._activation(h)
+
+
+class StackedDenseModel(tf.keras.Model):
+    """``K`` copies of a Dense-stack model evaluated as one batched model.
+
+    Args:
+        layers: StackedDense layers in call order.
+        name: Optional model name.
+    """
+
+    def __init__(self, layers: Sequence[StackedDense], name: Optional[str] = None) -> None:
+        super().__init__(name=name)
+        self.stacked_layers = list(layers)
+
+    @property
+    def num_members(self) -> int:
+        """Number of stacked members K."""
+        return int(self.stacked_layers[0].kernel.shape[0])
+
+    def call(self, x: tf.Tensor, training: bool = False) -> tf.Tensor:
+        """Map (K, B, in) to (K, B, out)."""
+        h = tf.convert_to_tensor(x, dtype=tf.float32)
+        for layer in self.stacked_layers:
+            h = layer(h)
+        return h
+
+    @classmethod
+    def from_models(cls, models: Sequence[tf.keras.Model], name: Optional[str] = None) -> "StackedDenseModel":
+        """Stack built Keras models with identical Dense architectures.
+
+        Raises:
+            ValueError: If the models differ in layer shapes or activations.
+        """
+        stacks = [export_dense_stack(m) for m in models]
+        reference = stacks[0]
+        for stack in stacks[1:]:
+            same = stack.activations == reference.activations and [k.shape for k in stack.kernels] == [
+                k.shape for k in reference.kernels
+            ]
+            if not same:
+                raise ValueError(f"Model {stack.name!r} does not have the architecture of {reference.name!r}.")
+        layers = [
+            StackedDense(
+                np.stack([s.kernels[i] for s in stacks]),
+                np.stack([s.biases[i] for s in stacks]),
+                activation=activation,
+                name=f"stacked_dense_{i}",
+            )
+            for i, activation in enumerate(reference.activations)
+        ]
+        return cls(layers, name=name or f"stacked_{reference.name}")
+
+    @classmethod
+    def initialise(cls, template: tf.keras.Model, seeds: Sequence[int], name: Optional[str] = None) -> "StackedDenseModel":
+        """Create freshly initialised members with the template's architecture.
+
+        Kernels are Glorot-uniform and biases zero (the Keras Dense
+        defaults), drawn from one NumPy generator per seed.
+        """
+        reference = export_dense_stack(template)
+        rngs = [np.random.default_rng(seed) for seed in seeds]
+        layers = []
+        for i, (kernel, activation) in enumerate(zip(reference.kernels, reference.activations)):
+            fan_in, fan_out = kernel.shape
+            limit = np.sqrt(6.0 / (fan_in + fan_out))
+            kernels = np.stack([rng.uniform(-limit, limit, size=kernel.shape) for rng in rngs])
+            biases = np.zeros((len(rngs), fan_out), dtype=np.float32)
+            layers.append(StackedDense(kernels, biases, activation=activation, name=f"stacked_dense_{i}"))
+        return cls(layers, name=name or f"stacked_{reference.name}")
+
+    def unstack(self, template: tf.keras.Model) -> List[tf.keras.Model]:
+        """Return the members as independent clones of ``template``."""
+        members = []
+        for k in range(self.num_members):
+            model = tf.keras.models.clone_model(template)
+            weights = []
+            for layer in self.stacked_layers:
+                weights.extend([layer.kernel.numpy()[k], layer.bias.numpy()[k]])
+            model.set_weights(weights)
+            members.append(model)
+        return members
+
+
+class EnsembleTrainer:
+    """Train ``K`` NeuralNetPlayers model pairs concurrently.
+
+    Every member ``k`` is initialised and draws its data (for DIAL) from
+    ``np.random.default_rng(seeds[k])``.
+
+    Args:
+        game_layout: Layout shared by all members.
+        seeds: One seed per member; ``len(seeds)`` is K.
+        learning_rate: Adam learning rate.
+        models_a: Optional list of K built models to start from instead of
+            a fresh initialisation (same for ``models_b``).
+        models_b: See ``models_a``.
+
+    Raises:
+        ValueError: If no seeds are given or the model lists have the wrong
+            length.
+    """
+
+    def __init__(
+        self,
+        game_layout: GameLayout,
+        seeds: Sequence[int],
+        learning_rate: float = 1e-3,
+        models_a: Optional[Sequence[tf.keras.Model]] = None,
+        models_b: Optional[Sequence[tf.keras.Model]] = None,
+    ) -> None:
+        if len(seeds) == 0:
+            raise ValueError("EnsembleTrainer needs at least one seed.")
+        for models in (models_a, models_b):
+            if models is not None and len(models) != len(seeds):
+                raise ValueError("models_a/models_b must have one model per seed.")
+
+        self.game_layout = game_layout
+        self.seeds = [int(s) for s in seeds]
+        self.learning_rate = float(learning_rate)
+        self._rngs = [np.random.default_rng(s) for s in self.seeds]
+
+        factory = NeuralNetPlayers(game_layout)
+        self._template_a = factory._build_model_a()
+        self._template_b = factory._build_model_b()
+        self.stack_a = (
+            StackedDenseModel.from_models(models_a)
+            if models_a is not None
+            else StackedDenseModel.initialise(self._template_a, self.seeds)
+        )
+        self.stack_b = (
+            StackedDenseModel.from_models(models_b)
+            if models_b is not None
+            else StackedDenseModel.initialise(self._template_b, [s + 1 for s in self.seeds])
+        )
+        self._dial_optimizer: Optional[tf.keras.optimizers.Optimizer] = None
+
+    @property
+    def num_members(self) -> int:
+        """Number of ensemble members K."""
+        return len(self.seeds)
+
+    # ------------------------------------------------------------------
+    # Imitation training (same data format as NeuralNetPlayers)
+    # ------------------------------------------------------------------
+    def train_model_a(self, datasets: Sequence[pd.DataFrame], training_settings: Dict[str, Any]) -> List[float]:
+        """Train all communication models, member ``k`` on ``datasets[k]``.
+
+        The datasets use the columns of :meth:`NeuralNetPlayers.train_model_a`
+        and must all have the same number of rows.
+
+        Returns:
+            Final-epoch mean loss per member.
+        """
+        n2 = self.game_layout.field_size ** 2
+        m = self.game_layout.comms_size
+        x = self._stack_column(datasets, "field", n2)
+        y = self._stack_column(datasets, "comm", m)
+        weights = self._sample_weights(datasets, training_settings)
+        return self._fit(self.stack_a, _scale_field(x), y, weights, training_settings)
+
+    def train_model_b(self, datasets: Sequence[pd.DataFrame], training_settings: Dict[str, Any]) -> List[float]:
+        """Train all shoot models, member ``k`` on ``datasets[k]``.
+
+        The datasets use the columns of :meth:`NeuralNetPlayers.train_model_b`
+        and must all have the same number of rows.
+
+        Returns:
+            Final-epoch mean loss per member.
+        """
+        n2 = self.game_layout.field_size ** 2
+        m = self.game_layout.comms_size
+        guns = self._stack_column(datasets, "gun", n2)
+        comms = self._stack_column(datasets, "comm", m)
+        gun_idx = _gun_one_hot_to_index(guns.reshape(-1, n2)).reshape(guns.shape[0], -1, 1)
+        x = np.concatenate([gun_idx, comms], axis=2)
+        y = self._stack_column(datasets, "shoot", 1)
+        weights = self._sample_weights(datasets, training_settings)
+        return self._fit(self.stack_b, x, y, weights, training_settings)
+
+    def _stack_column(self, datasets: Sequence[pd.DataFrame], column: str, width: int) -> np.ndarray:
+        if len(datasets) != self.num_members:
+            raise ValueError(f"Expected {self.num_members} datasets, got {len(datasets)}.")
+        if len({len(d) for d in datasets}) != 1:
+            raise ValueError("All member datasets must have the same number of rows.")
+        arrays = [np.stack(d[column].to_numpy(), axis=0).astype("float32").reshape(-1, width) for d in datasets]
+        return np.stack(arrays, axis=0)
+
+    @staticmethod
+    def _sample_weights(datasets: Sequence[pd.DataFrame], training_settings: Dict[str, Any]) -> Optional[np.ndarray]:
+        if not bool(training_settings.get("use_sample_weight", False)):
+            return None
+        if not all("sample_weight" in d.columns for d in datasets):
+            return None
+        return np.stack([d["sample_weight"].to_numpy().astype("float32") for d in datasets], axis=0)
+
+    def _fit(
+        self,
+        model: StackedDenseModel,
+        x: np.ndarray,
+        y: np.ndarray,
+        sample_weight: Optional[np.ndarray],
+        training_settings: Dict[str, Any],
+    ) -> List[float]:
+        """Mini-batch Adam on the summed per-member BCE-with-logits losses."""
+        epochs = int(training_settings.get("epochs", 3))
+        batch_size = int(training_settings.get("batch_size", 32))
+        learning_rate = float(training_settings.get("learning_rate", self.learning_rate))
+        optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+
+        k, n = x.shape[0], x.shape[1]
+        members = np.arange(k)[:, None]
+        if sample_weight is None:
+            sample_weight = np.ones((k, n), dtype=np.float32)
+
+        epoch_loss = np.zeros(k)
+        for _ in range(epochs):
+            # Independent shuffles per member, as K separate fit() calls would do.
+            order = np.stack([rng.permutation(n) for rng in self._rngs])
+            epoch_loss = np.zeros(k)
+            for start in range(0, n, batch_size):
+                idx = order[:, start : start + batch_size]
+                xb = tf.constant(x[members, idx])
+                yb = tf.constant(y[members, idx])
+                wb = tf.constant(sample_weight[members, idx])
+                with tf.GradientTape() as tape:
+                    logits = model(xb, training=True)
+                    bce = tf.reduce_mean(tf.nn.sigmoid_cross_entropy_with_logits(labels=yb, logits=logits), axis=-1)
+                    member_loss = tf.reduce_sum(wb * bce, axis=1) / float(idx.shape[1])
+                    loss = tf.reduce_sum(member_loss)
+                grads = tape.gradient(loss, model.trainable_variables)
+                optimizer.apply_gradients(zip(grads, model.trainable_variables))
+                epoch_loss += member_loss.numpy() * idx.shape[1]
+            epoch_loss /= n
+        return [float(v) for v in epoch_loss]
+
+    # ------------------------------------------------------------------
+    # DIAL / DRU policy-gradient training
+    # ------------------------------------------------------------------
+    def sample_batch(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample fields, guns and gun-cell values for every member.
+
+        Returns:
+            ``(fields, guns, cell_values)`` of shapes (K, B, n2), (K, B, n2)
+            and (K, B, 1).
+        """
+        n2 = self.game_layout.field_size ** 2
+        p = self.game_layout.enemy_probability
+        fields = np.stack([(rng.random((batch_size, n2)) < p) for rng in self._rngs]).astype(np.float32)
+        gun_idx = np.stack([rng.integers(0, n2, size=batch_size) for rng in self._rngs])
+        guns = np.zeros_like(fields)
+        np.put_along_axis(guns, gun_idx[:, :, None], 1.0, axis=2)
+        cell_values = np.take_along_axis(fields, gun_idx[:, :, None], axis=2)
+        return fields, guns, cell_values
+
+    def dial_step(
+        self,
+        batch_size: int = 512,
+        sigma: float = 2.0,
+        clip_range: Tuple[float, float] = (-10.0, 10.0),
+        entropy_coeff: float = 0.01,
+        normalize_adv: bool = True,
+    ) -> np.ndarray:
+        """One DIAL policy-gradient step with DRU for all members.
+
+        This is the update of the DIAL tutorial (REINFORCE on B's shoot
+        action with a per-member mean baseline, optional advantage
+        normalisation and an entropy bonus; gradients reach A through the
+        DRU), applied to every member at once.
+
+        Returns:
+            Mean reward per member, shape (K,).
+        """
+        if self._dial_optimizer is None:
+            self._dial_optimizer = tf.keras.optimizers.Adam(learning_rate=self.learning_rate)
+
+        fields, guns, cell_values = self.sample_batch(batch_size)
+        n2 = self.game_layout.field_size ** 2
+        gun_idx_norm = tf.constant(np.argmax(guns, axis=2)[:, :, None].astype(np.float32) / float(max(1, n2 - 1)))
+        fields_scaled = tf.constant(_scale_field(fields))
+        cell_values = tf.constant(cell_values)
+        eps = 1e-8
+
+        params = self.stack_a.trainable_variables + self.stack_b.trainable_variables
+        with tf.GradientTape() as tape:
+            comm_logits = self.stack_a(fields_scaled, training=True)  # (K, B, m)
+            comm_cont = tf.cast(dru_train(comm_logits, sigma=sigma, clip_range=clip_range), tf.float32)
+            shoot_logits = self.stack_b(tf.concat([gun_idx_norm, comm_cont], axis=2), training=True)  # (K, B, 1)
+
+            probs = tf.nn.sigmoid(shoot_logits)
+            actions = tf.cast(tf.random.uniform(tf.shape(probs)) < probs, tf.float32)
+            rewards = tf.cast(tf.equal(actions, cell_values), tf.float32)
+
+            advantages = rewards - tf.reduce_mean(rewards, axis=[1, 2], keepdims=True)
+            if normalize_adv:
+                advantages = advantages / (tf.math.reduce_std(advantages, axis=[1, 2], keepdims=True) + 1e-8)
+            advantages = tf.stop_gradient(advantages)
+
+            log_probs = actions * tf.math.log(probs + eps) + (1.0 - actions) * tf.math.log(1.0 - probs + eps)
+            entropy = -(probs * tf.math.log(probs + eps) + (1.0 - probs) * tf.math.log(1.0 - probs + eps))
+            member_loss = -tf.reduce_mean(log_probs * advantages, axis=[1, 2]) - entropy_coeff * tf.reduce_mean(
+                entropy, axis=[1, 2]
+            )
+            loss = tf.reduce_sum(member_loss)
+
+        grads = tape.gradient(loss, params)
+        self._dial_optimizer.apply_gradients(zip(grads, params))
+        return tf.reduce_mean(rewards, axis=[1, 2]).numpy()
+
+    # ------------------------------------------------------------------
+    # Unstacking
+    # ------------------------------------------------------------------
+    def models(self) -> List[Tuple[tf.keras.Model, tf.keras.Model]]:
+        """Return the trained members as independent (model_a, model_b) pairs."""
+        return list(zip(self.stack_a.unstack(self._template_a), self.stack_b.unstack(self._template_b)))
+
+    def players(self, explore: bool = False) -> List[NeuralNetPlayers]:
+        """Return one NeuralNetPlayers factory per member."""
+        return [
+            NeuralNetPlayers(self.game_layout, model_a=model_a, model_b=model_b, explore=explore)
+            for model_a, model_b in self.models()
+        ]
@@ -7,11 +7,14 @@ Version: 0.1
 
 from __future__ import annotations
 
-from typing import Tuple
+from time import perf_counter
+from typing import Optional, Tuple
 
 import numpy as np
 
+from .game_context import GameContext
 from .game_env import GameEnv
+from .instrumentation import GAME_SPAN, Instrumentation
 from .players_base import Players
 
 
@@ -22,17 +25,25 @@ class Game:
     and runs a single round of the game.
     """
 
-    def __init__(self, game_env: GameEnv, players: Players) -> None:
+    def __init__(
+        self,
+        game_env: GameEnv,
+        players: Players,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
         """Initialise the game.
 
         Args:
             game_env: Game environment instance.
             players: Players factory providing Player A and B.
+            instrumentation: Optional Instrumentation that records the
+                wall time of every stage of play(). None disables timing.
         """
         self.game_env = game_env
         self.players = players
+        self.instrumentation = instrumentation
 
-    def play(self) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, int]:
+    def play(self, context: Optional[GameContext] = None) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, int]:
         """Play a single game round.
 
         The sequence follows the specification:
@@ -45,11 +56,25 @@ class Game:
         6. Let Player B decide on shoot based on (gun, noisy comm).
         7. Evaluate reward via GameEnv.
 
+        Args:
+            context: Optional per-game state. If given, the game keeps its
+                state in the context: the environment is reset into it,
+                Players.prepare_context() replaces Players.reset(), and it
+                is passed to the players as ``supp``. Games with different
+                contexts can then run concurrently (see
+                Tournament.threaded_tournament()). Instrumentation is not
+                recorded for such games.
+
         Returns:
             A tuple (reward, field, gun, comm, shoot) capturing the
             outcome of the game. field, gun, and comm are flattened
             arrays.
         """
+        if context is not None:
+            return self._play_context(context)
+        if self.instrumentation is not None:
+            return self._play_instrumented(self.instrumentation)
+
         # Reset the environment and players for a fresh game.
         self.game_env.reset()
         self.players.reset()
@@ -74,3 +99,63 @@ class Game:
 
         return reward, field, gun, comm_noisy, int(shoot)
 
+
+    def _play_context(self, context: GameContext) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, int]:
+        """Same as play(), keeping all per-game state in ``context``."""
+        self.game_env.reset(context=context)
+        # Factories that do not derive from Players have no per-game resources.
+        prepare_context = getattr(self.players, "prepare_context", None)
+        if prepare_context is not None:
+            prepare_context(context)
+        player_a, player_b = self.players.players()
+
+        field, gun = self.game_env.provide(context=context)
+        comm = player_a.decide(field, supp=context)
+        comm_noisy = self.game_env.apply_channel_noise(comm, context=context)
+        shoot = player_b.decide(gun, comm_noisy, supp=context)
+        reward = self.game_env.evaluate(shoot, context=context)
+
+        return reward, field, gun, comm_noisy, int(shoot)
+
+    def _play_instrumented(
+        self, instrumentation: Instrumentation
+    ) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, int]:
+        """Same as play(), recording the wall time of every stage."""
+        record = instrumentation.record
+
+        t0 = perf_counter()
+        self.game_env.reset()
+        t1 = perf_counter()
+        record("env_reset", t0, t1)
+
+        self.players.reset()
+        t2 = perf_counter()
+        record("players_reset", t1, t2)
+
+        player_a, player_b = self.players.players()
+        t3 = perf_counter()
+        record("players", t2, t3)
+
+        field, gun = self.game_env.provide()
+        t4 = perf_counter()
+        record("provide", t3, t4)
+
+        comm = player_a.decide(field, supp=None)
+        t5 = perf_counter()
+        record("player_a_decide", t4, t5)
+
+        comm_noisy = self.game_env.apply_channel_noise(comm)
+        t6 = perf_counter()
+        record("channel_noise", t5, t6)
+
+        shoot = player_b.decide(gun, comm_noisy, supp=None)
+        t7 = perf_counter()
+        record("player_b_decide", t6, t7)
+
+        reward = self.game_env.evaluate(shoot)
+        t8 = perf_counter()
+        record("evaluate", t7, t8)
+
+        record(GAME_SPAN, t0, t8, category="game")
+        instrumentation.games += 1
+        return reward, field, gun, comm_noisy, int(shoot)
@@ -0,0 +1,61 @@
+"""Per-game state for concurrent play.
+
+During a normal game the state of the game lives on shared objects:
+the field and gun on GameEnv, the PR-assisted boxes on
+PRAssistedPlayers, the ``previous`` tensors on TrainableAssistedPlayers
+and the log-probabilities on the player instances. Two games can
+therefore not run at the same time.
+
+A :class:`GameContext` holds all of this state for one game. Game.play()
+passes it to GameEnv (``context=``) and to the players (as ``supp``), and
+players whose factory sets ``supports_game_context = True`` keep their
+per-game state in it instead of on themselves. All randomness of the game
+is drawn from ``context.rng``, so a game played with a context depends
+only on the seed of its generator, not on the order in which games run.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+
+@dataclass
+class GameContext:
+    """State of one game.
+
+    Attributes:
+        rng: Generator for all random draws of the game.
+        field: Flattened field, set by GameEnv.reset(context=...).
+        gun: Flattened one-hot gun, set by GameEnv.reset(context=...).
+        resources: Per-game resources of the players (e.g. the PR-assisted
+            boxes), set by Players.prepare_context().
+        previous: Tensors passed from Player A to Player B.
+        logprob_comm: Log-probability of Player A's comm.
+        logprob_shoot: Log-probability of Player B's shoot.
+    """
+
+    rng: np.random.Generator = dataclasses.field(default_factory=np.random.default_rng)
+    field: Optional[np.ndarray] = None
+    gun: Optional[np.ndarray] = None
+    resources: Any = None
+    previous: Any = None
+    logprob_comm: Optional[float] = None
+    logprob_shoot: Optional[float] = None
+
+    @classmethod
+    def from_seed(cls, seed: Any) -> "GameContext":
+        """Create a context whose generator is seeded with ``seed``."""
+        return cls(rng=np.random.default_rng(seed))
+
+
+def game_context(supp: Any) -> Optional[GameContext]:
+    """Return ``supp`` if it is a GameContext, else None."""
+    return supp if isinstance(supp, GameContext) else None
@@ -11,9 +11,16 @@ from typing import Optional, Tuple
 
 import numpy as np
 
+from .game_context import GameContext
 from .game_layout import GameLayout
 
 
+#: Supported sampling modes.
+GUN_SAMPLING_MODES = ("uniform", "balanced")
+FIELD_SAMPLING_MODES = ("independent", "antithetic")
+NOISE_SAMPLING_MODES = ("independent", "stratified")
+
+
 class GameEnv:
     """Environment for a single QSeaBattle game.
 
@@ -21,28 +28,178 @@ class GameEnv:
     providing them to the players, and evaluating the reward for Player B's
     shooting decision.
 
+    Besides independent sampling of every game, the environment supports
+    variance-reduction modes that correlate games within blocks of
+    ``block_size`` consecutive games:
+
+    - ``gun_sampling="balanced"``: every gun position occurs exactly once
+      per n2 games (random order).
+    - ``field_sampling="antithetic"``: every second field is the complement
+      of the previous one (requires ``enemy_probability == 0.5``).
+    - ``noise_sampling="stratified"``: per block and per comm bit the
+      number of flipped bits is fixed at ``channel_noise * block_size``
+      (randomly rounded), spread over the block in random order.
+
+    Each game keeps its marginal distribution, so win-rate estimates stay
+    unbiased. The block of the current game is exposed as ``sample_block``
+    so that TournamentLog.outcome() can compute block-aware standard errors.
+
+    With ``buffered=True`` the environment preallocates its arrays and
+    reuses them for every game: the field is filled in place, the gun is
+    tracked as an index, and provide() / apply_channel_noise() return
+    read-only views of internal buffers instead of fresh copies. The views
+    are overwritten by the next game, so callers that keep them (such as
+    Tournament) must copy them. Buffered mode draws from its own
+    ``numpy.random.Generator`` (seeded by ``seed``) and supports the
+    independent sampling modes only.
+
     Attributes:
         game_layout: Configuration object describing the game.
         field: Current field array of shape (n, n) with values in {0, 1}.
         gun: Current gun array of shape (n, n) with exactly one 1 (one-hot).
+        sample_block: Index of the sampling block of the current game, or
+            None if all sampling modes are independent.
     """
 
-    def __init__(self, game_layout: Optional[GameLayout] = None) -> None:
+    def __init__(
+        self,
+        game_layout: Optional[GameLayout] = None,
+        gun_sampling: str = "uniform",
+        field_sampling: str = "independent",
+        noise_sampling: str = "independent",
+        block_size: Optional[int] = None,
+        buffered: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
         """Initialise the game environment.
 
         Args:
             game_layout: Optional game configuration. If None, a default
                 GameLayout is constructed.
+            gun_sampling: ``"uniform"`` or ``"balanced"``.
+            field_sampling: ``"independent"`` or ``"antithetic"``.
+            noise_sampling: ``"independent"`` or ``"stratified"``.
+            block_size: Number of games per sampling block. Defaults to n2
+                (2 * n2 if n2 is odd and fields are antithetic). Must be a
+                multiple of n2 for balanced guns and even for antithetic
+                fields.
+            buffered: If True, reuse preallocated buffers for every game and
+                hand out read-only views (see class docstring).
+            seed: Seed of the random generator used in buffered mode.
+
+        Raises:
+            ValueError: If a sampling mode or the block size is invalid, or
+                if buffered mode is combined with correlated sampling.
         """
         self.game_layout: GameLayout = game_layout or GameLayout()
         self.field: Optional[np.ndarray] = None
         self.gun: Optional[np.ndarray] = None
 
-    def reset(self) -> None:
+        if gun_sampling not in GUN_SAMPLING_MODES:
+            raise ValueError(f"gun_sampling must be one of {GUN_SAMPLING_MODES}, got {gun_sampling!r}.")
+        if field_sampling not in FIELD_SAMPLING_MODES:
+            raise ValueError(
+                f"field_sampling must be one of {FIELD_SAMPLING_MODES}, got {field_sampling!r}."
+            )
+        if noise_sampling not in NOISE_SAMPLING_MODES:
+            raise ValueError(
+                f"noise_sampling must be one of {NOISE_SAMPLING_MODES}, got {noise_sampling!r}."
+            )
+        if field_sampling == "antithetic" and self.game_layout.enemy_probability != 0.5:
+            raise ValueError("Antithetic fields require enemy_probability == 0.5.")
+
+        n2 = self.game_layout.field_size ** 2
+        if block_size is None:
+            block_size = n2 if (field_sampling != "antithetic" or n2 % 2 == 0) else 2 * n2
+        if block_size <= 0:
+            raise ValueError("block_size must be > 0.")
+        if gun_sampling == "balanced" and block_size % n2 != 0:
+            raise ValueError(f"block_size must be a multiple of n2={n2} for balanced guns.")
+        if field_sampling == "antithetic" and block_size % 2 != 0:
+            raise ValueError("block_size must be even for antithetic fields.")
+
+        self.gun_sampling = gun_sampling
+        self.field_sampling = field_sampling
+        self.noise_sampling = noise_sampling
+        self.block_size = int(block_size)
+        self._blocked = (gun_sampling, field_sampling, noise_sampling) != (
+            "uniform",
+            "independent",
+            "independent",
+        )
+        if buffered and self._blocked:
+            raise ValueError("buffered mode supports independent sampling modes only.")
+        self.buffered = bool(buffered)
+        if self.buffered:
+            self._init_buffers(seed)
+        self.restart_sampling()
+
+    def _init_buffers(self, seed: Optional[int]) -> None:
+        """Allocate the arrays reused by buffered mode."""
+        n = self.game_layout.field_size
+        n2 = n * n
+        m = self.game_layout.comms_size
+
+        self._rng = np.random.default_rng(seed)
+        # Uniform draws: n2 for the field, one for the gun.
+        self._uniform = np.empty(n2 + 1, dtype=float)
+        self._uniform_field = self._uniform[:n2]
+        self._field_flat = np.zeros(n2, dtype=int)
+        self._gun_flat = np.zeros(n2, dtype=int)
+        self._gun_index = 0
+        self._comm_buffer = np.zeros(m, dtype=int)
+        self._noise_uniform = np.empty(m, dtype=float)
+        self._noise_mask = np.empty(m, dtype=bool)
+
+        self._field_view = self._read_only(self._field_flat)
+        self._gun_view = self._read_only(self._gun_flat)
+        self._comm_view = self._read_only(self._comm_buffer)
+        self._field_2d = self._field_flat.reshape(n, n)
+        self._gun_2d = self._gun_flat.reshape(n, n)
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        """Return a read-only view of an array."""
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def restart_sampling(self) -> None:
+        """Start a fresh sequence of sampling blocks.
+
+        The next reset() starts block 0. Tournament calls this before the
+        first game so that blocks never straddle two tournaments.
+        """
+        self.sample_block: Optional[int] = None
+        self._game_in_block = 0
+        self._gun_order: Optional[np.ndarray] = None
+        self._noise_block: Optional[np.ndarray] = None
+
+    def reset(self, context: Optional[GameContext] = None) -> None:
         """Reset the environment state for a new game.
 
         This creates a new random field and a new random one-hot gun position.
+
+        Args:
+            context: If given, the field and gun are drawn from
+                ``context.rng`` and stored on the context; the environment
+                itself is not changed, so games with different contexts can
+                run concurrently.
+
+        Raises:
+            ValueError: If a context is combined with correlated sampling
+                modes, whose blocks span consecutive games.
         """
+        if context is not None:
+            self._reset_context(context)
+            return
+        if self.buffered:
+            self._reset_buffered()
+            return
+        if self._blocked:
+            self._reset_blocked()
+            return
+
         n = self.game_layout.field_size
         p = self.game_layout.enemy_probability
 
@@ -55,11 +212,80 @@ class GameEnv:
         gun_flat[index] = 1
         self.gun = gun_flat.reshape(n, n)
 
-    def provide(self) -> Tuple[np.ndarray, np.ndarray]:
+    def _reset_context(self, context: GameContext) -> None:
+        """reset() for a GameContext: independent sampling from context.rng."""
+        if self._blocked:
+            raise ValueError("Game contexts support the independent sampling modes only.")
+        n2 = self.game_layout.field_size ** 2
+        context.field = (context.rng.random(n2) < self.game_layout.enemy_probability).astype(int)
+        context.gun = np.zeros(n2, dtype=int)
+        context.gun[context.rng.integers(0, n2)] = 1
+
+    def _reset_buffered(self) -> None:
+        """reset() for buffered mode: refill the preallocated arrays in place."""
+        n2 = self._field_flat.shape[0]
+        self._rng.random(out=self._uniform)
+        # Field: Bernoulli(p) on each cell, written into the field buffer.
+        np.less(self._uniform_field, self.game_layout.enemy_probability, out=self._field_flat)
+        # Gun: move the single 1 to a new uniformly drawn index.
+        self._gun_flat[self._gun_index] = 0
+        self._gun_index = min(int(self._uniform[n2] * n2), n2 - 1)
+        self._gun_flat[self._gun_index] = 1
+        self.field = self._field_2d
+        self.gun = self._gun_2d
+
+    def _reset_blocked(self) -> None:
+        """reset() for the variance-reduction sampling modes."""
+        n = self.game_layout.field_size
+        n2 = n * n
+
+        if self.sample_block is None or self._game_in_block >= self.block_size:
+            self.sample_block = 0 if self.sample_block is None else self.sample_block + 1
+            self._game_in_block = 0
+            if self.gun_sampling == "balanced":
+                self._gun_order = np.concatenate(
+                    [np.random.permutation(n2) for _ in range(self.block_size // n2)]
+                )
+            if self.noise_sampling == "stratified":
+                self._noise_block = self._stratified_noise_block()
+        position = self._game_in_block
+
+        # Field: Bernoulli(p), or the complement of the previous field.
+        if self.field_sampling == "antithetic" and position % 2 == 1:
+            self.field = 1 - self.field
+        else:
+            self.field = np.random.binomial(1, self.game_layout.enemy_probability, size=(n, n)).astype(int)
+
+        # Gun: one-hot, following the block permutation if balanced.
+        if self.gun_sampling == "balanced":
+            index = int(self._gun_order[position])
+        else:
+            index = np.random.randint(0, n2)
+        gun_flat = np.zeros(n2, dtype=int)
+        gun_flat[index] = 1
+        self.gun = gun_flat.reshape(n, n)
+
+        self._game_in_block = position + 1
+
+    def _stratified_noise_block(self) -> np.ndarray:
+        """Sample flip masks of shape (block_size, m) with stratified counts."""
+        c = float(self.game_layout.channel_noise)
+        m = self.game_layout.comms_size
+        b = self.block_size
+        # Randomly rounded number of flips per bit keeps E[flip] = c exactly.
+        counts = np.floor(c * b + np.random.random(m)).astype(int)
+        ranks = np.argsort(np.argsort(np.random.random((b, m)), axis=0), axis=0)
+        return ranks < counts[None, :]
+
+    def provide(self, context: Optional[GameContext] = None) -> Tuple[np.ndarray, np.ndarray]:
         """Provide inputs to the players.
 
         Returns the current field and gun arrays in flattened form.
 
+        Args:
+            context: If given, return copies of the field and gun of the
+                context instead.
+
         Returns:
             A tuple (field, gun) where both arrays are one-dimensional with
             length n^2 and dtype int.
@@ -67,13 +293,21 @@ class GameEnv:
         Raises:
             RuntimeError: If the environment has not been reset yet.
         """
+        if context is not None:
+            if context.field is None or context.gun is None:
+                raise RuntimeError("GameEnv must be reset with the context before calling provide().")
+            return context.field.copy(), context.gun.copy()
         if self.field is None or self.gun is None:
             raise RuntimeError("GameEnv must be reset before calling provide().")
 
+        if self.buffered:
+            # Read-only views of the buffers; valid until the next reset().
+            return self._field_view, self._gun_view
+
         # Return copies to prevent external modification of internal state.
         return self.field.ravel().copy(), self.gun.ravel().copy()
 
-    def evaluate(self, shoot: int) -> float:
+    def evaluate(self, shoot: int, context: Optional[GameContext] = None) -> float:
         """Evaluate the result of a shooting decision.
 
         The reward is 1.0 if the decision matches the true cell value at
@@ -81,6 +315,8 @@ class GameEnv:
 
         Args:
             shoot: Shooting action from Player B, either 0 or 1.
+            context: If given, evaluate against the field and gun of the
+                context.
 
         Returns:
             Reward value 1.0 if the decision is correct, otherwise 0.0.
@@ -88,9 +324,16 @@ class GameEnv:
         Raises:
             RuntimeError: If the environment has not been reset yet.
         """
+        if context is not None:
+            if context.field is None or context.gun is None:
+                raise RuntimeError("GameEnv must be reset with the context before calling evaluate().")
+            return 1.0 if int(shoot) == int(context.field[int(np.argmax(context.gun))]) else 0.0
         if self.field is None or self.gun is None:
             raise RuntimeError("GameEnv must be reset before calling evaluate().")
 
+        if self.buffered:
+            return 1.0 if int(shoot) == self._field_flat[self._gun_index] else 0.0
+
         # The cell value is the field entry at the one-hot gun index.
         cell_values = self.field[self.gun == 1]
         if cell_values.size != 1:
@@ -101,30 +344,95 @@ class GameEnv:
 
         return 1.0 if shoot_int == cell_value else 0.0
 
-    def apply_channel_noise(self, comm: np.ndarray) -> np.ndarray:
-        """Apply channel noise to a communication vector.
+    def sample_noise_mask(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Sample the bit-flip mask used by apply_channel_noise().
 
-        Each bit is flipped independently with probability channel_noise.
+        The random numbers drawn are exactly those apply_channel_noise()
+        would draw, so a mask sampled here and applied with
+        apply_noise_mask() reproduces the same noisy message. This allows
+        one noise pattern to be shared by several players.
 
         Args:
-            comm: One-dimensional array of integers in {0, 1} with length m.
+            shape: Shape of the communication vector.
 
         Returns:
-            A noisy communication vector with the same shape and dtype as comm.
+            Boolean array of the given shape; True marks a flipped bit.
         """
-        comm = np.asarray(comm, dtype=int)
         c = float(self.game_layout.channel_noise)
 
         if c <= 0.0:
-            # No noise: return an unchanged copy.
-            return comm.copy()
+            # No noise: nothing is flipped.
+            return np.zeros(shape, dtype=bool)
         if c >= 1.0:
             # Full noise: always flip all bits.
-            return 1 - comm
+            return np.ones(shape, dtype=bool)
+
+        if self.noise_sampling == "stratified":
+            if self._noise_block is None:
+                raise RuntimeError("GameEnv must be reset before sampling stratified noise.")
+            if tuple(shape) != (self.game_layout.comms_size,):
+                raise ValueError(f"Stratified noise requires shape ({self.game_layout.comms_size},).")
+            return self._noise_block[self._game_in_block - 1].copy()
 
         # Flip each bit with probability c.
-        flip_mask = np.random.random(size=comm.shape) < c
-        noisy = comm.copy()
+        if self.buffered:
+            return self._rng.random(size=shape) < c
+        return np.random.random(size=shape) < c
+
+    @staticmethod
+    def apply_noise_mask(comm: np.ndarray, flip_mask: np.ndarray) -> np.ndarray:
+        """Flip the bits of comm selected by a mask from sample_noise_mask().
+
+        Args:
+            comm: One-dimensional array of integers in {0, 1} with length m.
+            flip_mask: Boolean mask with the same shape as comm.
+
+        Returns:
+            A new noisy communication vector.
+        """
+        noisy = np.asarray(comm, dtype=int).copy()
         noisy[flip_mask] = 1 - noisy[flip_mask]
         return noisy
 
+    def apply_channel_noise(self, comm: np.ndarray, context: Optional[GameContext] = None) -> np.ndarray:
+        """Apply channel noise to a communication vector.
+
+        Each bit is flipped independently with probability channel_noise.
+
+        Args:
+            comm: One-dimensional array of integers in {0, 1} with length m.
+            context: If given, the flips are drawn from ``context.rng``.
+
+        Returns:
+            A noisy communication vector with the same shape and dtype as comm.
+        """
+        if context is not None:
+            comm = np.asarray(comm, dtype=int)
+            c = float(self.game_layout.channel_noise)
+            if c <= 0.0:
+                return comm.copy()
+            return self.apply_noise_mask(comm, context.rng.random(comm.shape) < c)
+        if self.buffered:
+            return self._apply_channel_noise_buffered(comm)
+
+        comm = np.asarray(comm, dtype=int)
+        if self.game_layout.channel_noise <= 0.0:
+            # No noise: return an unchanged copy.
+            return comm.copy()
+        return self.apply_noise_mask(comm, self.sample_noise_mask(comm.shape))
+
+    def _apply_channel_noise_buffered(self, comm: np.ndarray) -> np.ndarray:
+        """apply_channel_noise() for buffered mode, writing into the comm buffer.
+
+        Returns:
+            Read-only view of the noisy message; valid until the next call.
+        """
+        c = float(self.game_layout.channel_noise)
+        np.copyto(self._comm_buffer, comm, casting="unsafe")
+        if c >= 1.0:
+            np.subtract(1, self._comm_buffer, out=self._comm_buffer)
+        elif c > 0.0:
+            self._rng.random(out=self._noise_uniform)
+            np.less(self._noise_uniform, c, out=self._noise_mask)
+            np.bitwise_xor(self._comm_buffer, self._noise_mask, out=self._comm_buffer)
+        return self._comm_view
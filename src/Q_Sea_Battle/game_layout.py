@@ -54,6 +54,7 @@ class GameLayout:
             "tournament_id",
             "meta_id",
             "game_uid",
+            "sample_block",
             "prev_measurements",
             "prev_outcomes",
         ]
@@ -0,0 +1,248 @@
+"""Opt-in per-stage timing instrumentation for Game and Tournament.
+
+An :class:`Instrumentation` instance can be passed to :class:`Game` or
+:class:`Tournament`. It accumulates wall time and call counts for each
+stage of a game (environment reset, Player A decision, channel noise,
+Player B decision, evaluation, ...) and for the tournament log writes.
+Results are exposed as an :class:`InstrumentationSummary` and can be
+exported as a Chrome trace (``chrome://tracing`` / Perfetto) JSON file.
+
+When no instrumentation is attached, Game and Tournament run their
+original code path; the only cost is a single ``is None`` check per call.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+#: Stage names recorded by Game.play (in execution order).
+GAME_STAGES = (
+    "env_reset",
+    "players_reset",
+    "players",
+    "provide",
+    "player_a_decide",
+    "channel_noise",
+    "player_b_decide",
+    "evaluate",
+)
+#: Span covering one full game.
+GAME_SPAN = "game"
+#: Stage covering all TournamentLog bookkeeping for one game.
+LOG_WRITE_STAGE = "log_write"
+#: Span covering one full tournament.
+TOURNAMENT_SPAN = "tournament"
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Accumulated timing of one stage.
+
+    Attributes:
+        calls: Number of recorded calls.
+        total_seconds: Total wall time in seconds.
+        min_seconds: Shortest call in seconds.
+        max_seconds: Longest call in seconds.
+    """
+
+    calls: int
+    total_seconds: float
+    min_seconds: float
+    max_seconds: float
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean wall time per call in seconds."""
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class InstrumentationSummary:
+    """Snapshot of the measurements collected by an Instrumentation.
+
+    Attributes:
+        stages: Per-stage statistics keyed by stage name.
+        games: Number of games played.
+        tournaments: Number of tournaments run.
+        wall_seconds: Total wall time of the tournaments, or of the games
+            if no tournament was recorded.
+        games_per_sec: Games per second over ``wall_seconds``.
+        log_write_seconds: Total time spent in TournamentLog bookkeeping.
+    """
+
+    stages: Dict[str, StageStats]
+    games: int
+    tournaments: int
+    wall_seconds: float
+    games_per_sec: float
+    log_write_seconds: float
+
+    def fractions(self) -> Dict[str, float]:
+        """Return each game stage and log writes as a fraction of wall time."""
+        if self.wall_seconds <= 0.0:
+            return {}
+        names = [*GAME_STAGES, LOG_WRITE_STAGE]
+        return {
+            name: self.stages[name].total_seconds / self.wall_seconds
+            for name in names
+            if name in self.stages
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable dictionary representation."""
+        return {
+            "games": self.games,
+            "tournaments": self.tournaments,
+            "wall_seconds": self.wall_seconds,
+            "games_per_sec": self.games_per_sec,
+            "log_write_seconds": self.log_write_seconds,
+            "stages": {
+                name: {
+                    "calls": s.calls,
+                    "total_seconds": s.total_seconds,
+                    "mean_seconds": s.mean_seconds,
+                    "min_seconds": s.min_seconds,
+                    "max_seconds": s.max_seconds,
+                }
+                for name, s in self.stages.items()
+            },
+        }
+
+    def format(self) -> str:
+        """Format the summary as a human-readable table."""
+        lines = [
+            f"games: {self.games}  wall: {self.wall_seconds:.4f} s  "
+            f"games/sec: {self.games_per_sec:.1f}  log writes: {self.log_write_seconds:.4f} s",
+            f"{'stage':<18} {'calls':>8} {'total s':>10} {'mean us':>10} {'share':>7}",
+        ]
+        shares = self.fractions()
+        for name, s in self.stages.items():
+            share = f"{100.0 * shares[name]:.1f}%" if name in shares else ""
+            lines.append(
+                f"{name:<18} {s.calls:>8} {s.total_seconds:>10.4f} "
+                f"{1e6 * s.mean_seconds:>10.1f} {share:>7}"
+            )
+        return "\n".join(lines)
+
+
+class Instrumentation:
+    """Accumulator for per-stage wall time, call counts and trace events.
+
+    Stages are recorded with :meth:`record`, passing ``time.perf_counter()``
+    timestamps taken by the caller; this keeps the per-stage overhead to a
+    dictionary update.
+
+    Args:
+        trace: If True, also keep individual events for Chrome-trace export.
+        max_trace_events: Upper bound on stored trace events; later events
+            are counted in ``dropped_trace_events`` but not stored.
+    """
+
+    def __init__(self, trace: bool = False, max_trace_events: int = 1_000_000) -> None:
+        if max_trace_events < 0:
+            raise ValueError("max_trace_events must be non-negative.")
+        self.trace = bool(trace)
+        self.max_trace_events = int(max_trace_events)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all collected measurements."""
+        # name -> [calls, total, min, max]
+        self._stages: Dict[str, List[float]] = {}
+        self._events: List[Dict[str, Any]] = []
+        self.dropped_trace_events = 0
+        self.games = 0
+        self.tournaments = 0
+        self._origin = time.perf_counter()
+
+    def record(self, name: str, start: float, end: float, category: str = "stage") -> None:
+        """Record one call of a stage.
+
+        Args:
+            name: Stage name.
+            start: ``time.perf_counter()`` at stage start.
+            end: ``time.perf_counter()`` at stage end.
+            category: Trace category (used only for the Chrome trace).
+        """
+        dt = end - start
+        stats = self._stages.get(name)
+        if stats is None:
+            self._stages[name] = [1, dt, dt, dt]
+        else:
+            stats[0] += 1
+            stats[1] += dt
+            if dt < stats[2]:
+                stats[2] = dt
+            if dt > stats[3]:
+                stats[3] = dt
+
+        if self.trace:
+            if len(self._events) < self.max_trace_events:
+                self._events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": 1e6 * (start - self._origin),
+                        "dur": 1e6 * dt,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    }
+                )
+            else:
+                self.dropped_trace_events += 1
+
+    def summary(self) -> InstrumentationSummary:
+        """Return a snapshot of the collected measurements."""
+        stages = {
+            name: StageStats(int(calls), float(total), float(lo), float(hi))
+            for name, (calls, total, lo, hi) in self._stages.items()
+        }
+        span = stages.get(TOURNAMENT_SPAN) or stages.get(GAME_SPAN)
+        wall = span.total_seconds if span is not None else 0.0
+        log_write = stages[LOG_WRITE_STAGE].total_seconds if LOG_WRITE_STAGE in stages else 0.0
+        return InstrumentationSummary(
+            stages=stages,
+            games=self.games,
+            tournaments=self.tournaments,
+            wall_seconds=wall,
+            games_per_sec=self.games / wall if wall > 0.0 else 0.0,
+            log_write_seconds=log_write,
+        )
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the recorded events in Chrome trace-event format."""
+        return {
+            "traceEvents": list(self._events),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped_trace_events},
+        }
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        """Write the recorded events as a Chrome trace JSON file.
+
+        Args:
+            path: Output file path.
+
+        Returns:
+            The path written to.
+
+        Raises:
+            RuntimeError: If the instance was created with ``trace=False``.
+        """
+        if not self.trace:
+            raise RuntimeError("Chrome trace export requires Instrumentation(trace=True).")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
@@ -0,0 +1,420 @@
+"""Out-of-core play of PR-assisted and majority strategies on large fields.
+
+:class:`GameEnv`, :class:`PRAssistedPlayers` and :class:`MajorityPlayerA`
+hold complete int64 arrays of length ``n2`` per game (field, gun, every
+level of the pyramid and its PR-assisted boxes), which exhausts memory
+long before the field sizes of the large-field-limit experiments. This
+module plays the same games in streaming fashion:
+
+- :class:`LargeFieldGameEnv` draws the gun index first and then generates
+  the field block by block (``block_size`` cells at a time) from its own
+  generator; only the cell at the gun is remembered for the reward.
+- Player A consumes the blocks once. The PR-assisted player folds every
+  block through the pyramid levels it spans and merges the block results
+  on a carry stack with one slot per level, like a binary counter; the
+  majority player adds each block to per-segment counts.
+- The PR-assisted boxes of one game (:class:`SparsePRAssisted`) draw A's
+  outcomes for every index but keep only the measurement and outcome at
+  the single index player B will query at their level.
+
+State is O(block_size + log2 n2) per game, so ``n2 = 2**24`` (a 4096 x
+4096 field) is played with 64k-cell blocks in a few MB. Player B works
+on the gun index directly.
+
+The sparse boxes are told B's query index when the game starts. This is a
+simulation shortcut only: A's outcomes are uniformly random and
+independent per index, so the bits that are not stored cannot influence
+the game, and the joint distribution of (comm, shoot, reward) is the one
+of :class:`PRAssistedPlayers`.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .game_layout import GameLayout
+
+#: Default number of field cells generated per block.
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+Block = Tuple[int, np.ndarray]
+
+
+def _random_bits(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Return ``n`` uniform 0/1 values as uint8, eight per random byte."""
+    if n < 8:
+        return rng.integers(0, 2, size=n, dtype=np.uint8)
+    return np.unpackbits(np.frombuffer(rng.bytes((n + 7) // 8), dtype=np.uint8))[:n]
+
+
+def iter_field_blocks(field: np.ndarray, block_size: int) -> Iterator[Block]:
+    """Yield ``(start, block)`` pairs of a complete field array.
+
+    Lets the streaming players run on fields that do fit in memory (for
+    example to compare them with the array-based players).
+    """
+    flat = np.asarray(field, dtype=np.uint8).ravel()
+    for start in range(0, flat.size, block_size):
+        yield start, flat[start : start + block_size]
+
+
+def _check_power_of_two(name: str, value: int) -> None:
+    if value < 1 or value & (value - 1):
+        raise ValueError(f"{name} must be a power of two, got {value}.")
+
+
+class LargeFieldGameEnv:
+    """Game environment that generates the field in blocks.
+
+    Args:
+        game_layout: Game configuration (``n2`` must be a power of two).
+        block_size: Cells per block; a power of two, capped at ``n2``.
+        seed: Seed of the environment's generator.
+
+    Attributes:
+        gun_index: Flat index of the gun in the current game.
+        cell_value: Field value at the gun, known once the block holding
+            the gun has been generated.
+    """
+
+    def __init__(
+        self,
+        game_layout: Optional[GameLayout] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.game_layout: GameLayout = game_layout or GameLayout()
+        self.n2 = self.game_layout.field_size ** 2
+        _check_power_of_two("block_size", int(block_size))
+        self.block_size = min(int(block_size), self.n2)
+        self._rng = np.random.default_rng(seed)
+        self.gun_index: Optional[int] = None
+        self.cell_value: Optional[int] = None
+
+    def reset(self) -> None:
+        """Start a new game: draw the gun index, forget the old field."""
+        self.gun_index = int(self._rng.integers(0, self.n2))
+        self.cell_value = None
+
+    def field_blocks(self) -> Iterator[Block]:
+        """Generate the field of the current game, one block at a time.
+
+        Yields:
+            ``(start, block)`` with ``block`` a uint8 array of
+            ``block_size`` cells starting at flat index ``start``.
+
+        Raises:
+            RuntimeError: If the environment has not been reset.
+        """
+        if self.gun_index is None:
+            raise RuntimeError("LargeFieldGameEnv must be reset before generating the field.")
+        p = self.game_layout.enemy_probability
+        for start in range(0, self.n2, self.block_size):
+            if p == 0.5:
+                block = _random_bits(self._rng, self.block_size)
+            else:
+                block = (self._rng.random(self.block_size) < p).astype(np.uint8)
+            if start <= self.gun_index < start + self.block_size:
+                self.cell_value = int(block[self.gun_index - start])
+            yield start, block
+
+    def apply_channel_noise(self, comm: np.ndarray) -> np.ndarray:
+        """Flip each comm bit independently with probability ``channel_noise``."""
+        comm = np.asarray(comm, dtype=int)
+        c = float(self.game_layout.channel_noise)
+        if c <= 0.0:
+            return comm.copy()
+        return np.where(self._rng.random(comm.shape) < c, 1 - comm, comm)
+
+    def evaluate(self, shoot: int) -> float:
+        """Return 1.0 if ``shoot`` equals the cell value at the gun, else 0.0.
+
+        Raises:
+            RuntimeError: If the field of the current game was not generated.
+        """
+        if self.cell_value is None:
+            raise RuntimeError("The field must be generated before evaluate().")
+        return 1.0 if int(shoot) == self.cell_value else 0.0
+
+
+# ----------------------------------------------------------------------
+# PR-assisted play
+# ----------------------------------------------------------------------
+class SparsePRAssisted:
+    """PR-assisted box of one pyramid level that stores one index.
+
+    A measures first and receives uniform outcomes for all indices; the
+    box keeps A's measurement and outcome at ``query_index`` only. B's
+    single query then follows the correlation rule of :class:`PRAssisted`.
+
+    Args:
+        length: Number of indices of the box.
+        p_high: Correlation parameter in [0, 1].
+        query_index: Index B will query.
+        rng: Generator for the outcomes.
+    """
+
+    def __init__(self, length: int, p_high: float, query_index: int, rng: np.random.Generator) -> None:
+        if not 0 <= query_index < length:
+            raise ValueError(f"query_index must be in [0, {length}).")
+        self.length = int(length)
+        self.p_high = float(p_high)
+        self.query_index = int(query_index)
+        self._rng = rng
+        self.measurement_a_bit: Optional[int] = None
+        self.outcome_a_bit: Optional[int] = None
+
+    def measurement_a(self, start: int, measurement: np.ndarray) -> np.ndarray:
+        """Measure indices ``start .. start + len(measurement) - 1`` for A.
+
+        Returns:
+            Uniform 0/1 outcomes (uint8) for these indices.
+        """
+        outcome = _random_bits(self._rng, measurement.size)
+        offset = self.query_index - start
+        if 0 <= offset < measurement.size:
+            self.measurement_a_bit = int(measurement[offset])
+            self.outcome_a_bit = int(outcome[offset])
+        return outcome
+
+    def measurement_b(self, measurement_bit: int) -> int:
+        """Measure the query index for B (after A).
+
+        Raises:
+            RuntimeError: If A has not measured the query index yet.
+        """
+        if self.outcome_a_bit is None:
+            raise RuntimeError("Player A must measure before player B.")
+        both = self.measurement_a_bit == 1 and int(measurement_bit) == 1
+        same_prob = 1.0 - self.p_high if both else self.p_high
+        return self.outcome_a_bit if self._rng.random() < same_prob else 1 - self.outcome_a_bit
+
+
+class LargeFieldPRAssistedPlayerA:
+    """Streaming version of :class:`PRAssistedPlayerA`."""
+
+    def __init__(self, parent: "LargeFieldPRAssistedPlayers") -> None:
+        self.parent = parent
+
+    def decide_stream(self, blocks: Iterable[Block]) -> np.ndarray:
+        """Fold the field through the pyramid block by block.
+
+        Each block of ``2**b`` cells is reduced through levels ``0..b-1``
+        with vectorised pair operations; the resulting level-``b`` value is
+        merged with its left neighbour on the carry stack.
+
+        Returns:
+            Communication array of length 1.
+        """
+        boxes = self.parent.boxes
+        depth = len(boxes)
+        pending: List[Optional[int]] = [None] * depth
+        comm_bit: Optional[int] = None
+        for start, block in blocks:
+            values = np.asarray(block, dtype=np.uint8)
+            level = 0
+            while values.size > 1:
+                left, right = values[0::2], values[1::2]
+                outcome = boxes[level].measurement_a(start >> (level + 1), left ^ right)
+                values = left ^ outcome
+                level += 1
+            index, value = start >> level, int(values[0])
+            # Carry: merge completed subtrees as in a binary counter.
+            while level < depth and index % 2 == 1:
+                left_value = pending[level]
+                pending[level] = None
+                outcome = boxes[level].measurement_a(index >> 1, np.array([left_value ^ value], dtype=np.uint8))
+                value = left_value ^ int(outcome[0])
+                index >>= 1
+                level += 1
+            if level == depth:
+                comm_bit = value
+            else:
+                pending[level] = value
+        if comm_bit is None:
+            raise ValueError("The blocks did not cover the field.")
+        return np.array([comm_bit], dtype=int)
+
+
+class LargeFieldPRAssistedPlayerB:
+    """Streaming version of :class:`PRAssistedPlayerB` (works on the gun index)."""
+
+    def __init__(self, parent: "LargeFieldPRAssistedPlayers") -> None:
+        self.parent = parent
+
+    def decide_index(self, gun_index: int, comm: np.ndarray) -> int:
+        """Return the shoot decision for the gun at flat ``gun_index``."""
+        parity = int(np.asarray(comm, dtype=int).ravel()[0])
+        for level, box in enumerate(self.parent.boxes):
+            # B measures 1 at a level iff the gun is the right cell of its pair.
+            parity ^= box.measurement_b((gun_index >> level) & 1)
+        return parity
+
+
+class LargeFieldPRAssistedPlayers:
+    """PR-assisted players for large fields with sparse boxes.
+
+    Args:
+        game_layout: Game configuration with ``comms_size == 1``.
+        p_high: Correlation parameter of the boxes.
+        seed: Seed of the boxes' generator.
+
+    Raises:
+        ValueError: If ``comms_size != 1``.
+    """
+
+    def __init__(self, game_layout: GameLayout, p_high: float, seed: Optional[int] = None) -> None:
+        if game_layout.comms_size != 1:
+            raise ValueError("LargeFieldPRAssistedPlayers requires comms_size == 1")
+        if not 0.0 <= float(p_high) <= 1.0:
+            raise ValueError("p_high must be in the interval [0.0, 1.0]")
+        self.game_layout = game_layout
+        self.p_high = float(p_high)
+        self.depth = int(game_layout.field_size ** 2).bit_length() - 1
+        self._rng = np.random.default_rng(seed)
+        self.boxes: List[SparsePRAssisted] = []
+        self._players = (LargeFieldPRAssistedPlayerA(self), LargeFieldPRAssistedPlayerB(self))
+
+    def players(self) -> Tuple[LargeFieldPRAssistedPlayerA, LargeFieldPRAssistedPlayerB]:
+        """Return the (player_a, player_b) pair."""
+        return self._players
+
+    def new_game(self, gun_index: int) -> None:
+        """Create the boxes of a game, one per level (lengths n2/2, ..., 1)."""
+        self.boxes = [
+            SparsePRAssisted(1 << (self.depth - 1 - level), self.p_high, gun_index >> (level + 1), self._rng)
+            for level in range(self.depth)
+        ]
+
+
+# ----------------------------------------------------------------------
+# Majority play
+# ----------------------------------------------------------------------
+class LargeFieldMajorityPlayerA:
+    """Streaming version of :class:`MajorityPlayerA` (per-segment counts)."""
+
+    def __init__(self, game_layout: GameLayout) -> None:
+        self.game_layout = game_layout
+
+    def decide_stream(self, blocks: Iterable[Block]) -> np.ndarray:
+        """Return the majority bit of every segment of the streamed field."""
+        m = self.game_layout.comms_size
+        segment_len = self.game_layout.field_size ** 2 // m
+        counts = np.zeros(m, dtype=np.int64)
+        for start, block in blocks:
+            block = np.asarray(block)
+            first = start // segment_len
+            last = (start + block.size - 1) // segment_len
+            if first == last:
+                counts[first] += int(np.count_nonzero(block))
+            else:
+                segment = (np.arange(start, start + block.size) // segment_len) - first
+                counts[first : last + 1] += np.bincount(segment, weights=block, minlength=last - first + 1).astype(
+                    np.int64
+                )
+        return (2 * counts >= segment_len).astype(int)
+
+
+class LargeFieldMajorityPlayerB:
+    """Majority player B working on the gun index."""
+
+    def __init__(self, game_layout: GameLayout) -> None:
+        self.game_layout = game_layout
+
+    def decide_index(self, gun_index: int, comm: np.ndarray) -> int:
+        """Return the comm bit of the segment holding the gun."""
+        comm = np.asarray(comm, dtype=int).ravel()
+        segment_len = self.game_layout.field_size ** 2 // comm.size
+        return int(comm[min(gun_index // segment_len, comm.size - 1)])
+
+
+class LargeFieldMajorityPlayers:
+    """Majority players for large fields."""
+
+    def __init__(self, game_layout: GameLayout) -> None:
+        self.game_layout = game_layout
+        self._players = (LargeFieldMajorityPlayerA(game_layout), LargeFieldMajorityPlayerB(game_layout))
+
+    def players(self) -> Tuple[LargeFieldMajorityPlayerA, LargeFieldMajorityPlayerB]:
+        """Return the (player_a, player_b) pair."""
+        return self._players
+
+    def new_game(self, gun_index: int) -> None:
+        """Majority players keep no shared state."""
+
+
+# ----------------------------------------------------------------------
+# Tournament
+# ----------------------------------------------------------------------
+@dataclass
+class LargeFieldResult:
+    """Rewards of a large-field tournament.
+
+    Attributes:
+        rewards: Reward per game.
+        seconds: Wall time of the tournament.
+    """
+
+    rewards: np.ndarray
+    seconds: float
+
+    def outcome(self) -> Tuple[float, float]:
+        """Return ``(mean_reward, std_error)`` as TournamentLog.outcome() does."""
+        n = self.rewards.size
+        if n == 0:
+            return 0.0, 0.0
+        mean = float(self.rewards.mean())
+        if n == 1:
+            return mean, 0.0
+        return mean, float(self.rewards.std(ddof=1) / np.sqrt(n))
+
+    @property
+    def games_per_sec(self) -> float:
+        """Throughput of the tournament."""
+        return self.rewards.size / self.seconds if self.seconds > 0 else float("inf")
+
+
+class LargeFieldTournament:
+    """Play streaming games between LargeFieldGameEnv and large-field players.
+
+    Args:
+        game_env: Environment generating the fields.
+        players: :class:`LargeFieldPRAssistedPlayers` or
+            :class:`LargeFieldMajorityPlayers`.
+        number_of_games: Games per tournament; defaults to the layout's
+            ``number_of_games_in_tournament``.
+    """
+
+    def __init__(
+        self,
+        game_env: LargeFieldGameEnv,
+        players: LargeFieldPRAssistedPlayers | LargeFieldMajorityPlayers,
+        number_of_games: Optional[int] = None,
+    ) -> None:
+        self.game_env = game_env
+        self.players = players
+        self.number_of_games = int(number_of_games or game_env.game_layout.number_of_games_in_tournament)
+
+    def play_game(self) -> float:
+        """Play one game and return its reward."""
+        env = self.game_env
+        player_a, player_b = self.players.players()
+        env.reset()
+        self.players.new_game(env.gun_index)
+        comm = player_a.decide_stream(env.field_blocks())
+        shoot = player_b.decide_index(env.gun_index, env.apply_channel_noise(comm))
+        return env.evaluate(shoot)
+
+    def tournament(self) -> LargeFieldResult:
+        """Play ``number_of_games`` games."""
+        t_start = perf_counter()
+        rewards = np.array([self.play_game() for _ in range(self.number_of_games)], dtype=float)
+        return LargeFieldResult(rewards=rewards, seconds=perf_counter() - t_start)
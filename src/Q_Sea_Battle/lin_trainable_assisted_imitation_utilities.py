@@ -326,7 +326,7 @@ def transfer_assisted_model_b_layer_weights(
     transfer_layer_weights(trained_measure_layer, model_b.measure_layer)
     transfer_layer_weights(trained_combine_layer, model_b.combine_layer)
 
-def train_layer(layer, ds, loss, epochs: int, metrics=None):
+def train_layer(layer, ds, loss, epochs: int, metrics=None, callbacks=None):
     """
     Train a single Keras layer or callable module by supervised imitation.
 
@@ -367,6 +367,11 @@ def train_layer(layer, ds, loss, epochs: int, metrics=None):
         Optional list of Keras metrics to track during training.
         Defaults to an empty list.
 
+    callbacks : list, optional
+        Keras callbacks passed to ``fit``, e.g. a
+        :class:`~Q_Sea_Battle.training_control.TrainingControl` that stops
+        once the layer reproduces its teacher on a held-out batch.
+
     Returns
     -------
     tf.keras.Model
@@ -398,5 +403,5 @@ def train_layer(layer, ds, loss, epochs: int, metrics=None):
         model = tf.keras.Model(inp, out)
 
     model.compile(optimizer="adam", loss=loss, metrics=metrics)
-    model.fit(ds, epochs=epochs, verbose=1)
+    model.fit(ds, epochs=epochs, verbose=1, callbacks=list(callbacks or []))
     return model
@@ -21,6 +21,10 @@ class MajorityPlayers(Players):
     Uses a shared :class:`GameLayout` configuration for both players.
     """
 
+    #: The players hold no per-game state; random draws use the context.
+    supports_game_context: bool = True
+    supports_counterfactual: bool = True
+
     def __init__(self, game_layout: GameLayout | None = None) -> None:
         """Initialise a :class:`MajorityPlayers` factory.
 
@@ -29,14 +33,18 @@ class MajorityPlayers(Players):
                 default :class:`GameLayout` is created.
         """
         super().__init__(game_layout)
+        # The players hold no per-game state, so one pair is reused.
+        self._players: Tuple[PlayerA, PlayerB] | None = None
 
     def players(self) -> Tuple[PlayerA, PlayerB]:
-        """Create a ``(MajorityPlayerA, MajorityPlayerB)`` pair.
+        """Return the ``(MajorityPlayerA, MajorityPlayerB)`` pair.
+
+        The pair is created on first use and reused afterwards.
 
         Returns:
             Tuple of concrete player instances that share the
             factory's :class:`GameLayout`.
         """
-        player_a = MajorityPlayerA(self.game_layout)
-        player_b = MajorityPlayerB(self.game_layout)
-        return player_a, player_b
+        if self._players is None or self._players[0].game_layout is not self.game_layout:
+            self._players = (MajorityPlayerA(self.game_layout), MajorityPlayerB(self.game_layout))
+        return self._players
@@ -0,0 +1,330 @@
+"""Registry of saved ``.keras`` player models with lazy, LRU-cached loading.
+
+The ``models/`` directories hold many trained models whose settings are
+encoded in the filename, e.g.::
+
+    neural_net_model_a_f4_c1.keras           side A, field 4, comms 1
+    neural_A_stacked_field16_comms4.keras    side A, field 16, comms 4, phase "stacked"
+    diag_bc_neural_B_bc_tau_0.25.keras       side B, tau 0.25, phase "bc"
+    diag_sched_neural_A_ste_alpha_0.50.keras side A, alpha 0.5, phase "ste"
+    lin_model_a_f4_m1_p1.00.keras            side A, field 4, comms 1, p_high 1.0
+
+:class:`ModelRegistry` scans a directory and indexes these files by their
+parsed metadata without loading them (and without importing TensorFlow).
+Models are loaded on demand into a bounded least-recently-used cache, so
+repeated lookups in notebooks and evaluation loops reuse the same Keras
+objects. Matching A/B models can be retrieved as a pair and attached to a
+:class:`NeuralNetPlayers` factory.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+_SIDES = {"a": "A", "b": "B"}
+# Numeric settings encoded as a prefixed token (f4, field16, c1, comms4, m1, p1.00).
+_PREFIXED = (
+    (re.compile(r"^(?:f|field)(\d+)$"), "field_size", int),
+    (re.compile(r"^(?:c|comms|m)(\d+)$"), "comms_size", int),
+    (re.compile(r"^p(\d+(?:\.\d+)?)$"), "p_high", float),
+)
+# Numeric settings encoded as a name token followed by a value token (tau_0.25).
+_NAMED = {"tau": "tau", "alpha": "alpha"}
+_NUMBER = re.compile(r"^\d+(?:\.\d+)?$")
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    """Metadata of one saved model, parsed from its filename.
+
+    Attributes:
+        path: Path of the ``.keras`` file.
+        family: Filename prefix before the side token (e.g. ``"diag_bc_neural"``).
+        side: ``"A"`` or ``"B"``, or None if the name has no side token.
+        field_size: Field size, if encoded in the name.
+        comms_size: Number of communication bits, if encoded in the name.
+        tau: Temperature setting, if encoded in the name.
+        alpha: Straight-through mixing setting, if encoded in the name.
+        p_high: PR-assisted correlation setting, if encoded in the name.
+        phase: Remaining name tokens describing the training phase or
+            variant (e.g. ``"phase1_logits"``, ``"from_stacked"``), or None.
+        pair_key: Name with the side replaced by ``*``; A and B models
+            with the same pair key belong together.
+    """
+
+    path: Path
+    family: str
+    side: Optional[str] = None
+    field_size: Optional[int] = None
+    comms_size: Optional[int] = None
+    tau: Optional[float] = None
+    alpha: Optional[float] = None
+    p_high: Optional[float] = None
+    phase: Optional[str] = None
+    pair_key: str = ""
+
+    @property
+    def name(self) -> str:
+        """Filename without extension."""
+        return self.path.stem
+
+    def matches(self, **query: Any) -> bool:
+        """Return True if every given attribute equals the query value.
+
+        Float attributes are compared with ``math.isclose``; a query value
+        of None matches only entries without that attribute.
+        """
+        for key, wanted in query.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown model attribute {key!r}.")
+            value = getattr(self, key)
+            if key == "side" and wanted is not None:
+                wanted = str(wanted).upper()
+            if isinstance(wanted, float) and isinstance(value, float):
+                if not math.isclose(value, wanted, rel_tol=1e-9, abs_tol=1e-9):
+                    return False
+            elif value != wanted:
+                return False
+        return True
+
+    def keras_config(self) -> Dict[str, Any]:
+        """Read the model configuration stored in the ``.keras`` archive.
+
+        This only opens the zip file; no model is built.
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            return json.loads(archive.read("config.json"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metadata as a dictionary (path as string)."""
+        return {
+            "name": self.name,
+            "family": self.family,
+            "side": self.side,
+            "field_size": self.field_size,
+            "comms_size": self.comms_size,
+            "tau": self.tau,
+            "alpha": self.alpha,
+            "p_high": self.p_high,
+            "phase": self.phase,
+            "pair_key": self.pair_key,
+            "path": str(self.path),
+        }
+
+
+def parse_model_filename(path: str | Path) -> ModelEntry:
+    """Parse the metadata encoded in a model filename.
+
+    Args:
+        path: Path or filename of a ``.keras`` model.
+
+    Returns:
+        The parsed ModelEntry. Unrecognised tokens end up in ``phase``.
+    """
+    path = Path(path)
+    stem = path.name[: -len(".keras")] if path.name.endswith(".keras") else path.stem
+    tokens = stem.split("_")
+
+    side_pos = next((i for i, t in enumerate(tokens) if t.lower() in _SIDES and i > 0), None)
+    if side_pos is None:
+        family, side, rest = stem, None, []
+    else:
+        family = "_".join(tokens[:side_pos])
+        side = _SIDES[tokens[side_pos].lower()]
+        rest = tokens[side_pos + 1 :]
+
+    values: Dict[str, Any] = {}
+    phase_tokens: List[str] = []
+    i = 0
+    while i < len(rest):
+        token = rest[i]
+        if token in _NAMED and i + 1 < len(rest) and _NUMBER.match(rest[i + 1]):
+            values[_NAMED[token]] = float(rest[i + 1])
+            i += 2
+            continue
+        for pattern, key, convert in _PREFIXED:
+            match = pattern.match(token)
+            if match and key not in values:
+                values[key] = convert(match.group(1))
+                break
+        else:
+            phase_tokens.append(token)
+        i += 1
+
+    pair_tokens = list(tokens)
+    if side_pos is not None:
+        pair_tokens[side_pos] = "*"
+    return ModelEntry(
+        path=path,
+        family=family,
+        side=side,
+        phase="_".join(phase_tokens) or None,
+        pair_key="_".join(pair_tokens),
+        **values,
+    )
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the model cache (as in functools.lru_cache)."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ModelRegistry:
+    """Index of the ``.keras`` files in one or more directories.
+
+    The index is built from filenames only. :meth:`load` loads a model
+    with ``tf.keras.models.load_model(..., compile=False)`` the first time
+    it is requested and keeps it in an LRU cache of ``cache_size`` models;
+    cached models are shared, so training a returned model changes the
+    cached instance as well (use :meth:`clear_cache` to drop it).
+
+    Args:
+        *roots: Directories to scan (non-recursively). Defaults to
+            ``models`` in the current working directory.
+        cache_size: Maximum number of loaded models kept in memory.
+
+    Raises:
+        ValueError: If ``cache_size`` is not positive.
+    """
+
+    def __init__(self, *roots: str | Path, cache_size: int = 8) -> None:
+        if cache_size < 1:
+            raise ValueError("cache_size must be >= 1.")
+        self.roots: Tuple[Path, ...] = tuple(Path(r) for r in roots) or (Path("models"),)
+        self.cache_size = int(cache_size)
+        self._cache: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.entries: List[ModelEntry] = []
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan the directories for ``.keras`` files."""
+        entries = []
+        for root in self.roots:
+            if root.is_dir():
+                entries.extend(parse_model_filename(p) for p in sorted(root.glob("*.keras")))
+        self.entries = entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[ModelEntry]:
+        return iter(self.entries)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the index as a DataFrame (one row per model)."""
+        return pd.DataFrame([e.to_dict() for e in self.entries])
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def find(self, **query: Any) -> List[ModelEntry]:
+        """Return all entries matching the query (see ModelEntry.matches)."""
+        return [e for e in self.entries if e.matches(**query)]
+
+    def get(self, **query: Any) -> ModelEntry:
+        """Return the single entry matching the query.
+
+        Raises:
+            LookupError: If no entry or more than one entry matches.
+        """
+        found = self.find(**query)
+        if len(found) != 1:
+            names = [e.name for e in found]
+            raise LookupError(f"Expected exactly one model for {query}, found {len(found)}: {names}.")
+        return found[0]
+
+    def pair(self, **query: Any) -> Tuple[ModelEntry, ModelEntry]:
+        """Return the matching (A, B) entries for a query.
+
+        The query must select exactly one A/B pair (same pair key).
+
+        Raises:
+            LookupError: If the query matches no complete pair or several.
+        """
+        query.pop("side", None)
+        by_key: Dict[str, Dict[str, ModelEntry]] = {}
+        for entry in self.find(**query):
+            if entry.side is not None:
+                by_key.setdefault(entry.pair_key, {})[entry.side] = entry
+        pairs = [(sides["A"], sides["B"]) for sides in by_key.values() if set(sides) == {"A", "B"}]
+        if len(pairs) != 1:
+            keys = [a.pair_key for a, _ in pairs]
+            raise LookupError(f"Expected exactly one A/B pair for {query}, found {len(pairs)}: {keys}.")
+        return pairs[0]
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def load(self, entry: ModelEntry | str | Path) -> Any:
+        """Load a model through the LRU cache.
+
+        Args:
+            entry: A ModelEntry or a model path.
+
+        Returns:
+            The Keras model.
+        """
+        path = entry.path if isinstance(entry, ModelEntry) else Path(entry)
+        key = (str(path.resolve()), path.stat().st_mtime_ns)
+        model = self._cache.get(key)
+        if model is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return model
+
+        import tensorflow as tf
+
+        self._misses += 1
+        model = tf.keras.models.load_model(str(path), compile=False)
+        self._cache[key] = model
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return model
+
+    def load_pair(self, **query: Any) -> Tuple[Any, Any]:
+        """Load the (model_a, model_b) pair selected by a query."""
+        entry_a, entry_b = self.pair(**query)
+        return self.load(entry_a), self.load(entry_b)
+
+    def load_into(self, players: Any, **query: Any) -> Tuple[ModelEntry, ModelEntry]:
+        """Attach the A/B pair selected by a query to a NeuralNetPlayers.
+
+        Args:
+            players: A factory with a ``set_models(model_a, model_b)`` method.
+            **query: Attributes selecting one pair.
+
+        Returns:
+            The (A, B) entries that were attached.
+        """
+        entry_a, entry_b = self.pair(**query)
+        players.set_models(self.load(entry_a), self.load(entry_b))
+        return entry_a, entry_b
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss statistics of the model cache."""
+        return CacheInfo(self._hits, self._misses, self.cache_size, len(self._cache))
+
+    def clear_cache(self) -> None:
+        """Drop all cached models and reset the statistics."""
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
@@ -12,9 +12,11 @@ from typing import Any, Optional
 import numpy as np
 import tensorflow as tf
 
+from .game_context import game_context
 from .game_layout import GameLayout
 from .players_base import PlayerA
 from .logit_utilities import logit_to_prob, logit_to_logprob
+from .validation import is_strict
 
 
 def _scale_field(field: np.ndarray) -> np.ndarray:
@@ -31,6 +33,19 @@ def _scale_field(field: np.ndarray) -> np.ndarray:
     return field - 0.5
 
 
+def _bits_to_index(bits: np.ndarray) -> Optional[int]:
+    """Read a flat 0/1 vector as a binary number (most significant bit first).
+
+    Returns None if the vector is not binary (only checked in strict
+    validation mode), so that callers can fall back to the model.
+    """
+    bits = np.asarray(bits).reshape(-1)
+    if is_strict() and not np.all((bits == 0) | (bits == 1)):
+        return None
+    weights = 1 << np.arange(bits.size - 1, -1, -1, dtype=np.int64)
+    return int(np.dot(bits.astype(np.int64), weights))
+
+
 class NeuralNetPlayerA(PlayerA):
     """Player A driven by a Keras communication model.
 
@@ -41,6 +56,11 @@ class NeuralNetPlayerA(PlayerA):
 
     The log-probability of the taken action is stored in :attr:`last_logprob`
     and can be retrieved via :meth:`get_log_prob` for RL-style training.
+
+    If :attr:`logit_table` is set (see
+    :meth:`NeuralNetPlayers.compile_lookup_tables`), the logits of a binary
+    field are read from row ``int(field bits)`` of that table instead of
+    running the model.
     """
 
     def __init__(
@@ -62,6 +82,7 @@ class NeuralNetPlayerA(PlayerA):
         self.model_a: tf.keras.Model = model_a
         self.explore: bool = explore
         self.last_logprob: Optional[float] = None
+        self.logit_table: Optional[np.ndarray] = None
 
     # ------------------------------------------------------------------
     # Core API
@@ -72,22 +93,19 @@ class NeuralNetPlayerA(PlayerA):
         Args:
             field: Flattened field array of shape ``(n2,)`` with values in
                 ``{0, 1}``.
-            supp: Optional supporting information (unused).
+            supp: Optional GameContext; if given, bits are sampled from its
+                generator and the log-probability is stored on it.
 
         Returns:
             NumPy array of shape ``(m,)`` with integer bits in ``{0, 1}``.
         """
-        # Basic validation and scaling.
-        field = np.asarray(field, dtype=np.float32).reshape(1, -1)
-        field_scaled = _scale_field(field)
-
-        # Forward pass through the model (logits).
-        logits = self.model_a(field_scaled, training=False).numpy()[0]
+        context = game_context(supp)
+        logits = self._logits(field)
         probs = self.logit_to_probs(logits)
 
         if self.explore:
             # Sample each bit from Bernoulli(prob).
-            rnd = np.random.rand(*probs.shape)
+            rnd = context.rng.random(probs.shape) if context is not None else np.random.rand(*probs.shape)
             actions = (rnd < probs).astype(np.float32)
         else:
             # Greedy threshold at 0.5.
@@ -96,10 +114,27 @@ class NeuralNetPlayerA(PlayerA):
         # Compute and store the log-probability of the chosen action.
         log_probs_bits = self.logit_to_log_probs(logits, actions)
         # Sum over bits to obtain a scalar log-probability.
-        self.last_logprob = float(np.sum(log_probs_bits))
+        if context is not None:
+            context.logprob_comm = float(np.sum(log_probs_bits))
+        else:
+            self.last_logprob = float(np.sum(log_probs_bits))
 
         return actions.astype(int)
 
+    def _logits(self, field: np.ndarray) -> np.ndarray:
+        """Return the communication logits for one field."""
+        if self.logit_table is not None:
+            index = _bits_to_index(field)
+            if index is not None:
+                return self.logit_table[index]
+
+        # Basic validation and scaling.
+        field = np.asarray(field, dtype=np.float32).reshape(1, -1)
+        field_scaled = _scale_field(field)
+
+        # Forward pass through the model (logits).
+        return self.model_a(field_scaled, training=False).numpy()[0]
+
     # ------------------------------------------------------------------
     # Helper functions for probabilities and log-probs
     # ------------------------------------------------------------------
@@ -12,9 +12,11 @@ from typing import Any, Optional
 import numpy as np
 import tensorflow as tf
 
+from .game_context import game_context
 from .game_layout import GameLayout
 from .players_base import PlayerB
 from .logit_utilities import logit_to_prob, logit_to_logprob
+from .neural_net_player_a import _bits_to_index
 
 
 def _gun_one_hot_to_index(gun: np.ndarray) -> np.ndarray:
@@ -49,6 +51,11 @@ class NeuralNetPlayerB(PlayerB):
     :attr:`explore`, the decision is either a deterministic threshold at 0.5
     or sampled from the underlying Bernoulli distribution. The log-probability
     of the chosen action is stored in :attr:`last_logprob`.
+
+    If :attr:`logit_table` is set (see
+    :meth:`NeuralNetPlayers.compile_lookup_tables`), the logit is read from
+    entry ``[gun index, int(comm bits)]`` of that table instead of running
+    the model.
     """
 
     def __init__(
@@ -70,6 +77,7 @@ class NeuralNetPlayerB(PlayerB):
         self.model_b: tf.keras.Model = model_b
         self.explore: bool = explore
         self.last_logprob: Optional[float] = None
+        self.logit_table: Optional[np.ndarray] = None
 
     # ------------------------------------------------------------------
     # Core API
@@ -85,31 +93,45 @@ class NeuralNetPlayerB(PlayerB):
         Args:
             gun: Flattened one-hot gun vector of length ``n2``.
             comm: Communication vector from Player A of length ``m``.
-            supp: Optional supporting information (unused).
+            supp: Optional GameContext; if given, the action is sampled from
+                its generator and the log-probability is stored on it.
 
         Returns:
             ``1`` to shoot or ``0`` to not shoot.
         """
-        gun = np.asarray(gun, dtype=np.float32).reshape(1, -1)
-        comm = np.asarray(comm, dtype=np.float32).reshape(1, -1)
-
-        gun_idx_norm = _gun_one_hot_to_index(gun)  # shape (1, 1)
-        x = np.concatenate([gun_idx_norm, comm], axis=1)
-
-        logits = self.model_b(x, training=False).numpy().reshape(-1)[0]
+        context = game_context(supp)
+        logits = self._logit(gun, comm)
         prob = float(self.logit_to_probs(logits))
 
         if self.explore:
-            rnd = np.random.rand()
+            rnd = context.rng.random() if context is not None else np.random.rand()
             action = 1.0 if rnd < prob else 0.0
         else:
             action = 1.0 if prob >= 0.5 else 0.0
 
         log_prob = float(self.logit_to_log_probs(logits, action))
-        self.last_logprob = log_prob
+        if context is not None:
+            context.logprob_shoot = log_prob
+        else:
+            self.last_logprob = log_prob
 
         return int(action)
 
+    def _logit(self, gun: np.ndarray, comm: np.ndarray) -> float:
+        """Return the shoot logit for one gun/comm pair."""
+        if self.logit_table is not None:
+            comm_index = _bits_to_index(comm)
+            if comm_index is not None:
+                return self.logit_table[int(np.argmax(gun)), comm_index]
+
+        gun = np.asarray(gun, dtype=np.float32).reshape(1, -1)
+        comm = np.asarray(comm, dtype=np.float32).reshape(1, -1)
+
+        gun_idx_norm = _gun_one_hot_to_index(gun)  # shape (1, 1)
+        x = np.concatenate([gun_idx_norm, comm], axis=1)
+
+        return self.model_b(x, training=False).numpy().reshape(-1)[0]
+
     # ------------------------------------------------------------------
     # Helper functions for probabilities and log-probs
     # ------------------------------------------------------------------
@@ -7,9 +7,10 @@ Version: 0.1
 
 from __future__ import annotations
 
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import warnings
+import zlib
 
 import numpy as np
 import pandas as pd
@@ -21,6 +22,30 @@ from .game_layout import GameLayout
 from .players_base import Players, PlayerA, PlayerB
 from .neural_net_player_a import NeuralNetPlayerA, _scale_field
 from .neural_net_player_b import NeuralNetPlayerB, _gun_one_hot_to_index
+from .training_control import TrainingControl, TrainingReport
+
+if TYPE_CHECKING:
+    from .model_registry import ModelRegistry
+
+#: Largest field (in cells) for which model A is compiled into a table.
+DEFAULT_MAX_TABLE_FIELD_BITS = 16
+#: Number of inputs evaluated per batch while compiling lookup tables.
+LOOKUP_TABLE_BATCH_SIZE = 8192
+
+
+def _weights_fingerprint(model: tf.keras.Model) -> int:
+    """Return a CRC32 checksum of all weights of a model."""
+    checksum = 0
+    for weight in model.weights:
+        checksum = zlib.crc32(np.ascontiguousarray(weight.numpy()).tobytes(), checksum)
+    return checksum
+
+
+def _binary_rows(n_bits: int, start: int, stop: int) -> np.ndarray:
+    """Return rows ``start..stop-1`` of the ``n_bits`` truth table (MSB first)."""
+    idx = np.arange(start, stop, dtype=np.int64)[:, None]
+    shifts = np.arange(n_bits - 1, -1, -1, dtype=np.int64)[None, :]
+    return ((idx >> shifts) & 1).astype(np.float32)
 
 
 class NeuralNetPlayers(Players):
@@ -41,11 +66,21 @@ class NeuralNetPlayers(Players):
     specialised methods :meth:`train_model_a` and :meth:`train_model_b`. The
     legacy :meth:`train` method is retained for backwards compatibility but
     currently acts as a no-op and issues a warning.
+
+    For small layouts the models can be compiled into logit tables with
+    :meth:`compile_lookup_tables`; the players then read their logits from
+    memory instead of running Keras.
     """
 
     #: Whether Tournament should attempt to read log-probabilities via
     #: ``get_log_prob`` from the underlying players.
     has_log_probs: bool = True
+    #: Per-game state (sampled actions, log-probabilities) can live on a
+    #: GameContext.
+    supports_game_context: bool = True
+    supports_counterfactual: bool = True
+    #: Applied with set_explore(), which updates the child players.
+    series_settings: Tuple[str, ...] = ("explore",)
 
     def __init__(
         self,
@@ -79,6 +114,9 @@ class NeuralNetPlayers(Players):
         self._playerA: Optional[NeuralNetPlayerA] = None
         self._playerB: Optional[NeuralNetPlayerB] = None
 
+        # side -> (logit table, weights fingerprint at compile time)
+        self._lookup_tables: Dict[str, Tuple[np.ndarray, int]] = {}
+
     # ------------------------------------------------------------------
     # Player factory interface
     # ------------------------------------------------------------------
@@ -106,6 +144,7 @@ class NeuralNetPlayers(Players):
                 model_b=self.model_b,
                 explore=self.explore,
             )
+        self._attach_lookup_tables()
 
         return self._playerA, self._playerB
 
@@ -147,19 +186,160 @@ class NeuralNetPlayers(Players):
         self.model_a.save(filenameA)
         self.model_b.save(filenameB)
 
-    def load_models(self, filenameA: str, filenameB: str) -> None:
+    def load_models(self, filenameA: str, filenameB: str, registry: Optional["ModelRegistry"] = None) -> None:
         """Load Keras models from disk and attach them to this factory.
 
         Existing child players, if any, are updated to reference the new
         models.
+
+        Args:
+            filenameA: Path of the model for Player A.
+            filenameB: Path of the model for Player B.
+            registry: Optional ModelRegistry; if given, the models are
+                loaded through its LRU cache (shared, uncompiled models).
         """
-        self.model_a = tf.keras.models.load_model(filenameA)
-        self.model_b = tf.keras.models.load_model(filenameB)
+        if registry is not None:
+            self.set_models(registry.load(filenameA), registry.load(filenameB))
+        else:
+            self.set_models(tf.keras.models.load_model(filenameA), tf.keras.models.load_model(filenameB))
+
+    def set_models(self, model_a: tf.keras.Model, model_b: tf.keras.Model) -> None:
+        """Attach a pair of models, updating existing child players."""
+        self.model_a = model_a
+        self.model_b = model_b
 
         if self._playerA is not None and self.model_a is not None:
             self._playerA.model_a = self.model_a
         if self._playerB is not None and self.model_b is not None:
             self._playerB.model_b = self.model_b
+        self.invalidate_lookup_tables()
+
+    # ------------------------------------------------------------------
+    # Lookup tables
+    # ------------------------------------------------------------------
+    def compile_lookup_tables(
+        self,
+        max_field_bits: int = DEFAULT_MAX_TABLE_FIELD_BITS,
+        batch_size: int = LOOKUP_TABLE_BATCH_SIZE,
+    ) -> Dict[str, bool]:
+        """Evaluate the models once over their discrete input space.
+
+        Player B's input is a gun index and ``m`` comm bits, so its logits
+        form a table of shape ``(n2, 2**m)``. Player A's input is the whole
+        field, which is enumerated only if ``n2 <= max_field_bits``
+        (``2**n2`` rows of ``m`` logits). The tables store logits, so greedy
+        and explore decisions and their log-probabilities are the same as
+        with the models (up to float32 batching round-off).
+
+        The tables are dropped by :meth:`set_models`, :meth:`load_models`,
+        :meth:`train_model_a` and :meth:`train_model_b`, and stale tables
+        (changed weights fingerprint) are dropped by
+        :meth:`prepare_tournament` before every tournament. Compiling again
+        keeps tables whose models are unchanged without re-evaluation.
+
+        Args:
+            max_field_bits: Largest ``n2`` for which model A is compiled.
+            batch_size: Number of inputs per model call.
+
+        Returns:
+            Dict ``{"A": bool, "B": bool}`` telling which side is served
+            from a table.
+
+        Raises:
+            ValueError: If ``batch_size`` is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        if self.model_a is None:
+            self.model_a = self._build_model_a()
+        if self.model_b is None:
+            self.model_b = self._build_model_b()
+
+        n2 = self.game_layout.field_size ** 2
+        m = self.game_layout.comms_size
+        stale = self.stale_lookup_tables()
+        for side in stale:
+            self._lookup_tables.pop(side, None)
+
+        if "A" in stale and n2 <= max_field_bits:
+            n_rows = 1 << n2
+            chunks = []
+            for start in range(0, n_rows, batch_size):
+                fields = _binary_rows(n2, start, min(n_rows, start + batch_size))
+                chunks.append(self.model_a(_scale_field(fields), training=False).numpy())
+            self._lookup_tables["A"] = (np.concatenate(chunks, axis=0), _weights_fingerprint(self.model_a))
+
+        if "B" in stale:
+            comms = _binary_rows(m, 0, 1 << m)
+            guns = np.eye(n2, dtype=np.float32)
+            x = np.concatenate(
+                [np.repeat(_gun_one_hot_to_index(guns), len(comms), axis=0), np.tile(comms, (n2, 1))],
+                axis=1,
+            )
+            logits = np.concatenate(
+                [self.model_b(x[i : i + batch_size], training=False).numpy() for i in range(0, len(x), batch_size)],
+                axis=0,
+            )
+            self._lookup_tables["B"] = (logits.reshape(n2, 1 << m), _weights_fingerprint(self.model_b))
+
+        self._attach_lookup_tables()
+        return {side: side in self._lookup_tables for side in ("A", "B")}
+
+    def stale_lookup_tables(self) -> Tuple[str, ...]:
+        """Return the sides whose table is missing or out of date.
+
+        A table is out of date if the weights of its model changed since
+        compilation, or if a player was given a different model than the
+        factory's. This reads all weights, so it is meant to be called
+        between training and evaluation (Tournament calls it through
+        :meth:`prepare_tournament`), not per game.
+        """
+        stale = []
+        for side, model, player, attribute in (
+            ("A", self.model_a, self._playerA, "model_a"),
+            ("B", self.model_b, self._playerB, "model_b"),
+        ):
+            entry = self._lookup_tables.get(side)
+            if (
+                entry is None
+                or model is None
+                or (player is not None and getattr(player, attribute) is not model)
+                or entry[1] != _weights_fingerprint(model)
+            ):
+                stale.append(side)
+        return tuple(stale)
+
+    def prepare_tournament(self) -> None:
+        """Drop lookup tables whose models changed since compilation.
+
+        Weights trained in place (``model.fit``, ``optimizer.apply_gradients``,
+        a DIAL update) or models assigned directly to the players would
+        otherwise be shadowed by tables of the old weights.
+        """
+        stale = self.stale_lookup_tables()
+        if any(side in self._lookup_tables for side in stale):
+            for side in stale:
+                self._lookup_tables.pop(side, None)
+            self._attach_lookup_tables()
+
+    def invalidate_lookup_tables(self) -> None:
+        """Drop all lookup tables; the players use the models again."""
+        self._lookup_tables.clear()
+        self._attach_lookup_tables()
+
+    def _drop_lookup_table(self, side: str) -> None:
+        """Drop the table of one side (its model is about to change)."""
+        self._lookup_tables.pop(side, None)
+        self._attach_lookup_tables()
+
+    def _attach_lookup_tables(self) -> None:
+        """Point the child players at the current tables (or None)."""
+        if self._playerA is not None:
+            entry = self._lookup_tables.get("A")
+            self._playerA.logit_table = None if entry is None else entry[0]
+        if self._playerB is not None:
+            entry = self._lookup_tables.get("B")
+            self._playerB.logit_table = None if entry is None else entry[0]
 
     # ------------------------------------------------------------------
     # Legacy training API
@@ -187,10 +367,16 @@ class NeuralNetPlayers(Players):
     # ------------------------------------------------------------------
     # New training APIs
     # ------------------------------------------------------------------
-    def train_model_a(self, dataset, training_settings):
-        """Train the communication model (model_a) on a dataset."""
+    def train_model_a(self, dataset, training_settings) -> TrainingReport:
+        """Train the communication model (model_a) on a dataset.
+
+        Returns:
+            Per-epoch telemetry; see :meth:`_fit` for the early-stopping
+            settings.
+        """
         if self.model_a is None:
             self.model_a = self._build_model_a()
+        self._drop_lookup_table("A")
 
         layout = self.game_layout
         n2 = layout.field_size ** 2
@@ -211,31 +397,18 @@ class NeuralNetPlayers(Players):
         else:
             sample_weight = None
 
-        epochs = int(training_settings.get("epochs", 3))
-        batch_size = int(training_settings.get("batch_size", 32))
-        learning_rate = float(training_settings.get("learning_rate", 1e-3))
-        verbose = int(training_settings.get("verbose", 0))
-
-        opt_a = tf.keras.optimizers.Adam(learning_rate=learning_rate)
-        self.model_a.compile(
-            optimizer=opt_a,
-            loss=tf.keras.losses.BinaryCrossentropy(from_logits=True),
-            metrics=["accuracy"],
-        )
+        return self._fit(self.model_a, fields_scaled, comms_teacher, sample_weight, training_settings)
 
-        self.model_a.fit(
-            fields_scaled,
-            comms_teacher,
-            sample_weight=sample_weight,
-            epochs=epochs,
-            batch_size=batch_size,
-            verbose=verbose,
-        )
+    def train_model_b(self, dataset, training_settings) -> TrainingReport:
+        """Train the shoot model (model_b) on a dataset.
 
-    def train_model_b(self, dataset, training_settings):
-        """Train the shoot model (model_b) on a dataset."""
+        Returns:
+            Per-epoch telemetry; see :meth:`_fit` for the early-stopping
+            settings.
+        """
         if self.model_b is None:
             self.model_b = self._build_model_b()
+        self._drop_lookup_table("B")
 
         layout = self.game_layout
         n2 = layout.field_size ** 2
@@ -260,26 +433,62 @@ class NeuralNetPlayers(Players):
         else:
             sample_weight = None
 
+        return self._fit(self.model_b, x, shoots, sample_weight, training_settings)
+
+    @staticmethod
+    def _fit(
+        model: tf.keras.Model,
+        x: np.ndarray,
+        y: np.ndarray,
+        sample_weight: Optional[np.ndarray],
+        training_settings: Dict,
+    ) -> TrainingReport:
+        """Compile and fit one model under a TrainingControl.
+
+        With ``training_settings["early_stopping"]`` the last
+        ``validation_fraction`` (default 0.1) of the rows is held out and
+        training stops once the thresholded outputs match the teacher
+        exactly, or after ``patience`` (default 5) epochs without
+        improvement.
+        """
         epochs = int(training_settings.get("epochs", 3))
         batch_size = int(training_settings.get("batch_size", 32))
         learning_rate = float(training_settings.get("learning_rate", 1e-3))
         verbose = int(training_settings.get("verbose", 0))
 
-        opt_b = tf.keras.optimizers.Adam(learning_rate=learning_rate)
-        self.model_b.compile(
-            optimizer=opt_b,
+        validation = None
+        if bool(training_settings.get("early_stopping", False)):
+            fraction = float(training_settings.get("validation_fraction", 0.1))
+            if not 0.0 < fraction < 1.0:
+                raise ValueError("validation_fraction must be in (0, 1).")
+            n_train = len(x) - max(1, int(round(len(x) * fraction)))
+            validation = (x[n_train:], y[n_train:])
+            x, y = x[:n_train], y[:n_train]
+            if sample_weight is not None:
+                sample_weight = sample_weight[:n_train]
+        control = TrainingControl(
+            validation_data=validation,
+            samples_per_epoch=len(x),
+            patience=training_settings.get("patience", 5),
+        )
+
+        opt = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+        model.compile(
+            optimizer=opt,
             loss=tf.keras.losses.BinaryCrossentropy(from_logits=True),
             metrics=["accuracy"],
         )
 
-        self.model_b.fit(
+        model.fit(
             x,
-            shoots,
+            y,
             sample_weight=sample_weight,
             epochs=epochs,
             batch_size=batch_size,
             verbose=verbose,
+            callbacks=[control],
         )
+        return control.report
 
     # ------------------------------------------------------------------
     # Internal model builders
@@ -0,0 +1,478 @@
+"""TensorFlow-free inference for trained Dense player models.
+
+The neural players (:class:`NeuralNetPlayers`) and the Lin/Pyr Dense
+sublayers are plain stacks of ``Dense`` layers with element-wise
+activations. :func:`export_dense_stack` extracts the kernels, biases and
+activations of such a stack into a :class:`DenseStack`, which can be
+stored as a compact ``.npz`` bundle and evaluated with NumPy only.
+
+:class:`NumpyNeuralNetPlayers` plays with two exported bundles (model A
+and model B) and reproduces the decisions and log-probabilities of
+:class:`NeuralNetPlayers`, so evaluation workers only need NumPy:
+
+    >>> export_keras_model("neural_net_model_a_f4_c1.keras", "model_a.npz")  # needs TF
+    >>> players = NumpyNeuralNetPlayers.from_files(layout, "model_a.npz", "model_b.npz")
+
+Only exporting touches TensorFlow; this module does not import it.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .game_context import game_context
+from .game_layout import GameLayout
+from .logit_utilities import logit_to_logprob, logit_to_prob
+from .player_base_a import PlayerA
+from .player_base_b import PlayerB
+from .players_base import Players
+
+#: Format version stored in exported bundles.
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0, out=x)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # Stable for large |x|: exp of a non-positive argument only.
+    out = np.exp(-np.abs(x))
+    return np.where(x >= 0.0, 1.0 / (1.0 + out), out / (1.0 + out)).astype(x.dtype, copy=False)
+
+
+def _softplus(x: np.ndarray) -> np.ndarray:
+    return (np.maximum(x, 0.0) + np.log1p(np.exp(-np.abs(x)))).astype(x.dtype, copy=False)
+
+
+#: Supported element-wise activations, by Keras name.
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softplus": _softplus,
+}
+
+
+@dataclass
+class DenseStack:
+    """A stack of Dense layers evaluated with NumPy.
+
+    Attributes:
+        kernels: Weight matrices; ``kernels[i]`` has shape (in_i, out_i).
+        biases: Bias vectors; ``biases[i]`` has shape (out_i,).
+        activations: Activation name per layer (see ``ACTIVATIONS``).
+        name: Name of the source model or layer.
+    """
+
+    kernels: List[np.ndarray]
+    biases: List[np.ndarray]
+    activations: List[str]
+    name: str = "dense_stack"
+
+    def __post_init__(self) -> None:
+        if not self.kernels:
+            raise ValueError("DenseStack needs at least one layer.")
+        if not (len(self.kernels) == len(self.biases) == len(self.activations)):
+            raise ValueError("kernels, biases and activations must have the same length.")
+        for i, (kernel, bias, activation) in enumerate(zip(self.kernels, self.biases, self.activations)):
+            if activation not in ACTIVATIONS:
+                raise ValueError(
+                    f"Unsupported activation {activation!r} in layer {i}; "
+                    f"supported: {sorted(ACTIVATIONS)}."
+                )
+            if kernel.ndim != 2 or bias.shape != (kernel.shape[1],):
+                raise ValueError(f"Layer {i}: kernel {kernel.shape} and bias {bias.shape} do not match.")
+            if i > 0 and kernel.shape[0] != self.kernels[i - 1].shape[1]:
+                raise ValueError(f"Layer {i}: input size {kernel.shape[0]} does not match previous output.")
+
+    @property
+    def input_dim(self) -> int:
+        """Size of the input vector."""
+        return int(self.kernels[0].shape[0])
+
+    @property
+    def output_dim(self) -> int:
+        """Size of the output vector."""
+        return int(self.kernels[-1].shape[1])
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Evaluate the stack.
+
+        Args:
+            x: Input of shape (batch, input_dim) or (input_dim,).
+
+        Returns:
+            Output of shape (batch, output_dim), or (output_dim,) for a
+            1D input.
+        """
+        dtype = self.kernels[0].dtype
+        h = np.asarray(x, dtype=dtype)
+        squeeze = h.ndim == 1
+        if squeeze:
+            h = h[None, :]
+        if h.ndim != 2 or h.shape[1] != self.input_dim:
+            raise ValueError(f"Input must have shape (batch, {self.input_dim}), got {np.shape(x)}.")
+
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            h = h @ kernel
+            h += bias
+            h = ACTIVATIONS[activation](h)
+        return h[0] if squeeze else h
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str | Path) -> Path:
+        """Store the stack as an ``.npz`` bundle.
+
+        Args:
+            path: Output file path.
+
+        Returns:
+            The path written to.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "name": self.name,
+            "activations": list(self.activations),
+        }
+        arrays: Dict[str, np.ndarray] = {"meta": np.array(json.dumps(meta))}
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        with path.open("wb") as handle:
+            np.savez(handle, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, dtype: Any = np.float32) -> "DenseStack":
+        """Load a stack stored with :meth:`save`.
+
+        Args:
+            path: Bundle file path.
+            dtype: Floating point type used for evaluation.
+
+        Raises:
+            ValueError: If the file is not a supported bundle.
+        """
+        with np.load(Path(path), allow_pickle=False) as data:
+            if "meta" not in data:
+                raise ValueError(f"{path} is not a DenseStack bundle (missing metadata).")
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported bundle format version {meta.get('format_version')!r}.")
+            n_layers = len(meta["activations"])
+            kernels = [np.asarray(data[f"kernel_{i}"], dtype=dtype) for i in range(n_layers)]
+            biases = [np.asarray(data[f"bias_{i}"], dtype=dtype) for i in range(n_layers)]
+        return cls(kernels=kernels, biases=biases, activations=list(meta["activations"]), name=meta["name"])
+
+
+# ----------------------------------------------------------------------
+# Export from Keras (requires TensorFlow, imported lazily)
+# ----------------------------------------------------------------------
+def _activation_name(layer: Any) -> str:
+    activation = layer.get_config().get("activation", "linear")
+    if activation is None:
+        return "linear"
+    if isinstance(activation, dict):  # serialized activation object
+        activation = activation.get("config", {}).get("name", activation.get("class_name"))
+    return str(activation)
+
+
+def _dense_sublayers(layer: Any) -> List[Any]:
+    """Return the Dense layers of a model or custom layer, in call order."""
+    class_name = type(layer).__name__
+    if class_name == "Dense":
+        return [layer]
+
+    if getattr(layer, "_dense_gun", None) is not None:
+        # PyrCombineLayerB feeds one hidden layer into two output heads.
+        raise ValueError(f"{layer.name}: layers with several output heads are not a Dense stack.")
+
+    # Lin layers keep an MLP list (+ an output layer for the combine layers);
+    # Pyr layers keep a hidden and an output Dense.
+    collected: List[Any] = []
+    for attr in ("_mlp", "_out", "_dense_hidden", "_dense_out"):
+        value = getattr(layer, attr, None)
+        if value is None:
+            continue
+        for sub in value if isinstance(value, (list, tuple)) else [value]:
+            collected.extend(_dense_sublayers(sub))
+    if collected:
+        return collected
+
+    if hasattr(layer, "layers"):  # Sequential / functional model
+        for sub in layer.layers:
+            sub_name = type(sub).__name__
+            if sub_name in ("InputLayer", "Dropout"):
+                continue  # no-ops at inference time
+            if sub_name == "Activation":
+                if not collected:
+                    raise ValueError(f"{layer.name}: Activation layer before the first Dense layer.")
+                collected.append(sub)
+                continue
+            if sub_name != "Dense":
+                raise ValueError(f"{layer.name}: unsupported layer {sub.name!r} ({sub_name}).")
+            collected.append(sub)
+        return collected
+
+    raise ValueError(f"Cannot extract a Dense stack from {class_name}.")
+
+
+def export_dense_stack(model: Any, dtype: Any = np.float32) -> DenseStack:
+    """Extract the Dense/activation stack of a Keras model or layer.
+
+    Supported sources are sequential or functional models consisting of
+    Dense (and Activation / Dropout) layers -- such as the models of
+    :class:`NeuralNetPlayers` -- and the Lin/Pyr measurement and combine
+    layers. For PyrCombineLayerA/B the input of the stack is the
+    concatenation ``[field, sr_outcome]``, as in their ``call``.
+
+    Args:
+        model: Built Keras model or layer.
+        dtype: Floating point type of the exported weights.
+
+    Returns:
+        The extracted DenseStack.
+
+    Raises:
+        ValueError: If the model contains unsupported layers or has not
+            been built.
+    """
+    kernels: List[np.ndarray] = []
+    biases: List[np.ndarray] = []
+    activations: List[str] = []
+    for layer in _dense_sublayers(model):
+        if type(layer).__name__ == "Activation":
+            if activations[-1] != "linear":
+                raise ValueError(f"{model.name}: stacked activations are not supported.")
+            activations[-1] = _activation_name(layer)
+            continue
+        weights = layer.get_weights()
+        if not weights:
+            raise ValueError(f"{model.name}: layer {layer.name!r} has not been built.")
+        kernel = np.asarray(weights[0], dtype=dtype)
+        bias = np.asarray(weights[1], dtype=dtype) if len(weights) > 1 else np.zeros(kernel.shape[1], dtype=dtype)
+        kernels.append(kernel)
+        biases.append(bias)
+        activations.append(_activation_name(layer))
+    return DenseStack(kernels=kernels, biases=biases, activations=activations, name=str(model.name))
+
+
+def export_keras_model(keras_path: str | Path, bundle_path: str | Path) -> Path:
+    """Load a ``.keras`` file and store its Dense stack as an ``.npz`` bundle.
+
+    Args:
+        keras_path: Path of the saved Keras model.
+        bundle_path: Output path of the bundle.
+
+    Returns:
+        The bundle path written to.
+    """
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(str(keras_path), compile=False)
+    return export_dense_stack(model).save(bundle_path)
+
+
+# ----------------------------------------------------------------------
+# NumPy-backed neural players
+# ----------------------------------------------------------------------
+def _scale_field(field: np.ndarray) -> np.ndarray:
+    """Same scaling as neural_net_player_a._scale_field (x - 0.5)."""
+    return np.asarray(field, dtype=np.float32) - 0.5
+
+
+def _gun_one_hot_to_index(gun: np.ndarray) -> np.ndarray:
+    """Same encoding as neural_net_player_b._gun_one_hot_to_index."""
+    gun = np.asarray(gun, dtype=np.float32)
+    gun = gun.reshape(gun.shape[0], -1)
+    idx = np.argmax(gun, axis=1).astype(np.float32)
+    return (idx / float(max(1, gun.shape[1] - 1))).reshape(-1, 1)
+
+
+class NumpyNeuralNetPlayerA(PlayerA):
+    """Player A evaluating an exported communication model with NumPy.
+
+    Mirrors :class:`NeuralNetPlayerA`: the scaled field is mapped to
+    communication logits; bits are thresholded (or sampled when
+    ``explore`` is True) and the log-probability of the action is stored.
+    """
+
+    def __init__(self, game_layout: GameLayout, stack_a: DenseStack, explore: bool = False) -> None:
+        super().__init__(game_layout)
+        self.stack_a = stack_a
+        self.explore = explore
+        self.last_logprob: Optional[float] = None
+
+    def decide(self, field: np.ndarray, supp: Any | None = None) -> np.ndarray:
+        """Return the communication bits for a flattened field."""
+        context = game_context(supp)
+        logits = self.stack_a(_scale_field(np.asarray(field).reshape(1, -1)))[0]
+        probs = logit_to_prob(logits)
+        if self.explore:
+            rnd = context.rng.random(probs.shape) if context is not None else np.random.rand(*probs.shape)
+            actions = (rnd < probs).astype(np.float32)
+        else:
+            actions = (probs >= 0.5).astype(np.float32)
+        log_prob = float(np.sum(logit_to_logprob(logits, actions)))
+        if context is not None:
+            context.logprob_comm = log_prob
+        else:
+            self.last_logprob = log_prob
+        return actions.astype(int)
+
+    def get_log_prob(self) -> float:
+        """Return the log-probability of the last action."""
+        if self.last_logprob is None:
+            raise RuntimeError("No log-prob stored; call decide() first or reset.")
+        return float(self.last_logprob)
+
+    def reset(self) -> None:
+        """Clear the stored log-probability."""
+        self.last_logprob = None
+
+
+class NumpyNeuralNetPlayerB(PlayerB):
+    """Player B evaluating an exported shoot model with NumPy.
+
+    Mirrors :class:`NeuralNetPlayerB`: the normalised gun index and the
+    message are mapped to one shoot logit.
+    """
+
+    def __init__(self, game_layout: GameLayout, stack_b: DenseStack, explore: bool = False) -> None:
+        super().__init__(game_layout)
+        self.stack_b = stack_b
+        self.explore = explore
+        self.last_logprob: Optional[float] = None
+
+    def decide(self, gun: np.ndarray, comm: np.ndarray, supp: Any | None = None) -> int:
+        """Return 1 to shoot or 0 not to shoot."""
+        context = game_context(supp)
+        comm = np.asarray(comm, dtype=np.float32).reshape(1, -1)
+        x = np.concatenate([_gun_one_hot_to_index(np.asarray(gun).reshape(1, -1)), comm], axis=1)
+        logit = float(self.stack_b(x)[0, 0])
+        prob = float(logit_to_prob(logit))
+        if self.explore:
+            rnd = context.rng.random() if context is not None else np.random.rand()
+            action = 1.0 if rnd < prob else 0.0
+        else:
+            action = 1.0 if prob >= 0.5 else 0.0
+        if context is not None:
+            context.logprob_shoot = float(logit_to_logprob(logit, action))
+        else:
+            self.last_logprob = float(logit_to_logprob(logit, action))
+        return int(action)
+
+    def get_log_prob(self) -> float:
+        """Return the log-probability of the last action."""
+        if self.last_logprob is None:
+            raise RuntimeError("No log-prob stored; call decide() first or reset.")
+        return float(self.last_logprob)
+
+    def reset(self) -> None:
+        """Clear the stored log-probability."""
+        self.last_logprob = None
+
+
+class NumpyNeuralNetPlayers(Players):
+    """Players factory running exported NeuralNetPlayers models with NumPy.
+
+    Args:
+        game_layout: Layout the models were trained for.
+        stack_a: Exported communication model (input n2, output m).
+        stack_b: Exported shoot model (input 1 + m, output 1).
+        explore: Exploration flag of the players.
+
+    Raises:
+        ValueError: If the model sizes do not match the layout.
+    """
+
+    has_log_probs: bool = True
+    supports_game_context: bool = True
+    supports_counterfactual: bool = True
+    series_settings: Tuple[str, ...] = ("explore",)
+
+    def __init__(
+        self,
+        game_layout: GameLayout,
+        stack_a: DenseStack,
+        stack_b: DenseStack,
+        explore: bool = False,
+    ) -> None:
+        super().__init__(game_layout)
+        n2 = game_layout.field_size ** 2
+        m = game_layout.comms_size
+        if (stack_a.input_dim, stack_a.output_dim) != (n2, m):
+            raise ValueError(
+                f"model A maps {stack_a.input_dim} -> {stack_a.output_dim}, expected {n2} -> {m}."
+            )
+        if (stack_b.input_dim, stack_b.output_dim) != (1 + m, 1):
+            raise ValueError(
+                f"model B maps {stack_b.input_dim} -> {stack_b.output_dim}, expected {1 + m} -> 1."
+            )
+        self.stack_a = stack_a
+        self.stack_b = stack_b
+        self.explore = explore
+        self._playerA = NumpyNeuralNetPlayerA(game_layout, stack_a, explore)
+        self._playerB = NumpyNeuralNetPlayerB(game_layout, stack_b, explore)
+
+    @classmethod
+    def from_files(
+        cls,
+        game_layout: GameLayout,
+        path_a: str | Path,
+        path_b: str | Path,
+        explore: bool = False,
+    ) -> "NumpyNeuralNetPlayers":
+        """Create the factory from two ``.npz`` bundles."""
+        return cls(game_layout, DenseStack.load(path_a), DenseStack.load(path_b), explore=explore)
+
+    @classmethod
+    def from_neural_net_players(cls, players: Any) -> "NumpyNeuralNetPlayers":
+        """Export the models of a NeuralNetPlayers factory (requires TF)."""
+        players.players()  # builds the default models if needed
+        return cls(
+            players.game_layout,
+            export_dense_stack(players.model_a),
+            export_dense_stack(players.model_b),
+            explore=players.explore,
+        )
+
+    def players(self) -> Tuple[PlayerA, PlayerB]:
+        """Return the NumPy-backed Player A/B pair."""
+        return self._playerA, self._playerB
+
+    def reset(self) -> None:
+        """Clear the stored log-probabilities."""
+        self._playerA.reset()
+        self._playerB.reset()
+
+    def set_explore(self, flag: bool) -> None:
+        """Set the exploration behaviour of both players."""
+        self.explore = flag
+        self._playerA.explore = flag
+        self._playerB.explore = flag
+
+    def comm_logits(self, fields: np.ndarray) -> np.ndarray:
+        """Batched communication logits for fields of shape (batch, n2)."""
+        return self.stack_a(_scale_field(fields))
+
+    def shoot_logits(self, guns: np.ndarray, comms: np.ndarray) -> np.ndarray:
+        """Batched shoot logits for guns (batch, n2) and comms (batch, m)."""
+        comms = np.asarray(comms, dtype=np.float32).reshape(len(comms), -1)
+        x = np.concatenate([_gun_one_hot_to_index(guns), comms], axis=1)
+        return self.stack_b(x)[:, 0]
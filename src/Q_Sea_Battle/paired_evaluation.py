@@ -0,0 +1,181 @@
+"""Common-random-numbers comparison of several Players factories.
+
+Independent tournaments draw their own fields, guns and channel noise,
+so the difference between two players is estimated with the sampling
+noise of both tournaments. :class:`PairedEvaluation` instead generates
+one shared stream of ``(field, gun, noise mask)`` from a GameEnv and lets
+every Players factory play exactly the same games. Win-rate differences
+are then estimated from per-game reward differences, whose variance is
+much smaller when the players tend to win and lose the same games.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .game_env import GameEnv
+from .game_layout import GameLayout
+from .players_base import Players
+from .validation import TRUSTED, validation_level
+
+
+def _std_error(values: np.ndarray) -> float:
+    """Standard error of the mean of a 1D array (0.0 for fewer than 2 values)."""
+    n = values.size
+    if n <= 1:
+        return 0.0
+    return float(values.std(ddof=1) / np.sqrt(n))
+
+
+@dataclass
+class PairedEvaluationResult:
+    """Per-game rewards of several players on a shared game stream.
+
+    Attributes:
+        names: Player names, in the order of the rows of ``rewards``.
+        rewards: Array of shape (n_players, n_games) with rewards in {0, 1}.
+        shoots: Array of shape (n_players, n_games) with shoot decisions.
+    """
+
+    names: List[str]
+    rewards: np.ndarray
+    shoots: np.ndarray
+
+    @property
+    def n_games(self) -> int:
+        """Number of shared games."""
+        return int(self.rewards.shape[1])
+
+    def _row(self, name: str) -> np.ndarray:
+        try:
+            return self.rewards[self.names.index(name)]
+        except ValueError:
+            raise ValueError(f"Unknown player {name!r}; known: {self.names}.") from None
+
+    def outcome(self, name: str) -> Tuple[float, float]:
+        """Return (mean reward, standard error) of one player."""
+        row = self._row(name)
+        return float(row.mean()) if row.size else 0.0, _std_error(row)
+
+    def difference(self, first: str, second: str) -> Tuple[float, float]:
+        """Return the paired win-rate difference ``first - second``.
+
+        Returns:
+            Tuple (mean difference, paired standard error), where the
+            standard error is computed from the per-game differences.
+        """
+        diff = self._row(first) - self._row(second)
+        return float(diff.mean()) if diff.size else 0.0, _std_error(diff)
+
+    def summary(self) -> pd.DataFrame:
+        """Return mean reward and standard error per player."""
+        rows = [(name, *self.outcome(name)) for name in self.names]
+        return pd.DataFrame(rows, columns=["player", "mean_reward", "std_error"]).set_index("player")
+
+    def differences(self) -> pd.DataFrame:
+        """Return paired differences for all player pairs.
+
+        Columns:
+            ``difference``: mean reward of ``first`` minus ``second``.
+            ``paired_std_error``: standard error from per-game differences.
+            ``independent_std_error``: standard error the same number of
+            games would give with independent streams (for comparison).
+            ``z``: difference divided by the paired standard error.
+        """
+        rows = []
+        for first, second in combinations(self.names, 2):
+            diff, se = self.difference(first, second)
+            se_independent = float(np.hypot(self.outcome(first)[1], self.outcome(second)[1]))
+            z = diff / se if se > 0.0 else float("nan")
+            rows.append((first, second, diff, se, se_independent, z))
+        return pd.DataFrame(
+            rows,
+            columns=["first", "second", "difference", "paired_std_error", "independent_std_error", "z"],
+        )
+
+
+class PairedEvaluation:
+    """Play several Players factories on one shared stream of games.
+
+    For each game the environment is reset once (field and gun) and one
+    channel-noise mask is sampled; every factory then plays that game:
+    Player A sees the field, the shared mask is applied to its message,
+    and Player B decides based on the gun and the noisy message.
+
+    Randomness internal to the players (e.g. PR-assisted boxes) is not
+    shared; only the game itself is common to all players.
+
+    Args:
+        game_layout: Layout shared by all players.
+        players: Mapping from a display name to a Players factory.
+        game_env: Optional environment generating the stream; a new
+            GameEnv(game_layout) is used if omitted.
+
+    Raises:
+        ValueError: If no players are given.
+    """
+
+    def __init__(
+        self,
+        game_layout: GameLayout,
+        players: Mapping[str, Players],
+        game_env: Optional[GameEnv] = None,
+    ) -> None:
+        if not players:
+            raise ValueError("players must contain at least one Players factory.")
+        self.game_layout = game_layout
+        self.players: Dict[str, Players] = dict(players)
+        self.game_env = game_env if game_env is not None else GameEnv(game_layout)
+
+    def run(self, n_games: Optional[int] = None) -> PairedEvaluationResult:
+        """Play ``n_games`` shared games with every factory.
+
+        Args:
+            n_games: Number of games; defaults to
+                game_layout.number_of_games_in_tournament.
+
+        Returns:
+            A PairedEvaluationResult with per-game rewards.
+        """
+        if n_games is None:
+            n_games = self.game_layout.number_of_games_in_tournament
+        if n_games <= 0:
+            raise ValueError("n_games must be > 0.")
+
+        names = list(self.players)
+        factories = [self.players[name] for name in names]
+        for factory in factories:
+            prepare_tournament = getattr(factory, "prepare_tournament", None)
+            if prepare_tournament is not None:
+                prepare_tournament()
+        rewards = np.zeros((len(names), n_games), dtype=float)
+        shoots = np.zeros((len(names), n_games), dtype=int)
+        m = self.game_layout.comms_size
+        env = self.game_env
+
+        # The game stream is generated here; skip the player input checks.
+        with validation_level(TRUSTED):
+            for game_id in range(n_games):
+                env.reset()
+                field, gun = env.provide()
+                flip_mask = env.sample_noise_mask((m,))
+
+                for k, factory in enumerate(factories):
+                    factory.reset()
+                    player_a, player_b = factory.players()
+                    comm = player_a.decide(field.copy(), supp=None)
+                    comm_noisy = env.apply_noise_mask(comm, flip_mask)
+                    shoot = int(player_b.decide(gun.copy(), comm_noisy, supp=None))
+                    rewards[k, game_id] = env.evaluate(shoot)
+                    shoots[k, game_id] = shoot
+
+        return PairedEvaluationResult(names=names, rewards=rewards, shoots=shoots)
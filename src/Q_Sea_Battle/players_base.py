@@ -43,6 +43,22 @@ class Players:
         game_layout: Shared configuration used by both players.
     """
 
+    #: True if the players keep all per-game state in a GameContext passed
+    #: as ``supp`` (see prepare_context()), so that games can run
+    #: concurrently. Factories must opt in explicitly.
+    supports_game_context: bool = False
+    #: Settings that TournamentSeries meta-experiments may change. Each is
+    #: applied through the factory's ``set_<name>()`` setter if it has one,
+    #: otherwise by assignment followed by reset(); it must then reach the
+    #: players of the next game.
+    series_settings: Tuple[str, ...] = ()
+    #: True if Player B can be replayed for one decision of Player A
+    #: (AllGunsEvaluation, NoiseMarginalizedEvaluation): either Player B
+    #: changes no state shared with A, or snapshot_shared_state() /
+    #: restore_shared_state() capture it. Factories must opt in explicitly
+    #: or override both methods.
+    supports_counterfactual: bool = False
+
     def __init__(self, game_layout: Optional[GameLayout] = None) -> None:
         """Initialise a pair of players.
 
@@ -76,6 +92,52 @@ class Players:
         # No state to reset in the base implementation.
         return None
 
+    def prepare_tournament(self) -> None:
+        """Prepare the players for a series of games.
+
+        Called once by Tournament (and the evaluators) before the first
+        game. Factories that cache anything derived from mutable state,
+        such as lookup tables compiled from trainable weights, check here
+        that the cache is still valid. The base implementation has no
+        caches.
+        """
+        return None
+
+    def prepare_context(self, context: "GameContext") -> None:
+        """Prepare a GameContext for a new game (replaces reset()).
+
+        Factories with per-game resources (e.g. PR-assisted boxes) create
+        them on the context here instead of on themselves. The base
+        implementation has no per-game resources.
+
+        Args:
+            context: Context of the game about to be played.
+        """
+        return None
+
+    def snapshot_shared_state(self) -> Any:
+        """Capture the state shared between Player A and Player B.
+
+        Counterfactual evaluations (e.g. scoring Player B on every gun
+        position for one decision of Player A) take a snapshot right after
+        Player A has decided and restore it before every replay of Player B.
+        Players that keep no shared state return None and set
+        ``supports_counterfactual``.
+
+        Returns:
+            An opaque state object for restore_shared_state().
+        """
+        return None
+
+    def restore_shared_state(self, state: Any) -> None:
+        """Restore a state captured with snapshot_shared_state().
+
+        Args:
+            state: Object returned by snapshot_shared_state().
+        """
+        # No shared state in the base implementation.
+        return None
+
 
 def __getattr__(name: str) -> Any:
     """Resolve deprecated attribute access for PlayerA/PlayerB.
@@ -106,6 +168,7 @@ def __getattr__(name: str) -> Any:
 
 
 if TYPE_CHECKING:
+    from .game_context import GameContext
     # Make type checkers aware of the deprecated names without importing via __getattr__.
     from .players_base_a import PlayerA
     from .players_base_b import PlayerB
@@ -17,6 +17,8 @@ from typing import Optional
 
 import numpy as np
 
+from .validation import is_strict
+
 
 class PRAssisted:
     """Two-party PR-assisted resource with biased correlations.
@@ -38,12 +40,14 @@ class PRAssisted:
         documentation have been updated.
     """
 
-    def __init__(self, length: int, p_high: float) -> None:
+    def __init__(self, length: int, p_high: float, rng: Optional[np.random.Generator] = None) -> None:
         """Initialise the PR-assisted resource.
 
         Args:
             length: Number of bits in each measurement/outcome string.
             p_high: Correlation parameter in [0.0, 1.0].
+            rng: Optional generator for the outcomes; a fresh unseeded
+                generator is used if None.
 
         Raises:
             TypeError: If argument types are incorrect.
@@ -73,7 +77,7 @@ class PRAssisted:
 
         # Random number generator; in a larger system this can be seeded
         # from a global seed for full reproducibility.
-        self._rng = np.random.default_rng()
+        self._rng = rng if rng is not None else np.random.default_rng()
 
     # ------------------------------------------------------------------
     # Public API
@@ -156,7 +160,7 @@ class PRAssisted:
             raise ValueError("measurement must be 1D")
         if meas.shape[0] != self.length:
             raise ValueError(f"measurement must have length {self.length}")
-        if not np.all(np.logical_or(meas == 0, meas == 1)):
+        if is_strict() and not np.all(np.logical_or(meas == 0, meas == 1)):
             raise ValueError("measurement must contain only 0/1 values")
         return meas
 
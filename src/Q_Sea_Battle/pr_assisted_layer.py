@@ -24,6 +24,8 @@ from typing import Any, Dict, Optional
 
 import tensorflow as tf
 
+from .validation import is_strict
+
 
 @dataclass(frozen=True)
 class _PRInputs:
@@ -53,6 +55,11 @@ class PRAssistedLayer(tf.keras.layers.Layer):
         seed: Optional integer seed used for deterministic sampling in
             ``mode='sample'``. If ``None``, sampling is still well-defined but
             non-deterministic across processes.
+        validate: Input checks (``tf.debugging`` assertions). ``True``
+            always checks, ``False`` never does. ``None`` follows the
+            package validation level in eager execution and always checks
+            while a graph is traced, since a traced graph is reused under
+            any later level.
         name: Optional layer name.
 
     Notes:
@@ -68,6 +75,7 @@ class PRAssistedLayer(tf.keras.layers.Layer):
         mode: str = "expected",
         resource_index: Optional[int] = None,
         seed: Optional[int] = None,
+        validate: Optional[bool] = None,
         name: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
@@ -84,6 +92,7 @@ class PRAssistedLayer(tf.keras.layers.Layer):
         self.mode = mode
         self.resource_index = None if resource_index is None else int(resource_index)
         self.seed = None if seed is None else int(seed)
+        self.validate = None if validate is None else bool(validate)
 
     def get_config(self) -> Dict[str, Any]:
         """Return layer config for Keras serialization."""
@@ -96,6 +105,7 @@ class PRAssistedLayer(tf.keras.layers.Layer):
                 "mode": self.mode,
                 "resource_index": self.resource_index,
                 "seed": self.seed,
+                "validate": self.validate,
             }
         )
         return base
@@ -119,6 +129,14 @@ class PRAssistedLayer(tf.keras.layers.Layer):
         prev_o = tf.convert_to_tensor(inputs["previous_outcome"], dtype=tf.float32)
         first = tf.convert_to_tensor(inputs["first_measurement"], dtype=tf.float32)
 
+        if not self._checks_enabled():
+            return _PRInputs(
+                current_measurement=curr,
+                previous_measurement=prev_m,
+                previous_outcome=prev_o,
+                first_measurement=first,
+            )
+
         # Shape checks: last dim must be length.
         tf.debugging.assert_equal(
             tf.shape(curr)[-1],
@@ -153,6 +171,14 @@ class PRAssistedLayer(tf.keras.layers.Layer):
             first_measurement=first,
         )
 
+    def _checks_enabled(self) -> bool:
+        """Whether the input assertions are part of this call (or trace)."""
+        if self.validate is not None:
+            return self.validate
+        # The level is only known per call in eager execution; a graph keeps
+        # the checks so that it is valid under any later level.
+        return is_strict() or not tf.executing_eagerly()
+
     def _stateless_seed(self, stream_id: int) -> tf.Tensor:
         """Create a TensorFlow stateless seed pair.
 
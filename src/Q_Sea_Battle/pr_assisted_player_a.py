@@ -15,8 +15,10 @@ from typing import Any
 
 import numpy as np
 
+from .game_context import game_context
 from .game_layout import GameLayout
 from .players_base import PlayerA
+from .validation import is_strict
 
 
 class PRAssistedPlayerA(PlayerA):
@@ -50,19 +52,21 @@ class PRAssistedPlayerA(PlayerA):
 
         Args:
             field: Flattened field array of shape ``(n2,)`` with 0/1 values.
-            supp: Optional supporting information (unused).
+            supp: Optional GameContext whose PR-assisted boxes are used
+                instead of the parent's.
 
         Returns:
             1D NumPy array of length 1 containing the communication bit.
         """
-        del supp  # unused
+        context = game_context(supp)
+        boxes = context.resources if context is not None else None
 
         field = np.asarray(field, dtype=int)
         n2 = self.game_layout.field_size**2
 
         if field.ndim != 1 or field.shape[0] != n2:
             raise ValueError(f"field must be a 1D array of length {n2}")  # noqa: TRY003
-        if not np.all(np.logical_or(field == 0, field == 1)):
+        if is_strict() and not np.all(np.logical_or(field == 0, field == 1)):
             raise ValueError("field must contain only 0/1 values")  # noqa: TRY003
 
         intermediate_field = field.copy()
@@ -85,7 +89,7 @@ class PRAssistedPlayerA(PlayerA):
                 measurement[k] = 0 if a == b else 1
 
             # First measurement on the PR-assisted resource at this level.
-            pr_box = self.parent.pr_assisted(level)
+            pr_box = boxes[level] if boxes is not None else self.parent.pr_assisted(level)
             outcome_a = pr_box.measurement_a(measurement)
 
             # Build auxiliary array (original_first_bit, outcome_a_bit) pairs.
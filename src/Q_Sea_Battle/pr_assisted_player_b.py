@@ -15,8 +15,10 @@ from typing import Any
 
 import numpy as np
 
+from .game_context import game_context
 from .game_layout import GameLayout
 from .players_base import PlayerB
+from .validation import is_strict
 
 
 class PRAssistedPlayerB(PlayerB):
@@ -52,12 +54,14 @@ class PRAssistedPlayerB(PlayerB):
         Args:
             gun: One-hot gun vector of shape ``(n2,)`` with values in ``{0, 1}``.
             comm: Communication array of shape ``(1,)`` with values in ``{0, 1}``.
-            supp: Optional supporting information (unused).
+            supp: Optional GameContext whose PR-assisted boxes are used
+                instead of the parent's.
 
         Returns:
             ``1`` to shoot or ``0`` to not shoot.
         """
-        del supp  # unused
+        context = game_context(supp)
+        boxes = context.resources if context is not None else None
 
         gun = np.asarray(gun, dtype=int)
         comm = np.asarray(comm, dtype=int)
@@ -65,14 +69,16 @@ class PRAssistedPlayerB(PlayerB):
         n2 = self.game_layout.field_size**2
         if gun.ndim != 1 or gun.shape[0] != n2:
             raise ValueError(f"gun must be a 1D array of length {n2}")
-        if not np.all((gun == 0) | (gun == 1)):
-            raise ValueError("gun must contain only 0/1 values")
-        if gun.sum() != 1:
-            raise ValueError("gun must be one-hot (sum equal to 1)")
+        strict = is_strict()
+        if strict:
+            if not np.all((gun == 0) | (gun == 1)):
+                raise ValueError("gun must contain only 0/1 values")
+            if gun.sum() != 1:
+                raise ValueError("gun must be one-hot (sum equal to 1)")
 
         if comm.ndim != 1 or comm.shape[0] != 1:
             raise ValueError("comm must be a 1D array of length 1")
-        if not np.all((comm == 0) | (comm == 1)):
+        if strict and not np.all((comm == 0) | (comm == 1)):
             raise ValueError("comm must contain only 0/1 values")
 
         intermediate_gun = gun.copy()
@@ -83,7 +89,7 @@ class PRAssistedPlayerB(PlayerB):
             if intermediate_gun.size % 2 != 0:
                 raise ValueError("intermediate_gun length must be even at each level")
 
-            if intermediate_gun.sum() != 1:
+            if strict and intermediate_gun.sum() != 1:
                 raise ValueError("intermediate_gun must remain one-hot at each level")
 
             half = intermediate_gun.size // 2
@@ -111,12 +117,12 @@ class PRAssistedPlayerB(PlayerB):
                     "expected exactly one active pair (0, 1) or (1, 0); found none"
                 )
 
-            if measurement.sum() not in (0, 1):
+            if strict and measurement.sum() not in (0, 1):
                 raise ValueError(
                     "measurement_string must have sum 0 or 1 per specification"
                 )
 
-            pr_box = self.parent.pr_assisted(level)
+            pr_box = boxes[level] if boxes is not None else self.parent.pr_assisted(level)
             outcome_b = pr_box.measurement_b(measurement)
 
             results.append(int(outcome_b[pair_index]))
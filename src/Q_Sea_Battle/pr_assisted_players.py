@@ -15,10 +15,11 @@ Version: 0.1
 
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Any, List, Tuple
 
 import numpy as np
 
+from .game_context import GameContext
 from .game_layout import GameLayout
 from .players_base import Players, PlayerA, PlayerB
 from .pr_assisted import PRAssisted
@@ -34,6 +35,13 @@ class PRAssistedPlayers(Players):
     instances that query these boxes during play.
     """
 
+    #: Per-game boxes can live on a GameContext (see prepare_context()).
+    supports_game_context: bool = True
+    #: Shared A/B state is captured by snapshot_shared_state().
+    supports_counterfactual: bool = True
+    #: p_high is read whenever the boxes are created (reset()).
+    series_settings: Tuple[str, ...] = ("p_high",)
+
     def __init__(self, game_layout: GameLayout, p_high: float) -> None:
         """Initialise assisted players for a given layout.
 
@@ -87,6 +95,51 @@ class PRAssistedPlayers(Players):
         """
         self._pr_assisted_array = self._create_pr_assisted_array()
 
+    def prepare_context(self, context: GameContext) -> None:
+        """Create fresh PR-assisted boxes for one game on ``context``.
+
+        The boxes draw their outcomes from ``context.rng``; the players
+        use them instead of the factory's boxes when the context is
+        passed as ``supp``.
+        """
+        context.resources = self._create_pr_assisted_array(rng=context.rng)
+
+    def snapshot_shared_state(self) -> List[Tuple[Any, ...]]:
+        """Capture the measurement state of all PR-assisted boxes.
+
+        Returns:
+            One tuple per box with its measured flags and the stored first
+            measurement/outcome.
+        """
+        return [
+            (
+                box.a_measured,
+                box.b_measured,
+                box.prev_party,
+                None if box.prev_measurement is None else box.prev_measurement.copy(),
+                None if box.prev_outcome is None else box.prev_outcome.copy(),
+            )
+            for box in self._pr_assisted_array
+        ]
+
+    def restore_shared_state(self, state: List[Tuple[Any, ...]]) -> None:
+        """Restore the box states captured with snapshot_shared_state().
+
+        Replayed second measurements draw fresh randomness from the boxes,
+        so each replay is an independent sample given the first measurement.
+
+        Args:
+            state: Object returned by snapshot_shared_state().
+        """
+        for box, (a_measured, b_measured, prev_party, prev_meas, prev_out) in zip(
+            self._pr_assisted_array, state
+        ):
+            box.a_measured = a_measured
+            box.b_measured = b_measured
+            box.prev_party = prev_party
+            box.prev_measurement = prev_meas
+            box.prev_outcome = prev_out
+
     def pr_assisted(self, index: int) -> PRAssisted:
         """Return the PR-assisted resource at a given level index.
 
@@ -116,7 +169,7 @@ class PRAssistedPlayers(Players):
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _create_pr_assisted_array(self) -> list[PRAssisted]:
+    def _create_pr_assisted_array(self, rng: np.random.Generator | None = None) -> list[PRAssisted]:
         """Create the list of PR-assisted resources.
 
         For a field of size ``n2 = field_size ** 2 = 2**n`` the algorithm
@@ -124,6 +177,9 @@ class PRAssistedPlayers(Players):
 
             2**(n-1), 2**(n-2), ..., 2**1, 2**0
 
+        Args:
+            rng: Optional generator shared by the boxes (see PRAssisted).
+
         Returns:
             List of :class:`PRAssisted` instances, one per level.
 
@@ -136,4 +192,4 @@ class PRAssistedPlayers(Players):
             raise ValueError("field_size ** 2 must be an exact power of 2")
 
         lengths = [2**exp for exp in range(n - 1, -1, -1)]
-        return [PRAssisted(length=L, p_high=self.p_high) for L in lengths]
+        return [PRAssisted(length=L, p_high=self.p_high, rng=rng) for L in lengths]
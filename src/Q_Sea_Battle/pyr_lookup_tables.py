@@ -0,0 +1,229 @@
+"""Truth-table compilation of small per-level Pyr layers.
+
+At the lower pyramid levels the inputs of the per-level layers are a few
+bits: ``L`` state bits for the measurement layers, plus ``L/2`` shared
+resource outcome bits for the combine layers (and one comm bit for
+:class:`PyrCombineLayerB`). In gameplay (``sr_mode="sample"``) all of
+them are hard 0/1 values, so each layer is a Boolean function that can be
+enumerated once and replaced by a table.
+
+:func:`compile_layer_table` evaluates a trained layer on all ``2**k``
+binary inputs (in batches), thresholds the outputs at 0.5 and stores them
+bit-packed in a :class:`LookupTableLayer`; calling that layer is a single
+``tf.gather`` on the packed table. :func:`compile_pyr_lookup_tables`
+builds a copy of a PyrTrainableAssistedModelA/B in which every level
+whose input fits in ``max_input_bits`` uses such a table. Larger levels
+keep their trained layers.
+
+The compiled model is the hard-decision version of the trained model:
+table layers threshold their inputs and outputs at 0.5. The same tables
+can be built for any layer with binary inputs (e.g. the Lin layers of
+small fields) with :func:`compile_layer_table`.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from .pyr_trainable_assisted_model_a import PyrTrainableAssistedModelA
+from .pyr_trainable_assisted_model_b import PyrTrainableAssistedModelB
+
+#: Default upper bound on the number of input bits of a compiled layer.
+DEFAULT_MAX_INPUT_BITS = 16
+#: Hard upper bound (2**24 rows) to keep tables in memory.
+MAX_INPUT_BITS_LIMIT = 24
+#: Number of input patterns evaluated per batch during compilation.
+COMPILE_BATCH_SIZE = 1 << 14
+
+
+def enumerate_binary_inputs(n_bits: int, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    """Return rows ``start..stop-1`` of the truth table of ``n_bits`` bits.
+
+    Row ``i`` holds the bits of ``i``, most significant bit first, so that
+    :class:`LookupTableLayer` can index the table with the same weights.
+
+    Returns:
+        Float32 array of shape (stop - start, n_bits) with 0/1 values.
+    """
+    stop = (1 << n_bits) if stop is None else stop
+    idx = np.arange(start, stop, dtype=np.int64)[:, None]
+    shifts = np.arange(n_bits - 1, -1, -1, dtype=np.int64)[None, :]
+    return ((idx >> shifts) & 1).astype(np.float32)
+
+
+class LookupTableLayer(tf.keras.layers.Layer):
+    """Keras layer serving a compiled Boolean function by table lookup.
+
+    The inputs (one or more tensors of shape (B, k_i)) are thresholded at
+    0.5, concatenated and read as one binary index; the output bits are
+    gathered from a bit-packed table and unpacked.
+
+    Args:
+        table: uint8 array of shape (2**in_bits, ceil(out_bits / 8)) as
+            produced by ``np.packbits(bits, axis=1)``.
+        in_bits: Total number of input bits.
+        output_sizes: Sizes of the outputs; a single size returns one
+            tensor, several sizes return a tuple (e.g. (L/2, 1) for
+            PyrCombineLayerB).
+        name: Optional layer name.
+    """
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        in_bits: int,
+        output_sizes: Sequence[int],
+        name: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(name=name, trainable=False, **kwargs)
+        table = np.asarray(table, dtype=np.uint8)
+        self.in_bits = int(in_bits)
+        self.output_sizes = tuple(int(s) for s in output_sizes)
+        self.out_bits = sum(self.output_sizes)
+        if table.shape != (1 << self.in_bits, (self.out_bits + 7) // 8):
+            raise ValueError(
+                f"table shape {table.shape} does not match in_bits={self.in_bits}, out_bits={self.out_bits}."
+            )
+        self.table = table
+        self._table = tf.constant(table)
+        self._index_weights = tf.constant(1 << np.arange(self.in_bits - 1, -1, -1, dtype=np.int64))
+        self._bit_shifts = tf.constant(np.arange(7, -1, -1, dtype=np.uint8))
+        self.built = True  # no weights to create
+
+    def call(self, *inputs: tf.Tensor, training: bool = False, **kwargs: Any) -> Any:
+        parts = [tf.cast(tf.convert_to_tensor(x) >= 0.5, tf.int64) for x in inputs]
+        bits = parts[0] if len(parts) == 1 else tf.concat(parts, axis=-1)
+        index = tf.reduce_sum(bits * self._index_weights, axis=-1)
+
+        packed = tf.gather(self._table, index)  # (B, n_bytes)
+        unpacked = tf.bitwise.bitwise_and(tf.bitwise.right_shift(packed[..., None], self._bit_shifts), 1)
+        out = tf.cast(tf.reshape(unpacked, [tf.shape(index)[0], -1])[:, : self.out_bits], tf.float32)
+
+        if len(self.output_sizes) == 1:
+            return out
+        return tuple(tf.split(out, self.output_sizes, axis=-1))
+
+    def get_config(self) -> Dict[str, Any]:
+        cfg = super().get_config()
+        cfg.update({"in_bits": self.in_bits, "output_sizes": list(self.output_sizes)})
+        return cfg
+
+
+def compile_layer_table(
+    layer: Any,
+    input_sizes: Sequence[int],
+    max_input_bits: int = DEFAULT_MAX_INPUT_BITS,
+    name: Optional[str] = None,
+) -> LookupTableLayer:
+    """Enumerate a layer with binary inputs into a LookupTableLayer.
+
+    Args:
+        layer: Callable taking one tensor per entry of ``input_sizes``
+            and returning a tensor or a tuple of tensors with values in
+            [0, 1].
+        input_sizes: Number of bits of each input.
+        max_input_bits: Refuse to compile layers with more input bits.
+        name: Name of the table layer.
+
+    Returns:
+        The compiled LookupTableLayer.
+
+    Raises:
+        ValueError: If the layer has too many input bits.
+    """
+    in_bits = int(sum(input_sizes))
+    limit = min(int(max_input_bits), MAX_INPUT_BITS_LIMIT)
+    if in_bits > limit:
+        raise ValueError(f"Layer has {in_bits} input bits; at most {limit} can be compiled.")
+
+    splits = np.cumsum(input_sizes)[:-1]
+    chunks: List[np.ndarray] = []
+    output_sizes: Optional[Tuple[int, ...]] = None
+    n_rows = 1 << in_bits
+    for start in range(0, n_rows, COMPILE_BATCH_SIZE):
+        rows = enumerate_binary_inputs(in_bits, start, min(n_rows, start + COMPILE_BATCH_SIZE))
+        outputs = layer(*[tf.constant(part) for part in np.split(rows, splits, axis=1)])
+        outputs = outputs if isinstance(outputs, (tuple, list)) else (outputs,)
+        arrays = [np.asarray(o) for o in outputs]
+        output_sizes = tuple(a.shape[-1] for a in arrays)
+        bits = np.concatenate(arrays, axis=1) >= 0.5
+        chunks.append(np.packbits(bits, axis=1))
+
+    assert output_sizes is not None
+    return LookupTableLayer(np.concatenate(chunks, axis=0), in_bits, output_sizes, name=name)
+
+
+def compile_pyr_lookup_tables(
+    model: PyrTrainableAssistedModelA | PyrTrainableAssistedModelB,
+    max_input_bits: int = DEFAULT_MAX_INPUT_BITS,
+) -> PyrTrainableAssistedModelA | PyrTrainableAssistedModelB:
+    """Return a copy of a Pyr model with small levels replaced by tables.
+
+    The shared-resource layers of the original model are reused. A level's
+    measurement layer is compiled if ``L <= max_input_bits`` and its
+    combine layer if ``L + L/2 (+1 for model B) <= max_input_bits``, with
+    ``L = n2 / 2**level``.
+
+    Args:
+        model: Trained PyrTrainableAssistedModelA or B in ``sr_mode="sample"``.
+        max_input_bits: Largest number of input bits compiled into a table.
+
+    Returns:
+        A new model of the same class. ``model.compiled_levels`` lists,
+        per level, which layers were compiled (``"measure"``, ``"combine"``).
+
+    Raises:
+        TypeError: If ``model`` is not a Pyr model.
+        ValueError: If the model does not run its shared resource in
+            ``"sample"`` mode.
+    """
+    if isinstance(model, PyrTrainableAssistedModelA):
+        cls, extra_inputs = PyrTrainableAssistedModelA, ()
+    elif isinstance(model, PyrTrainableAssistedModelB):
+        cls, extra_inputs = PyrTrainableAssistedModelB, (1,)
+    else:
+        raise TypeError(f"Expected a Pyr trainable assisted model, got {type(model).__name__}.")
+    if any(sr.mode != "sample" for sr in model.sr_layers):
+        raise ValueError('Lookup tables represent hard decisions; the model must use sr_mode="sample".')
+
+    measure_layers = list(model.measure_layers)
+    combine_layers = list(model.combine_layers)
+    compiled_levels: List[Tuple[str, ...]] = []
+    for level in range(model.depth):
+        L = model.n2 >> level
+        done: List[str] = []
+        if L <= max_input_bits:
+            measure_layers[level] = compile_layer_table(
+                model.measure_layers[level], (L,), max_input_bits, name=f"measure_table_{level}"
+            )
+            done.append("measure")
+        combine_sizes = (L, L // 2, *extra_inputs)
+        if sum(combine_sizes) <= max_input_bits:
+            combine_layers[level] = compile_layer_table(
+                model.combine_layers[level], combine_sizes, max_input_bits, name=f"combine_table_{level}"
+            )
+            done.append("combine")
+        compiled_levels.append(tuple(done))
+
+    compiled = cls(
+        SimpleNamespace(n2=model.n2, comms_size=model.M),
+        p_high=model.sr_layers[0].p_high,
+        sr_mode="sample",
+        measure_layers=measure_layers,
+        combine_layers=combine_layers,
+        name=f"{model.name}_tables",
+    )
+    compiled.sr_layers = list(model.sr_layers)
+    # All sublayers are built (tables) or build themselves on first call.
+    compiled.built = True
+    compiled.compiled_levels = compiled_levels
+    return compiled
@@ -31,6 +31,8 @@ Public API
 - :func:`generate_combine_dataset_b`
 - :func:`to_tf_dataset`
 - :func:`train_layer`
+- :func:`train_layers_jointly`
+- :func:`joint_training_arrays`
 - :func:`transfer_pyr_model_a_layer_weights`
 - :func:`transfer_pyr_model_b_layer_weights`
 
@@ -264,8 +266,21 @@ def to_tf_dataset(
     return tds.batch(int(batch_size)).prefetch(tfm.data.AUTOTUNE)
 
 
-def train_layer(layer: Any, ds: "tf.data.Dataset", loss: Any, epochs: int, metrics: Optional[Sequence[Any]] = None, verbose: int = 1) -> "tf.keras.Model":
-    """Train a Keras layer as a standalone model (wrapper model)."""
+def train_layer(
+    layer: Any,
+    ds: "tf.data.Dataset",
+    loss: Any,
+    epochs: int,
+    metrics: Optional[Sequence[Any]] = None,
+    verbose: int = 1,
+    callbacks: Optional[Sequence[Any]] = None,
+) -> "tf.keras.Model":
+    """Train a Keras layer as a standalone model (wrapper model).
+
+    ``callbacks`` are passed to ``fit``; use a
+    :class:`~Q_Sea_Battle.training_control.TrainingControl` with a held-out
+    batch to stop as soon as the layer reproduces its teacher exactly.
+    """
     tfm = _require_tf()
     metrics = list(metrics) if metrics is not None else []
     sample_x, _ = next(iter(ds.take(1)))
@@ -280,10 +295,175 @@ def train_layer(layer: Any, ds: "tf.data.Dataset", loss: Any, epochs: int, metri
         model = tfm.keras.Model(inp, out)
 
     model.compile(optimizer="adam", loss=loss, metrics=metrics)
-    model.fit(ds, epochs=int(epochs), verbose=verbose)
+    model.fit(ds, epochs=int(epochs), verbose=verbose, callbacks=list(callbacks or []))
     return model
 
 
+# Task name -> (input keys, target keys) of the per-level datasets.
+JOINT_TASKS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "meas_a": (("field",), ("meas_target",)),
+    "comb_a": (("field", "sr_outcome"), ("next_field_target",)),
+    "meas_b": (("gun",), ("meas_target",)),
+    "comb_b": (("gun", "sr_outcome", "comm"), ("next_gun_target", "next_comm_target")),
+}
+
+
+def _new_task_layer(task: str, hidden_units: int) -> Any:
+    from .pyr_combine_layer_a import PyrCombineLayerA
+    from .pyr_combine_layer_b import PyrCombineLayerB
+    from .pyr_measurement_layer_a import PyrMeasurementLayerA
+    from .pyr_measurement_layer_b import PyrMeasurementLayerB
+
+    classes = {
+        "meas_a": PyrMeasurementLayerA,
+        "comb_a": PyrCombineLayerA,
+        "meas_b": PyrMeasurementLayerB,
+        "comb_b": PyrCombineLayerB,
+    }
+    return classes[task](hidden_units=hidden_units)
+
+
+def train_layers_jointly(
+    datasets: Mapping[str, Mapping[int, Mapping[str, np.ndarray]]],
+    epochs: int,
+    batch_size: int = 256,
+    layers: Optional[Mapping[str, Sequence[Any]]] = None,
+    hidden_units: int = 64,
+    learning_rate: float = 1e-3,
+    verbose: int = 1,
+    callbacks: Optional[Sequence[Any]] = None,
+) -> Tuple[Dict[str, List[Any]], "tf.keras.callbacks.History"]:
+    """Train all per-level Pyr layers in a single multi-output ``fit``.
+
+    Instead of one compile/fit cycle per level and layer type (see
+    :func:`train_layer`), every layer becomes a branch of one
+    multi-input/multi-output model. The losses of the branches are summed;
+    as the branches share no weights, each layer receives the same
+    gradients as in separate training. Samples are shuffled by ``fit``
+    (seeded through the global TensorFlow seed). Keras reports the loss
+    and binary accuracy of each output (named ``"<task>_L<L>"``, with
+    ``_next_gun`` / ``_next_comm`` suffixes for combine B) in the
+    returned history.
+
+    Parameters
+    ----------
+    datasets:
+        ``{task: {L: dataset}}`` with tasks ``"meas_a"``, ``"comb_a"``,
+        ``"meas_b"``, ``"comb_b"`` (any subset) and the dict-of-arrays
+        datasets of the ``generate_*`` functions. All datasets must have
+        the same number of samples.
+    epochs:
+        Number of epochs (shared by all layers).
+    batch_size:
+        Mini-batch size.
+    layers:
+        Optional ``{task: [layer per level]}`` to train (in the order of
+        ``datasets[task]``); missing tasks get fresh layers with
+        ``hidden_units``.
+    hidden_units:
+        Hidden width of freshly created layers.
+    learning_rate:
+        Adam learning rate.
+    verbose:
+        Verbosity passed to ``fit``.
+    callbacks:
+        Keras callbacks passed to ``fit``, e.g. a ``TrainingControl`` on
+        :func:`joint_training_arrays` of held-out datasets; it stops once
+        every output is exact.
+
+    Returns
+    -------
+    tuple
+        ``(layers, history)`` where ``layers[task]`` lists the trained
+        layers in level order, ready for
+        :func:`transfer_pyr_model_a_layer_weights` /
+        :func:`transfer_pyr_model_b_layer_weights`.
+    """
+    tfm = _require_tf()
+    x, y = joint_training_arrays(datasets)
+    sizes = {int(a.shape[0]) for a in y.values()}
+    if len(sizes) != 1:
+        raise ValueError(f"All datasets must have the same number of samples, got {sorted(sizes)}.")
+
+    inputs: Dict[str, Any] = {}
+    outputs: Dict[str, Any] = {}
+    trained: Dict[str, List[Any]] = {}
+    for task, per_level in datasets.items():
+        given = list(layers[task]) if layers is not None and task in layers else None
+        if given is not None:
+            _assert_len(f"layers[{task!r}]", given, len(per_level))
+        trained[task] = []
+        for i, L in enumerate(per_level):
+            layer = given[i] if given is not None else _new_task_layer(task, hidden_units)
+            trained[task].append(layer)
+            input_names, output_names = _joint_names(task, L)
+            branch_inputs = []
+            for name in input_names:
+                inputs[name] = tfm.keras.Input(shape=x[name].shape[1:], dtype=tfm.float32, name=name)
+                branch_inputs.append(inputs[name])
+            branch_outputs = layer(*branch_inputs)
+            if not isinstance(branch_outputs, (tuple, list)):
+                branch_outputs = (branch_outputs,)
+            for name, out in zip(output_names, branch_outputs):
+                # Identity activation to give each output a stable name.
+                outputs[name] = tfm.keras.layers.Activation("linear", name=name)(out)
+
+    model = tfm.keras.Model(inputs=inputs, outputs=outputs, name="pyr_joint_imitation")
+    # All Pyr layers end in a sigmoid, so the targets are fitted on probabilities.
+    model.compile(
+        optimizer=tfm.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss={name: tfm.keras.losses.BinaryCrossentropy(from_logits=False) for name in outputs},
+        metrics={name: [tfm.keras.metrics.BinaryAccuracy(threshold=0.5)] for name in outputs},
+    )
+    # Arrays rather than a per-row tf.data pipeline: with dozens of inputs,
+    # shuffling and batching row by row costs more than the training step.
+    history = model.fit(
+        x,
+        y,
+        batch_size=int(batch_size),
+        epochs=int(epochs),
+        shuffle=True,
+        verbose=verbose,
+        callbacks=list(callbacks or []),
+    )
+    return trained, history
+
+
+def _joint_names(task: str, L: int) -> Tuple[List[str], List[str]]:
+    """Input and output names of one branch of the joint model."""
+    x_keys, y_keys = JOINT_TASKS[task]
+    prefix = f"{task}_L{int(L)}"
+    input_names = [f"{prefix}_{key}" for key in x_keys]
+    if len(y_keys) == 1:
+        return input_names, [prefix]
+    return input_names, [f"{prefix}_{key[: -len('_target')]}" for key in y_keys]
+
+
+def joint_training_arrays(
+    datasets: Mapping[str, Mapping[int, Mapping[str, np.ndarray]]],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Return the ``(x, y)`` dicts fed to the joint model of :func:`train_layers_jointly`.
+
+    Useful to build a held-out batch for a
+    :class:`~Q_Sea_Battle.training_control.TrainingControl` from datasets
+    generated with another seed.
+    """
+    unknown = set(datasets) - set(JOINT_TASKS)
+    if unknown:
+        raise ValueError(f"Unknown tasks {sorted(unknown)}; expected a subset of {sorted(JOINT_TASKS)}.")
+    x: Dict[str, np.ndarray] = {}
+    y: Dict[str, np.ndarray] = {}
+    for task, per_level in datasets.items():
+        x_keys, y_keys = JOINT_TASKS[task]
+        for L, ds in per_level.items():
+            input_names, output_names = _joint_names(task, L)
+            for name, key in zip(input_names, x_keys):
+                x[name] = np.asarray(ds[key], dtype=np.float32)
+            for name, key in zip(output_names, y_keys):
+                y[name] = np.asarray(ds[key], dtype=np.float32)
+    return x, y
+
+
 def _assert_len(name: str, lst: Sequence[Any], expected: int) -> None:
     if len(lst) != expected:
         raise ValueError(f"{name} must have length {expected}, got {len(lst)}.")
@@ -11,8 +11,11 @@ from __future__ import annotations
 import math
 from typing import Union
 
+import numpy as np
+
 
 Number = Union[float, int]
+ArrayLike = Union[float, int, np.ndarray]
 
 
 def binary_entropy(p: Number) -> float:
@@ -238,3 +241,291 @@ def limit_from_mutual_information(
     H_target = 1.0 - r
     p = binary_entropy_reverse(H_target, accuracy_in_digits=accuracy_in_digits)
     return float(p)
+
+
+# ---------------------------------------------------------------------------
+# Array-aware versions
+# ---------------------------------------------------------------------------
+#
+# The functions below accept NumPy arrays (or scalars) for every numeric
+# parameter, broadcast them against each other and evaluate a whole curve in
+# one pass. They return float64 arrays with the broadcast shape and follow the
+# same validation rules as their scalar counterparts above.
+
+
+def _broadcast_float(*values: ArrayLike) -> tuple[np.ndarray, ...]:
+    """Broadcast inputs against each other as float64 arrays."""
+    return tuple(np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in values]))
+
+
+def _require_integral(values: np.ndarray, name: str) -> np.ndarray:
+    """Return ``values`` as int64, raising if any entry is not integral."""
+    if not np.all(np.isfinite(values)) or np.any(values != np.round(values)):
+        raise ValueError(f"{name} must contain integers only.")
+    return values.astype(np.int64)
+
+
+def _require_unit_interval(values: np.ndarray, name: str) -> None:
+    """Raise if any entry of ``values`` lies outside [0, 1]."""
+    if np.any(~((values >= 0.0) & (values <= 1.0))):
+        raise ValueError(f"{name} must lie in [0.0, 1.0].")
+
+
+def binary_entropy_array(p: ArrayLike) -> np.ndarray:
+    """Element-wise Shannon binary entropy H(p) in bits.
+
+    Array counterpart of :func:`binary_entropy`: entries with p <= 0 or
+    p >= 1 map to 0.0.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    inside = (p > 0.0) & (p < 1.0)
+    q = np.where(inside, p, 0.5)
+    h = -q * np.log2(q) - (1.0 - q) * np.log2(1.0 - q)
+    return np.where(inside, h, 0.0)
+
+
+def binary_entropy_reverse_array(
+    H: ArrayLike,
+    accuracy_in_digits: int = 8,
+    max_iterations: int = 200,
+) -> np.ndarray:
+    """Invert binary entropy element-wise on the branch p in [0.5, 1.0].
+
+    Uses a safeguarded Newton iteration: every entry keeps a bracket
+    ``[lo, hi]`` around its root and falls back to bisection whenever the
+    Newton step leaves the bracket (which happens near p = 0.5, where
+    H'(p) vanishes). Only unconverged entries are updated per iteration,
+    so typical inputs converge in a handful of vectorised steps.
+
+    Args:
+        H: Target entropies in [0.0, 1.0] (scalar or array).
+        accuracy_in_digits: Absolute tolerance on H is
+            ``10 ** -accuracy_in_digits``, as in :func:`binary_entropy_reverse`.
+        max_iterations: Upper bound on the number of iterations.
+
+    Returns:
+        Array of probabilities in [0.5, 1.0] with the shape of ``H``.
+
+    Raises:
+        ValueError: If any entry of ``H`` lies outside [0.0, 1.0].
+        RuntimeError: If some entry does not converge within ``max_iterations``.
+    """
+    H = np.asarray(H, dtype=np.float64)
+    _require_unit_interval(H, "H")
+
+    target_tol = 10.0 ** (-accuracy_in_digits)
+
+    flat_H = H.ravel()
+    p = np.empty_like(flat_H)
+    p[flat_H == 0.0] = 1.0
+    p[flat_H == 1.0] = 0.5
+
+    active = np.flatnonzero((flat_H > 0.0) & (flat_H < 1.0))
+    h_target = flat_H[active]
+    lo = np.full(active.size, 0.5)
+    hi = np.ones(active.size)
+    # Second-order expansion around p = 0.5: H(0.5 + d) ~ 1 - 2 d^2 / ln 2.
+    guess = np.clip(0.5 + np.sqrt((1.0 - h_target) * math.log(2.0) / 2.0), 0.5, 1.0)
+    guess = np.where((guess > lo) & (guess < hi), guess, 0.5 * (lo + hi))
+
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+
+        h_guess = binary_entropy_array(guess)
+        diff = h_guess - h_target
+        done = np.abs(diff) < target_tol
+        if np.any(done):
+            p[active[done]] = guess[done]
+            keep = ~done
+            active, h_target = active[keep], h_target[keep]
+            lo, hi, guess, diff = lo[keep], hi[keep], guess[keep], diff[keep]
+            if active.size == 0:
+                break
+
+        # H is decreasing on [0.5, 1]: too much entropy means p is too small.
+        too_small = diff > 0.0
+        lo = np.where(too_small, guess, lo)
+        hi = np.where(too_small, hi, guess)
+
+        slope = np.log2((1.0 - guess) / guess)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = guess - diff / slope
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        guess = np.where(inside, newton, 0.5 * (lo + hi))
+
+    if active.size:
+        raise RuntimeError(
+            f"binary_entropy_reverse_array did not converge within {max_iterations} iterations."
+        )
+    return p.reshape(H.shape)
+
+
+def expected_win_rate_simple_array(
+    field_size: ArrayLike,
+    comms_size: ArrayLike,
+    enemy_probability: ArrayLike = 0.5,
+    channel_noise: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Array counterpart of :func:`expected_win_rate_simple`."""
+    fs, m, p, c = _broadcast_float(field_size, comms_size, enemy_probability, channel_noise)
+    if np.any(fs < 1):
+        raise ValueError("field_size must be >= 1.")
+    n2 = fs * fs
+    if np.any((m < 1) | (m > n2)):
+        raise ValueError("comms_size must satisfy 1 <= comms_size <= field_size**2.")
+    _require_unit_interval(p, "enemy_probability")
+    _require_unit_interval(c, "channel_noise")
+
+    p_cov = 1.0 - c
+    p_uncovered = p * p + (1.0 - p) * (1.0 - p)
+    frac_cov = m / n2
+    return frac_cov * p_cov + (1.0 - frac_cov) * p_uncovered
+
+
+def expected_win_rate_majority_array(
+    field_size: ArrayLike,
+    comms_size: ArrayLike,
+    enemy_probability: ArrayLike = 0.5,
+    channel_noise: ArrayLike = 0.0,
+    max_chunk_elements: int = 4_000_000,
+) -> np.ndarray:
+    """Array counterpart of :func:`expected_win_rate_majority`.
+
+    Grid points are grouped by block length ``L = field_size**2 / comms_size``.
+    For each group the binomial PMF over ``k = 0..L`` is evaluated in log
+    space for all points at once (log-factorials come from a single
+    cumulative sum), so the cost is one ``(points, L + 1)`` array operation
+    per distinct ``L`` instead of a Python loop per point and per ``k``.
+
+    Args:
+        field_size: Field side lengths.
+        comms_size: Number of majority blocks ``m``.
+        enemy_probability: Bernoulli parameter of each cell.
+        channel_noise: Channel flip probability.
+        max_chunk_elements: Upper bound on the size of the temporary
+            ``(points, L + 1)`` arrays; larger groups are processed in chunks.
+
+    Returns:
+        Array of expected win rates with the broadcast shape of the inputs.
+
+    Raises:
+        ValueError: On the same invalid inputs as the scalar version.
+    """
+    fs, m, p, c = _broadcast_float(field_size, comms_size, enemy_probability, channel_noise)
+    if np.any(fs < 1):
+        raise ValueError("field_size must be >= 1.")
+    fs_int = _require_integral(fs, "field_size")
+    m_int = _require_integral(m, "comms_size")
+    N = fs_int * fs_int
+    if np.any((m_int < 1) | (m_int > N)):
+        raise ValueError("comms_size must satisfy 1 <= comms_size <= field_size**2.")
+    if np.any(N % m_int != 0):
+        raise ValueError("field_size**2 must be divisible by comms_size.")
+    _require_unit_interval(p, "enemy_probability")
+    _require_unit_interval(c, "channel_noise")
+
+    shape = fs.shape
+    L_all = (N // m_int).ravel()
+    p_all = p.ravel()
+    c_all = c.ravel()
+
+    result = np.empty(L_all.size, dtype=np.float64)
+
+    # Degenerate fields: majority bit is deterministic; only channel flips can fail.
+    degenerate = (p_all == 0.0) | (p_all == 1.0)
+    result[degenerate] = 1.0 - c_all[degenerate]
+
+    regular = ~degenerate
+    if np.any(regular):
+        L_max = int(L_all[regular].max())
+        log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, L_max + 1, dtype=np.float64)))))
+
+        for L in np.unique(L_all[regular]):
+            L = int(L)
+            idx = np.flatnonzero(regular & (L_all == L))
+            k = np.arange(L + 1, dtype=np.float64)
+            log_binom = log_fact[L] - log_fact[: L + 1] - log_fact[L::-1]
+
+            # Per k: probability that the queried cell equals the (noiseless)
+            # majority bit, with ties resolved to 1 as in MajorityPlayerA.
+            p_cell_1 = k / float(L)
+            agree = np.where(2.0 * k >= L, p_cell_1, 1.0 - p_cell_1)
+
+            chunk = max(1, max_chunk_elements // (L + 1))
+            for start in range(0, idx.size, chunk):
+                sel = idx[start : start + chunk]
+                pp = p_all[sel][:, None]
+                cc = c_all[sel]
+                log_pmf = log_binom + k * np.log(pp) + (L - k) * np.log1p(-pp)
+                p_agree = np.exp(log_pmf) @ agree
+                result[sel] = (1.0 - cc) * p_agree + cc * (1.0 - p_agree)
+
+    return result.reshape(shape)
+
+
+def expected_win_rate_assisted_array(
+    field_size: ArrayLike,
+    comms_size: ArrayLike = 1,
+    enemy_probability: ArrayLike = 0.5,
+    channel_noise: ArrayLike = 0.0,
+    p_high: ArrayLike = 0.9,
+) -> np.ndarray:
+    """Array counterpart of :func:`expected_win_rate_assisted`.
+
+    ``field_size`` may be given as floats so that very large fields (beyond
+    the int64 range of ``field_size**2``) can be evaluated for large-field
+    limit plots; only ``log2(field_size**2)`` enters the formula.
+    """
+    fs, m, _, c, ph = _broadcast_float(
+        field_size, comms_size, enemy_probability, channel_noise, p_high
+    )
+    if np.any(fs < 1):
+        raise ValueError("field_size must be >= 1.")
+    if np.any(m != 1):
+        raise ValueError("expected_win_rate_assisted currently supports comms_size == 1 only.")
+
+    exponent = 2.0 * np.log2(fs)
+    if np.any(exponent != np.round(exponent)):
+        raise ValueError("field_size**2 must be a power of two.")
+
+    _require_unit_interval(c, "channel_noise")
+    _require_unit_interval(ph, "p_high")
+
+    s_ideal = 0.5 * (1.0 + (2.0 * ph - 1.0) ** exponent)
+    s_noisy = (1.0 - c) * s_ideal + c * (1.0 - s_ideal)
+    return np.clip(s_noisy, 0.0, 1.0)
+
+
+def limit_from_mutual_information_array(
+    field_size: ArrayLike,
+    comms_size: ArrayLike,
+    channel_noise: ArrayLike = 0.0,
+    accuracy_in_digits: int = 8,
+) -> np.ndarray:
+    """Array counterpart of :func:`limit_from_mutual_information`.
+
+    The entropy inversion for all grid points is done in a single call to
+    :func:`binary_entropy_reverse_array`.
+    """
+    fs, m, c = _broadcast_float(field_size, comms_size, channel_noise)
+    if np.any(fs < 1):
+        raise ValueError("field_size must be >= 1.")
+    n2 = fs * fs
+    if np.any((m < 0) | (m > n2)):
+        raise ValueError("comms_size must satisfy 0 <= comms_size <= field_size**2.")
+    _require_unit_interval(c, "channel_noise")
+
+    capacity = 1.0 - binary_entropy_array(c)
+    m_eff = m * capacity
+
+    result = np.full(fs.shape, 0.5)
+    result[m_eff >= n2] = 1.0
+
+    interior = (m > 0) & (m_eff > 0.0) & (m_eff < n2)
+    if np.any(interior):
+        H_target = 1.0 - m_eff[interior] / n2[interior]
+        result[interior] = binary_entropy_reverse_array(
+            H_target, accuracy_in_digits=accuracy_in_digits
+        )
+    return result
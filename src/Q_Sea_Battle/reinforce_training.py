@@ -0,0 +1,269 @@
+"""Batched REINFORCE fine-tuning of NeuralNetPlayers from a replay buffer.
+
+:class:`ReinforceTrainer` alternates two batched phases:
+
+- :meth:`ReinforceTrainer.collect` plays explore-mode games for a whole
+  batch at once: one forward pass of ``model_a`` over the fields,
+  Bernoulli sampling of the comm bits, channel noise, one forward pass
+  of ``model_b`` and sampling of the shoots. The games and the
+  log-probabilities of the behaviour policy go into a
+  :class:`~Q_Sea_Battle.replay_buffer.ReplayBuffer`.
+- :meth:`ReinforceTrainer.step` samples a batch from the buffer and
+  applies one policy-gradient update to both models,
+
+      loss = -mean(w * (r - b) * (log pi_A(comm | field) + log pi_B(shoot | gun, comm')))
+
+  with the baseline ``b`` computed from the batch with vectorised ops
+  (``"mean"``: batch mean reward; ``"gun"``: mean reward of the other
+  games with the same gun index via ``np.bincount``; leaving the game out
+  keeps the baseline independent of its own actions) and ``w`` the
+  importance weight
+  ``exp(log pi - log mu)`` against the stored behaviour log-probabilities,
+  truncated at ``max_importance_weight``, which corrects for games that
+  were played by an older policy. Each player's factor of ``w`` is 1 where
+  its behaviour log-probability is unknown. Games whose sent comm was not
+  recorded (``comm_known`` False, e.g. noisy tournament logs) drop A's
+  term and only train B.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from .logit_utilities import logit_to_prob
+from .neural_net_player_a import _scale_field
+from .neural_net_players import NeuralNetPlayers
+from .replay_buffer import ReplayBuffer
+
+#: Supported baselines of ReinforceTrainer.
+BASELINES: Tuple[Optional[str], ...] = (None, "mean", "gun")
+
+
+def _bernoulli_log_prob(logits: tf.Tensor, actions: tf.Tensor) -> tf.Tensor:
+    """log P(actions) under Bernoulli(sigmoid(logits)), element-wise."""
+    return -tf.nn.sigmoid_cross_entropy_with_logits(labels=actions, logits=logits)
+
+
+class ReinforceTrainer:
+    """Replay-buffer REINFORCE trainer for the models of NeuralNetPlayers.
+
+    Args:
+        players: Factory whose ``model_a``/``model_b`` are trained in place
+            (default models are built if missing).
+        buffer: Replay buffer; a new one holding ``16 * batch_size`` games
+            is created if None.
+        batch_size: Games per collect call and per update.
+        learning_rate: Adam learning rate.
+        baseline: ``"gun"``, ``"mean"`` or None.
+        normalize_adv: Divide the advantages by their standard deviation.
+        entropy_coeff: Weight of the entropy bonus of both policies.
+        max_importance_weight: Truncation of the importance weights.
+        seed: Seed of the trainer's generator (games and sampled actions).
+
+    Raises:
+        ValueError: If ``baseline`` is unknown or the buffer layout does not
+            match the players.
+    """
+
+    def __init__(
+        self,
+        players: NeuralNetPlayers,
+        buffer: Optional[ReplayBuffer] = None,
+        batch_size: int = 1024,
+        learning_rate: float = 1e-3,
+        baseline: Optional[str] = "gun",
+        normalize_adv: bool = True,
+        entropy_coeff: float = 0.0,
+        max_importance_weight: float = 2.0,
+        seed: int = 0,
+    ) -> None:
+        if baseline not in BASELINES:
+            raise ValueError(f"baseline must be one of {BASELINES}, got {baseline!r}.")
+        players.players()  # builds default models if missing
+        self.players = players
+        self.game_layout = players.game_layout
+        self.model_a: tf.keras.Model = players.model_a
+        self.model_b: tf.keras.Model = players.model_b
+        self.batch_size = int(batch_size)
+        if buffer is None:
+            buffer = ReplayBuffer(self.game_layout, capacity=16 * self.batch_size, seed=seed)
+        layout = buffer.game_layout
+        if (layout.field_size, layout.comms_size) != (self.game_layout.field_size, self.game_layout.comms_size):
+            raise ValueError("ReplayBuffer layout does not match the players' layout.")
+        self.buffer = buffer
+        self.baseline = baseline
+        self.normalize_adv = bool(normalize_adv)
+        self.entropy_coeff = float(entropy_coeff)
+        self.max_importance_weight = float(max_importance_weight)
+        self.rng = np.random.default_rng(seed)
+
+        self.optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+        self.optimizer.build(self._params())
+        #: One dict per update (update, mean_reward, loss, mean_weight).
+        self.history: List[Dict[str, Any]] = []
+
+    def _params(self) -> List[tf.Variable]:
+        return self.model_a.trainable_variables + self.model_b.trainable_variables
+
+    def _model_b_inputs(self, gun: np.ndarray, comm: np.ndarray) -> np.ndarray:
+        n2 = self.game_layout.field_size ** 2
+        gun_idx_norm = gun.astype(np.float32)[:, None] / float(max(1, n2 - 1))
+        return np.concatenate([gun_idx_norm, comm.astype(np.float32)], axis=1)
+
+    # ------------------------------------------------------------------
+    # Batched explore-mode play
+    # ------------------------------------------------------------------
+    def collect(self, n_games: Optional[int] = None) -> Tuple[float, float]:
+        """Play ``n_games`` explore-mode games in one batch into the buffer.
+
+        Fields, guns and channel noise follow the layout; comm bits and
+        shoots are sampled from the current models.
+
+        Returns:
+            ``(mean_reward, std_error)`` of the collected games.
+        """
+        n = self.batch_size if n_games is None else int(n_games)
+        layout = self.game_layout
+        n2 = layout.field_size ** 2
+        rng = self.rng
+
+        field = (rng.random((n, n2)) < layout.enemy_probability).astype(np.uint8)
+        gun = rng.integers(0, n2, size=n)
+        comm_logits = self.model_a(_scale_field(field), training=False).numpy()
+        comm = (rng.random(comm_logits.shape) < logit_to_prob(comm_logits)).astype(np.float32)
+        logprob_comm = _bernoulli_log_prob(comm_logits, comm).numpy().sum(axis=1)
+
+        flips = rng.random(comm.shape) < layout.channel_noise
+        comm_received = np.where(flips, 1.0 - comm, comm).astype(np.float32)
+        shoot_logits = self.model_b(self._model_b_inputs(gun, comm_received), training=False).numpy()[:, 0]
+        shoot = (rng.random(n) < logit_to_prob(shoot_logits)).astype(np.float32)
+        logprob_shoot = _bernoulli_log_prob(shoot_logits, shoot).numpy()
+
+        reward = (shoot == field[np.arange(n), gun]).astype(np.float32)
+        self.buffer.add_batch(
+            field, gun, comm, shoot, reward, logprob_comm, logprob_shoot, comm_received=comm_received
+        )
+        if n == 1:
+            return float(reward[0]), 0.0
+        return float(reward.mean()), float(reward.std(ddof=1) / np.sqrt(n))
+
+    # ------------------------------------------------------------------
+    # Update
+    # ------------------------------------------------------------------
+    def advantages(self, reward: np.ndarray, gun: np.ndarray) -> np.ndarray:
+        """Reward minus the baseline of the batch (optionally normalised).
+
+        The ``"gun"`` baseline of a game is the mean reward of the other
+        games with the same gun (0 for a game alone with its gun).
+        """
+        reward = reward.astype(np.float32)
+        if self.baseline == "mean":
+            advantage = reward - reward.mean()
+        elif self.baseline == "gun":
+            n2 = self.game_layout.field_size ** 2
+            counts = np.bincount(gun, minlength=n2)
+            sums = np.bincount(gun, weights=reward, minlength=n2)
+            # Leave-one-out: a game's own reward must not enter its baseline.
+            baseline = (sums[gun] - reward) / np.maximum(counts[gun] - 1, 1)
+            advantage = reward - baseline.astype(np.float32)
+        else:
+            advantage = reward
+        if self.normalize_adv:
+            advantage = advantage / (advantage.std() + 1e-8)
+        return advantage.astype(np.float32)
+
+    def step(self, batch: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+        """One policy-gradient update on a batch sampled from the buffer.
+
+        Args:
+            batch: Batch as returned by ReplayBuffer.sample(); sampled
+                with ``batch_size`` games if None.
+
+        Returns:
+            The history record of the update.
+        """
+        if batch is None:
+            batch = self.buffer.sample(self.batch_size)
+        loss, weight = self._update(
+            tf.constant(_scale_field(batch["field"])),
+            tf.constant(self._model_b_inputs(batch["gun"], batch["comm_received"])),
+            tf.constant(batch["comm"].astype(np.float32)),
+            tf.constant(batch["shoot"].astype(np.float32)[:, None]),
+            tf.constant(self.advantages(batch["reward"], batch["gun"])),
+            tf.constant(batch["comm_known"].astype(bool)),
+            tf.constant(batch["logprob_comm"].astype(np.float32)),
+            tf.constant(batch["logprob_shoot"].astype(np.float32)),
+        )
+        self.players.invalidate_lookup_tables()
+        record = {
+            "update": len(self.history) + 1,
+            "mean_reward": float(batch["reward"].mean()),
+            "loss": float(loss.numpy()),
+            "mean_weight": float(weight.numpy()),
+        }
+        self.history.append(record)
+        return record
+
+    def _update(
+        self,
+        field: tf.Tensor,
+        inputs_b: tf.Tensor,
+        comm: tf.Tensor,
+        shoot: tf.Tensor,
+        advantage: tf.Tensor,
+        comm_known: tf.Tensor,
+        behaviour_comm: tf.Tensor,
+        behaviour_shoot: tf.Tensor,
+    ) -> Tuple[tf.Tensor, tf.Tensor]:
+        """Gradient step; returns the loss and the mean importance weight."""
+        known_comm = tf.logical_and(comm_known, tf.math.is_finite(behaviour_comm))
+        known_shoot = tf.math.is_finite(behaviour_shoot)
+        params = self._params()
+        with tf.GradientTape() as tape:
+            comm_logits = self.model_a(field, training=True)
+            shoot_logits = self.model_b(inputs_b, training=True)
+            # A's term only where ``comm`` holds the bits A sent.
+            log_prob_a = tf.where(comm_known, tf.reduce_sum(_bernoulli_log_prob(comm_logits, comm), axis=1), 0.0)
+            log_prob_b = tf.reduce_sum(_bernoulli_log_prob(shoot_logits, shoot), axis=1)
+            # Unknown behaviour log-probabilities contribute a factor 1.
+            log_ratio = tf.where(known_comm, log_prob_a - tf.where(known_comm, behaviour_comm, 0.0), 0.0) + tf.where(
+                known_shoot, log_prob_b - tf.where(known_shoot, behaviour_shoot, 0.0), 0.0
+            )
+            weight = tf.stop_gradient(tf.minimum(tf.exp(log_ratio), self.max_importance_weight))
+            loss = -tf.reduce_mean(weight * advantage * (log_prob_a + log_prob_b))
+            if self.entropy_coeff:
+                entropy = 0.0
+                for logits, mask in ((comm_logits, comm_known), (shoot_logits, None)):
+                    probs = tf.nn.sigmoid(logits)
+                    row = tf.reduce_sum(tf.nn.sigmoid_cross_entropy_with_logits(labels=probs, logits=logits), axis=1)
+                    entropy += tf.reduce_mean(row if mask is None else tf.where(mask, row, 0.0))
+                loss -= self.entropy_coeff * entropy
+
+        grads = tape.gradient(loss, params)
+        self.optimizer.apply_gradients(zip(grads, params))
+        return loss, tf.reduce_mean(weight)
+
+    def run(self, n_updates: int, collect_every: int = 1, games_per_collect: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Alternate collection and updates.
+
+        Args:
+            n_updates: Number of policy-gradient updates.
+            collect_every: Collect a batch of games before every this many
+                updates.
+            games_per_collect: Games per collection; defaults to ``batch_size``.
+
+        Returns:
+            The history of all updates.
+        """
+        for i in range(int(n_updates)):
+            if i % collect_every == 0 or len(self.buffer) == 0:
+                self.collect(games_per_collect)
+            self.step()
+        return self.history
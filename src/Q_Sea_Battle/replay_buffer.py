@@ -0,0 +1,255 @@
+"""Fixed-capacity replay store of played games.
+
+Explore-mode players (``has_log_probs = True``) report the log-probability
+of their actions, and Tournament records them in ``logprob_comm`` /
+``logprob_shoot``. Training on those trajectories from TournamentLog rows
+means converting object columns for every batch. :class:`ReplayBuffer`
+keeps the games in preallocated arrays instead:
+
+- ``field``: uint8, shape (capacity, n2);
+- ``gun``: int32 gun index, shape (capacity,);
+- ``comm``: uint8 bits sent by A, shape (capacity, m);
+- ``comm_received``: uint8 bits seen by B (after channel noise);
+- ``comm_known``: bool, False if the bits sent by A were not recorded
+  (``comm`` then holds the received bits and must not train A);
+- ``shoot``: uint8, ``reward``: float32;
+- ``logprob_comm`` / ``logprob_shoot``: float32 log-probabilities of the
+  actions under the policy that played the game (NaN if unknown).
+
+The buffer is a ring: once full, new games overwrite the oldest ones.
+Games are written in batches with at most two slice assignments, and
+:meth:`ReplayBuffer.sample` draws a batch with one fancy-indexing pass.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .game_layout import GameLayout
+
+#: Array names and dtypes of a ReplayBuffer.
+BUFFER_DTYPES: Dict[str, Any] = {
+    "field": np.uint8,
+    "gun": np.int32,
+    "comm": np.uint8,
+    "comm_received": np.uint8,
+    "comm_known": np.bool_,
+    "shoot": np.uint8,
+    "reward": np.float32,
+    "logprob_comm": np.float32,
+    "logprob_shoot": np.float32,
+}
+
+
+class ReplayBuffer:
+    """Ring buffer of games for policy-gradient training.
+
+    Args:
+        game_layout: Layout of the stored games.
+        capacity: Maximum number of stored games.
+        seed: Seed of the generator used by :meth:`sample`.
+
+    Raises:
+        ValueError: If ``capacity`` is smaller than 1.
+    """
+
+    def __init__(self, game_layout: GameLayout, capacity: int, seed: Optional[int] = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1.")
+        self.game_layout = game_layout
+        self.capacity = int(capacity)
+        n2 = game_layout.field_size ** 2
+        m = game_layout.comms_size
+        shapes = {"field": (n2,), "comm": (m,), "comm_received": (m,)}
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.zeros((self.capacity, *shapes.get(name, ())), dtype=dtype)
+            for name, dtype in BUFFER_DTYPES.items()
+        }
+        self.rng = np.random.default_rng(seed)
+        self._next = 0
+        self._size = 0
+        #: Total number of games ever added.
+        self.games_added = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        """True once the buffer holds ``capacity`` games."""
+        return self._size == self.capacity
+
+    def clear(self) -> None:
+        """Forget all stored games (the arrays are kept)."""
+        self._next = 0
+        self._size = 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def add_batch(
+        self,
+        field: np.ndarray,
+        gun: np.ndarray,
+        comm: np.ndarray,
+        shoot: np.ndarray,
+        reward: np.ndarray,
+        logprob_comm: Optional[np.ndarray] = None,
+        logprob_shoot: Optional[np.ndarray] = None,
+        comm_received: Optional[np.ndarray] = None,
+        comm_known: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append a batch of games.
+
+        Args:
+            field: Fields, shape (B, n2).
+            gun: Gun indices, shape (B,).
+            comm: Comm bits sent by A, shape (B, m).
+            shoot: Shoot decisions, shape (B,).
+            reward: Rewards, shape (B,).
+            logprob_comm: Log-probabilities of the comms; NaN if None.
+            logprob_shoot: Log-probabilities of the shoots; NaN if None.
+            comm_received: Comm bits seen by B; defaults to ``comm``.
+            comm_known: Per game, whether ``comm`` holds the bits sent by
+                A; a bool broadcasts to the batch. Defaults to True.
+
+        Raises:
+            ValueError: If the batch arrays do not have matching shapes.
+        """
+        n2 = self.game_layout.field_size ** 2
+        m = self.game_layout.comms_size
+        field = np.asarray(field).reshape(-1, n2)
+        batch = field.shape[0]
+        nan = np.full(batch, np.nan, dtype=np.float32)
+        values = {
+            "field": field,
+            "gun": np.asarray(gun).reshape(-1),
+            "comm": np.asarray(comm).reshape(-1, m),
+            "comm_received": np.asarray(comm if comm_received is None else comm_received).reshape(-1, m),
+            "comm_known": np.broadcast_to(np.asarray(True if comm_known is None else comm_known, dtype=bool), (batch,)),
+            "shoot": np.asarray(shoot).reshape(-1),
+            "reward": np.asarray(reward).reshape(-1),
+            "logprob_comm": nan if logprob_comm is None else np.asarray(logprob_comm).reshape(-1),
+            "logprob_shoot": nan if logprob_shoot is None else np.asarray(logprob_shoot).reshape(-1),
+        }
+        for name, value in values.items():
+            if value.shape[0] != batch:
+                raise ValueError(f"{name} has {value.shape[0]} rows, expected {batch}.")
+
+        if batch > self.capacity:  # only the newest games fit
+            values = {name: value[-self.capacity :] for name, value in values.items()}
+            self.games_added += batch - self.capacity
+            batch = self.capacity
+        start = self._next
+        first = min(batch, self.capacity - start)
+        for name, value in values.items():
+            target = self.arrays[name]
+            target[start : start + first] = value[:first]
+            target[: batch - first] = value[first:]
+        self._next = (start + batch) % self.capacity
+        self._size = min(self.capacity, self._size + batch)
+        self.games_added += batch
+
+    def add(
+        self,
+        field: np.ndarray,
+        gun: np.ndarray,
+        comm: np.ndarray,
+        shoot: int,
+        reward: float,
+        logprob_comm: Optional[float] = None,
+        logprob_shoot: Optional[float] = None,
+    ) -> None:
+        """Append one game as returned by Game.play() (one-hot ``gun``)."""
+        self.add_batch(
+            np.asarray(field).reshape(1, -1),
+            np.array([int(np.argmax(gun))]),
+            np.asarray(comm).reshape(1, -1),
+            np.array([shoot]),
+            np.array([reward]),
+            None if logprob_comm is None else np.array([logprob_comm]),
+            None if logprob_shoot is None else np.array([logprob_shoot]),
+        )
+
+    def add_log(self, log: Any) -> None:
+        """Append all games of a TournamentLog.
+
+        The log records the comm seen by B only, so ``comm`` and
+        ``comm_received`` are both set to it. With channel noise the sent
+        bits are not logged: ``comm_known`` is False and ``logprob_comm``
+        is stored as NaN (unknown) for noisy layouts; the layout of the log
+        is used if it has one, else the buffer's.
+        """
+        df = log.log if hasattr(log, "log") else log
+        if len(df) == 0:
+            return
+        n2 = self.game_layout.field_size ** 2
+        layout = getattr(log, "game_layout", self.game_layout)
+        noisy = float(layout.channel_noise) > 0.0
+
+        def floats(column: str) -> Optional[np.ndarray]:
+            if column not in df.columns:
+                return None
+            return df[column].astype(float).to_numpy()
+
+        self.add_batch(
+            np.stack([np.asarray(f).reshape(n2) for f in df["field"].to_numpy()]),
+            np.stack([np.asarray(g).reshape(n2) for g in df["gun"].to_numpy()]).argmax(axis=1),
+            np.stack([np.asarray(c).reshape(-1) for c in df["comm"].to_numpy()]),
+            df["shoot"].to_numpy(dtype=np.int64),
+            df["reward"].to_numpy(dtype=np.float64),
+            None if noisy else floats("logprob_comm"),
+            floats("logprob_shoot"),
+            comm_known=not noisy,
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def indices(self) -> np.ndarray:
+        """Row indices of the stored games, oldest first."""
+        if not self.full:
+            return np.arange(self._size)
+        return (self._next + np.arange(self.capacity)) % self.capacity
+
+    def get(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Return copies of the given rows of all arrays."""
+        return {name: array[rows] for name, array in self.arrays.items()}
+
+    def sample(self, batch_size: int, replace: bool = True) -> Dict[str, np.ndarray]:
+        """Sample a batch of stored games uniformly.
+
+        Args:
+            batch_size: Number of games.
+            replace: Sample with replacement.
+
+        Raises:
+            ValueError: If the buffer is empty, or ``batch_size`` exceeds
+                the number of stored games when sampling without replacement.
+        """
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty ReplayBuffer.")
+        if not replace and batch_size > self._size:
+            raise ValueError(f"batch_size {batch_size} exceeds the {self._size} stored games.")
+        rows = self.rng.choice(self._size, size=batch_size, replace=replace)
+        return self.get(rows)
+
+    def latest(self, n: int) -> Dict[str, np.ndarray]:
+        """Return the ``n`` most recently added games, oldest first."""
+        n = min(int(n), self._size)
+        return self.get((self._next - n + np.arange(n)) % self.capacity)
+
+    def mean_reward(self) -> Tuple[float, float]:
+        """Mean reward of the stored games and its standard error."""
+        rewards = self.arrays["reward"][: self._size].astype(np.float64)
+        if rewards.size == 0:
+            return 0.0, 0.0
+        if rewards.size == 1:
+            return float(rewards[0]), 0.0
+        return float(rewards.mean()), float(rewards.std(ddof=1) / np.sqrt(rewards.size))
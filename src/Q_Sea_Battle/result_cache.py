@@ -0,0 +1,395 @@
+"""On-disk memoization of tournament results.
+
+Notebooks and tutorial tests rerun the same ``Tournament(...).tournament()
+.outcome()`` evaluations on every execution. :class:`ResultCache` stores
+the outcome of an evaluation under a key built from
+
+- the players fingerprint (:func:`players_fingerprint`): the factory class,
+  its ``p_high`` / ``explore`` settings and a SHA-256 of the weights of its
+  ``model_a`` / ``model_b``;
+- ``GameLayout.to_dict()`` and the GameEnv sampling options;
+- the seed of the global NumPy generator the tournament is played with,
+  and the seed derived from it for the GameEnv's own generator (buffered
+  mode draws from ``np.random.default_rng(seed)``, not the global one);
+- a fingerprint of the code: the sources of the Q_Sea_Battle package and
+  of the module defining the players class (for classes defined in a
+  notebook or ``__main__``, the source of the class itself).
+
+Any change to the weights, settings or code therefore leads to a new key,
+and stale entries are never returned. Entries are a small JSON summary
+and, optionally, the tournament log as Parquet (see
+``tournament_log_storage``). When the directory exceeds ``max_bytes``, the
+least recently used entries are deleted.
+
+Randomness drawn from private generators (e.g. the unseeded generators of
+the PR-assisted boxes) is not controlled by the seed; the cached result
+is then one sample of that evaluation.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import time
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .game_env import GameEnv
+from .game_layout import GameLayout
+from .players_base import Players
+from .tournament import Tournament
+from .tournament_log import TournamentLog
+
+#: Version of the key and entry format; bump to invalidate all entries.
+CACHE_FORMAT_VERSION = "1"
+#: Default size limit of a cache directory.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+#: Factory attributes included in the players fingerprint when present.
+FINGERPRINT_SETTINGS: Tuple[str, ...] = ("p_high", "explore")
+#: Factory attributes whose model weights are hashed when present.
+FINGERPRINT_MODELS: Tuple[str, ...] = ("model_a", "model_b")
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=None)
+def _source_digest(path: str) -> str:
+    """SHA-256 of one source file (or of all .py files below a directory)."""
+    root = Path(path)
+    files = sorted(root.rglob("*.py")) if root.is_dir() else [root]
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(str(file.relative_to(root) if root.is_dir() else file.name).encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def _class_source(cls: type) -> str:
+    """Source of a class, or of its methods if the class source is unavailable.
+
+    Classes defined in a notebook or in ``__main__`` have no source file,
+    but the code of their methods is still registered with ``linecache``.
+
+    Raises:
+        OSError: If neither is available.
+    """
+    try:
+        return inspect.getsource(cls)
+    except (OSError, TypeError):
+        pass
+    sources = [cls.__qualname__]
+    for name, member in sorted(vars(cls).items()):
+        if isinstance(member, (staticmethod, classmethod)):
+            member = member.__func__
+        elif isinstance(member, property):
+            member = member.fget
+        if inspect.isfunction(member):
+            try:
+                sources.append(f"{name}:{inspect.getsource(member)}")
+            except (OSError, TypeError) as exc:
+                raise OSError(f"source of {cls.__qualname__}.{name} is unavailable") from exc
+    return "\n".join(sources)
+
+
+def code_fingerprint(players: Players) -> str:
+    """Fingerprint of the package sources and of the players' defining module.
+
+    Sources are hashed once per process. For a players class without a
+    source file (defined in a notebook or in ``__main__``) the source of
+    the class itself is hashed, with a warning since code it calls outside
+    the class is not covered. If that is unavailable too, the factory must
+    define ``cache_fingerprint()``.
+
+    Raises:
+        ValueError: If the class source is unavailable and the factory has
+            no ``cache_fingerprint()``.
+    """
+    cls = type(players)
+    parts = [_source_digest(str(_PACKAGE_DIR))]
+    try:
+        source = inspect.getsourcefile(cls)
+    except (OSError, TypeError):
+        source = None
+    if source is not None and Path(source).is_file():
+        if Path(source).resolve().parent != _PACKAGE_DIR:
+            parts.append(_source_digest(str(Path(source).resolve())))
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    try:
+        parts.append(hashlib.sha256(_class_source(cls).encode()).hexdigest())
+        warnings.warn(
+            f"{cls.__qualname__} has no source file; only the source of the class is fingerprinted.",
+            UserWarning,
+            stacklevel=2,
+        )
+    except OSError:
+        if not callable(getattr(players, "cache_fingerprint", None)):
+            raise ValueError(
+                f"The source of {cls.__qualname__} is unavailable; define cache_fingerprint() "
+                "to make its results cacheable."
+            ) from None
+        warnings.warn(
+            f"The source of {cls.__qualname__} is unavailable; relying on its cache_fingerprint().",
+            UserWarning,
+            stacklevel=2,
+        )
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _game_env_options(seed: int, game_env_options: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """GameEnv keyword arguments of a cached evaluation.
+
+    Adds a ``seed`` derived from ``seed`` unless one is given, so that
+    environments with their own generator (buffered mode) are reproducible
+    as well.
+    """
+    options = dict(game_env_options or {})
+    options.setdefault("seed", int(np.random.SeedSequence(int(seed)).generate_state(1)[0]))
+    return options
+
+
+def _weights_digest(model: Any) -> Optional[str]:
+    if model is None:
+        return None
+    digest = hashlib.sha256()
+    for weight in model.get_weights():
+        array = np.ascontiguousarray(weight)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def players_fingerprint(players: Players) -> Dict[str, Any]:
+    """Describe a Players factory for use in a cache key.
+
+    Returns:
+        JSON-serialisable dict with the class, the settings in
+        :data:`FINGERPRINT_SETTINGS`, the weight digests of the models in
+        :data:`FINGERPRINT_MODELS` and the code fingerprint. Factories can
+        add state by defining ``cache_fingerprint()`` returning a
+        JSON-serialisable value.
+    """
+    cls = type(players)
+    fingerprint: Dict[str, Any] = {"class": f"{cls.__module__}.{cls.__qualname__}"}
+    for name in FINGERPRINT_SETTINGS:
+        if hasattr(players, name):
+            fingerprint[name] = getattr(players, name)
+    for name in FINGERPRINT_MODELS:
+        if hasattr(players, name):
+            fingerprint[name] = _weights_digest(getattr(players, name))
+    if callable(getattr(players, "cache_fingerprint", None)):
+        fingerprint["custom"] = players.cache_fingerprint()
+    fingerprint["code"] = code_fingerprint(players)
+    return fingerprint
+
+
+@dataclass
+class CachedResult:
+    """Outcome summary of a cached evaluation.
+
+    Attributes:
+        key: Cache key of the entry.
+        mean_reward: Mean reward of the tournament.
+        std_error: Standard error of the mean reward.
+        n_games: Number of games played.
+        cached: True if the result was read from the cache.
+        log_path: Parquet file of the tournament log, if stored.
+    """
+
+    key: str
+    mean_reward: float
+    std_error: float
+    n_games: int
+    cached: bool = False
+    log_path: Optional[Path] = None
+
+    def outcome(self) -> Tuple[float, float]:
+        """Return ``(mean_reward, std_error)`` like TournamentLog.outcome()."""
+        return self.mean_reward, self.std_error
+
+    def load_log(self) -> TournamentLog:
+        """Load the stored tournament log.
+
+        Raises:
+            FileNotFoundError: If the evaluation was cached without its log.
+        """
+        if self.log_path is None or not self.log_path.exists():
+            raise FileNotFoundError(f"No log stored for cache entry {self.key}.")
+        return TournamentLog.from_parquet(self.log_path)
+
+
+class ResultCache:
+    """Directory of memoized tournament outcomes.
+
+    Args:
+        directory: Cache directory; created if missing.
+        max_bytes: Size limit of the directory; least recently used entries
+            are evicted after each write. None disables eviction.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    def key(
+        self,
+        players: Players,
+        game_layout: GameLayout,
+        seed: int,
+        game_env_options: Optional[Mapping[str, Any]] = None,
+    ) -> str:
+        """Return the cache key of an evaluation."""
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "players": players_fingerprint(players),
+            "layout": game_layout.to_dict(),
+            "game_env": _game_env_options(seed, game_env_options),
+            "seed": int(seed),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def _summary_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _log_path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    # ------------------------------------------------------------------
+    # Lookup / evaluation
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return the cached result for ``key``, or None."""
+        path = self._summary_path(key)
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        now = time.time()
+        os.utime(path, (now, now))  # mark as recently used
+        log_path = self._log_path(key)
+        return CachedResult(
+            key=key,
+            mean_reward=float(summary["mean_reward"]),
+            std_error=float(summary["std_error"]),
+            n_games=int(summary["n_games"]),
+            cached=True,
+            log_path=log_path if log_path.exists() else None,
+        )
+
+    def evaluate(
+        self,
+        players: Players,
+        game_layout: GameLayout,
+        seed: int,
+        game_env_options: Optional[Mapping[str, Any]] = None,
+        store_log: bool = False,
+    ) -> CachedResult:
+        """Return the tournament outcome, running the tournament on a miss.
+
+        On a miss the global NumPy generator is seeded with ``seed`` and
+        ``Tournament(GameEnv(game_layout, **options), players,
+        game_layout).tournament()`` is played, with ``options`` from
+        ``_game_env_options``; the state of the global generator is
+        restored afterwards.
+
+        Args:
+            players: Players factory; its models are built first if needed.
+            game_layout: Layout of the tournament.
+            seed: Seed of the global NumPy generator; the GameEnv seed is
+                derived from it unless ``game_env_options`` sets one.
+            game_env_options: Keyword arguments of GameEnv (sampling modes).
+            store_log: Also store the log as Parquet (requires
+                ``fastparquet``). A hit without a stored log is replayed.
+
+        Returns:
+            The cached or freshly computed result.
+        """
+        players.players()  # materialise lazily built models before hashing
+        key = self.key(players, game_layout, seed, game_env_options)
+        hit = self.get(key)
+        if hit is not None and (not store_log or hit.log_path is not None):
+            return hit
+
+        state = np.random.get_state()
+        try:
+            np.random.seed(int(seed))
+            game_env = GameEnv(game_layout, **_game_env_options(seed, game_env_options))
+            log = Tournament(game_env, players, game_layout).tournament()
+        finally:
+            np.random.set_state(state)
+        mean_reward, std_error = log.outcome()
+        result = CachedResult(
+            key=key, mean_reward=float(mean_reward), std_error=float(std_error), n_games=len(log.log)
+        )
+        if store_log:
+            tmp = self._log_path(key).with_suffix(".parquet.tmp")
+            log.to_parquet(tmp)
+            os.replace(tmp, self._log_path(key))
+            result.log_path = self._log_path(key)
+
+        summary = {"mean_reward": result.mean_reward, "std_error": result.std_error, "n_games": result.n_games}
+        tmp = self._summary_path(key).with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(summary), encoding="utf-8")
+        os.replace(tmp, self._summary_path(key))
+        self._evict(keep=key)
+        return result
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """Return ``(last_used, size, key)`` per entry."""
+        sizes: Dict[str, int] = {}
+        used: Dict[str, float] = {}
+        for path in self.directory.iterdir():
+            if path.suffix not in (".json", ".parquet"):
+                continue
+            key = path.stem
+            stat = path.stat()
+            sizes[key] = sizes.get(key, 0) + stat.st_size
+            if path.suffix == ".json":
+                used[key] = stat.st_mtime
+        return [(used.get(key, 0.0), size, key) for key, size in sizes.items()]
+
+    def size_bytes(self) -> int:
+        """Total size of all entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used entries (except ``keep``) until under the limit."""
+        if self.max_bytes is None:
+            return
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            total -= size
+
+    def remove(self, key: str) -> None:
+        """Delete one entry."""
+        for path in (self._summary_path(key), self._log_path(key)):
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        for _, _, key in self._entries():
+            self.remove(key)
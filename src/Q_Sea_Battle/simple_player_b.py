@@ -11,6 +11,7 @@ from typing import Any, Optional
 
 import numpy as np
 
+from .game_context import game_context
 from .game_layout import GameLayout
 from .players_base import PlayerB
 
@@ -46,7 +47,8 @@ class SimplePlayerB(PlayerB):
         Args:
             gun: Flattened one-hot gun vector of length ``n2``.
             comm: Communication vector from Player A, length ``m``.
-            supp: Optional supporting information (unused).
+            supp: Optional GameContext providing the generator of the
+                random decision.
 
         Returns:
             1 to shoot or 0 to not shoot.
@@ -65,6 +67,7 @@ class SimplePlayerB(PlayerB):
             return int(comm[gun_index])
 
         # Otherwise use a Bernoulli(enemy_probability) decision.
-        shoot = int(np.random.rand() < p)
+        context = game_context(supp)
+        shoot = int((context.rng.random() if context is not None else np.random.rand()) < p)
         return shoot
 
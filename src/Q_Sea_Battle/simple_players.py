@@ -23,6 +23,10 @@ class SimplePlayers(Players):
     :class:`SimplePlayerB` instances.
     """
 
+    #: The players hold no per-game state; random draws use the context.
+    supports_game_context: bool = True
+    supports_counterfactual: bool = True
+
     def __init__(self, game_layout: GameLayout | None = None) -> None:
         """Initialise a :class:`SimplePlayers` factory.
 
@@ -31,15 +35,19 @@ class SimplePlayers(Players):
                 default :class:`GameLayout` is created.
         """
         super().__init__(game_layout)
+        # The players hold no per-game state, so one pair is reused.
+        self._players: Tuple[PlayerA, PlayerB] | None = None
 
     def players(self) -> Tuple[PlayerA, PlayerB]:
-        """Create a ``(SimplePlayerA, SimplePlayerB)`` pair.
+        """Return the ``(SimplePlayerA, SimplePlayerB)`` pair.
+
+        The pair is created on first use and reused afterwards.
 
         Returns:
             Tuple of concrete player instances that share the same
             :class:`GameLayout`.
         """
-        player_a = SimplePlayerA(self.game_layout)
-        player_b = SimplePlayerB(self.game_layout)
-        return player_a, player_b
+        if self._players is None or self._players[0].game_layout is not self.game_layout:
+            self._players = (SimplePlayerA(self.game_layout), SimplePlayerB(self.game_layout))
+        return self._players
 
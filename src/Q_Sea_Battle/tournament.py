@@ -7,11 +7,46 @@ Version: 0.1
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
 from .game import Game
+from .game_context import GameContext
 from .game_env import GameEnv
 from .game_layout import GameLayout
+from .instrumentation import LOG_WRITE_STAGE, TOURNAMENT_SPAN, Instrumentation
 from .players_base import Players
 from .tournament_log import TournamentLog
+from .validation import TRUSTED, VALIDATION_LEVELS, validation_level
+
+
+@dataclass(frozen=True)
+class SequentialStopping:
+    """Outcome of the stopping rule of a sequential tournament.
+
+    Attributes:
+        reason: ``"target_std_error"``, ``"reference_excluded"`` or
+            ``"max_games"``.
+        games: Number of games played.
+        mean: Mean reward at stopping time.
+        std_error: Standard error of the mean reward at stopping time.
+        ci_low: Lower bound of the confidence interval.
+        ci_high: Upper bound of the confidence interval.
+        confidence: Confidence level of the interval.
+    """
+
+    reason: str
+    games: int
+    mean: float
+    std_error: float
+    ci_low: float
+    ci_high: float
+    confidence: float
 
 
 class Tournament:
@@ -22,7 +57,12 @@ class Tournament:
     """
 
     def __init__(
-        self, game_env: GameEnv, players: Players, game_layout: GameLayout
+        self,
+        game_env: GameEnv,
+        players: Players,
+        game_layout: GameLayout,
+        instrumentation: Optional[Instrumentation] = None,
+        validation: str = TRUSTED,
     ) -> None:
         """Initialise a tournament runner.
 
@@ -30,10 +70,24 @@ class Tournament:
             game_env: Game environment instance.
             players: Players factory for A and B.
             game_layout: Configuration specifying tournament length.
+            instrumentation: Optional Instrumentation recording per-stage
+                game timings, log-write time and games/sec. None disables
+                timing.
+            validation: Validation level ("strict" or "trusted") used while
+                games are played. The fields and guns come from the game
+                environment, so player input checks are skipped by default.
+
+        Raises:
+            ValueError: If ``validation`` is not a known level.
         """
         self.game_env = game_env
         self.players = players
         self.game_layout = game_layout
+        self.instrumentation = instrumentation
+        self.last_stopping: Optional[SequentialStopping] = None
+        if validation not in VALIDATION_LEVELS:
+            raise ValueError(f"validation must be one of {VALIDATION_LEVELS}, got {validation!r}.")
+        self.validation = validation
 
     def tournament(self) -> TournamentLog:
         """Execute a full tournament and return its log.
@@ -46,41 +100,276 @@ class Tournament:
         Returns:
             A TournamentLog instance containing all game results.
         """
+        t_start = perf_counter()
+        game = self._make_game()
         log = TournamentLog(self.game_layout)
+
+        n_games = self.game_layout.number_of_games_in_tournament
+        with validation_level(self.validation):
+            self._play_games(game, log, 0, n_games)
+
+        self._record_tournament(t_start)
+        return log
+
+    def sequential_tournament(
+        self,
+        target_std_error: Optional[float] = None,
+        reference: Optional[float] = None,
+        confidence: float = 0.95,
+        block_size: Optional[int] = None,
+        min_games: int = 100,
+        max_games: Optional[int] = None,
+    ) -> TournamentLog:
+        """Run games in blocks until the win-rate estimate is precise enough.
+
+        After every block the outcome of the log is inspected and the
+        tournament stops as soon as
+
+        - the standard error from TournamentLog.outcome() is at or below
+          ``target_std_error``, or
+        - the two-sided ``confidence`` interval around the mean reward
+          excludes ``reference`` (e.g. expected_win_rate_assisted() or
+          limit_from_mutual_information()),
+
+        but never before ``min_games`` and never beyond ``max_games``.
+        The reason for stopping is stored in ``self.last_stopping``.
+
+        Args:
+            target_std_error: Stop once the standard error is <= this value.
+            reference: Stop once the confidence interval excludes this value.
+            confidence: Confidence level of the interval, in (0, 1).
+            block_size: Games per block; defaults to n2 (one game per gun
+                position on average).
+            min_games: Minimum number of games before stopping is allowed.
+            max_games: Hard cap on the number of games; defaults to
+                game_layout.number_of_games_in_tournament.
+
+        Returns:
+            A TournamentLog with all games played.
+
+        Raises:
+            ValueError: If no stopping criterion is given or an argument is
+                out of range.
+        """
+        if target_std_error is None and reference is None:
+            raise ValueError("Provide target_std_error and/or reference.")
+        if target_std_error is not None and target_std_error <= 0.0:
+            raise ValueError("target_std_error must be > 0.")
+        if not (0.0 < confidence < 1.0):
+            raise ValueError("confidence must be in (0, 1).")
+        if block_size is None:
+            block_size = self.game_layout.field_size ** 2
+        if block_size <= 0:
+            raise ValueError("block_size must be > 0.")
+        if max_games is None:
+            max_games = self.game_layout.number_of_games_in_tournament
+        if max_games <= 0:
+            raise ValueError("max_games must be > 0.")
+        min_games = max(2, min(int(min_games), max_games))
+        z = NormalDist().inv_cdf(0.5 + 0.5 * confidence)
+
+        t_start = perf_counter()
+        game = self._make_game()
+        log = TournamentLog(self.game_layout)
+
+        played = 0
+        reason = "max_games"
+        mean = std_error = 0.0
+        while played < max_games:
+            n_block = min(block_size, max_games - played)
+            with validation_level(self.validation):
+                self._play_games(game, log, played, n_block)
+            played += n_block
+            if played < min_games:
+                continue
+
+            mean, std_error = log.outcome()
+            if target_std_error is not None and std_error <= target_std_error:
+                reason = "target_std_error"
+                break
+            if reference is not None and std_error > 0.0 and abs(mean - reference) > z * std_error:
+                reason = "reference_excluded"
+                break
+        else:
+            mean, std_error = log.outcome()
+
+        self.last_stopping = SequentialStopping(
+            reason=reason,
+            games=played,
+            mean=mean,
+            std_error=std_error,
+            ci_low=mean - z * std_error,
+            ci_high=mean + z * std_error,
+            confidence=confidence,
+        )
+        self._record_tournament(t_start)
+        return log
+
+    def threaded_tournament(self, max_workers: int = 4, seed: Optional[int] = None) -> TournamentLog:
+        """Play the tournament's games concurrently in a thread pool.
+
+        Every game gets its own GameContext, holding the field, gun,
+        per-game player resources and log-probabilities, with a generator
+        spawned from ``seed``. Games therefore share no mutable state, and
+        the log depends only on ``seed`` and not on ``max_workers`` or the
+        order in which the threads run. The games are logged in game_id
+        order once all of them have been played.
+
+        Instrumentation is not recorded per game (only the tournament span),
+        and the players must opt in with ``supports_game_context``.
+
+        Args:
+            max_workers: Number of worker threads.
+            seed: Root seed of the per-game generators; drawn from the
+                global NumPy generator if None, so np.random.seed() still
+                makes the tournament reproducible.
+
+        Returns:
+            A TournamentLog instance containing all game results.
+
+        Raises:
+            ValueError: If the players do not support game contexts, the
+                environment uses correlated sampling blocks, or
+                ``max_workers`` is smaller than 1.
+        """
+        if not getattr(self.players, "supports_game_context", False):
+            raise ValueError(f"{type(self.players).__name__} does not support game contexts.")
+        if getattr(self.game_env, "_blocked", False):
+            raise ValueError("threaded_tournament() supports the independent sampling modes only.")
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
+
+        t_start = perf_counter()
         game = Game(self.game_env, self.players)
+        # Build the players (and any default models) before the threads start.
+        self.players.players()
+        self._prepare_players()
+        log = TournamentLog(self.game_layout)
 
         n_games = self.game_layout.number_of_games_in_tournament
+        if seed is None:
+            seed = int(np.random.randint(0, 2**31 - 1))
+        seeds = np.random.SeedSequence(seed).spawn(n_games)
+        level = self.validation
+
+        def play(child: np.random.SeedSequence) -> Tuple[GameContext, Tuple]:
+            # The validation level is a ContextVar, which threads do not inherit.
+            with validation_level(level):
+                context = GameContext(rng=np.random.default_rng(child))
+                return context, game.play(context=context)
+
+        # The first game runs on this thread: Keras layers that are built on
+        # their first call must not be built by several threads at once.
+        results: List[Tuple[GameContext, Tuple]] = [play(child) for child in seeds[:1]]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="game") as executor:
+            results.extend(executor.map(play, seeds[1:]))
+
+        for game_id, (context, (reward, field, gun, comm, shoot)) in enumerate(results):
+            self._log_game(log, game_id, 0, 0, reward, field, gun, comm, shoot, context=context)
+
+        self._record_tournament(t_start)
+        return log
+
+    def _make_game(self) -> Game:
+        """Create the Game used for all games of a tournament.
+
+        Also restarts the sampling blocks of the environment so that
+        correlated samples never straddle two tournaments, and lets the
+        players validate their caches (Players.prepare_tournament()).
+        """
+        self._prepare_players()
+        restart_sampling = getattr(self.game_env, "restart_sampling", None)
+        if restart_sampling is not None:
+            restart_sampling()
+        if self.instrumentation is not None:
+            return Game(self.game_env, self.players, instrumentation=self.instrumentation)
+        return Game(self.game_env, self.players)
+
+    def _prepare_players(self) -> None:
+        """Call Players.prepare_tournament() if the factory provides it."""
+        prepare_tournament = getattr(self.players, "prepare_tournament", None)
+        if prepare_tournament is not None:
+            prepare_tournament()
+
+    def _record_tournament(self, t_start: float) -> None:
+        """Record the tournament span if instrumentation is enabled."""
+        if self.instrumentation is not None:
+            self.instrumentation.record(TOURNAMENT_SPAN, t_start, perf_counter(), category="tournament")
+            self.instrumentation.tournaments += 1
+
+    def _play_games(self, game: Game, log: TournamentLog, first_game_id: int, n_games: int) -> None:
+        """Play ``n_games`` games and append them to the log."""
+        instrumentation = self.instrumentation
         # For now we use fixed tournament_id and meta_id; these can be
         # extended later if needed.
         tournament_id = 0
         meta_id = 0
 
-        for game_id in range(n_games):
+        for game_id in range(first_game_id, first_game_id + n_games):
             # Run a single game.
             reward, field, gun, comm, shoot = game.play()
-            cell_value = int(field[gun == 1][0])
-
-            # Basic outcome logging.
-            log.update(field, gun, comm, shoot, cell_value, reward)
-
-            # Optional: log-probabilities if provided by players.
-            if getattr(self.players, "has_log_probs", False):
-                player_a, player_b = self.players.players()
-                # Assume child players implement get_log_prob().
-                logprob_comm = player_a.get_log_prob()
-                logprob_shoot = player_b.get_log_prob()
-                log.update_log_probs(logprob_comm, logprob_shoot)
-
-            # Optional: previous measurements/outcomes if provided.
-            if getattr(self.players, "has_prev", False):
-                player_a, _ = self.players.players()
-                prev = player_a.get_prev()
-                if prev is not None:
-                    prev_meas, prev_out = prev
-                    log.update_log_prev(prev_meas, prev_out)
-
-            # Add identifiers for this game.
-            log.update_indicators(game_id=game_id, tournament_id=tournament_id, meta_id=meta_id)
 
-        return log
+            if instrumentation is None:
+                self._log_game(log, game_id, tournament_id, meta_id, reward, field, gun, comm, shoot)
+            else:
+                t0 = perf_counter()
+                self._log_game(log, game_id, tournament_id, meta_id, reward, field, gun, comm, shoot)
+                instrumentation.record(LOG_WRITE_STAGE, t0, perf_counter())
+
+    def _log_game(
+        self,
+        log: TournamentLog,
+        game_id: int,
+        tournament_id: int,
+        meta_id: int,
+        reward: float,
+        field: np.ndarray,
+        gun: np.ndarray,
+        comm: np.ndarray,
+        shoot: int,
+        context: Optional[GameContext] = None,
+    ) -> None:
+        """Record the outcome of one game (and optional player data) in the log.
+
+        If the game was played with a GameContext, the log-probabilities and
+        previous tensors are taken from the context instead of the players.
+        """
+        cell_value = int(field[gun == 1][0])
+
+        # Buffered environments hand out read-only views that are
+        # overwritten by the next game; the log must keep its own copies.
+        if not field.flags.writeable:
+            field = field.copy()
+        if not gun.flags.writeable:
+            gun = gun.copy()
+        if not comm.flags.writeable:
+            comm = comm.copy()
+
+        # Basic outcome logging.
+        log.update(field, gun, comm, shoot, cell_value, reward)
+
+        # Optional: log-probabilities if provided by players.
+        if getattr(self.players, "has_log_probs", False) and context is not None:
+            log.update_log_probs(context.logprob_comm, context.logprob_shoot)
+        elif getattr(self.players, "has_log_probs", False):
+            player_a, player_b = self.players.players()
+            # Assume child players implement get_log_prob().
+            logprob_comm = player_a.get_log_prob()
+            logprob_shoot = player_b.get_log_prob()
+            log.update_log_probs(logprob_comm, logprob_shoot)
+
+        # Optional: previous measurements/outcomes if provided.
+        if getattr(self.players, "has_prev", False):
+            player_a, _ = self.players.players()
+            prev = context.previous if context is not None else player_a.get_prev()
+            if prev is not None:
+                prev_meas, prev_out = prev
+                log.update_log_prev(prev_meas, prev_out)
+
+        # Add identifiers for this game.
+        log.update_indicators(game_id=game_id, tournament_id=tournament_id, meta_id=meta_id)
 
+        # Sampling block of correlated (variance-reduced) sampling, if any.
+        sample_block = getattr(self.game_env, "sample_block", None)
+        if sample_block is not None and context is None:
+            log.update_sample_block(sample_block)
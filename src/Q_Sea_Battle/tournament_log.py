@@ -8,7 +8,8 @@ Version: 0.1
 from __future__ import annotations
 
 import uuid
-from typing import Any, Tuple
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -32,6 +33,8 @@ class TournamentLog:
         """
         self.game_layout = game_layout
         self.log = pd.DataFrame(columns=game_layout.log_columns)
+        self._query: Any = None
+        self._query_frame: Optional[pd.DataFrame] = None
 
     # --------------------------------------------------------------------- #
     # Row update helpers
@@ -60,6 +63,7 @@ class TournamentLog:
             "tournament_id": None,
             "meta_id": None,
             "game_uid": None,
+            "sample_block": None,
             "prev_measurements": None,
             "prev_outcomes": None,
         }
@@ -122,6 +126,21 @@ class TournamentLog:
         # Use UUID4 to generate a unique identifier per game.
         self.log.at[idx, "game_uid"] = uuid.uuid4().hex
 
+    def update_sample_block(self, sample_block: int) -> None:
+        """Record the sampling block of the last logged game.
+
+        Games in the same block were sampled jointly by GameEnv (balanced
+        guns, antithetic fields, stratified noise) and are therefore not
+        independent; outcome() uses the blocks for its standard error.
+
+        Args:
+            sample_block: Block index reported by GameEnv.sample_block.
+        """
+        if "sample_block" not in self.log.columns:
+            return
+        idx = self._last_row_index()
+        self.log.at[idx, "sample_block"] = int(sample_block)
+
     # --------------------------------------------------------------------- #
     # Summary statistics
     # --------------------------------------------------------------------- #
@@ -133,6 +152,12 @@ class TournamentLog:
         standard error is the sample standard deviation divided by the
         square root of the number of games.
 
+        If games carry a "sample_block" (correlated sampling in GameEnv),
+        the standard error is computed from the block sums instead
+        (cluster/batch-means estimator), which accounts for the
+        correlation within blocks. Games without a block count as blocks
+        of size one, in which case the estimator equals the formula above.
+
         Returns:
             A tuple (mean_reward, std_error) summarising performance.
         """
@@ -144,10 +169,111 @@ class TournamentLog:
 
         n = rewards.size
         if n <= 1:
-            std_error = 0.0
-        else:
-            std = float(rewards.std(ddof=1))
-            std_error = std / float(np.sqrt(n))
+            return mean_reward, 0.0
+
+        if "sample_block" in self.log.columns and self.log["sample_block"].notna().any():
+            std_error = self._block_std_error(rewards, mean_reward)
+            if std_error is not None:
+                return mean_reward, std_error
+
+        std = float(rewards.std(ddof=1))
+        std_error = std / float(np.sqrt(n))
 
         return mean_reward, std_error
 
+    def _block_std_error(self, rewards: np.ndarray, mean_reward: float) -> Optional[float]:
+        """Cluster standard error of the mean reward over sampling blocks.
+
+        Returns:
+            The standard error, or None if there are fewer than two blocks.
+        """
+        codes, _ = pd.factorize(self.log["sample_block"], use_na_sentinel=True)
+        codes = np.asarray(codes, dtype=np.int64)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = codes.max() + 1 + np.arange(int(missing.sum()))
+        n_blocks = int(codes.max()) + 1
+        if n_blocks < 2:
+            return None
+        block_sums = np.bincount(codes, weights=rewards, minlength=n_blocks)
+        block_sizes = np.bincount(codes, minlength=n_blocks)
+        residuals = block_sums - block_sizes * mean_reward
+        variance = n_blocks / (n_blocks - 1) * float(np.sum(residuals ** 2)) / rewards.size ** 2
+        return float(np.sqrt(variance))
+
+    def query(self) -> Any:
+        """Return a LogIndex for grouped win-rate diagnostics.
+
+        The index is cached and only the rows appended since the previous
+        call are converted (plus the last indexed row, which the update_*
+        helpers may have changed). It is rebuilt if ``log`` was replaced
+        or shrank. See tournament_log_query.
+
+        Example:
+            >>> log.query().win_rate_by_gun()
+        """
+        from .tournament_log_query import LogIndex
+
+        n = len(self.log)
+        index = self._query
+        if index is None or self._query_frame is not self.log or len(index) > n:
+            index = LogIndex.from_frame(self.log, self.game_layout)
+        else:
+            start = max(len(index) - 1, 0)
+            for name in index.columns:
+                index.columns[name] = index.columns[name][:start]
+            index.extend(self.log.iloc[start:])
+        self._query, self._query_frame = index, self.log
+        return index
+
+    # --------------------------------------------------------------------- #
+    # Persistence
+    # --------------------------------------------------------------------- #
+
+    def to_parquet(
+        self,
+        path: Union[str, Path],
+        chunk_size: int = 10_000,
+        compression: Optional[str] = None,
+    ) -> None:
+        """Write the log to a Parquet file with packed, typed columns.
+
+        See tournament_log_storage for the on-disk format. For write-as-you-go
+        persistence of long runs use TournamentLogWriter directly.
+
+        Args:
+            path: Target file (overwritten).
+            chunk_size: Number of rows per row group.
+            compression: Optional fastparquet compression codec.
+        """
+        from .tournament_log_storage import write_tournament_log
+
+        write_tournament_log(self, path, chunk_size=chunk_size, compression=compression)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        path: Union[str, Path],
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Any]] = None,
+    ) -> "TournamentLog":
+        """Load a log written by to_parquet() or TournamentLogWriter.
+
+        Args:
+            path: Parquet file.
+            columns: Optional column projection; the resulting log then
+                only contains these columns.
+            filters: Optional fastparquet-style filters, e.g.
+                ``[("tournament_id", "==", 3)]``.
+
+        Returns:
+            A TournamentLog with the layout stored in the file.
+        """
+        from .tournament_log_storage import read_tournament_log, read_tournament_log_layout
+
+        log = cls(read_tournament_log_layout(path))
+        df = read_tournament_log(path, columns=columns, filters=filters)
+        if columns is None:
+            df = df.reindex(columns=log.game_layout.log_columns)
+        log.log = df
+        return log
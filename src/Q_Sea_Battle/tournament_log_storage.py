@@ -0,0 +1,492 @@
+"""Chunked Parquet persistence for TournamentLog data.
+
+Tournament logs are written as a single Parquet file that grows by one
+row group per flushed chunk, so arbitrarily long runs can be persisted
+while they are played without holding the full log in memory.
+
+Columns are stored in typed, compact form:
+
+- ``field`` and ``comm`` are bit-packed (``np.packbits``) into bytes.
+- ``gun`` is stored as the int32 index of the one-hot entry.
+- ``shoot`` / ``cell_value`` are int8, rewards and log-probs float64.
+- ``game_id`` / ``tournament_id`` / ``meta_id`` / ``sample_block`` are
+  nullable int64 with per-row-group min/max statistics, so filters on
+  them skip row groups.
+- ``prev_measurements`` / ``prev_outcomes`` are JSON-encoded lists.
+
+Readers support column projection (only the requested column chunks are
+read from disk) and filter pushdown (row groups whose statistics cannot
+match are skipped; remaining rows are filtered exactly).
+
+``fastparquet`` is imported lazily; it is only required when this module
+is actually used.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .game_layout import GameLayout
+
+#: Version tag of the on-disk format.
+STORAGE_FORMAT_VERSION = "1"
+#: Key-value metadata keys.
+_META_FORMAT = "qsb_log_format"
+_META_LAYOUT = "qsb_game_layout"
+
+#: Columns stored bit-packed.
+PACKED_COLUMNS: Tuple[str, ...] = ("field", "comm")
+#: Identifier columns with row-group statistics.
+ID_COLUMNS: Tuple[str, ...] = ("game_id", "tournament_id", "meta_id", "sample_block")
+#: Columns holding nested lists of arrays.
+NESTED_COLUMNS: Tuple[str, ...] = ("prev_measurements", "prev_outcomes")
+
+_NUMERIC_DTYPES: Dict[str, Any] = {
+    "gun": np.int32,
+    "shoot": np.int8,
+    "cell_value": np.int8,
+    "reward": np.float64,
+    "sample_weight": np.float64,
+    "logprob_comm": np.float64,
+    "logprob_shoot": np.float64,
+}
+
+Filter = Tuple[str, str, Any]
+Filters = Union[Sequence[Filter], Sequence[Sequence[Filter]]]
+
+
+def _require_fastparquet() -> Any:
+    """Import fastparquet or raise an informative error."""
+    try:
+        import fastparquet
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "Parquet persistence of tournament logs requires 'fastparquet' "
+            "(pip install fastparquet)."
+        ) from exc
+    return fastparquet
+
+
+def _layout_to_json(game_layout: GameLayout) -> str:
+    """Serialise a GameLayout for the file metadata."""
+    return json.dumps(game_layout.to_dict())
+
+
+def _to_nested_list(value: Any) -> Any:
+    """Convert a list of arrays/tensors into JSON-compatible nested lists."""
+    if value is None:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [np.asarray(v).tolist() for v in value]
+    return np.asarray(value).tolist()
+
+
+def _optional_float(value: Any) -> float:
+    """Return value as float, mapping None to NaN."""
+    return np.nan if value is None else float(value)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+class TournamentLogWriter:
+    """Write tournament log rows to a Parquet file in chunks.
+
+    Rows are buffered in memory and written as one row group every
+    ``chunk_size`` rows (and on :meth:`flush` / :meth:`close`). The writer
+    can be used as a context manager.
+
+    Args:
+        path: Target Parquet file.
+        game_layout: Layout of the logged games (stored in the file metadata).
+        chunk_size: Number of rows per row group.
+        mode: ``"w"`` to overwrite an existing file, ``"a"`` to append to it.
+        compression: Optional fastparquet compression codec (e.g. ``"GZIP"``).
+
+    Raises:
+        ValueError: If ``chunk_size`` or ``mode`` is invalid, or if an
+            appended file was written for a different layout.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        game_layout: GameLayout,
+        chunk_size: int = 10_000,
+        mode: str = "w",
+        compression: Optional[str] = None,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0.")
+        if mode not in ("w", "a"):
+            raise ValueError(f"mode must be 'w' or 'a', got {mode!r}.")
+        self._fastparquet = _require_fastparquet()
+
+        self.path = Path(path)
+        self.game_layout = game_layout
+        self.chunk_size = int(chunk_size)
+        self.compression = compression
+        self.columns: List[str] = list(game_layout.log_columns)
+        self.n2 = game_layout.field_size ** 2
+        self.rows_written = 0
+        self._closed = False
+        self._buffer: Dict[str, List[Any]] = {c: [] for c in self.columns}
+        self._buffered = 0
+
+        self._file_exists = False
+        if mode == "a" and self.path.exists():
+            stored = read_tournament_log_layout(self.path)
+            if stored.to_dict() != game_layout.to_dict():
+                raise ValueError("Existing Parquet log was written for a different GameLayout.")
+            self._file_exists = True
+        elif mode == "w" and self.path.exists():
+            os.remove(self.path)
+
+    # ------------------------------------------------------------------ #
+    # Context manager
+    # ------------------------------------------------------------------ #
+
+    def __enter__(self) -> "TournamentLogWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Appending
+    # ------------------------------------------------------------------ #
+
+    def append(
+        self,
+        field: np.ndarray,
+        gun: np.ndarray,
+        comm: np.ndarray,
+        shoot: int,
+        cell_value: int,
+        reward: float,
+        **extra: Any,
+    ) -> None:
+        """Append one game.
+
+        Args:
+            field: Flattened field of length n2.
+            gun: Flattened one-hot gun vector of length n2.
+            comm: Communication vector of length m.
+            shoot: Shoot decision.
+            cell_value: Field value at the gun position.
+            reward: Game reward.
+            **extra: Values for the remaining log columns
+                (``game_id``, ``tournament_id``, ``logprob_comm``, ...).
+                Missing columns are stored as null.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+            ValueError: If ``extra`` contains an unknown column.
+        """
+        if self._closed:
+            raise RuntimeError("TournamentLogWriter is closed.")
+        row = {
+            "field": field,
+            "gun": gun,
+            "comm": comm,
+            "shoot": shoot,
+            "cell_value": cell_value,
+            "reward": reward,
+            **extra,
+        }
+        unknown = set(row) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Unknown log columns: {sorted(unknown)}.")
+        for column in self.columns:
+            self._buffer[column].append(row.get(column))
+        self._buffered += 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def append_log(self, log: Union["pd.DataFrame", Any]) -> None:
+        """Append all rows of a TournamentLog (or its DataFrame).
+
+        Args:
+            log: TournamentLog instance or a DataFrame with log columns.
+        """
+        df = log.log if hasattr(log, "log") else log
+        if self._closed:
+            raise RuntimeError("TournamentLogWriter is closed.")
+        n = len(df)
+        start = 0
+        while start < n:
+            take = min(self.chunk_size - self._buffered, n - start)
+            for column in self.columns:
+                if column in df.columns:
+                    values = df[column].iloc[start : start + take].tolist()
+                else:
+                    values = [None] * take
+                self._buffer[column].extend(values)
+            self._buffered += take
+            start += take
+            if self._buffered >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group."""
+        if self._buffered == 0:
+            return
+        frame = self._encode_buffer()
+        object_encoding = {
+            c: ("bytes" if c in PACKED_COLUMNS else "utf8" if c == "game_uid" else "json")
+            for c in frame.columns
+            if frame[c].dtype == object
+        }
+        stats = [c for c in ID_COLUMNS if c in frame.columns]
+        if self._file_exists:
+            self._fastparquet.write(
+                str(self.path),
+                frame,
+                append=True,
+                compression=self.compression,
+                object_encoding=object_encoding,
+                stats=stats,
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fastparquet.write(
+                str(self.path),
+                frame,
+                compression=self.compression,
+                object_encoding=object_encoding,
+                stats=stats,
+                custom_metadata={
+                    _META_FORMAT: STORAGE_FORMAT_VERSION,
+                    _META_LAYOUT: _layout_to_json(self.game_layout),
+                },
+            )
+            self._file_exists = True
+
+        self.rows_written += self._buffered
+        self._buffer = {c: [] for c in self.columns}
+        self._buffered = 0
+
+    def close(self) -> None:
+        """Flush remaining rows and close the writer."""
+        if not self._closed:
+            self.flush()
+            self._closed = True
+
+    # ------------------------------------------------------------------ #
+    # Encoding
+    # ------------------------------------------------------------------ #
+
+    def _encode_buffer(self) -> pd.DataFrame:
+        """Convert buffered rows into a typed DataFrame."""
+        n = self._buffered
+        data: Dict[str, Any] = {}
+        for column in self.columns:
+            values = self._buffer[column]
+            if column in PACKED_COLUMNS:
+                bits = np.asarray([np.asarray(v).ravel() for v in values], dtype=np.uint8)
+                packed = np.packbits(bits.reshape(n, -1), axis=1)
+                data[column] = pd.Series([row.tobytes() for row in packed], dtype=object)
+            elif column == "gun":
+                guns = np.asarray([np.asarray(v).ravel() for v in values])
+                data[column] = np.argmax(guns.reshape(n, -1), axis=1).astype(np.int32)
+            elif column in _NUMERIC_DTYPES:
+                dtype = _NUMERIC_DTYPES[column]
+                if np.issubdtype(dtype, np.floating):
+                    data[column] = np.asarray([_optional_float(v) for v in values], dtype=dtype)
+                else:
+                    data[column] = np.asarray(values, dtype=dtype)
+            elif column in ID_COLUMNS:
+                data[column] = pd.array(
+                    [None if v is None or (isinstance(v, float) and np.isnan(v)) else int(v) for v in values],
+                    dtype="Int64",
+                )
+            elif column == "game_uid":
+                data[column] = pd.Series([None if v is None else str(v) for v in values], dtype=object)
+            else:
+                data[column] = pd.Series([_to_nested_list(v) for v in values], dtype=object)
+        return pd.DataFrame(data)
+
+
+def write_tournament_log(
+    log: Any,
+    path: Union[str, Path],
+    chunk_size: int = 10_000,
+    compression: Optional[str] = None,
+) -> None:
+    """Write a complete TournamentLog to a Parquet file.
+
+    Args:
+        log: TournamentLog instance.
+        path: Target Parquet file (overwritten).
+        chunk_size: Number of rows per row group.
+        compression: Optional fastparquet compression codec.
+    """
+    with TournamentLogWriter(path, log.game_layout, chunk_size=chunk_size, compression=compression) as writer:
+        writer.append_log(log)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def _open(path: Union[str, Path]) -> Any:
+    """Open a Parquet tournament log and check its format tag."""
+    fastparquet = _require_fastparquet()
+    pf = fastparquet.ParquetFile(str(path))
+    meta = pf.key_value_metadata or {}
+    if meta.get(_META_FORMAT) != STORAGE_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a QSeaBattle tournament log (format {STORAGE_FORMAT_VERSION}).")
+    return pf
+
+
+def read_tournament_log_layout(path: Union[str, Path]) -> GameLayout:
+    """Return the GameLayout stored in a Parquet tournament log."""
+    pf = _open(path)
+    return GameLayout.from_dict(json.loads(pf.key_value_metadata[_META_LAYOUT]))
+
+
+def _normalise_filters(filters: Optional[Filters]) -> List[List[Filter]]:
+    """Return filters in disjunctive normal form (OR of AND-lists)."""
+    if not filters:
+        return []
+    first = filters[0]
+    if isinstance(first, tuple):
+        return [list(filters)]  # type: ignore[arg-type]
+    return [list(group) for group in filters]  # type: ignore[union-attr]
+
+
+def _filter_mask(df: pd.DataFrame, dnf: List[List[Filter]]) -> np.ndarray:
+    """Evaluate DNF filters row-wise on a DataFrame."""
+    ops = {
+        "==": lambda s, v: s == v,
+        "=": lambda s, v: s == v,
+        "!=": lambda s, v: s != v,
+        "<": lambda s, v: s < v,
+        "<=": lambda s, v: s <= v,
+        ">": lambda s, v: s > v,
+        ">=": lambda s, v: s >= v,
+        "in": lambda s, v: s.isin(list(v)),
+        "not in": lambda s, v: ~s.isin(list(v)),
+    }
+    mask = np.zeros(len(df), dtype=bool)
+    for group in dnf:
+        group_mask = np.ones(len(df), dtype=bool)
+        for column, op, value in group:
+            if op not in ops:
+                raise ValueError(f"Unsupported filter operator {op!r}.")
+            group_mask &= ops[op](df[column], value).fillna(False).to_numpy(dtype=bool)
+        mask |= group_mask
+    return mask
+
+
+def _decode(df: pd.DataFrame, game_layout: GameLayout) -> pd.DataFrame:
+    """Expand packed columns back to the in-memory TournamentLog format."""
+    n2 = game_layout.field_size ** 2
+    sizes = {"field": n2, "comm": game_layout.comms_size}
+    for column in PACKED_COLUMNS:
+        if column in df.columns and len(df):
+            raw = np.frombuffer(b"".join(df[column].tolist()), dtype=np.uint8)
+            bits = np.unpackbits(raw.reshape(len(df), -1), axis=1)[:, : sizes[column]].astype(int)
+            df[column] = pd.Series(list(bits), index=df.index, dtype=object)
+    if "gun" in df.columns and len(df):
+        guns = np.zeros((len(df), n2), dtype=int)
+        guns[np.arange(len(df)), df["gun"].to_numpy()] = 1
+        df["gun"] = pd.Series(list(guns), index=df.index, dtype=object)
+    for column in NESTED_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(
+                lambda v: None if v is None else [np.asarray(x) for x in v]
+            )
+    return df
+
+
+def iter_tournament_log(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+    unpack: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a Parquet tournament log one row group at a time.
+
+    Args:
+        path: Parquet file written by :class:`TournamentLogWriter`.
+        columns: Columns to load; None loads all columns.
+        filters: fastparquet-style filters, e.g.
+            ``[("tournament_id", "==", 3)]`` (AND) or a list of such lists
+            (OR). Row groups are pruned using their statistics and the
+            remaining rows are filtered exactly.
+        unpack: If True, ``field``/``comm``/``gun`` are returned as integer
+            arrays as in TournamentLog; otherwise the stored packed bytes and
+            gun indices are returned.
+
+    Yields:
+        One DataFrame per (non-empty) row group.
+    """
+    pf = _open(path)
+    game_layout = GameLayout.from_dict(json.loads(pf.key_value_metadata[_META_LAYOUT]))
+    dnf = _normalise_filters(filters)
+    wanted = list(columns) if columns is not None else list(pf.columns)
+    filter_cols = [c for group in dnf for c, _, _ in group if c not in wanted]
+    load = wanted + sorted(set(filter_cols))
+
+    for chunk in pf.iter_row_groups(columns=load, filters=dnf or None):
+        if dnf:
+            chunk = chunk.loc[_filter_mask(chunk, dnf), wanted]
+        if chunk.empty:
+            continue
+        chunk = chunk.reset_index(drop=True)
+        yield _decode(chunk, game_layout) if unpack else chunk
+
+
+def read_tournament_log(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+    unpack: bool = True,
+) -> pd.DataFrame:
+    """Read (part of) a Parquet tournament log into a DataFrame.
+
+    See :func:`iter_tournament_log` for the meaning of the arguments.
+    For example, ``read_tournament_log(path, columns=["reward", "shoot"])``
+    reads only the two small columns and never touches the fields.
+
+    Returns:
+        DataFrame with the requested columns.
+    """
+    pf = _open(path)
+    wanted = list(columns) if columns is not None else list(pf.columns)
+    chunks = list(iter_tournament_log(path, columns=wanted, filters=filters, unpack=unpack))
+    if not chunks:
+        return pd.DataFrame(columns=wanted)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def tournament_log_info(path: Union[str, Path]) -> Mapping[str, Any]:
+    """Return basic information about a Parquet tournament log.
+
+    Returns:
+        Dictionary with ``rows``, ``row_groups``, ``columns`` and
+        ``game_layout``.
+    """
+    pf = _open(path)
+    return {
+        "rows": int(pf.count()),
+        "row_groups": len(pf.row_groups),
+        "columns": list(pf.columns),
+        "game_layout": GameLayout.from_dict(json.loads(pf.key_value_metadata[_META_LAYOUT])),
+    }
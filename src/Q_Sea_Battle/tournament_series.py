@@ -0,0 +1,360 @@
+"""Series of tournaments sharing one game engine and one log.
+
+Tournament.tournament() plays one tournament with ``tournament_id = 0`` and
+``meta_id = 0``. Repeated tournaments (for confidence bands) or
+meta-experiments (e.g. one per ``p_high``) would otherwise mean building
+new Tournament objects and concatenating their logs by hand.
+
+:class:`TournamentSeries` plays ``number_of_tournaments`` tournaments per
+meta-experiment with one Game, GameEnv and Players instance. Rows are
+written to preallocated column arrays and turned into a single
+:class:`TournamentLog` at the end, so an extra tournament costs only its
+games. Per-tournament outcomes are computed afterwards in one ``np.bincount``
+pass over the whole log.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from time import perf_counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .game import Game
+from .game_env import GameEnv
+from .game_layout import GameLayout
+from .instrumentation import LOG_WRITE_STAGE, Instrumentation
+from .players_base import Players
+from .tournament import Tournament
+from .tournament_log import TournamentLog
+from .validation import TRUSTED, validation_level
+
+
+def tournament_outcomes(
+    tournament_ids: np.ndarray,
+    rewards: np.ndarray,
+    sample_blocks: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Mean reward and standard error per tournament in one vectorised pass.
+
+    Uses the same estimators as TournamentLog.outcome(): the sample
+    standard deviation over sqrt(n), or the cluster estimator over
+    sampling blocks when games carry a block. Each block must belong to
+    a single tournament.
+
+    Args:
+        tournament_ids: Non-negative tournament id per game.
+        rewards: Reward per game.
+        sample_blocks: Optional non-negative block id per game (-1 for
+            games without a block, which count as blocks of size one).
+
+    Returns:
+        Dict with ``tournament_id``, ``n_games``, ``mean_reward`` and
+        ``std_error`` arrays, one entry per tournament with games.
+    """
+    tournament_ids = np.asarray(tournament_ids, dtype=np.int64)
+    rewards = np.asarray(rewards, dtype=np.float64)
+    counts = np.bincount(tournament_ids)
+    sums = np.bincount(tournament_ids, weights=rewards)
+    sumsq = np.bincount(tournament_ids, weights=rewards * rewards)
+    present = np.flatnonzero(counts)
+    n = counts[present].astype(np.float64)
+    mean = sums[present] / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = np.where(n > 1, (sumsq[present] - n * mean * mean) / (n - 1), 0.0) / n
+    variance = np.maximum(variance, 0.0)
+
+    if sample_blocks is not None:
+        blocks = np.asarray(sample_blocks, dtype=np.int64).copy()
+        if (blocks >= 0).any():
+            missing = blocks < 0
+            blocks[missing] = blocks.max() + 1 + np.arange(int(missing.sum()))
+            block_sizes = np.bincount(blocks)
+            block_sums = np.bincount(blocks, weights=rewards)
+            used = np.flatnonzero(block_sizes)
+            block_tournament = np.zeros(block_sizes.size, dtype=np.int64)
+            block_tournament[blocks] = tournament_ids
+            owner = block_tournament[used]
+            mean_all = np.zeros(counts.size)
+            mean_all[present] = mean
+            residuals = block_sums[used] - block_sizes[used] * mean_all[owner]
+            n_blocks = np.bincount(owner, minlength=counts.size)[present].astype(np.float64)
+            squares = np.bincount(owner, weights=residuals ** 2, minlength=counts.size)[present]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                clustered = n_blocks / (n_blocks - 1) * squares / (n * n)
+            variance = np.where(n_blocks >= 2, clustered, variance)
+
+    return {
+        "tournament_id": present.astype(np.int64),
+        "n_games": counts[present].astype(np.int64),
+        "mean_reward": mean,
+        "std_error": np.sqrt(variance),
+    }
+
+
+@dataclass
+class SeriesResult:
+    """Log and per-tournament outcomes of a TournamentSeries.
+
+    Attributes:
+        log: One TournamentLog with all games of the series.
+        tournament_id: Tournament id per tournament, shape (K,).
+        meta_id: Meta-experiment id per tournament, shape (K,).
+        n_games: Games per tournament, shape (K,).
+        mean_reward: Mean reward per tournament, shape (K,).
+        std_error: Standard error per tournament, shape (K,).
+        meta_settings: Player settings per meta_id.
+    """
+
+    log: TournamentLog
+    tournament_id: np.ndarray
+    meta_id: np.ndarray
+    n_games: np.ndarray
+    mean_reward: np.ndarray
+    std_error: np.ndarray
+    meta_settings: List[Dict[str, Any]] = field(default_factory=list)
+
+    def outcomes(self) -> pd.DataFrame:
+        """Per-tournament outcomes indexed by ``tournament_id``."""
+        return pd.DataFrame(
+            {
+                "meta_id": self.meta_id,
+                "n_games": self.n_games,
+                "mean_reward": self.mean_reward,
+                "std_error": self.std_error,
+            },
+            index=pd.Index(self.tournament_id, name="tournament_id"),
+        )
+
+    def meta_outcomes(self, confidence: float = 0.95) -> pd.DataFrame:
+        """Spread of the tournament means per meta-experiment.
+
+        Args:
+            confidence: Level of the normal confidence band around the
+                mean of the tournament means.
+
+        Returns:
+            DataFrame indexed by ``meta_id`` with the meta settings and
+            ``tournaments``, ``mean_reward`` (mean of tournament means),
+            ``spread`` (their sample std), ``std_error`` (spread over
+            sqrt(tournaments)), ``ci_low`` and ``ci_high``.
+        """
+        z = NormalDist().inv_cdf(0.5 + 0.5 * confidence)
+        codes = self.meta_id
+        k = np.bincount(codes)
+        sums = np.bincount(codes, weights=self.mean_reward)
+        sumsq = np.bincount(codes, weights=self.mean_reward ** 2)
+        present = np.flatnonzero(k)
+        n = k[present].astype(np.float64)
+        mean = sums[present] / n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            spread = np.sqrt(np.maximum(np.where(n > 1, (sumsq[present] - n * mean * mean) / (n - 1), 0.0), 0.0))
+        std_error = spread / np.sqrt(n)
+        frame = pd.DataFrame(
+            [self.meta_settings[i] if i < len(self.meta_settings) else {} for i in present],
+            index=pd.Index(present, name="meta_id"),
+        )
+        frame["tournaments"] = k[present]
+        frame["mean_reward"] = mean
+        frame["spread"] = spread
+        frame["std_error"] = std_error
+        frame["ci_low"] = mean - z * std_error
+        frame["ci_high"] = mean + z * std_error
+        return frame
+
+
+class TournamentSeries(Tournament):
+    """Run many tournaments and meta-experiments into one log.
+
+    Every meta-experiment ``meta_id`` first applies ``meta_settings[meta_id]``
+    to the players factory (e.g. ``{"p_high": 0.9}`` or
+    ``{"explore": True}``) and then plays ``number_of_tournaments``
+    tournaments of ``game_layout.number_of_games_in_tournament`` games.
+    Tournament ids run over the whole series. The original player settings
+    are restored afterwards.
+
+    Only settings listed in the factory's ``series_settings`` are accepted.
+    They are applied with the factory's ``set_<name>()`` setter if it has
+    one (child players copy settings when they are created), otherwise by
+    assignment, and the factory is reset afterwards.
+
+    Sampling blocks restart with every tournament (as in Tournament); in
+    the series log they are offset to stay unique, so that
+    TournamentLog.outcome() of the combined log remains block-aware.
+    """
+
+    def __init__(
+        self,
+        game_env: GameEnv,
+        players: Players,
+        game_layout: GameLayout,
+        number_of_tournaments: int = 10,
+        meta_settings: Optional[Sequence[Mapping[str, Any]]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        validation: str = TRUSTED,
+    ) -> None:
+        """Initialise a tournament series.
+
+        Args:
+            game_env: Game environment reused for all games.
+            players: Players factory reused for all games.
+            game_layout: Layout; sets the number of games per tournament.
+            number_of_tournaments: Tournaments per meta-experiment.
+            meta_settings: Player settings per meta-experiment (names from
+                ``players.series_settings``); None runs a single
+                meta-experiment with the current settings.
+            instrumentation: Optional Instrumentation (see Tournament).
+            validation: Validation level used while games are played.
+
+        Raises:
+            ValueError: If ``number_of_tournaments`` is not positive, a
+                meta setting is not in the players' ``series_settings``,
+                or ``validation`` is unknown.
+        """
+        super().__init__(game_env, players, game_layout, instrumentation=instrumentation, validation=validation)
+        if number_of_tournaments <= 0:
+            raise ValueError("number_of_tournaments must be > 0.")
+        self.number_of_tournaments = int(number_of_tournaments)
+        self.meta_settings: List[Dict[str, Any]] = [dict(s) for s in (meta_settings or [{}])]
+        supported = tuple(getattr(players, "series_settings", ()))
+        for settings in self.meta_settings:
+            for name in settings:
+                if name not in supported:
+                    raise ValueError(
+                        f"{type(players).__name__} does not support the meta setting {name!r} "
+                        f"(supported: {supported})."
+                    )
+
+    def series(self) -> SeriesResult:
+        """Play the whole series.
+
+        Returns:
+            SeriesResult with the combined log and per-tournament outcomes.
+        """
+        n_games = self.game_layout.number_of_games_in_tournament
+        n_tournaments = self.number_of_tournaments * len(self.meta_settings)
+        total = n_games * n_tournaments
+        columns = self.game_layout.log_columns
+
+        # Preallocated log columns.
+        data: Dict[str, np.ndarray] = {
+            "field": np.empty(total, dtype=object),
+            "gun": np.empty(total, dtype=object),
+            "comm": np.empty(total, dtype=object),
+            "shoot": np.empty(total, dtype=np.int64),
+            "cell_value": np.empty(total, dtype=np.int64),
+            "reward": np.empty(total, dtype=np.float64),
+            "logprob_comm": np.full(total, None, dtype=object),
+            "logprob_shoot": np.full(total, None, dtype=object),
+            "game_id": np.tile(np.arange(n_games, dtype=np.int64), n_tournaments),
+            "tournament_id": np.repeat(np.arange(n_tournaments, dtype=np.int64), n_games),
+            "meta_id": np.repeat(np.arange(len(self.meta_settings), dtype=np.int64), self.number_of_tournaments * n_games),
+            "sample_block": np.full(total, -1, dtype=np.int64),
+            "prev_measurements": np.full(total, None, dtype=object),
+            "prev_outcomes": np.full(total, None, dtype=object),
+        }
+
+        game = self._make_game()
+        originals = {name: getattr(self.players, name) for s in self.meta_settings for name in s}
+        block_offset = 0
+        try:
+            row = 0
+            for settings in self.meta_settings:
+                self._apply_settings(settings)
+                for _ in range(self.number_of_tournaments):
+                    t_start = perf_counter()
+                    restart_sampling = getattr(self.game_env, "restart_sampling", None)
+                    if restart_sampling is not None:
+                        restart_sampling()
+                    with validation_level(self.validation):
+                        self._play_rows(game, data, row, n_games, block_offset)
+                    blocks = data["sample_block"][row : row + n_games]
+                    if (blocks >= 0).any():
+                        block_offset = int(blocks.max()) + 1
+                    row += n_games
+                    self._record_tournament(t_start)
+        finally:
+            self._apply_settings(originals)
+
+        log = TournamentLog(self.game_layout)
+        frame = {c: data[c] for c in columns if c in data}
+        frame["game_uid"] = np.array([uuid.uuid4().hex for _ in range(total)], dtype=object)
+        df = pd.DataFrame(frame).reindex(columns=columns)
+        if "sample_block" in df.columns:
+            df["sample_block"] = df["sample_block"].astype(object).where(data["sample_block"] >= 0, None)
+        log.log = df
+
+        outcomes = tournament_outcomes(data["tournament_id"], data["reward"], data["sample_block"])
+        meta_of_tournament = np.repeat(np.arange(len(self.meta_settings)), self.number_of_tournaments)
+        return SeriesResult(
+            log=log,
+            tournament_id=outcomes["tournament_id"],
+            meta_id=meta_of_tournament[outcomes["tournament_id"]],
+            n_games=outcomes["n_games"],
+            mean_reward=outcomes["mean_reward"],
+            std_error=outcomes["std_error"],
+            meta_settings=self.meta_settings,
+        )
+
+    def _apply_settings(self, settings: Mapping[str, Any]) -> None:
+        """Apply meta settings so that they reach the players."""
+        for name, value in settings.items():
+            setter = getattr(self.players, f"set_{name}", None)
+            if setter is not None:
+                setter(value)
+            else:
+                setattr(self.players, name, value)
+        if settings:
+            self.players.reset()
+
+    def _play_rows(
+        self,
+        game: Game,
+        data: Dict[str, np.ndarray],
+        first_row: int,
+        n_games: int,
+        block_offset: int,
+    ) -> None:
+        """Play ``n_games`` games into rows ``first_row...`` of ``data``."""
+        instrumentation = self.instrumentation
+        has_log_probs = getattr(self.players, "has_log_probs", False)
+        has_prev = getattr(self.players, "has_prev", False)
+        field_col, gun_col, comm_col = data["field"], data["gun"], data["comm"]
+        shoot_col, cell_col, reward_col = data["shoot"], data["cell_value"], data["reward"]
+
+        for row in range(first_row, first_row + n_games):
+            reward, field_, gun, comm, shoot = game.play()
+            t0 = perf_counter() if instrumentation is not None else 0.0
+
+            # Buffered environments hand out read-only views that are
+            # overwritten by the next game; the log keeps its own copies.
+            field_col[row] = field_ if field_.flags.writeable else field_.copy()
+            gun_col[row] = gun if gun.flags.writeable else gun.copy()
+            comm_col[row] = comm if comm.flags.writeable else comm.copy()
+            shoot_col[row] = shoot
+            cell_col[row] = field_[gun == 1][0]
+            reward_col[row] = reward
+
+            if has_log_probs:
+                player_a, player_b = self.players.players()
+                data["logprob_comm"][row] = float(player_a.get_log_prob())
+                data["logprob_shoot"][row] = float(player_b.get_log_prob())
+            if has_prev:
+                prev = self.players.players()[0].get_prev()
+                if prev is not None:
+                    data["prev_measurements"][row], data["prev_outcomes"][row] = prev
+
+            sample_block = getattr(self.game_env, "sample_block", None)
+            if sample_block is not None:
+                data["sample_block"][row] = block_offset + int(sample_block)
+
+            if instrumentation is not None:
+                instrumentation.record(LOG_WRITE_STAGE, t0, perf_counter())
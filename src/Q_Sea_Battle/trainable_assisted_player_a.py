@@ -18,6 +18,7 @@ from typing import Any, Optional
 import numpy as np
 import tensorflow as tf
 
+from .game_context import game_context
 from .lin_trainable_assisted_model_a import LinTrainableAssistedModelA
 
 try:
@@ -67,13 +68,15 @@ class TrainableAssistedPlayerA(PlayerA):
 
         Args:
             field: 1D array of ints, length n2, values in {0,1}.
-            supp: Ignored.
+            supp: Optional GameContext; if given, the previous tensors and the
+                log-prob are stored on it and bits are sampled from its
+                generator.
             explore: Optional override of self.explore.
 
         Returns:
             1D NumPy array of shape (M,), dtype int, values {0,1}.
         """
-        del supp
+        context = game_context(supp)
         do_explore = self.explore if explore is None else bool(explore)
 
         n2 = int(getattr(self.game_layout, "field_size")) ** 2
@@ -89,22 +92,30 @@ class TrainableAssistedPlayerA(PlayerA):
 
         comm_logits, meas_list, out_list = self.model_a.compute_with_internal(field_batch)
 
-        # Store prev tensors on the parent
-        if self.parent is not None:
+        # Store prev tensors on the context or the parent
+        if context is not None:
+            context.previous = (meas_list, out_list)
+        elif self.parent is not None:
             self.parent.previous = (meas_list, out_list)
 
         comm_probs = tf.sigmoid(comm_logits)[0]  # (m,)
 
         if do_explore:
             # Sample Bernoulli bits.
-            rnd = tf.random.uniform(shape=(m,), dtype=tf.float32)
+            if context is not None:
+                rnd = tf.constant(context.rng.random(m), dtype=tf.float32)
+            else:
+                rnd = tf.random.uniform(shape=(m,), dtype=tf.float32)
             comm_bits = tf.cast(rnd < comm_probs, tf.int32)
         else:
             comm_bits = tf.cast(comm_probs >= 0.5, tf.int32)
 
         # Log-prob under independent Bernoulli with logits.
         logp = bernoulli_log_prob_from_logits(comm_logits[0:1, :], tf.cast(comm_bits[None, :], tf.float32))
-        self.last_logprob_comm = float(logp.numpy()[0])
+        if context is not None:
+            context.logprob_comm = float(logp.numpy()[0])
+        else:
+            self.last_logprob_comm = float(logp.numpy()[0])
 
         return comm_bits.numpy().astype(np.int32)
 
@@ -17,7 +17,9 @@ from typing import Any
 import numpy as np
 import tensorflow as tf
 
+from .game_context import game_context
 from .lin_trainable_assisted_model_b import LinTrainableAssistedModelB
+from .validation import is_strict
 
 try:
     from .logit_utils import bernoulli_log_prob_from_logits  # type: ignore
@@ -64,13 +66,15 @@ class TrainableAssistedPlayerB(PlayerB):
         Args:
             gun: 1D array of ints length n2, values in {0,1}.
             comm: 1D array of ints length m, values in {0,1} (or float in [0,1] for DRU).
-            supp: Ignored.
+            supp: Optional GameContext; if given, the previous tensors are read
+                from it, the log-prob is stored on it and the action is
+                sampled from its generator.
             explore: Optional override of self.explore.
 
         Returns:
             int 0 or 1
         """
-        del supp
+        context = game_context(supp)
         do_explore = self.explore if explore is None else bool(explore)
 
         n2 = int(getattr(self.game_layout, "field_size")) ** 2
@@ -79,7 +83,7 @@ class TrainableAssistedPlayerB(PlayerB):
         gun = np.asarray(gun)
         if gun.shape != (n2,):
             raise ValueError(f"gun must have shape ({n2},), got {gun.shape}")
-        if not np.all((gun == 0) | (gun == 1)):
+        if is_strict() and not np.all((gun == 0) | (gun == 1)):
             raise ValueError("gun must contain only 0/1")
 
         comm = np.asarray(comm)
@@ -89,16 +93,22 @@ class TrainableAssistedPlayerB(PlayerB):
         gun_batch = tf.convert_to_tensor(gun[None, :], dtype=tf.float32)  # (1,n2)
         comm_batch = tf.convert_to_tensor(comm[None, :], dtype=tf.float32)  # (1,m)
 
-        if self.parent is None or getattr(self.parent, "previous", None) is None:
+        if context is not None:
+            previous = context.previous
+            if previous is None:
+                raise RuntimeError("context.previous is None: PlayerA must decide() before PlayerB.")
+        elif self.parent is None or getattr(self.parent, "previous", None) is None:
             raise RuntimeError("parent.previous is None: PlayerA must decide() before PlayerB.")
+        else:
+            previous = self.parent.previous
 
-        prev_meas_list, prev_out_list = self.parent.previous
+        prev_meas_list, prev_out_list = previous
         if not (isinstance(prev_meas_list, list) and isinstance(prev_out_list, list)):
             raise TypeError("parent.previous must be (list, list).")
         if len(prev_meas_list) < 1 or len(prev_out_list) < 1:
             raise ValueError("parent.previous lists must have length >= 1.")
 
-        prev_meas_list, prev_out_list = self.parent.previous
+        prev_meas_list, prev_out_list = previous
 
         # Normalize to lists (linear case: single tensor → list of length 1)
         if not isinstance(prev_meas_list, (list, tuple)):
@@ -130,13 +140,19 @@ class TrainableAssistedPlayerB(PlayerB):
         shoot_prob = tf.sigmoid(shoot_logit)[0, 0]
 
         if do_explore:
-            rnd = tf.random.uniform(shape=(), dtype=tf.float32)
+            if context is not None:
+                rnd = tf.constant(context.rng.random(), dtype=tf.float32)
+            else:
+                rnd = tf.random.uniform(shape=(), dtype=tf.float32)
             shoot = int((rnd < shoot_prob).numpy())
         else:
             shoot = int((shoot_prob >= 0.5).numpy())
 
         logp = bernoulli_log_prob_from_logits(shoot_logit, tf.constant([[float(shoot)]], dtype=tf.float32))
-        self.last_logprob_shoot = float(logp.numpy()[0])
+        if context is not None:
+            context.logprob_shoot = float(logp.numpy()[0])
+        else:
+            self.last_logprob_shoot = float(logp.numpy()[0])
 
         return shoot
 
@@ -48,6 +48,12 @@ class TrainableAssistedPlayers(Players):
     """
 
     has_log_probs: bool = True
+    #: With a GameContext, ``previous`` and the log-probs live on the context.
+    supports_game_context: bool = True
+    #: Shared A/B state is captured by snapshot_shared_state().
+    supports_counterfactual: bool = True
+    #: Applied with set_explore(); p_high is not used by the Lin models.
+    series_settings: Tuple[str, ...] = ("explore",)
 
     def __init__(
         self,
@@ -135,6 +141,18 @@ class TrainableAssistedPlayers(Players):
             self._playerB.reset()
         self.previous = None
 
+    def snapshot_shared_state(self) -> Any:
+        """Return the (measurements, outcomes) tensors stored by Player A.
+
+        Player B only reads ``previous``, so the stored reference is a
+        complete snapshot of the state shared between the players.
+        """
+        return self.previous
+
+    def restore_shared_state(self, state: Any) -> None:
+        """Restore ``previous`` captured with snapshot_shared_state()."""
+        self.previous = state
+
     def set_explore(self, flag: bool) -> None:
         """Set exploration flag for both players.
 
@@ -0,0 +1,190 @@
+"""Local-disk checkpoints for long training runs.
+
+A checkpoint is a directory ``ckpt-<step>`` holding
+
+- ``arrays.npz``: named NumPy arrays (model weights, optimizer slots,
+  RNG state vectors, ...);
+- ``meta.json``: JSON-serialisable metadata (epoch counter, schedule
+  position, NumPy bit-generator states, history, ...).
+
+:class:`CheckpointManager` writes checkpoints in a background thread: the
+caller hands over a snapshot (arrays already copied out of the
+TensorFlow variables) and continues training while the files are written.
+Each checkpoint is first written to a temporary directory and then
+renamed, so an interrupted write never leaves a partial checkpoint
+behind. After every write, checkpoints beyond the retention limits are
+deleted.
+
+The manager does not know what it stores; see
+:class:`Q_Sea_Battle.dial_training.DialTrainer` for a trainer that
+snapshots its complete state and resumes bit-identically.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+_CHECKPOINT_DIR = re.compile(r"^ckpt-(\d+)$")
+_ARRAYS_FILE = "arrays.npz"
+_META_FILE = "meta.json"
+
+
+class CheckpointManager:
+    """Write, list, restore and prune checkpoints in one directory.
+
+    Args:
+        directory: Checkpoint directory; created if missing.
+        max_to_keep: Number of most recent checkpoints to keep; None keeps
+            all of them.
+        keep_every: Additionally keep every checkpoint whose step is a
+            multiple of this value (e.g. one per 10 epochs); None disables.
+        asynchronous: Write checkpoints in a background thread. With False,
+            :meth:`save` returns after the checkpoint is on disk.
+
+    Raises:
+        ValueError: If ``max_to_keep`` or ``keep_every`` is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_to_keep: Optional[int] = 3,
+        keep_every: Optional[int] = None,
+        asynchronous: bool = True,
+    ) -> None:
+        if max_to_keep is not None and max_to_keep < 1:
+            raise ValueError("max_to_keep must be >= 1 or None.")
+        if keep_every is not None and keep_every < 1:
+            raise ValueError("keep_every must be >= 1 or None.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_to_keep = max_to_keep
+        self.keep_every = keep_every
+        self.asynchronous = bool(asynchronous)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+    def checkpoints(self) -> List[Tuple[int, Path]]:
+        """Return the complete checkpoints on disk as ``(step, path)``, oldest first."""
+        found = []
+        for path in self.directory.iterdir():
+            match = _CHECKPOINT_DIR.match(path.name)
+            if match and (path / _META_FILE).is_file():
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def latest(self) -> Optional[Tuple[int, Path]]:
+        """Return ``(step, path)`` of the newest checkpoint, or None."""
+        found = self.checkpoints()
+        return found[-1] if found else None
+
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
+    def save(self, step: int, arrays: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> Path:
+        """Write a checkpoint for ``step``.
+
+        ``arrays`` must already be copies (e.g. ``variable.numpy()``) that
+        the caller does not modify afterwards; ``meta`` is serialised to
+        JSON immediately, so later changes to it are not recorded.
+
+        Returns:
+            Path the checkpoint will have once written.
+        """
+        step = int(step)
+        meta_json = json.dumps({"step": step, **meta})
+        arrays = dict(arrays)
+        target = self.directory / f"ckpt-{step:08d}"
+        if not self.asynchronous:
+            self._write(target, arrays, meta_json)
+            return target
+        if self._executor is None:
+            # One worker keeps the writes (and the pruning) in order.
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending = [f for f in self._pending if not f.done() or f.exception() is not None]
+        self._pending.append(self._executor.submit(self._write, target, arrays, meta_json))
+        return target
+
+    def wait(self) -> None:
+        """Block until all pending writes are done; re-raise write errors."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Wait for pending writes and stop the writer thread."""
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _write(self, target: Path, arrays: Dict[str, np.ndarray], meta_json: str) -> None:
+        tmp = target.with_name(target.name + ".tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir()
+        np.savez(tmp / _ARRAYS_FILE, **arrays)
+        (tmp / _META_FILE).write_text(meta_json, encoding="utf-8")
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(tmp, target)
+        self._prune()
+
+    def _prune(self) -> None:
+        found = self.checkpoints()
+        if self.max_to_keep is None:
+            return
+        for step, path in found[: -self.max_to_keep]:
+            if self.keep_every is not None and step % self.keep_every == 0:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Restoring
+    # ------------------------------------------------------------------
+    def restore(self, step: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Load a checkpoint (the latest one by default).
+
+        Pending writes are waited for first.
+
+        Returns:
+            ``(arrays, meta)`` as passed to :meth:`save`; ``meta`` also
+            holds the ``"step"``.
+
+        Raises:
+            FileNotFoundError: If there is no (matching) checkpoint.
+        """
+        self.wait()
+        found = dict(self.checkpoints())
+        if not found:
+            raise FileNotFoundError(f"No checkpoints in {self.directory}.")
+        step = max(found) if step is None else int(step)
+        if step not in found:
+            raise FileNotFoundError(f"No checkpoint for step {step} in {self.directory}.")
+        with np.load(found[step] / _ARRAYS_FILE) as data:
+            arrays = {name: data[name] for name in data.files}
+        meta = json.loads((found[step] / _META_FILE).read_text(encoding="utf-8"))
+        return arrays, meta
+
+    def __enter__(self) -> "CheckpointManager":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,211 @@
+"""Training telemetry and exact-accuracy early stopping for imitation training.
+
+The imitation targets of the neural, Lin and Pyr layers are deterministic
+teacher functions of the inputs, and the layers often reproduce them bit
+for bit long before the configured number of epochs has passed.
+:class:`TrainingControl` is a Keras callback shared by the imitation
+trainers (:meth:`NeuralNetPlayers.train_model_a` / ``train_model_b``, the
+Lin and Pyr ``train_layer`` helpers and
+:func:`~Q_Sea_Battle.pyr_trainable_assisted_imitation_utilities.train_layers_jointly`).
+After every epoch it
+
+- evaluates the model on a held-out batch, thresholds the outputs and
+  measures the bitwise accuracy against the teacher targets;
+- stops training as soon as the accuracy is exact (or has not improved
+  for ``patience`` epochs);
+- records the wall time, samples/sec and steps/sec of the epoch.
+
+The result is available as a :class:`TrainingReport`.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+#: Stop reasons reported in TrainingReport.stop_reason.
+STOP_EXACT = "exact"
+STOP_PLATEAU = "plateau"
+STOP_MAX_EPOCHS = "max_epochs"
+
+
+@dataclass
+class EpochRecord:
+    """Telemetry of one training epoch.
+
+    Attributes:
+        epoch: Zero-based epoch index.
+        seconds: Wall time of the epoch (training only).
+        samples_per_sec: Training throughput, if the epoch size is known.
+        steps_per_sec: Optimizer steps per second, if known.
+        loss: Training loss reported by Keras.
+        bit_accuracy: Lowest bitwise held-out accuracy over the outputs,
+            or None without held-out data.
+        output_accuracy: Held-out bitwise accuracy per output.
+    """
+
+    epoch: int
+    seconds: float
+    samples_per_sec: Optional[float] = None
+    steps_per_sec: Optional[float] = None
+    loss: Optional[float] = None
+    bit_accuracy: Optional[float] = None
+    output_accuracy: List[float] = field(default_factory=list)
+
+
+@dataclass
+class TrainingReport:
+    """Summary of a training run under TrainingControl.
+
+    Attributes:
+        epochs: One record per completed epoch.
+        stop_reason: ``"exact"``, ``"plateau"`` or ``"max_epochs"``.
+        total_seconds: Wall time of the whole ``fit`` call.
+    """
+
+    epochs: List[EpochRecord] = field(default_factory=list)
+    stop_reason: str = STOP_MAX_EPOCHS
+    total_seconds: float = 0.0
+
+    @property
+    def epochs_run(self) -> int:
+        """Number of completed epochs."""
+        return len(self.epochs)
+
+    @property
+    def final_accuracy(self) -> Optional[float]:
+        """Held-out bit accuracy after the last epoch."""
+        return self.epochs[-1].bit_accuracy if self.epochs else None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the per-epoch records as a DataFrame."""
+        return pd.DataFrame([asdict(r) for r in self.epochs])
+
+
+def _infer_from_logits(loss: Any) -> bool:
+    """Return the ``from_logits`` flag of a compiled loss (False if unknown)."""
+    if isinstance(loss, dict):
+        loss = next(iter(loss.values()), None)
+    elif isinstance(loss, (list, tuple)):
+        loss = loss[0] if loss else None
+    return bool(getattr(loss, "from_logits", False))
+
+
+class TrainingControl(tf.keras.callbacks.Callback):
+    """Keras callback for telemetry and exact-accuracy early stopping.
+
+    Args:
+        validation_data: Optional held-out ``(x, y)`` batch with the same
+            structure as the training data (``x`` and ``y`` may be arrays,
+            tuples or dicts). Without it only telemetry is recorded.
+        samples_per_epoch: Training samples per epoch, used for the
+            samples/sec figure.
+        target_accuracy: Bit accuracy at which training stops.
+        patience: Stop if the accuracy has not improved by more than
+            ``min_delta`` for this many epochs; None disables it.
+        min_delta: Minimum improvement that resets the patience counter.
+        from_logits: Whether the outputs are logits (threshold 0) or
+            probabilities (threshold 0.5). None infers it from the
+            compiled loss.
+
+    Raises:
+        ValueError: If ``target_accuracy`` is not in (0, 1] or
+            ``patience`` is negative.
+    """
+
+    def __init__(
+        self,
+        validation_data: Optional[Any] = None,
+        samples_per_epoch: Optional[int] = None,
+        target_accuracy: float = 1.0,
+        patience: Optional[int] = 5,
+        min_delta: float = 1e-4,
+        from_logits: Optional[bool] = None,
+    ) -> None:
+        super().__init__()
+        if not 0.0 < target_accuracy <= 1.0:
+            raise ValueError("target_accuracy must be in (0, 1].")
+        if patience is not None and patience < 0:
+            raise ValueError("patience must be >= 0 or None.")
+        self.validation_data = validation_data
+        self.samples_per_epoch = samples_per_epoch
+        self.target_accuracy = float(target_accuracy)
+        self.patience = patience
+        self.min_delta = float(min_delta)
+        self.from_logits = from_logits
+        self.report = TrainingReport()
+
+    # ------------------------------------------------------------------
+    # Held-out evaluation
+    # ------------------------------------------------------------------
+    def evaluate_bits(self) -> List[float]:
+        """Return the held-out bitwise accuracy of each model output."""
+        if self.validation_data is None:
+            return []
+        x, y = self.validation_data
+        threshold = 0.0 if self._from_logits else 0.5
+        predictions = tf.nest.flatten(self.model(x, training=False))
+        targets = tf.nest.flatten(y)
+        if len(predictions) != len(targets):
+            raise ValueError(f"Model has {len(predictions)} outputs but {len(targets)} targets were given.")
+        return [
+            float(np.mean((np.asarray(p) > threshold) == (np.asarray(t) > 0.5)))
+            for p, t in zip(predictions, targets)
+        ]
+
+    # ------------------------------------------------------------------
+    # Keras hooks
+    # ------------------------------------------------------------------
+    def on_train_begin(self, logs: Optional[Dict[str, Any]] = None) -> None:
+        self.report = TrainingReport()
+        self._from_logits = (
+            self.from_logits if self.from_logits is not None else _infer_from_logits(getattr(self.model, "loss", None))
+        )
+        self._best = -np.inf
+        self._wait = 0
+        self._train_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch: int, logs: Optional[Dict[str, Any]] = None) -> None:
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch: int, logs: Optional[Dict[str, Any]] = None) -> None:
+        seconds = time.perf_counter() - self._epoch_start
+        steps = (self.params or {}).get("steps")
+        accuracies = self.evaluate_bits()
+        record = EpochRecord(
+            epoch=int(epoch),
+            seconds=seconds,
+            samples_per_sec=self.samples_per_epoch / seconds if self.samples_per_epoch and seconds > 0 else None,
+            steps_per_sec=steps / seconds if steps and seconds > 0 else None,
+            loss=float(logs["loss"]) if logs and "loss" in logs else None,
+            bit_accuracy=min(accuracies) if accuracies else None,
+            output_accuracy=accuracies,
+        )
+        self.report.epochs.append(record)
+        if record.bit_accuracy is None:
+            return
+
+        if record.bit_accuracy >= self.target_accuracy:
+            self.report.stop_reason = STOP_EXACT
+            self.model.stop_training = True
+            return
+        if record.bit_accuracy > self._best + self.min_delta:
+            self._best = record.bit_accuracy
+            self._wait = 0
+        else:
+            self._wait += 1
+            if self.patience is not None and self._wait >= self.patience:
+                self.report.stop_reason = STOP_PLATEAU
+                self.model.stop_training = True
+
+    def on_train_end(self, logs: Optional[Dict[str, Any]] = None) -> None:
+        self.report.total_seconds = time.perf_counter() - self._train_start
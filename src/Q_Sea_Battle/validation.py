@@ -0,0 +1,92 @@
+"""Package-wide validation policy for hot-path input checks.
+
+Players and PR-assisted resources check their inputs on every call
+(0/1 content, one-hot guns, ...). For arrays produced by the package
+itself -- fields and guns from GameEnv, measurements built by the
+PR-assisted players -- these checks are redundant and often cost more
+than the actual work. The validation level selects how much is checked:
+
+- ``"strict"`` (default): full shape and content checks.
+- ``"trusted"``: only cheap O(1) shape checks; element-wise content
+  checks are skipped.
+
+The level is stored in a :class:`contextvars.ContextVar`, so it is local
+to the current thread / asyncio task. Internal callers such as
+Tournament switch to trusted mode with :func:`validation_level` for the
+inputs they generate themselves; user code calling players directly
+keeps strict checking.
+
+TensorFlow layers can only read the level in eager execution: inside a
+traced graph (``tf.function``, Keras ``fit``/``predict``) PRAssistedLayer
+keeps its checks unless it was built with ``validate=False``.
+
+Author: Rob Hendriks
+Package: Q_Sea_Battle
+Version: 0.1
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+STRICT = "strict"
+TRUSTED = "trusted"
+VALIDATION_LEVELS = (STRICT, TRUSTED)
+
+_LEVEL: ContextVar[str] = ContextVar("q_sea_battle_validation_level", default=STRICT)
+
+
+def _check_level(level: str) -> str:
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"validation level must be one of {VALIDATION_LEVELS}, got {level!r}.")
+    return level
+
+
+def get_validation_level() -> str:
+    """Return the validation level of the current context."""
+    return _LEVEL.get()
+
+
+def set_validation_level(level: str) -> str:
+    """Set the validation level of the current context.
+
+    Args:
+        level: ``"strict"`` or ``"trusted"``.
+
+    Returns:
+        The previous level, so callers can restore it.
+
+    Raises:
+        ValueError: If ``level`` is unknown.
+    """
+    previous = _LEVEL.get()
+    _LEVEL.set(_check_level(level))
+    return previous
+
+
+def is_strict() -> bool:
+    """Return True if full input checks should be performed."""
+    return _LEVEL.get() == STRICT
+
+
+@contextmanager
+def validation_level(level: str) -> Iterator[None]:
+    """Temporarily set the validation level.
+
+    Example:
+        >>> with validation_level("trusted"):
+        ...     log = tournament.tournament()
+
+    Args:
+        level: ``"strict"`` or ``"trusted"``.
+
+    Raises:
+        ValueError: If ``level`` is unknown.
+    """
+    token = _LEVEL.set(_check_level(level))
+    try:
+        yield
+    finally:
+        _LEVEL.reset(token)
@@ -0,0 +1,89 @@
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_run_benchmark_reports_consistent_statistics():
+    from Q_Sea_Battle.benchmark_utilities import run_benchmark
+
+    calls = {"setup": 0, "fn": 0}
+
+    def setup():
+        calls["setup"] += 1
+
+    def fn():
+        calls["fn"] += 1
+        return [0] * 1000
+
+    result = run_benchmark(
+        "dummy", fn, "4x4_m1", setup=setup, items_per_call=10, warmup=1, min_calls=7, min_time=0.0
+    )
+
+    assert result.key == "dummy[4x4_m1]"
+    assert result.calls == 7
+    assert calls["setup"] == calls["fn"]
+    assert result.items_per_call == 10
+    assert result.latency_median_us <= result.latency_p95_us
+    assert result.items_per_sec > 0.0
+    # A list of 1000 references must show up in the traced peak.
+    assert result.peak_memory_bytes >= 8000
+
+
+@pytest.mark.usefixtures("qsb")
+def test_history_and_baseline_round_trip(tmp_path):
+    import json
+    from Q_Sea_Battle.benchmark_utilities import (
+        append_history,
+        load_baseline,
+        run_benchmark,
+        write_baseline,
+    )
+
+    result = run_benchmark("noop", lambda: None, "2x2_m1", min_calls=3, min_time=0.0, measure_memory=False)
+    assert result.peak_memory_bytes == -1
+
+    history = tmp_path / "history.json"
+    append_history(history, [result], metadata={"run": 1})
+    append_history(history, [result], metadata={"run": 2})
+    runs = json.loads(history.read_text())["runs"]
+    assert [r["metadata"]["run"] for r in runs] == [1, 2]
+    assert runs[0]["results"][0]["name"] == "noop"
+
+    baseline_path = tmp_path / "baseline.json"
+    assert load_baseline(baseline_path) == {}
+    write_baseline(baseline_path, [result])
+    baseline = load_baseline(baseline_path)
+    assert set(baseline) == {"noop[2x2_m1]"}
+
+
+@pytest.mark.usefixtures("qsb")
+def test_compare_to_baseline_flags_only_regressions_beyond_threshold():
+    from dataclasses import replace
+    from Q_Sea_Battle.benchmark_utilities import BenchmarkResult, compare_to_baseline
+
+    base = BenchmarkResult(
+        name="game_play", layout="4x4_m1", calls=10, items_per_call=1, total_seconds=1e-3,
+        items_per_sec=1e4, latency_mean_us=100.0, latency_median_us=100.0,
+        latency_p95_us=120.0, peak_memory_bytes=1000,
+    )
+    baseline = {base.key: base.to_dict()}
+
+    within = replace(base, latency_median_us=120.0, peak_memory_bytes=5000)
+    assert compare_to_baseline([within], baseline, threshold=0.25) == []
+
+    slower = replace(base, latency_median_us=140.0)
+    regressions = compare_to_baseline([slower], baseline, threshold=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].metric == "latency_median_us"
+    assert regressions[0].ratio == pytest.approx(1.4)
+
+    heavier = replace(base, peak_memory_bytes=5000)
+    regressions = compare_to_baseline([heavier], baseline, memory_threshold=0.5)
+    assert [r.metric for r in regressions] == ["peak_memory_bytes"]
+
+    unknown = replace(base, layout="8x8_m1", latency_median_us=1e9)
+    assert compare_to_baseline([unknown], baseline) == []
+
+    with pytest.raises(ValueError):
+        compare_to_baseline([base], baseline, threshold=-0.1)
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_all_guns_evaluation_simple_players_exact_per_cell():
+    from Q_Sea_Battle.counterfactual_evaluation import AllGunsEvaluation
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.simple_players import SimplePlayers
+
+    np.random.seed(0)
+    layout = GameLayout(field_size=2, comms_size=1)
+    result = AllGunsEvaluation(layout, SimplePlayers(layout)).run(n_fields=300)
+
+    assert result.rewards.shape == (300, 4)
+    # Simple players communicate cell 0 and guess at random elsewhere.
+    cells = result.per_cell()
+    assert cells.loc[0, "mean_reward"] == 1.0
+    for cell in (1, 2, 3):
+        assert cells.loc[cell, "mean_reward"] == pytest.approx(0.5, abs=4 * cells.loc[cell, "std_error"])
+    np.testing.assert_allclose(result.per_field, result.rewards.mean(axis=1))
+
+    mean, se = result.outcome()
+    assert mean == pytest.approx(0.625, abs=4 * se)
+    assert list(cells.columns[:2]) == ["row", "col"]
+
+
+@pytest.mark.usefixtures("qsb")
+def test_all_guns_evaluation_replays_pr_assisted_boxes():
+    from Q_Sea_Battle.counterfactual_evaluation import AllGunsEvaluation
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.reference_performance_utilities import expected_win_rate_assisted
+
+    layout = GameLayout(field_size=4, comms_size=1)
+
+    perfect = AllGunsEvaluation(layout, PRAssistedPlayers(layout, p_high=1.0)).run(n_fields=20)
+    assert perfect.outcome() == (1.0, 0.0)
+
+    np.random.seed(1)
+    noisy = AllGunsEvaluation(layout, PRAssistedPlayers(layout, p_high=0.9)).run(n_fields=300)
+    mean, se = noisy.outcome()
+    expected = expected_win_rate_assisted(field_size=4, comms_size=1, p_high=0.9)
+    assert mean == pytest.approx(expected, abs=4 * se + 0.01)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_enumerate_noise_masks_weights():
+    from Q_Sea_Battle.counterfactual_evaluation import enumerate_noise_masks
+
+    masks, weights = enumerate_noise_masks(3, 0.2)
+    assert len(masks) == 8
+    assert weights.sum() == pytest.approx(1.0)
+    assert weights[0] == pytest.approx(0.8 ** 3) and not masks[0].any()
+
+    masks, weights = enumerate_noise_masks(10, 0.1, max_flips=1)
+    assert len(masks) == 11
+    assert weights.sum() == pytest.approx(0.9 ** 10 + 10 * 0.1 * 0.9 ** 9)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_noise_marginalized_evaluation_removes_noise_variance():
+    from Q_Sea_Battle.counterfactual_evaluation import NoiseMarginalizedEvaluation
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.reference_performance_utilities import expected_win_rate_majority
+    from Q_Sea_Battle.tournament import Tournament
+
+    np.random.seed(9)
+    layout = GameLayout(field_size=4, comms_size=2, channel_noise=0.2, number_of_games_in_tournament=400)
+    evaluation = NoiseMarginalizedEvaluation(GameEnv(layout), MajorityPlayers(layout), layout)
+    assert evaluation.n_variants == 4 and evaluation.residual_weight == pytest.approx(0.0)
+
+    log = evaluation.tournament()
+    rewards = log.log["reward"].astype(float)
+    assert len(log.log) == 400
+    assert ((rewards >= 0.0) & (rewards <= 1.0)).all()
+    assert set(np.round(rewards, 6)) - {0.0, 1.0}
+
+    mean, se = log.outcome()
+    sampled_mean, sampled_se = Tournament(GameEnv(layout), MajorityPlayers(layout), layout).tournament().outcome()
+    assert se < sampled_se
+    expected = expected_win_rate_majority(field_size=4, comms_size=2, channel_noise=0.2)
+    assert mean == pytest.approx(expected, abs=4 * se)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_noise_marginalized_evaluation_residual_sample_is_unbiased():
+    from Q_Sea_Battle.counterfactual_evaluation import NoiseMarginalizedEvaluation
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.simple_players import SimplePlayers
+
+    np.random.seed(10)
+    # m = n2: every cell is communicated, so the win rate is 1 - channel_noise.
+    layout = GameLayout(field_size=4, comms_size=16, channel_noise=0.1, number_of_games_in_tournament=300)
+    evaluation = NoiseMarginalizedEvaluation(GameEnv(layout), SimplePlayers(layout), layout, max_flips=1)
+    assert evaluation.n_variants == 1 + 16 + 1
+    assert evaluation.residual_weight == pytest.approx(1 - 0.9 ** 16 - 16 * 0.1 * 0.9 ** 15)
+
+    mean, se = evaluation.tournament().outcome()
+    assert mean == pytest.approx(0.9, abs=4 * se)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_counterfactual_evaluations_require_an_explicit_opt_in():
+    from Q_Sea_Battle.counterfactual_evaluation import AllGunsEvaluation, NoiseMarginalizedEvaluation
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.players_base import Players
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=10)
+
+    class ThirdPartyPlayers(Players):
+        pass
+
+    class StatelessPlayers(Players):
+        supports_counterfactual = True
+
+    class SnapshotPlayers(Players):
+        def snapshot_shared_state(self):
+            return None
+
+        def restore_shared_state(self, state):
+            return None
+
+    with pytest.raises(ValueError):
+        AllGunsEvaluation(layout, ThirdPartyPlayers(layout))
+    with pytest.raises(ValueError):
+        NoiseMarginalizedEvaluation(GameEnv(layout), ThirdPartyPlayers(layout), layout)
+    AllGunsEvaluation(layout, StatelessPlayers(layout))
+    NoiseMarginalizedEvaluation(GameEnv(layout), SnapshotPlayers(layout), layout)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_stacked_members_match_unstacked_models_and_solo_training():
+    from Q_Sea_Battle.ensemble_training import EnsembleTrainer, StackedDenseModel
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_imitation_utilities import generate_majority_dataset_model_a
+
+    layout = GameLayout(field_size=2, comms_size=2)
+    trainer = EnsembleTrainer(layout, seeds=[1, 2, 3])
+    assert trainer.num_members == 3
+
+    x = np.random.default_rng(0).random((3, 5, 4)).astype(np.float32)
+    stacked = trainer.stack_a(x).numpy()
+    pairs = trainer.models()
+    for k, (model_a, _) in enumerate(pairs):
+        np.testing.assert_allclose(model_a(x[k]).numpy(), stacked[k], atol=1e-6)
+
+    # Round trip through ordinary Keras models.
+    restacked = StackedDenseModel.from_models([a for a, _ in pairs])
+    np.testing.assert_allclose(restacked(x).numpy(), stacked, atol=1e-6)
+
+    # Member 1 of the ensemble trains exactly like a solo run with its seed.
+    datasets = [generate_majority_dataset_model_a(layout, num_samples=64, seed=s) for s in (1, 2, 3)]
+    settings = {"epochs": 2, "batch_size": 16}
+    losses = trainer.train_model_a(datasets, settings)
+    solo = EnsembleTrainer(layout, seeds=[2])
+    assert solo.train_model_a(datasets[1:2], settings)[0] == pytest.approx(losses[1], abs=1e-6)
+    np.testing.assert_allclose(
+        trainer.stack_a.stacked_layers[0].kernel.numpy()[1],
+        solo.stack_a.stacked_layers[0].kernel.numpy()[0],
+        atol=1e-6,
+    )
+
+    with pytest.raises(ValueError):
+        trainer.train_model_a(datasets[:2], settings)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_dial_step_and_players():
+    from Q_Sea_Battle.ensemble_training import EnsembleTrainer
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    trainer = EnsembleTrainer(layout, seeds=[0, 1])
+    fields, guns, cell_values = trainer.sample_batch(8)
+    assert fields.shape == guns.shape == (2, 8, 4)
+    np.testing.assert_array_equal(cell_values[..., 0], (fields * guns).sum(axis=2))
+
+    before = trainer.stack_b.stacked_layers[0].kernel.numpy().copy()
+    rewards = trainer.dial_step(batch_size=32)
+    assert rewards.shape == (2,)
+    assert np.all((rewards >= 0.0) & (rewards <= 1.0))
+    assert not np.allclose(before, trainer.stack_b.stacked_layers[0].kernel.numpy())
+
+    factories = trainer.players()
+    assert len(factories) == 2
+    player_a, player_b = factories[0].players()
+    comm = player_a.decide(np.array([0, 1, 1, 0]))
+    assert player_b.decide(np.array([0, 0, 1, 0]), comm) in (0, 1)
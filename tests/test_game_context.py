@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_context_game_leaves_environment_untouched():
+    from Q_Sea_Battle.game import Game
+    from Q_Sea_Battle.game_context import GameContext
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+
+    layout = GameLayout(field_size=4, comms_size=4, channel_noise=0.2)
+    env = GameEnv(layout)
+    game = Game(env, MajorityPlayers(layout))
+
+    first = game.play(context=GameContext.from_seed(3))
+    second = game.play(context=GameContext.from_seed(3))
+    assert env.field is None and env.gun is None
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+
+    context = GameContext.from_seed(4)
+    reward, field, gun, comm, shoot = game.play(context=context)
+    np.testing.assert_array_equal(context.field, field)
+    assert reward == float(shoot == field[np.argmax(gun)])
+
+
+def test_threaded_tournament_is_deterministic_and_matches_theory():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=200)
+    logs = [
+        Tournament(GameEnv(layout), SimplePlayers(layout), layout).threaded_tournament(max_workers=w, seed=11)
+        for w in (1, 4)
+    ]
+    for column in ("field", "gun", "comm", "shoot", "reward"):
+        for a, b in zip(logs[0].log[column], logs[1].log[column]):
+            np.testing.assert_array_equal(a, b)
+    assert logs[0].log["game_id"].tolist() == list(range(200))
+
+    # Perfectly correlated boxes: the assisted players never lose.
+    players = PRAssistedPlayers(layout, p_high=1.0)
+    log = Tournament(GameEnv(layout), players, layout).threaded_tournament(max_workers=4, seed=0)
+    assert log.outcome()[0] == 1.0
+
+
+def test_threaded_tournament_rejects_unsupported_setups():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.players_base import Players
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=10)
+    with pytest.raises(ValueError):
+        Tournament(GameEnv(layout), Players(layout), layout).threaded_tournament()
+    env = GameEnv(layout, gun_sampling="balanced")
+    with pytest.raises(ValueError):
+        Tournament(env, SimplePlayers(layout), layout).threaded_tournament()
+
+
+@pytest.mark.usefixtures("qsb")
+def test_threaded_tournament_records_log_probs_from_context():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=4, number_of_games_in_tournament=20)
+    players = NeuralNetPlayers(layout, explore=True)
+    log = Tournament(GameEnv(layout), players, layout).threaded_tournament(max_workers=3, seed=5)
+    logprob_comm = log.log["logprob_comm"].astype(float).to_numpy()
+    logprob_shoot = log.log["logprob_shoot"].astype(float).to_numpy()
+    assert np.all(np.isfinite(logprob_comm)) and np.all(logprob_comm <= 0.0)
+    assert np.all(np.isfinite(logprob_shoot)) and np.all(logprob_shoot <= 0.0)
+    player_a, player_b = players.players()
+    assert player_a.last_logprob is None and player_b.last_logprob is None
+
+
+@pytest.mark.usefixtures("qsb")
+def test_threaded_tournament_with_trainable_assisted_players():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.tournament import Tournament
+    from Q_Sea_Battle.trainable_assisted_players import TrainableAssistedPlayers
+
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=8)
+    players = TrainableAssistedPlayers(layout)
+    log = Tournament(GameEnv(layout), players, layout).threaded_tournament(max_workers=2, seed=1)
+    assert len(log.log) == 8
+    assert log.log["prev_measurements"].notna().all()
+    assert players.previous is None
@@ -107,3 +107,159 @@ def test_game_env_apply_channel_noise_probabilistic_is_seedable():
     np.random.seed(0)
     out_b = env.apply_channel_noise(comm)
     assert np.array_equal(out_a, out_b)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_noise_mask_reproduces_apply_channel_noise():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=4, comms_size=8, channel_noise=0.3)
+    env = GameEnv(layout)
+    comm = np.array([0, 1, 0, 1, 1, 0, 0, 1])
+
+    np.random.seed(4)
+    direct = env.apply_channel_noise(comm)
+    np.random.seed(4)
+    mask = env.sample_noise_mask(comm.shape)
+    np.testing.assert_array_equal(env.apply_noise_mask(comm, mask), direct)
+    np.testing.assert_array_equal(comm, [0, 1, 0, 1, 1, 0, 0, 1])
+
+    full = GameEnv(GameLayout(field_size=4, comms_size=8, channel_noise=1.0))
+    assert full.sample_noise_mask((8,)).all()
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_balanced_guns_and_antithetic_fields():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    env = GameEnv(layout, gun_sampling="balanced", field_sampling="antithetic", block_size=8)
+
+    np.random.seed(2)
+    guns, fields, blocks = [], [], []
+    for _ in range(16):
+        env.reset()
+        field, gun = env.provide()
+        guns.append(int(np.argmax(gun)))
+        fields.append(field)
+        blocks.append(env.sample_block)
+
+    assert blocks == [0] * 8 + [1] * 8
+    for b in range(2):
+        assert sorted(guns[8 * b : 8 * b + 8]) == [0, 0, 1, 1, 2, 2, 3, 3]
+    for i in range(0, 16, 2):
+        np.testing.assert_array_equal(fields[i + 1], 1 - fields[i])
+
+    env.restart_sampling()
+    env.reset()
+    assert env.sample_block == 0
+
+    with pytest.raises(ValueError):
+        GameEnv(GameLayout(field_size=2, enemy_probability=0.3), field_sampling="antithetic")
+    with pytest.raises(ValueError):
+        GameEnv(layout, gun_sampling="balanced", block_size=6)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_stratified_noise_fixes_flip_counts_per_block():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=4, comms_size=4, channel_noise=0.25)
+    env = GameEnv(layout, noise_sampling="stratified")
+    assert env.block_size == 16
+
+    np.random.seed(8)
+    masks = []
+    for _ in range(16):
+        env.reset()
+        masks.append(env.sample_noise_mask((4,)))
+    # 0.25 * 16 = 4 flips per bit, exactly.
+    np.testing.assert_array_equal(np.sum(masks, axis=0), [4, 4, 4, 4])
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_buffered_reuses_read_only_buffers():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=4, comms_size=2, channel_noise=0.3)
+    env = GameEnv(layout, buffered=True, seed=3)
+
+    env.reset()
+    field, gun = env.provide()
+    comm = env.apply_channel_noise(np.array([1, 0]))
+    assert not field.flags.writeable and not gun.flags.writeable and not comm.flags.writeable
+    assert gun.sum() == 1
+    idx = int(np.argmax(gun))
+    assert env.evaluate(field[idx]) == 1.0
+    assert env.evaluate(1 - field[idx]) == 0.0
+
+    env.reset()
+    field2, gun2 = env.provide()
+    assert field2 is field and gun2 is gun
+    assert gun2.sum() == 1
+    assert env.apply_channel_noise(np.array([0, 1])) is comm
+
+    # Same seed, same stream.
+    other = GameEnv(layout, buffered=True, seed=3)
+    other.reset()
+    env = GameEnv(layout, buffered=True, seed=3)
+    env.reset()
+    np.testing.assert_array_equal(env.provide()[0], other.provide()[0])
+
+    with pytest.raises(ValueError):
+        GameEnv(layout, buffered=True, gun_sampling="balanced")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_buffered_steady_state_does_not_allocate_arrays():
+    import tracemalloc
+
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=32, comms_size=4, channel_noise=0.1)
+    env = GameEnv(layout, buffered=True, seed=0)
+    message = np.array([1, 0, 1, 0])
+
+    def step():
+        env.reset()
+        field, _ = env.provide()
+        env.apply_channel_noise(message)
+        env.evaluate(int(field[0]))
+
+    step()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(200):
+            step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # A fresh 32x32 int field alone is 8 KiB; only small scalars remain.
+    assert peak - base < 4096
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_env_buffered_mode_in_tournament_logs_distinct_rows():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=20)
+    players = SimplePlayers(layout)
+    assert players.players()[0] is players.players()[0]
+
+    log = Tournament(GameEnv(layout, buffered=True, seed=1), players, layout).tournament()
+    fields = np.stack(log.log["field"].to_list())
+    guns = np.stack(log.log["gun"].to_list())
+    assert len({f.tobytes() for f in fields}) > 1
+    assert all(f.flags.writeable for f in log.log["field"])
+    cells = fields[np.arange(len(fields)), guns.argmax(axis=1)]
+    np.testing.assert_array_equal(cells, log.log["cell_value"].to_numpy())
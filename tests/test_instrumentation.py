@@ -0,0 +1,81 @@
+import json
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_game_play_unchanged_by_instrumentation():
+    from Q_Sea_Battle.game import Game
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.instrumentation import GAME_STAGES, Instrumentation
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+
+    layout = GameLayout(field_size=4, comms_size=2, channel_noise=0.1)
+
+    np.random.seed(7)
+    plain = Game(GameEnv(layout), MajorityPlayers(layout)).play()
+
+    instrumentation = Instrumentation()
+    np.random.seed(7)
+    timed = Game(GameEnv(layout), MajorityPlayers(layout), instrumentation=instrumentation).play()
+
+    assert plain[0] == timed[0] and plain[4] == timed[4]
+    for a, b in zip(plain[1:4], timed[1:4]):
+        np.testing.assert_array_equal(a, b)
+
+    summary = instrumentation.summary()
+    assert summary.games == 1
+    for stage in GAME_STAGES:
+        assert summary.stages[stage].calls == 1
+    assert summary.wall_seconds == pytest.approx(summary.stages["game"].total_seconds)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_tournament_instrumentation_summary_and_chrome_trace(tmp_path):
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.instrumentation import GAME_STAGES, Instrumentation
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=12)
+    instrumentation = Instrumentation(trace=True)
+    t = Tournament(GameEnv(layout), SimplePlayers(layout), layout, instrumentation=instrumentation)
+    log = t.tournament()
+    assert len(log.log) == 12
+
+    summary = instrumentation.summary()
+    assert summary.games == 12
+    assert summary.tournaments == 1
+    assert summary.stages["log_write"].calls == 12
+    assert summary.log_write_seconds > 0.0
+    assert summary.games_per_sec == pytest.approx(12 / summary.wall_seconds)
+    stage_total = sum(summary.stages[s].total_seconds for s in (*GAME_STAGES, "log_write"))
+    assert stage_total <= summary.wall_seconds
+    assert "player_a_decide" in summary.format()
+    json.dumps(summary.to_dict())
+
+    path = instrumentation.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads(path.read_text())["traceEvents"]
+    names = [e["name"] for e in events]
+    assert names.count("game") == 12
+    assert names.count("tournament") == 1
+    assert all(e["ph"] == "X" and e["dur"] >= 0.0 for e in events)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_instrumentation_trace_cap_and_disabled_export(tmp_path):
+    from Q_Sea_Battle.instrumentation import Instrumentation
+
+    capped = Instrumentation(trace=True, max_trace_events=2)
+    for i in range(5):
+        capped.record("stage", float(i), float(i) + 0.5)
+    assert len(capped.chrome_trace()["traceEvents"]) == 2
+    assert capped.dropped_trace_events == 3
+    assert capped.summary().stages["stage"].calls == 5
+
+    with pytest.raises(RuntimeError):
+        Instrumentation().write_chrome_trace(tmp_path / "trace.json")
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_streaming_majority_matches_array_players():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.large_field import LargeFieldMajorityPlayers, iter_field_blocks
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+
+    rng = np.random.default_rng(0)
+    for m in (1, 4, 16):
+        layout = GameLayout(field_size=8, comms_size=m)
+        reference_a, reference_b = MajorityPlayers(layout).players()
+        player_a, player_b = LargeFieldMajorityPlayers(layout).players()
+        for block_size in (1, 8, 64):
+            field = rng.integers(0, 2, size=64)
+            comm = player_a.decide_stream(iter_field_blocks(field, block_size))
+            np.testing.assert_array_equal(comm, reference_a.decide(field))
+            gun_index = int(rng.integers(64))
+            assert player_b.decide_index(gun_index, comm) == reference_b.decide(np.eye(64, dtype=int)[gun_index], comm)
+
+
+def test_streaming_pr_assisted_win_rates():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.large_field import (
+        LargeFieldGameEnv,
+        LargeFieldPRAssistedPlayers,
+        LargeFieldTournament,
+    )
+    from Q_Sea_Battle.reference_performance_utilities import expected_win_rate_assisted
+
+    # Perfect boxes always win, whatever the block size.
+    layout = GameLayout(field_size=32, comms_size=1)
+    for block_size in (1, 16, 1 << 16):
+        env = LargeFieldGameEnv(layout, block_size=block_size, seed=block_size)
+        result = LargeFieldTournament(env, LargeFieldPRAssistedPlayers(layout, p_high=1.0, seed=1), 20).tournament()
+        assert result.outcome() == (1.0, 0.0)
+
+    layout = GameLayout(field_size=4, comms_size=1)
+    env = LargeFieldGameEnv(layout, block_size=4, seed=2)
+    result = LargeFieldTournament(env, LargeFieldPRAssistedPlayers(layout, p_high=0.85, seed=3), 4000).tournament()
+    mean, std_error = result.outcome()
+    expected = expected_win_rate_assisted(field_size=4, comms_size=1, p_high=0.85)
+    assert abs(mean - expected) < 4 * std_error
+    assert result.games_per_sec > 0
+
+
+def test_large_field_env_streams_without_full_arrays():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.large_field import LargeFieldGameEnv, LargeFieldPRAssistedPlayers, LargeFieldTournament
+
+    layout = GameLayout(field_size=1024, comms_size=1)  # n2 = 2**20
+    env = LargeFieldGameEnv(layout, block_size=1 << 12, seed=0)
+    with pytest.raises(RuntimeError):
+        next(env.field_blocks())
+    env.reset()
+    with pytest.raises(RuntimeError):
+        env.evaluate(1)
+    sizes = {block.size for _, block in env.field_blocks()}
+    assert sizes == {1 << 12} and env.cell_value in (0, 1)
+
+    players = LargeFieldPRAssistedPlayers(layout, p_high=1.0, seed=0)
+    assert LargeFieldTournament(env, players, 2).tournament().outcome()[0] == 1.0
+    assert len(players.boxes) == 20
+
+    with pytest.raises(ValueError):
+        LargeFieldGameEnv(layout, block_size=3)
+    with pytest.raises(ValueError):
+        LargeFieldPRAssistedPlayers(GameLayout(field_size=4, comms_size=2), p_high=0.9)
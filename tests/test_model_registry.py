@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_parse_model_filename_variants():
+    from Q_Sea_Battle.model_registry import parse_model_filename
+
+    e = parse_model_filename("models/neural_net_model_b_f16_c4.keras")
+    assert (e.family, e.side, e.field_size, e.comms_size, e.phase) == ("neural_net_model", "B", 16, 4, None)
+
+    e = parse_model_filename("diag_bc_neural_A_bc_tau_0.25.keras")
+    assert (e.family, e.side, e.tau, e.phase) == ("diag_bc_neural", "A", 0.25, "bc")
+    assert e.pair_key == "diag_bc_neural_*_bc_tau_0.25"
+
+    e = parse_model_filename("diag_sched_neural_B_ste_alpha_0.50.keras")
+    assert (e.side, e.alpha, e.phase) == ("B", 0.5, "ste")
+
+    e = parse_model_filename("neural_A_stacked_field16_comms4.keras")
+    assert (e.family, e.field_size, e.comms_size, e.phase) == ("neural", 16, 4, "stacked")
+
+    e = parse_model_filename("lin_model_a_f4_m1_p1.00.keras")
+    assert (e.name, e.field_size, e.comms_size, e.p_high) == ("lin_model_a_f4_m1_p1.00", 4, 1, 1.0)
+
+    e = parse_model_filename("diag_bc_neural_B_phase1_logits.keras")
+    assert e.phase == "phase1_logits" and e.tau is None
+
+
+@pytest.mark.usefixtures("qsb")
+def test_registry_indexes_shipped_models_without_loading():
+    import sys as _sys
+
+    from Q_Sea_Battle.model_registry import ModelRegistry
+
+    registry = ModelRegistry("models")
+    assert len(registry) >= 30
+    a, b = registry.pair(family="diag_sched_neural", alpha=0.75)
+    assert (a.side, b.side) == ("A", "B")
+    assert len(registry.find(family="diag_bc_neural", side="a")) == 5
+    assert registry.cache_info().currsize == 0
+    assert set(registry.to_frame().columns) >= {"family", "side", "tau", "alpha", "phase"}
+    assert "class_name" in a.keras_config()
+
+    with pytest.raises(LookupError):
+        registry.pair(family="diag_bc_neural")  # several taus and phases
+    with pytest.raises(LookupError):
+        registry.get(family="no_such_family")
+    with pytest.raises(ValueError):
+        registry.find(colour="red")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_registry_lru_cache_and_load_into_players(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.model_registry import ModelRegistry
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    for c in (1, 2):
+        source = NeuralNetPlayers(GameLayout(field_size=2, comms_size=c))
+        source.store_models(
+            str(tmp_path / f"neural_net_model_a_f2_c{c}.keras"),
+            str(tmp_path / f"neural_net_model_b_f2_c{c}.keras"),
+        )
+
+    registry = ModelRegistry(tmp_path, cache_size=2)
+    assert len(registry) == 4
+
+    players = NeuralNetPlayers(layout)
+    player_a, player_b = players.players()
+    entry_a, entry_b = registry.load_into(players, field_size=2, comms_size=1)
+    assert entry_a.side == "A" and players.model_a is player_a.model_a
+    assert registry.cache_info().misses == 2
+
+    model_a, model_b = registry.load_pair(field_size=2, comms_size=1)
+    assert model_a is players.model_a and model_b is players.model_b
+    assert registry.cache_info().hits == 2
+
+    field = np.array([0, 1, 1, 0])
+    assert player_a.decide(field).shape == (1,)
+
+    # Loading a third model evicts the least recently used one (model A).
+    registry.load(registry.get(side="A", comms_size=2))
+    assert registry.cache_info().currsize == 2
+    assert registry.load(entry_b) is model_b
+    assert registry.load(entry_a) is not model_a
+
+    players.load_models(str(entry_a.path), str(entry_b.path), registry=registry)
+    assert players.model_b is model_b
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_lookup_tables_match_models_and_are_invalidated():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    layout = GameLayout(field_size=2, comms_size=2)
+    players = NeuralNetPlayers(layout)
+    player_a, player_b = players.players()
+
+    rng = np.random.default_rng(0)
+    cases = []
+    for _ in range(12):
+        field = rng.integers(0, 2, size=4)
+        gun = np.eye(4, dtype=int)[rng.integers(4)]
+        comm = player_a.decide(field)
+        log_prob_a = player_a.get_log_prob()
+        shoot = player_b.decide(gun, comm)
+        cases.append((field, gun, comm, log_prob_a, shoot, player_b.get_log_prob()))
+
+    assert players.compile_lookup_tables() == {"A": True, "B": True}
+    assert player_a.logit_table.shape == (16, 2)
+    assert player_b.logit_table.shape == (4, 4)
+    assert players.stale_lookup_tables() == ()
+    for field, gun, comm, log_prob_a, shoot, log_prob_b in cases:
+        np.testing.assert_array_equal(player_a.decide(field), comm)
+        assert player_a.get_log_prob() == pytest.approx(log_prob_a, abs=1e-5)
+        assert player_b.decide(gun, comm) == shoot
+        assert player_b.get_log_prob() == pytest.approx(log_prob_b, abs=1e-5)
+
+    # Explore mode samples from the tabulated logits.
+    players.set_explore(True)
+    np.random.seed(1)
+    comm = player_a.decide(cases[0][0])
+    assert player_a.get_log_prob() <= 0.0
+    assert comm.shape == (2,)
+    players.set_explore(False)
+
+    # Weights changed outside the factory: detected, recompiled on request.
+    weights = players.model_b.get_weights()
+    players.model_b.set_weights([w + 0.1 for w in weights])
+    assert players.stale_lookup_tables() == ("B",)
+    table_a = player_a.logit_table
+    players.compile_lookup_tables()
+    assert player_a.logit_table is table_a
+
+    # Replacing the models drops the tables.
+    players.set_models(players.model_a, players.model_b)
+    assert player_a.logit_table is None and player_b.logit_table is None
+
+
+@pytest.mark.usefixtures("qsb")
+def test_lookup_table_for_a_is_limited_to_small_fields():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    players = NeuralNetPlayers(GameLayout(field_size=4, comms_size=1))
+    assert players.compile_lookup_tables(max_field_bits=8) == {"A": False, "B": True}
+    player_a, player_b = players.players()
+    assert player_a.logit_table is None
+    assert player_b.logit_table.shape == (16, 2)
+
+    # Non-binary inputs fall back to the model in strict mode.
+    assert player_b.decide(np.eye(16)[3], np.array([0.3])) in (0, 1)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_tournament_drops_tables_of_weights_changed_in_place():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=10)
+    players = NeuralNetPlayers(layout)
+    player_a, player_b = players.players()
+    players.compile_lookup_tables()
+    table_a = player_a.logit_table
+
+    # An optimizer step outside the factory changes model_b only.
+    players.model_b.set_weights([w + 0.1 for w in players.model_b.get_weights()])
+    Tournament(GameEnv(layout), players, layout).tournament()
+    assert player_a.logit_table is table_a
+    assert player_b.logit_table is None
+
+    # A model assigned directly to a player is not shadowed by the table.
+    players.compile_lookup_tables()
+    player_a.model_a = players._build_model_a()
+    Tournament(GameEnv(layout), players, layout).threaded_tournament(seed=0)
+    assert player_a.logit_table is None
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_exported_neural_net_models_match_keras(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.numpy_inference import DenseStack, NumpyNeuralNetPlayers, export_dense_stack
+
+    layout = GameLayout(field_size=4, comms_size=2)
+    players = NeuralNetPlayers(layout)
+    players.players()
+
+    rng = np.random.default_rng(0)
+    x_a = rng.integers(0, 2, size=(64, 16)).astype(np.float32) - 0.5
+    x_b = rng.random((64, 3)).astype(np.float32)
+
+    stack_a = export_dense_stack(players.model_a)
+    stack_b = export_dense_stack(players.model_b)
+    assert stack_a.activations == ["relu", "relu", "linear"]
+    np.testing.assert_allclose(stack_a(x_a), players.model_a(x_a).numpy(), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(stack_b(x_b), players.model_b(x_b).numpy(), rtol=1e-5, atol=1e-5)
+
+    loaded = DenseStack.load(stack_a.save(tmp_path / "a.npz"))
+    np.testing.assert_array_equal(loaded(x_a), stack_a(x_a))
+    assert loaded.name == players.model_a.name
+
+    # Same decisions and log-probabilities as the Keras players.
+    numpy_players = NumpyNeuralNetPlayers.from_neural_net_players(players)
+    keras_a, keras_b = players.players()
+    np_a, np_b = numpy_players.players()
+    for _ in range(10):
+        field = rng.integers(0, 2, size=16)
+        gun = np.eye(16, dtype=int)[rng.integers(16)]
+        comm = keras_a.decide(field)
+        np.testing.assert_array_equal(np_a.decide(field), comm)
+        assert np_a.get_log_prob() == pytest.approx(keras_a.get_log_prob(), abs=1e-4)
+        assert np_b.decide(gun, comm) == keras_b.decide(gun, comm)
+        assert np_b.get_log_prob() == pytest.approx(keras_b.get_log_prob(), abs=1e-4)
+
+    with pytest.raises(ValueError):
+        NumpyNeuralNetPlayers(GameLayout(field_size=8, comms_size=2), stack_a, stack_b)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_export_lin_and_pyr_dense_sublayers():
+    import tensorflow as tf
+
+    from Q_Sea_Battle.lin_combine_layer_a import LinCombineLayerA
+    from Q_Sea_Battle.lin_measurement_layer_a import LinMeasurementLayerA
+    from Q_Sea_Battle.numpy_inference import export_dense_stack
+    from Q_Sea_Battle.pyr_combine_layer_a import PyrCombineLayerA
+
+    rng = np.random.default_rng(1)
+    fields = rng.integers(0, 2, size=(8, 16)).astype(np.float32)
+
+    measure = LinMeasurementLayerA(n2=16, hidden_units=(12, 8))
+    expected = measure(fields).numpy()
+    stack = export_dense_stack(measure)
+    assert stack.activations == ["relu", "relu", "sigmoid"]
+    np.testing.assert_allclose(stack(fields), expected, rtol=1e-5, atol=1e-6)
+
+    combine = LinCombineLayerA(comms_size=2, hidden_units=(8,))
+    expected = combine(fields).numpy()
+    np.testing.assert_allclose(export_dense_stack(combine)(fields), expected, rtol=1e-5, atol=1e-5)
+
+    pyr = PyrCombineLayerA(hidden_units=6)
+    outcomes = rng.integers(0, 2, size=(8, 8)).astype(np.float32)
+    expected = pyr(fields, outcomes).numpy()
+    stack = export_dense_stack(pyr)
+    np.testing.assert_allclose(stack(np.concatenate([fields, outcomes], axis=1)), expected, rtol=1e-5, atol=1e-6)
+
+    conv = tf.keras.Sequential([tf.keras.Input((4, 4, 1)), tf.keras.layers.Conv2D(2, 2)])
+    with pytest.raises(ValueError):
+        export_dense_stack(conv)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_numpy_players_play_tournament_from_bundle(tmp_path):
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.numpy_inference import NumpyNeuralNetPlayers, export_keras_model
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    players = NeuralNetPlayers(layout)
+    players.store_models(str(tmp_path / "a.keras"), str(tmp_path / "b.keras"))
+    export_keras_model(tmp_path / "a.keras", tmp_path / "a.npz")
+    export_keras_model(tmp_path / "b.keras", tmp_path / "b.npz")
+
+    numpy_players = NumpyNeuralNetPlayers.from_files(layout, tmp_path / "a.npz", tmp_path / "b.npz")
+    log = Tournament(GameEnv(layout), numpy_players, layout).tournament()
+    assert len(log.log) == 20
+    assert log.log["logprob_comm"].notna().all()
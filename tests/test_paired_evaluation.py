@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_paired_evaluation_identical_players_have_zero_difference():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.paired_evaluation import PairedEvaluation
+
+    layout = GameLayout(field_size=4, comms_size=2, channel_noise=0.1)
+    result = PairedEvaluation(
+        layout, {"first": MajorityPlayers(layout), "second": MajorityPlayers(layout)}
+    ).run(n_games=200)
+
+    assert result.rewards.shape == (2, 200)
+    assert result.difference("first", "second") == (0.0, 0.0)
+    with pytest.raises(ValueError):
+        result.outcome("missing")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_paired_evaluation_reduces_standard_error_of_differences():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.paired_evaluation import PairedEvaluation
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.simple_players import SimplePlayers
+
+    np.random.seed(21)
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=600)
+    evaluation = PairedEvaluation(
+        layout,
+        {
+            "simple": SimplePlayers(layout),
+            "majority": MajorityPlayers(layout),
+            "pr_assisted": PRAssistedPlayers(layout, p_high=1.0),
+        },
+    )
+    result = evaluation.run()
+
+    summary = result.summary()
+    assert list(summary.index) == ["simple", "majority", "pr_assisted"]
+    # Perfect PR boxes win every game.
+    assert summary.loc["pr_assisted", "mean_reward"] == 1.0
+
+    table = result.differences()
+    assert len(table) == 3
+    row = table[(table["first"] == "simple") & (table["second"] == "majority")].iloc[0]
+    # Simple and majority players share the comm bit on the first cells,
+    # so their rewards are strongly correlated and pairing helps.
+    assert row["paired_std_error"] < row["independent_std_error"]
+    diff, se = result.difference("simple", "majority")
+    assert diff == pytest.approx(row["difference"]) and se == pytest.approx(row["paired_std_error"])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_train_layers_jointly_feeds_weight_transfer():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pyr_trainable_assisted_imitation_utilities import (
+        generate_combine_dataset_a,
+        generate_combine_dataset_b,
+        generate_measurement_dataset_a,
+        generate_measurement_dataset_b,
+        pyramid_levels,
+        train_layers_jointly,
+        transfer_pyr_model_a_layer_weights,
+        transfer_pyr_model_b_layer_weights,
+    )
+    from Q_Sea_Battle.pyr_trainable_assisted_model_a import PyrTrainableAssistedModelA
+    from Q_Sea_Battle.pyr_trainable_assisted_model_b import PyrTrainableAssistedModelB
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    levels = pyramid_levels(4)
+    datasets = {"meas_a": {}, "comb_a": {}, "meas_b": {}, "comb_b": {}}
+    for i, L in enumerate(levels):
+        datasets["meas_a"][L] = generate_measurement_dataset_a(L, num_samples=64, seed=i)
+        datasets["comb_a"][L] = generate_combine_dataset_a(L, num_samples=64, seed=i)
+        datasets["meas_b"][L] = generate_measurement_dataset_b(L, num_samples=64, seed=i)
+        datasets["comb_b"][L] = generate_combine_dataset_b(L, num_samples=64, seed=i)
+
+    layers, history = train_layers_jointly(datasets, epochs=2, batch_size=32, verbose=0)
+    assert {task: len(v) for task, v in layers.items()} == {"meas_a": 2, "comb_a": 2, "meas_b": 2, "comb_b": 2}
+    for name in ("meas_a_L4", "comb_a_L2", "comb_b_L4_next_gun", "comb_b_L2_next_comm"):
+        assert len(history.history[f"{name}_loss"]) == 2
+        assert f"{name}_binary_accuracy" in history.history
+
+    model_a = PyrTrainableAssistedModelA(layout, sr_mode="expected")
+    model_b = PyrTrainableAssistedModelB(layout, sr_mode="expected")
+    field = np.zeros((1, 4), np.float32)
+    _, meas, outs = model_a.compute_with_internal(field)
+    model_b([np.eye(4, dtype=np.float32)[:1], np.zeros((1, 1), np.float32), meas, outs])
+    transfer_pyr_model_a_layer_weights(model_a, layers["meas_a"], layers["comb_a"])
+    transfer_pyr_model_b_layer_weights(model_b, layers["meas_b"], layers["comb_b"])
+    for src, dst in zip(layers["comb_b"], model_b.combine_layers):
+        for w_src, w_dst in zip(src.get_weights(), dst.get_weights()):
+            np.testing.assert_array_equal(w_src, w_dst)
+
+    # Existing layers can be passed in and are trained in place.
+    before = [w.copy() for w in layers["meas_a"][0].get_weights()]
+    again, _ = train_layers_jointly({"meas_a": datasets["meas_a"]}, epochs=1, layers=layers, verbose=0)
+    assert again["meas_a"][0] is layers["meas_a"][0]
+    assert not np.allclose(before[0], layers["meas_a"][0].get_weights()[0])
+
+    datasets["meas_a"][4] = generate_measurement_dataset_a(4, num_samples=32, seed=0)
+    with pytest.raises(ValueError):
+        train_layers_jointly(datasets, epochs=1, verbose=0)
+    with pytest.raises(ValueError):
+        train_layers_jointly({"other": {}}, epochs=1, verbose=0)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_layer_tables_match_thresholded_layers():
+    from Q_Sea_Battle.pyr_combine_layer_a import PyrCombineLayerA
+    from Q_Sea_Battle.pyr_combine_layer_b import PyrCombineLayerB
+    from Q_Sea_Battle.pyr_lookup_tables import compile_layer_table, enumerate_binary_inputs
+    from Q_Sea_Battle.pyr_measurement_layer_a import PyrMeasurementLayerA
+
+    rows = enumerate_binary_inputs(3)
+    np.testing.assert_array_equal(rows[5], [1, 0, 1])
+
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 2, size=(32, 8)).astype(np.float32)
+    s = rng.integers(0, 2, size=(32, 4)).astype(np.float32)
+    c = rng.integers(0, 2, size=(32, 1)).astype(np.float32)
+
+    measure = PyrMeasurementLayerA()
+    table = compile_layer_table(measure, (8,))
+    np.testing.assert_array_equal(table(x).numpy(), measure(x).numpy() >= 0.5)
+
+    combine_a = PyrCombineLayerA()
+    table = compile_layer_table(combine_a, (8, 4))
+    np.testing.assert_array_equal(table(x, s).numpy(), combine_a(x, s).numpy() >= 0.5)
+
+    combine_b = PyrCombineLayerB()
+    table = compile_layer_table(combine_b, (8, 4, 1))
+    next_gun, next_comm = combine_b(x, s, c)
+    table_gun, table_comm = table(x, s, c)
+    np.testing.assert_array_equal(table_gun.numpy(), next_gun.numpy() >= 0.5)
+    np.testing.assert_array_equal(table_comm.numpy(), next_comm.numpy() >= 0.5)
+
+    with pytest.raises(ValueError):
+        compile_layer_table(combine_a, (8, 4), max_input_bits=10)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_compiled_pyr_models_run_in_sample_mode():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pyr_lookup_tables import LookupTableLayer, compile_pyr_lookup_tables
+    from Q_Sea_Battle.pyr_trainable_assisted_model_a import PyrTrainableAssistedModelA
+    from Q_Sea_Battle.pyr_trainable_assisted_model_b import PyrTrainableAssistedModelB
+
+    layout = GameLayout(field_size=4, comms_size=1)
+    rng = np.random.default_rng(1)
+    field = rng.integers(0, 2, size=(8, 16)).astype(np.float32)
+    gun = np.eye(16, dtype=np.float32)[rng.integers(0, 16, size=8)]
+    comm = rng.integers(0, 2, size=(8, 1)).astype(np.float32)
+
+    model_a = PyrTrainableAssistedModelA(layout)
+    model_b = PyrTrainableAssistedModelB(layout)
+    _, meas, outs = model_a.compute_with_internal(field)
+
+    compiled_a = compile_pyr_lookup_tables(model_a)
+    # Level 0 combine (16 + 8 bits) exceeds the default limit.
+    assert compiled_a.compiled_levels == [("measure",)] + [("measure", "combine")] * 3
+    assert isinstance(compiled_a.measure_layers[0], LookupTableLayer)
+    assert compiled_a.combine_layers[0] is model_a.combine_layers[0]
+    logits = compiled_a(field).numpy()
+    assert logits.shape == (8, 1)
+    assert set(np.unique(logits)) <= {-10.0, 10.0}
+
+    compiled_b = compile_pyr_lookup_tables(model_b)
+    assert compiled_b.compiled_levels == [("measure",)] + [("measure", "combine")] * 3
+    assert compiled_b([gun, comm, meas, outs]).numpy().shape == (8, 1)
+
+    with pytest.raises(ValueError):
+        compile_pyr_lookup_tables(PyrTrainableAssistedModelA(layout, sr_mode="expected"))
+    with pytest.raises(TypeError):
+        compile_pyr_lookup_tables(object())
+
+
+@pytest.mark.usefixtures("qsb")
+def test_export_dense_stack_rejects_two_head_layers():
+    from Q_Sea_Battle.numpy_inference import export_dense_stack
+    from Q_Sea_Battle.pyr_combine_layer_b import PyrCombineLayerB
+
+    layer = PyrCombineLayerB()
+    layer(np.zeros((1, 4), np.float32), np.zeros((1, 2), np.float32), np.zeros((1, 1), np.float32))
+    with pytest.raises(ValueError):
+        export_dense_stack(layer)
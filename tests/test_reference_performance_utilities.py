@@ -83,3 +83,82 @@ def test_expected_win_rate_invalid_domains_raise():
         expected_win_rate_simple(field_size=4, comms_size=1, enemy_probability=-0.1)
     with pytest.raises(ValueError):
         expected_win_rate_simple(field_size=4, comms_size=1, channel_noise=1.1)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_binary_entropy_reverse_array_matches_scalar_inverse():
+    import numpy as np
+    from Q_Sea_Battle.reference_performance_utilities import (
+        binary_entropy,
+        binary_entropy_array,
+        binary_entropy_reverse_array,
+    )
+
+    H = np.linspace(0.0, 1.0, 1001)
+    p = binary_entropy_reverse_array(H)
+    assert p.shape == H.shape
+    assert np.all((p >= 0.5) & (p <= 1.0))
+    assert np.max(np.abs(binary_entropy_array(p) - H)) < 1e-8
+    assert p[0] == 1.0 and p[-1] == 0.5
+
+    for h in (0.05, 0.3, 0.7, 0.95):
+        assert binary_entropy(float(binary_entropy_reverse_array(h))) == pytest.approx(h, abs=1e-8)
+
+    with pytest.raises(ValueError):
+        binary_entropy_reverse_array(np.array([0.5, 1.2]))
+
+
+@pytest.mark.usefixtures("qsb")
+def test_array_win_rates_match_scalar_versions():
+    import numpy as np
+    from Q_Sea_Battle.reference_performance_utilities import (
+        expected_win_rate_simple,
+        expected_win_rate_simple_array,
+        expected_win_rate_majority,
+        expected_win_rate_majority_array,
+        expected_win_rate_assisted,
+        expected_win_rate_assisted_array,
+    )
+
+    field_sizes = np.array([2, 4, 4, 8, 8])
+    comms_sizes = np.array([1, 1, 4, 2, 16])
+    for p in (0.0, 0.3, 0.5):
+        for c in (0.0, 0.1):
+            simple = expected_win_rate_simple_array(field_sizes, comms_sizes, p, c)
+            majority = expected_win_rate_majority_array(field_sizes, comms_sizes, p, c)
+            for i, (fs, m) in enumerate(zip(field_sizes, comms_sizes)):
+                assert simple[i] == pytest.approx(expected_win_rate_simple(int(fs), int(m), p, c))
+                assert majority[i] == pytest.approx(expected_win_rate_majority(int(fs), int(m), p, c))
+
+    p_high = np.linspace(0.5, 1.0, 11)
+    assisted = expected_win_rate_assisted_array(np.array([[2], [4], [8]]), 1, 0.5, 0.05, p_high)
+    assert assisted.shape == (3, 11)
+    for i, fs in enumerate((2, 4, 8)):
+        for j, ph in enumerate(p_high):
+            assert assisted[i, j] == pytest.approx(
+                expected_win_rate_assisted(fs, 1, channel_noise=0.05, p_high=float(ph))
+            )
+
+    with pytest.raises(ValueError):
+        expected_win_rate_majority_array(4, np.array([1, 3]))
+
+
+@pytest.mark.usefixtures("qsb")
+def test_limit_from_mutual_information_array_matches_scalar():
+    import numpy as np
+    from Q_Sea_Battle.reference_performance_utilities import (
+        binary_entropy,
+        limit_from_mutual_information,
+        limit_from_mutual_information_array,
+    )
+
+    noise = np.linspace(0.0, 0.5, 26)
+    limits = limit_from_mutual_information_array(4, np.array([[0], [1], [4], [16]]), noise)
+    assert limits.shape == (4, 26)
+    assert np.all(limits[0] == 0.5)
+
+    for i, m in enumerate((0, 1, 4, 16)):
+        for j, c in enumerate(noise):
+            expected = limit_from_mutual_information(4, m, float(c))
+            # Both inversions stop once H(p) is within 1e-8 of the target, so compare in H.
+            assert binary_entropy(limits[i, j]) == pytest.approx(binary_entropy(expected), abs=2e-8)
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_replay_buffer_ring_and_sampling():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.replay_buffer import ReplayBuffer
+
+    layout = GameLayout(field_size=2, comms_size=2)
+    buffer = ReplayBuffer(layout, capacity=5, seed=0)
+    with pytest.raises(ValueError):
+        buffer.sample(1)
+
+    def batch(start, n):
+        ids = np.arange(start, start + n)
+        return dict(
+            field=np.tile(ids[:, None] % 2, (1, 4)),
+            gun=ids % 4,
+            comm=np.tile(ids[:, None] % 2, (1, 2)),
+            shoot=ids % 2,
+            reward=ids.astype(float),
+        )
+
+    buffer.add_batch(**batch(0, 3), logprob_shoot=np.full(3, -0.5))
+    assert len(buffer) == 3 and not buffer.full
+    assert np.isnan(buffer.arrays["logprob_comm"][:3]).all()
+    assert buffer.arrays["comm_known"][:3].all()
+    buffer.add_batch(**batch(3, 4))  # wraps around
+    assert buffer.full and buffer.games_added == 7
+    assert buffer.latest(5)["reward"].tolist() == [2, 3, 4, 5, 6]
+    assert buffer.arrays["reward"][buffer.indices()].tolist() == [2, 3, 4, 5, 6]
+    buffer.add_batch(**batch(7, 12))  # larger than the capacity
+    assert buffer.latest(5)["reward"].tolist() == [14, 15, 16, 17, 18]
+    assert buffer.games_added == 19
+
+    sample = buffer.sample(64)
+    assert sample["field"].shape == (64, 4) and sample["field"].dtype == np.uint8
+    assert set(sample["reward"]) <= {14.0, 15.0, 16.0, 17.0, 18.0}
+    np.testing.assert_array_equal(sample["comm"], sample["comm_received"])
+    assert sorted(buffer.sample(5, replace=False)["reward"]) == [14, 15, 16, 17, 18]
+    with pytest.raises(ValueError):
+        buffer.sample(6, replace=False)
+    with pytest.raises(ValueError):
+        buffer.add_batch(np.zeros((2, 4)), np.zeros(3), np.zeros((2, 2)), np.zeros(2), np.zeros(2))
+    with pytest.raises(ValueError):
+        ReplayBuffer(layout, capacity=0)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_replay_buffer_from_explore_tournament():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.replay_buffer import ReplayBuffer
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    players = NeuralNetPlayers(layout, explore=True)
+    log = Tournament(GameEnv(layout), players, layout).tournament()
+    buffer = ReplayBuffer(layout, capacity=100)
+    buffer.add_log(log)
+    assert len(buffer) == 20
+    np.testing.assert_allclose(buffer.arrays["logprob_shoot"][:20], log.log["logprob_shoot"].astype(float), rtol=1e-6)
+    assert buffer.arrays["gun"][:20].tolist() == [int(np.argmax(g)) for g in log.log["gun"]]
+    assert buffer.mean_reward()[0] == pytest.approx(log.outcome()[0])
+    np.testing.assert_allclose(buffer.arrays["logprob_comm"][:20], log.log["logprob_comm"].astype(float), rtol=1e-6)
+
+    # With channel noise the logged comm is not the one A's log-prob refers to.
+    noisy = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20, channel_noise=0.1)
+    log = Tournament(GameEnv(noisy), NeuralNetPlayers(noisy, explore=True), noisy).tournament()
+    buffer = ReplayBuffer(noisy, capacity=100)
+    buffer.add_log(log)
+    assert np.isnan(buffer.arrays["logprob_comm"][:20]).all()
+    assert np.isfinite(buffer.arrays["logprob_shoot"][:20]).all()
+    assert not buffer.arrays["comm_known"][:20].any()
+
+
+@pytest.mark.usefixtures("qsb")
+def test_reinforce_trainer_improves_explore_play():
+    import tensorflow as tf
+
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.reinforce_training import ReinforceTrainer
+
+    tf.keras.utils.set_random_seed(0)
+    layout = GameLayout(field_size=2, comms_size=1)
+    trainer = ReinforceTrainer(NeuralNetPlayers(layout), batch_size=512, learning_rate=3e-3, seed=0)
+    before, _ = trainer.collect(2048)
+    history = trainer.run(120)
+    after, std_error = trainer.collect(2048)
+    assert len(history) == 120 and len(trainer.buffer) == trainer.buffer.capacity
+    assert after > before + 5 * std_error
+    assert 0.0 < history[-1]["mean_weight"] <= trainer.max_importance_weight
+
+    # Per-gun baseline: mean reward of the other games with the same gun.
+    reward = np.array([1, 0, 1, 1, 0, 0, 1, 1, 1, 0], dtype=np.float32)
+    gun = np.array([0, 0, 1, 1, 2, 2, 3, 4, 4, 4])
+    trainer.normalize_adv = False
+    np.testing.assert_allclose(
+        trainer.advantages(reward, gun), [1.0, -1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.5, 0.5, -1.0]
+    )
+    with pytest.raises(ValueError):
+        ReinforceTrainer(NeuralNetPlayers(layout), baseline="median")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_reinforce_trainer_noisy_log_trains_only_player_b():
+    import tensorflow as tf
+
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.reinforce_training import ReinforceTrainer
+    from Q_Sea_Battle.tournament import Tournament
+
+    tf.keras.utils.set_random_seed(1)
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=64, channel_noise=0.2)
+    players = NeuralNetPlayers(layout, explore=True)
+    log = Tournament(GameEnv(layout), players, layout).tournament()
+    trainer = ReinforceTrainer(players, batch_size=64, learning_rate=1e-2, entropy_coeff=0.01)
+    trainer.buffer.add_log(log)
+
+    weights_a = [w.copy() for w in trainer.model_a.get_weights()]
+    weights_b = [w.copy() for w in trainer.model_b.get_weights()]
+    record = trainer.step(trainer.buffer.latest(64))
+    assert 0.0 < record["mean_weight"] <= trainer.max_importance_weight
+    for before, after in zip(weights_a, trainer.model_a.get_weights()):
+        np.testing.assert_array_equal(before, after)
+    assert any(not np.array_equal(b, a) for b, a in zip(weights_b, trainer.model_b.get_weights()))
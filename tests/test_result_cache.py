@@ -0,0 +1,146 @@
+import os
+import time
+
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_result_cache_hits_and_invalidation(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.result_cache import ResultCache, players_fingerprint
+
+    cache = ResultCache(tmp_path)
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=50)
+
+    first = cache.evaluate(MajorityPlayers(layout), layout, seed=1)
+    assert not first.cached and first.n_games == 50
+    again = cache.evaluate(MajorityPlayers(layout), layout, seed=1)
+    assert again.cached and again.outcome() == first.outcome()
+
+    # Seed, layout, sampling options and settings all change the key.
+    assert not cache.evaluate(MajorityPlayers(layout), layout, seed=2).cached
+    other = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=60)
+    assert not cache.evaluate(MajorityPlayers(other), other, seed=1).cached
+    assert not cache.evaluate(MajorityPlayers(layout), layout, seed=1, game_env_options={"buffered": True}).cached
+    key_a = cache.key(PRAssistedPlayers(layout, p_high=0.9), layout, 1)
+    assert key_a != cache.key(PRAssistedPlayers(layout, p_high=0.8), layout, 1)
+    assert players_fingerprint(PRAssistedPlayers(layout, p_high=0.9))["p_high"] == 0.9
+
+    # A players class defined outside the package contributes its own source.
+    class LocalPlayers(MajorityPlayers):
+        pass
+
+    assert players_fingerprint(LocalPlayers(layout))["code"] != players_fingerprint(MajorityPlayers(layout))["code"]
+
+
+@pytest.mark.usefixtures("qsb")
+def test_result_cache_tracks_weights_and_logs(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.result_cache import ResultCache
+
+    cache = ResultCache(tmp_path)
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    players = NeuralNetPlayers(layout)
+
+    first = cache.evaluate(players, layout, seed=0, store_log=True)
+    assert first.load_log().outcome() == pytest.approx(first.outcome())
+    assert cache.evaluate(players, layout, seed=0).cached
+
+    players.model_b.set_weights([w + 1.0 for w in players.model_b.get_weights()])
+    assert not cache.evaluate(players, layout, seed=0).cached
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.result_cache import ResultCache
+
+    cache = ResultCache(tmp_path, max_bytes=None)
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=10)
+    keys = [cache.evaluate(MajorityPlayers(layout), layout, seed=s).key for s in range(3)]
+    for age, key in zip((300, 100, 200), keys):
+        stamp = time.time() - age
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+
+    entry_size = cache.size_bytes() // 3
+    cache.max_bytes = 3 * entry_size
+    cache.evaluate(MajorityPlayers(layout), layout, seed=3)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None and cache.get(keys[2]) is not None
+
+    cache.clear()
+    assert cache.size_bytes() == 0
+
+
+def test_result_cache_notebook_players_and_global_rng(tmp_path):
+    import linecache
+    import types
+
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.result_cache import ResultCache, players_fingerprint
+    from Q_Sea_Battle.simple_players import SimplePlayers
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    cache = ResultCache(tmp_path)
+    code = (
+        "class NotebookPlayers(SimplePlayers):\n"
+        "    def players(self):\n"
+        "        return super().players()\n"
+        "class Fingerprinted(NotebookPlayers):\n"
+        "    def cache_fingerprint(self):\n"
+        "        return 'v1'\n"
+    )
+
+    def define(cell):
+        # Classes of a notebook cell: their module has no source file.
+        namespace = {"SimplePlayers": SimplePlayers, "__name__": "notebook_cell"}
+        exec(compile(code, cell, "exec"), namespace)
+        return namespace["NotebookPlayers"], namespace["Fingerprinted"]
+
+    sys.modules["notebook_cell"] = types.ModuleType("notebook_cell")
+    cell = "<ipython-input-1-test>"
+    linecache.cache[cell] = (len(code), None, code.splitlines(True), cell)
+    try:
+        # The code of the methods is still available through linecache.
+        notebook_players, _ = define(cell)
+        with pytest.warns(UserWarning):
+            assert not cache.evaluate(notebook_players(layout), layout, seed=1).cached
+
+        # Without any source the factory must provide cache_fingerprint().
+        notebook_players, fingerprinted = define("<lost-cell>")
+        with pytest.raises(ValueError):
+            players_fingerprint(notebook_players(layout))
+        with pytest.warns(UserWarning):
+            assert players_fingerprint(fingerprinted(layout))["custom"] == "v1"
+    finally:
+        linecache.cache.pop(cell, None)
+        sys.modules.pop("notebook_cell", None)
+
+    # The caller's global generator is left as it was.
+    np.random.seed(123)
+    expected = np.random.random()
+    np.random.seed(123)
+    cache.evaluate(SimplePlayers(layout), layout, seed=7)
+    assert np.random.random() == expected
+
+
+def test_result_cache_buffered_evaluation_is_reproducible(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.result_cache import ResultCache
+
+    layout = GameLayout(field_size=4, comms_size=2, channel_noise=0.1, number_of_games_in_tournament=200)
+    options = {"buffered": True}
+    first = ResultCache(tmp_path / "a").evaluate(MajorityPlayers(layout), layout, seed=7, game_env_options=options)
+    second = ResultCache(tmp_path / "b").evaluate(MajorityPlayers(layout), layout, seed=7, game_env_options=options)
+    assert not first.cached and not second.cached
+    assert first.key == second.key
+    assert first.outcome() == second.outcome()
+
+    cache = ResultCache(tmp_path / "a")
+    assert cache.key(MajorityPlayers(layout), layout, 7, options) != cache.key(MajorityPlayers(layout), layout, 8, options)
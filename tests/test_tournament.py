@@ -68,3 +68,52 @@ def test_tournament_runs_n_games_and_updates_log(monkeypatch):
     # Optional hooks should have been recorded
     assert log.log.iloc[-1]["logprob_comm"] is not None
     assert log.log.iloc[-1]["prev_measurements"] is not None
+
+
+@pytest.mark.usefixtures("qsb")
+def test_sequential_tournament_stops_on_target_std_error():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    np.random.seed(11)
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=5000)
+    t = Tournament(GameEnv(layout), SimplePlayers(layout), layout)
+    log = t.sequential_tournament(target_std_error=0.03, block_size=16, min_games=32)
+
+    stop = t.last_stopping
+    assert stop.reason == "target_std_error"
+    assert stop.games == len(log.log) and stop.games % 16 == 0
+    assert stop.games < 5000
+    assert stop.std_error <= 0.03
+    assert (stop.mean, stop.std_error) == pytest.approx(log.outcome())
+    assert list(log.log["game_id"]) == list(range(stop.games))
+
+
+@pytest.mark.usefixtures("qsb")
+def test_sequential_tournament_reference_exclusion_and_hard_cap():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.reference_performance_utilities import expected_win_rate_majority
+    from Q_Sea_Battle.tournament import Tournament
+
+    np.random.seed(5)
+    layout = GameLayout(field_size=4, comms_size=1, number_of_games_in_tournament=3000)
+    t = Tournament(GameEnv(layout), MajorityPlayers(layout), layout)
+
+    # Majority players are far from a perfect score: the interval quickly excludes 1.0.
+    t.sequential_tournament(reference=1.0, min_games=16, block_size=16)
+    assert t.last_stopping.reason == "reference_excluded"
+    assert t.last_stopping.ci_high < 1.0
+    assert t.last_stopping.games < 3000
+
+    # The true win rate is never excluded (with high probability): the cap applies.
+    true_rate = expected_win_rate_majority(field_size=4, comms_size=1)
+    log = t.sequential_tournament(reference=true_rate, confidence=0.999, max_games=64, block_size=16)
+    assert t.last_stopping.reason == "max_games"
+    assert len(log.log) == 64
+
+    with pytest.raises(ValueError):
+        t.sequential_tournament()
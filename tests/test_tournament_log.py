@@ -70,3 +70,53 @@ def test_tournament_log_last_row_updates():
     assert isinstance(row["game_uid"], str) and len(row["game_uid"]) > 0
     assert row["prev_measurements"] == [1, 2]
     assert row["prev_outcomes"] == [0, 1]
+
+
+@pytest.mark.usefixtures("qsb")
+def test_tournament_log_outcome_uses_block_standard_error():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.tournament_log import TournamentLog
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    field = np.zeros(4, dtype=int)
+    gun = np.array([1, 0, 0, 0])
+    comm = np.array([0])
+    rewards = [1.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 0.0]
+
+    iid = TournamentLog(layout)
+    blocked = TournamentLog(layout)
+    for i, r in enumerate(rewards):
+        iid.update(field, gun, comm, 0, 0, r)
+        blocked.update(field, gun, comm, 0, 0, r)
+        blocked.update_sample_block(i // 2)
+
+    mean, se_iid = iid.outcome()
+    assert se_iid == pytest.approx(np.std(rewards, ddof=1) / np.sqrt(8))
+
+    mean_b, se_b = blocked.outcome()
+    sums = np.add.reduceat(rewards, [0, 2, 4, 6])
+    expected = np.sqrt(4 / 3 * np.sum((sums - 2 * mean) ** 2) / 64)
+    assert mean_b == mean
+    assert se_b == pytest.approx(expected)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_balanced_gun_tournament_reports_smaller_block_standard_error():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.simple_players import SimplePlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    np.random.seed(13)
+    layout = GameLayout(field_size=2, comms_size=2, number_of_games_in_tournament=400)
+    env = GameEnv(layout, gun_sampling="balanced")
+    log = Tournament(env, SimplePlayers(layout), layout).tournament()
+
+    assert log.log["sample_block"].tolist() == [i // 4 for i in range(400)]
+    mean, se = log.outcome()
+    rewards = log.log["reward"].astype(float).to_numpy()
+    se_iid = rewards.std(ddof=1) / np.sqrt(rewards.size)
+    # Half of the gun positions are always won by simple players; balancing
+    # removes that source of variance.
+    assert se < se_iid
+    assert mean == pytest.approx(0.75, abs=3 * se)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def _play(layout, seed):
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    np.random.seed(seed)
+    return Tournament(GameEnv(layout), MajorityPlayers(layout), layout).tournament()
+
+
+def test_group_stats_match_pandas_groupby():
+    from Q_Sea_Battle.game_layout import GameLayout
+
+    layout = GameLayout(field_size=4, comms_size=4, number_of_games_in_tournament=300)
+    log = _play(layout, seed=0)
+    index = log.query()
+    assert len(index) == 300
+
+    df = log.log
+    guns = np.array([int(np.argmax(g)) for g in df["gun"]])
+    comms = np.array([int("".join(str(int(b)) for b in c), 2) for c in df["comm"]])
+    rewards = df["reward"].astype(float).to_numpy()
+    np.testing.assert_array_equal(index["gun"], guns)
+    np.testing.assert_array_equal(index["comm"], comms)
+    np.testing.assert_array_equal(index.comm_bits(comms), np.stack(df["comm"].to_numpy()))
+
+    import pandas as pd
+
+    frame = pd.DataFrame({"gun": guns, "comm": comms, "reward": rewards})
+    for by, stats in ((["gun"], index.win_rate_by_gun()), (["gun", "comm"], index.group_stats(["gun", "comm"]))):
+        expected = frame.groupby(by)["reward"].agg(["count", "mean", "sem"]).fillna(0.0)
+        np.testing.assert_array_equal(stats["count"].to_numpy(), expected["count"].to_numpy())
+        np.testing.assert_allclose(stats["mean"].to_numpy(), expected["mean"].to_numpy())
+        np.testing.assert_allclose(stats["std_error"].to_numpy(), expected["sem"].to_numpy(), atol=1e-12)
+        assert list(stats.index) == list(expected.index)
+
+    by_tournament = index.win_rate_by_tournament()
+    assert by_tournament["count"].sum() == 300
+    assert by_tournament["mean"].iloc[0] == pytest.approx(log.outcome()[0])
+
+    # Sparse keys go through np.unique.
+    index.columns["meta_id"] = np.where(np.arange(300) % 2 == 0, 10**12, -5)
+    stats = index.group_stats("meta_id", value="shoot")
+    assert list(stats.index) == [-5, 10**12] and stats["count"].tolist() == [150, 150]
+
+    with pytest.raises(KeyError):
+        index.group_stats("field")
+    with pytest.raises(KeyError):
+        index.group_stats("gun", value="logprob_comm")
+
+
+def test_query_index_is_maintained_incrementally(tmp_path):
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.tournament_log import TournamentLog
+    from Q_Sea_Battle.tournament_log_query import LogIndex
+
+    layout = GameLayout(field_size=2, comms_size=2, number_of_games_in_tournament=40)
+    log = TournamentLog(layout)
+    assert len(log.query()) == 0
+
+    field, gun, comm = np.zeros(4, int), np.eye(4, dtype=int)[2], np.array([1, 0])
+    log.update(field, gun, comm, 1, 0, 0.0)
+    first = log.query()
+    assert first["tournament_id"].tolist() == [-1]
+    log.update_indicators(game_id=0, tournament_id=7, meta_id=1)
+    log.update(field, np.eye(4, dtype=int)[1], np.array([1, 1]), 0, 0, 1.0)
+    index = log.query()
+    assert index is first
+    assert index["tournament_id"].tolist() == [7, -1]
+    assert index["gun"].tolist() == [2, 1] and index["comm"].tolist() == [2, 3]
+
+    played = _play(layout, seed=1)
+    log.log = played.log
+    assert len(log.query()) == 40
+
+    played.to_parquet(tmp_path / "log.parquet")
+    stored = LogIndex.from_parquet(tmp_path / "log.parquet")
+    for name, values in played.query().columns.items():
+        np.testing.assert_array_equal(stored[name], values)
+    filtered = LogIndex.from_parquet(tmp_path / "log.parquet", filters=[("game_id", "<", 10)])
+    assert len(filtered) == 10
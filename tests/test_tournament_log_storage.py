@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def _played_log(n_games=40, tournament_id=0):
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.tournament import Tournament
+
+    layout = GameLayout(field_size=4, comms_size=2, number_of_games_in_tournament=n_games)
+    log = Tournament(GameEnv(layout), MajorityPlayers(layout), layout).tournament()
+    log.log["tournament_id"] = tournament_id
+    return log
+
+
+@pytest.mark.usefixtures("qsb")
+def test_parquet_round_trip_restores_log(tmp_path):
+    pytest.importorskip("fastparquet")
+    from Q_Sea_Battle.tournament_log import TournamentLog
+    from Q_Sea_Battle.tournament_log_storage import tournament_log_info
+
+    np.random.seed(3)
+    log = _played_log()
+    path = tmp_path / "log.parquet"
+    log.to_parquet(path, chunk_size=16)
+
+    info = tournament_log_info(path)
+    assert info["rows"] == 40
+    assert info["row_groups"] == 3
+    assert info["game_layout"] == log.game_layout
+
+    loaded = TournamentLog.from_parquet(path)
+    assert list(loaded.log.columns) == log.game_layout.log_columns
+    assert loaded.outcome() == pytest.approx(log.outcome())
+    for column in ("field", "gun", "comm"):
+        for a, b in zip(log.log[column], loaded.log[column]):
+            np.testing.assert_array_equal(a, b)
+    assert loaded.log["game_uid"].tolist() == log.log["game_uid"].tolist()
+    assert loaded.log["shoot"].tolist() == log.log["shoot"].tolist()
+
+
+@pytest.mark.usefixtures("qsb")
+def test_writer_appends_chunks_with_projection_and_filter_pushdown(tmp_path):
+    pytest.importorskip("fastparquet")
+    from Q_Sea_Battle.tournament_log_storage import (
+        TournamentLogWriter,
+        iter_tournament_log,
+        read_tournament_log,
+    )
+
+    logs = [_played_log(n_games=10, tournament_id=t) for t in range(3)]
+    path = tmp_path / "series.parquet"
+    with TournamentLogWriter(path, logs[0].game_layout, chunk_size=10) as writer:
+        writer.append_log(logs[0])
+    # Re-open in append mode, as a long-running experiment would.
+    with TournamentLogWriter(path, logs[0].game_layout, chunk_size=10, mode="a") as writer:
+        writer.append_log(logs[1])
+        writer.append_log(logs[2])
+
+    df = read_tournament_log(path, columns=["reward", "shoot"])
+    assert list(df.columns) == ["reward", "shoot"]
+    assert len(df) == 30
+
+    only_one = read_tournament_log(path, columns=["reward"], filters=[("tournament_id", "==", 1)])
+    assert only_one["reward"].tolist() == logs[1].log["reward"].astype(float).tolist()
+
+    # Statistics prune the row groups of other tournaments.
+    chunks = list(iter_tournament_log(path, columns=["tournament_id"], filters=[("tournament_id", ">=", 2)]))
+    assert len(chunks) == 1 and set(chunks[0]["tournament_id"]) == {2}
+
+    packed = read_tournament_log(path, columns=["field", "gun"], unpack=False)
+    assert isinstance(packed["field"].iloc[0], bytes) and len(packed["field"].iloc[0]) == 2
+    assert packed["gun"].dtype == np.int32
+
+
+@pytest.mark.usefixtures("qsb")
+def test_writer_rejects_layout_mismatch_and_unknown_columns(tmp_path):
+    pytest.importorskip("fastparquet")
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.tournament_log_storage import TournamentLogWriter
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    path = tmp_path / "log.parquet"
+    with TournamentLogWriter(path, layout) as writer:
+        writer.append(np.array([1, 0, 1, 1]), np.array([0, 0, 1, 0]), np.array([1]), 1, 1, 1.0, game_id=0)
+        with pytest.raises(ValueError):
+            writer.append(np.zeros(4), np.eye(4)[0], np.zeros(1), 0, 0, 1.0, bogus=1)
+
+    with pytest.raises(ValueError):
+        TournamentLogWriter(path, GameLayout(field_size=4, comms_size=1), mode="a")
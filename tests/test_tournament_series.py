@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_series_outcomes_match_per_tournament_logs():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.majority_players import MajorityPlayers
+    from Q_Sea_Battle.tournament_log import TournamentLog
+    from Q_Sea_Battle.tournament_series import TournamentSeries
+
+    layout = GameLayout(field_size=4, comms_size=2, number_of_games_in_tournament=64)
+    for env in (GameEnv(layout), GameEnv(layout, gun_sampling="balanced", field_sampling="antithetic")):
+        np.random.seed(0)
+        result = TournamentSeries(env, MajorityPlayers(layout), layout, number_of_tournaments=5).series()
+        df = result.log.log
+        assert len(df) == 5 * 64
+        assert result.tournament_id.tolist() == [0, 1, 2, 3, 4]
+        assert df["game_id"].tolist() == list(range(64)) * 5
+        assert set(df["meta_id"]) == {0}
+
+        for t in range(5):
+            single = TournamentLog(layout)
+            single.log = df[df["tournament_id"] == t].reset_index(drop=True)
+            mean, std_error = single.outcome()
+            assert result.mean_reward[t] == pytest.approx(mean)
+            assert result.std_error[t] == pytest.approx(std_error)
+        # Blocks stay unique across tournaments in the combined log.
+        if env.sample_block is not None:
+            assert df.groupby("sample_block")["tournament_id"].nunique().max() == 1
+
+
+def test_series_meta_settings_and_restore():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.tournament_series import TournamentSeries
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=50)
+    players = PRAssistedPlayers(layout, p_high=0.5)
+    series = TournamentSeries(
+        GameEnv(layout), players, layout, number_of_tournaments=3, meta_settings=[{"p_high": 1.0}, {"p_high": 0.5}]
+    )
+    result = series.series()
+    assert players.p_high == 0.5
+    assert result.meta_id.tolist() == [0, 0, 0, 1, 1, 1]
+    assert result.log.log["tournament_id"].max() == 5
+    np.testing.assert_array_equal(result.mean_reward[:3], 1.0)
+
+    meta = result.meta_outcomes()
+    assert meta.loc[0, "p_high"] == 1.0 and meta.loc[0, "mean_reward"] == 1.0
+    assert meta["tournaments"].tolist() == [3, 3]
+    assert meta.loc[1, "ci_low"] <= meta.loc[1, "mean_reward"] <= meta.loc[1, "ci_high"]
+    assert list(result.outcomes().columns) == ["meta_id", "n_games", "mean_reward", "std_error"]
+
+    with pytest.raises(ValueError):
+        TournamentSeries(GameEnv(layout), players, layout, meta_settings=[{"p_low": 0.1}])
+    with pytest.raises(ValueError):
+        TournamentSeries(GameEnv(layout), players, layout, number_of_tournaments=0)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_series_meta_settings_reach_the_players():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.tournament_series import TournamentSeries
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=40)
+    players = NeuralNetPlayers(layout)
+    player_a, player_b = players.players()
+    np.random.seed(0)
+    result = TournamentSeries(
+        GameEnv(layout), players, layout, number_of_tournaments=1,
+        meta_settings=[{"explore": False}, {"explore": True}],
+    ).series()
+    assert not players.explore and not player_a.explore and not player_b.explore
+
+    # Greedy play always takes the more likely action; exploring does not.
+    df = result.log.log
+    logprob_shoot = df["logprob_shoot"].astype(float).to_numpy()
+    greedy = df["meta_id"].to_numpy() == 0
+    assert np.all(logprob_shoot[greedy] >= np.log(0.5) - 1e-6)
+    assert np.any(logprob_shoot[~greedy] < np.log(0.5))
+
+    with pytest.raises(ValueError):
+        TournamentSeries(GameEnv(layout), players, layout, meta_settings=[{"model_a": None}])
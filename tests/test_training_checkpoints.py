@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+def test_checkpoint_manager_retention_and_restore(tmp_path):
+    from Q_Sea_Battle.training_checkpoints import CheckpointManager
+
+    with CheckpointManager(tmp_path, max_to_keep=2, keep_every=3) as manager:
+        assert manager.latest() is None
+        for step in range(1, 8):
+            manager.save(step, {"w": np.full((2, 2), step, np.float32)}, {"epoch": step, "history": [step]})
+        manager.wait()
+        assert [step for step, _ in manager.checkpoints()] == [3, 6, 7]
+        assert not list(tmp_path.glob("*.tmp"))
+
+        arrays, meta = manager.restore()
+        assert meta == {"step": 7, "epoch": 7, "history": [7]}
+        np.testing.assert_array_equal(arrays["w"], np.full((2, 2), 7, np.float32))
+        arrays, meta = manager.restore(3)
+        assert meta["epoch"] == 3
+        with pytest.raises(FileNotFoundError):
+            manager.restore(5)
+
+    with pytest.raises(ValueError):
+        CheckpointManager(tmp_path, max_to_keep=0)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_dial_trainer_resumes_bit_identically(tmp_path):
+    from Q_Sea_Battle.dial_training import DialTrainer
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+    from Q_Sea_Battle.training_checkpoints import CheckpointManager
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    settings = dict(num_epochs=4, batches_per_epoch=2, batch_size=64, seed=3)
+
+    reference = DialTrainer(NeuralNetPlayers(layout), **settings)
+    reference.load_state(*DialTrainer(NeuralNetPlayers(layout), **settings).state())  # same initial weights
+    initial = reference.state()
+    history = reference.run(evaluate_every=2)
+    assert [r["epoch"] for r in history] == [1, 2, 3, 4]
+    assert "tournament_reward" in history[1] and "tournament_reward" not in history[0]
+    assert history[0]["sigma"] == pytest.approx(reference.sigma_for_epoch(1))
+
+    # Interrupted after epoch 2, resumed by a fresh trainer from disk.
+    first = DialTrainer(NeuralNetPlayers(layout), **settings)
+    first.load_state(*initial)
+    with CheckpointManager(tmp_path / "run", max_to_keep=1) as manager:
+        first.run(checkpoints=manager, stop_after=2)
+        assert manager.latest()[0] == 2
+
+        resumed = DialTrainer(NeuralNetPlayers(layout), **settings)
+        resumed.run(checkpoints=manager)
+        assert resumed.epoch == 4 and manager.latest()[0] == 4
+
+    for w_ref, w_res in zip(reference.model_a.get_weights() + reference.model_b.get_weights(),
+                            resumed.model_a.get_weights() + resumed.model_b.get_weights()):
+        np.testing.assert_array_equal(w_ref, w_res)
+    assert [r["mean_loss"] for r in resumed.history] == [r["mean_loss"] for r in reference.history]
+
+    arrays, meta = initial
+    with pytest.raises(ValueError):
+        DialTrainer(NeuralNetPlayers(layout), **{**settings, "num_epochs": 5}).load_state(arrays, meta)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_dial_trainer_drops_compiled_lookup_tables():
+    from Q_Sea_Battle.dial_training import DialTrainer
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=20)
+    players = NeuralNetPlayers(layout)
+    players.players()
+    assert players.compile_lookup_tables() == {"A": True, "B": True}
+    player_a, player_b = players.players()
+    assert player_a.logit_table is not None and player_b.logit_table is not None
+
+    DialTrainer(players, num_epochs=1, batches_per_epoch=1, batch_size=32, seed=0).run()
+    assert player_a.logit_table is None and player_b.logit_table is None
+    field = np.array([1, 0, 0, 1])
+    expected = (players.model_a(field[None, :].astype(np.float32) - 0.5).numpy()[0] >= 0.0).astype(int)
+    np.testing.assert_array_equal(player_a.decide(field), expected)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_training_control_stops_on_exact_and_plateau():
+    import tensorflow as tf
+    from Q_Sea_Battle.training_control import TrainingControl
+
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 2, size=(256, 2)).astype(np.float32)
+    y = x[:, :1].copy()  # copy the first bit: learned within a few epochs
+
+    tf.random.set_seed(0)
+    model = tf.keras.Sequential([tf.keras.Input(shape=(2,)), tf.keras.layers.Dense(1)])
+    model.compile(optimizer=tf.keras.optimizers.Adam(0.1), loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+    control = TrainingControl(validation_data=(x[:32], y[:32]), samples_per_epoch=len(x), patience=None)
+    model.fit(x, y, epochs=50, batch_size=64, verbose=0, callbacks=[control])
+
+    report = control.report
+    assert report.stop_reason == "exact"
+    assert report.epochs_run < 50
+    assert report.final_accuracy == 1.0
+    record = report.epochs[0]
+    assert record.seconds > 0 and record.samples_per_sec > 0 and record.steps_per_sec > 0
+    assert record.loss is not None
+    assert list(report.to_frame().columns[:3]) == ["epoch", "seconds", "samples_per_sec"]
+    assert report.total_seconds >= sum(r.seconds for r in report.epochs)
+
+    # Random targets cannot be matched: stops after `patience` flat epochs.
+    y_random = rng.integers(0, 2, size=(256, 1)).astype(np.float32)
+    model.compile(optimizer=tf.keras.optimizers.SGD(0.0), loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+    control = TrainingControl(validation_data=(x, y_random), patience=2)
+    model.fit(x, y_random, epochs=20, verbose=0, callbacks=[control])
+    assert control.report.stop_reason == "plateau"
+    assert control.report.epochs_run == 3
+
+    with pytest.raises(ValueError):
+        TrainingControl(target_accuracy=0.0)
+    with pytest.raises(ValueError):
+        TrainingControl(patience=-1)
+
+
+@pytest.mark.usefixtures("qsb")
+def test_training_control_with_pyr_joint_training():
+    from Q_Sea_Battle.pyr_trainable_assisted_imitation_utilities import (
+        generate_measurement_dataset_b,
+        joint_training_arrays,
+        train_layers_jointly,
+    )
+    from Q_Sea_Battle.training_control import TrainingControl
+
+    datasets = {"meas_b": {L: generate_measurement_dataset_b(L, num_samples=128, seed=L) for L in (4, 2)}}
+    held_out = {"meas_b": {L: generate_measurement_dataset_b(L, num_samples=32, seed=10 + L) for L in (4, 2)}}
+    x, y = joint_training_arrays(held_out)
+    assert set(x) == {"meas_b_L4_gun", "meas_b_L2_gun"} and set(y) == {"meas_b_L4", "meas_b_L2"}
+
+    control = TrainingControl(validation_data=(x, y), patience=None)
+    layers, history = train_layers_jointly(
+        datasets, epochs=3, batch_size=32, learning_rate=1e-2, verbose=0, callbacks=[control]
+    )
+    assert len(layers["meas_b"]) == 2
+    assert control.report.epochs_run == len(history.history["loss"])
+    assert len(control.report.epochs[0].output_accuracy) == 2
+
+
+@pytest.mark.usefixtures("qsb")
+def test_neural_net_players_training_returns_report():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.neural_net_players import NeuralNetPlayers
+
+    layout = GameLayout(field_size=2, comms_size=1)
+    players = NeuralNetPlayers(layout)
+    rng = np.random.default_rng(0)
+    fields = rng.integers(0, 2, size=(100, 4))
+    dataset = pd.DataFrame({"field": list(fields), "comm": list(fields[:, :1])})
+
+    report = players.train_model_a(dataset, {"epochs": 2, "batch_size": 20})
+    assert report.epochs_run == 2 and report.stop_reason == "max_epochs"
+    assert report.final_accuracy is None
+    assert report.epochs[0].samples_per_sec > 0
+
+    report = players.train_model_a(
+        dataset, {"epochs": 2, "early_stopping": True, "validation_fraction": 0.2, "patience": 1}
+    )
+    assert 1 <= report.epochs_run <= 2
+    assert report.final_accuracy is not None
+    assert report.epochs[0].steps_per_sec > 0
+
+    with pytest.raises(ValueError):
+        players.train_model_a(dataset, {"epochs": 1, "early_stopping": True, "validation_fraction": 1.0})
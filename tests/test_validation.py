@@ -0,0 +1,159 @@
+import threading
+import numpy as np
+import pytest
+import sys
+sys.path.append("./src")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_validation_level_context_manager_restores_level():
+    from Q_Sea_Battle.validation import (
+        get_validation_level,
+        is_strict,
+        set_validation_level,
+        validation_level,
+    )
+
+    assert get_validation_level() == "strict" and is_strict()
+    with validation_level("trusted"):
+        assert get_validation_level() == "trusted" and not is_strict()
+        with validation_level("strict"):
+            assert is_strict()
+        assert not is_strict()
+    assert is_strict()
+
+    previous = set_validation_level("trusted")
+    try:
+        assert previous == "strict" and not is_strict()
+    finally:
+        set_validation_level(previous)
+
+    with pytest.raises(ValueError):
+        with validation_level("sloppy"):
+            pass
+
+
+@pytest.mark.usefixtures("qsb")
+def test_validation_level_is_local_to_thread():
+    from Q_Sea_Battle.validation import is_strict, validation_level
+
+    seen = []
+    with validation_level("trusted"):
+        thread = threading.Thread(target=lambda: seen.append(is_strict()))
+        thread.start()
+        thread.join()
+    assert seen == [True]
+
+
+@pytest.mark.usefixtures("qsb")
+def test_trusted_level_skips_content_checks_only():
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.pr_assisted import PRAssisted
+    from Q_Sea_Battle.pr_assisted_players import PRAssistedPlayers
+    from Q_Sea_Battle.validation import validation_level
+
+    box = PRAssisted(length=4, p_high=0.9)
+    with pytest.raises(ValueError):
+        box.measurement_a(np.array([0, 2, 0, 1]))
+    box.reset()
+    with validation_level("trusted"):
+        box.measurement_a(np.array([0, 1, 0, 1]))
+        with pytest.raises(ValueError):
+            box.measurement_b(np.array([0, 1]))  # shape is still checked
+
+    layout = GameLayout(field_size=4, comms_size=1)
+    players = PRAssistedPlayers(layout, p_high=1.0)
+    player_a, player_b = players.players()
+    field = np.random.randint(0, 2, size=16)
+    gun = np.zeros(16, dtype=int)
+    gun[5] = 1
+
+    players.reset()
+    comm = player_a.decide(field)
+    strict_shoot = player_b.decide(gun, comm)
+    with pytest.raises(ValueError):
+        players.reset()
+        player_a.decide(field)
+        player_b.decide(np.full(16, 1), comm)
+
+    # Same decision on valid inputs in trusted mode.
+    with validation_level("trusted"):
+        players.reset()
+        comm = player_a.decide(field)
+        assert player_b.decide(gun, comm) == strict_shoot == field[5]
+
+
+@pytest.mark.usefixtures("qsb")
+def test_tournament_runs_trusted_by_default():
+    from Q_Sea_Battle.game_env import GameEnv
+    from Q_Sea_Battle.game_layout import GameLayout
+    from Q_Sea_Battle.players_base import Players
+    from Q_Sea_Battle.simple_player_a import SimplePlayerA
+    from Q_Sea_Battle.simple_player_b import SimplePlayerB
+    from Q_Sea_Battle.tournament import Tournament
+    from Q_Sea_Battle.validation import is_strict
+
+    levels = []
+
+    class RecordingPlayerB(SimplePlayerB):
+        def decide(self, gun, comm, supp=None):
+            levels.append(is_strict())
+            return super().decide(gun, comm, supp)
+
+    class RecordingPlayers(Players):
+        def players(self):
+            return SimplePlayerA(self.game_layout), RecordingPlayerB(self.game_layout)
+
+    layout = GameLayout(field_size=2, comms_size=1, number_of_games_in_tournament=3)
+    Tournament(GameEnv(layout), RecordingPlayers(layout), layout).tournament()
+    Tournament(GameEnv(layout), RecordingPlayers(layout), layout, validation="strict").tournament()
+    assert levels == [False] * 3 + [True] * 3
+    assert is_strict()
+
+    with pytest.raises(ValueError):
+        Tournament(GameEnv(layout), RecordingPlayers(layout), layout, validation="off")
+
+
+@pytest.mark.usefixtures("qsb")
+def test_pr_assisted_layer_checks_do_not_depend_on_trace_time_level():
+    import tensorflow as tf
+
+    from Q_Sea_Battle.pr_assisted_layer import PRAssistedLayer
+    from Q_Sea_Battle.validation import validation_level
+
+    bad = tf.constant([[0.0, 2.0, 0.0, 1.0]])
+    inputs = {
+        "current_measurement": bad,
+        "previous_measurement": tf.zeros((1, 4)),
+        "previous_outcome": tf.zeros((1, 4)),
+        "first_measurement": tf.ones((1, 1)),
+    }
+
+    eager = tf.config.functions_run_eagerly()
+    tf.config.run_functions_eagerly(False)
+    try:
+        # A graph first traced under trusted mode keeps the assertions.
+        layer = PRAssistedLayer(length=4, p_high=0.9)
+        graph_call = tf.function(lambda x: layer(x))
+        with validation_level("trusted"):
+            with pytest.raises(tf.errors.InvalidArgumentError):
+                graph_call(inputs)
+        with pytest.raises(tf.errors.InvalidArgumentError):
+            graph_call(inputs)
+
+        # An explicit constructor argument overrides the level.
+        unchecked = PRAssistedLayer(length=4, p_high=0.9, validate=False)
+        tf.function(lambda x: unchecked(x))(inputs)
+        checked = PRAssistedLayer(length=4, p_high=0.9, validate=True)
+        with validation_level("trusted"):
+            with pytest.raises(tf.errors.InvalidArgumentError):
+                checked(inputs)
+        assert PRAssistedLayer.from_config(checked.get_config()).validate is True
+    finally:
+        tf.config.run_functions_eagerly(eager)
+
+    # Eager calls follow the level.
+    with validation_level("trusted"):
+        layer(inputs)
+    with pytest.raises(tf.errors.InvalidArgumentError):
+        layer(inputs)